@@ -5,6 +5,7 @@ Provides hybrid Docling/ADE PDF parsing integration for SHPT and DOMESTIC system
 
 Main Components:
 - HybridPDFRouter: Route documents to optimal parsing engine
+- PDFProbe: Cached page-tree/first-page layout probe for routing features
 - Data Adapters: Convert between SHPT/DOMESTIC and Unified IR formats
 - SchemaValidator: Validate documents against Unified IR schema
 - Routing Rules: HVDC-specific routing configuration
@@ -32,6 +33,7 @@ __version__ = "1.0.0"
 __author__ = "HVDC Logistics AI Team"
 
 from .hybrid_pdf_router import HybridPDFRouter
+from .pdf_probe import PDFProbe, get_shared_probe
 from .data_adapters import (
     SHPTToUnifiedIRAdapter,
     DOMESTICToUnifiedIRAdapter,
@@ -44,6 +46,9 @@ from .schema_validator import SchemaValidator
 __all__ = [
     # Router
     "HybridPDFRouter",
+    # Probe
+    "PDFProbe",
+    "get_shared_probe",
     # Adapters
     "SHPTToUnifiedIRAdapter",
     "DOMESTICToUnifiedIRAdapter",
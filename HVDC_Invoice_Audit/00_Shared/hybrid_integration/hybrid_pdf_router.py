@@ -14,7 +14,11 @@ import json
 import logging
 from pathlib import Path
 from datetime import datetime, date
-import hashlib
+
+try:
+    from .pdf_probe import PDFProbe, get_shared_probe
+except ImportError:  # loaded as a top-level module (hybrid_doc_system worker)
+    from pdf_probe import PDFProbe, get_shared_probe
 
 
 class HybridPDFRouter:
@@ -22,20 +26,28 @@ class HybridPDFRouter:
     Intelligent routing engine for hybrid Docling/ADE parsing
 
     Features:
-    - Rule-based routing from routing_rules_hvdc.json
+    - Rule-based routing from routing_rules_hvdc.json ("rules", or the
+      worker's "hvdc_rules" where priority 1 is evaluated first)
     - Budget tracking for ADE usage
     - Automatic fallback on engine failure
     - Document type detection
     - Routing decision logging
     """
 
-    def __init__(self, config_path: Optional[str] = None, log_level: str = "INFO"):
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        log_level: str = "INFO",
+        probe: Optional[PDFProbe] = None,
+    ):
         """
         Initialize router
 
         Args:
             config_path: Path to routing_rules_hvdc.json
             log_level: Logging level
+            probe: PDFProbe for document characteristics (defaults to the
+                process-wide shared probe)
         """
         self.logger = self._setup_logger(log_level)
 
@@ -48,6 +60,12 @@ class HybridPDFRouter:
         self.daily_budget = self.rules.get("daily_ade_budget_usd", 50.0)
         self.sensitivity_list = self.rules.get("sensitivity_force_local", [])
 
+        # Layout probe (shared with hybrid_doc_system worker). Indicators are
+        # passed per probe() call so routers with different configs can share
+        # one probe without overwriting each other's settings.
+        self.probe = probe or get_shared_probe()
+        self.doc_type_indicators = self._load_doc_type_indicators() or None
+
         # Budget tracking (resets daily)
         self.budget_date = date.today()
         self.budget_used = 0.0
@@ -77,7 +95,6 @@ class HybridPDFRouter:
             with open(config_path, "r") as f:
                 rules = json.load(f)
             self.logger.info(f"Loaded routing rules from {config_path}")
-            return rules
         except FileNotFoundError:
             self.logger.error(f"Routing rules file not found: {config_path}")
             return {"default_engine": "docling", "rules": []}
@@ -85,6 +102,27 @@ class HybridPDFRouter:
             self.logger.error(f"Invalid JSON in routing rules: {e}")
             return {"default_engine": "docling", "rules": []}
 
+        # hybrid_doc_system config: "hvdc_rules", lowest priority number first
+        if "rules" not in rules and "hvdc_rules" in rules:
+            rules["rules"] = rules["hvdc_rules"]
+            rules.setdefault("priority_order", "ascending")
+        return rules
+
+    def _load_doc_type_indicators(self) -> Dict[str, List[str]]:
+        """Map routing_rules "document_type_detection" to probe doc types"""
+        detection = self.rules.get("document_type_detection", {})
+        key_map = {
+            "boe_indicators": "BOE",
+            "do_indicators": "DO",
+            "dn_indicators": "DN",
+            "carrier_invoice_indicators": "CarrierInvoice",
+        }
+        return {
+            doc_type: detection[key]
+            for key, doc_type in key_map.items()
+            if detection.get(key)
+        }
+
     def decide_route(
         self,
         file_path: str,
@@ -132,16 +170,38 @@ class HybridPDFRouter:
                 reason=f"ADE budget exceeded (${self.budget_used:.2f}/${self.daily_budget})",
             )
 
-        # Check sensitivity (critical priority)
+        # Check sensitivity (critical priority); a matching sensitivity rule
+        # (e.g. samsung_ct_priority) names the decision, engine stays local
         if self._is_sensitive_document(doc_characteristics):
+            sensitive_rule = self._match_rules(
+                doc_characteristics, required_condition="sensitivity_in"
+            )
+            if sensitive_rule:
+                return self._create_decision(
+                    engine="docling",
+                    rule_name=sensitive_rule["name"],
+                    reason=sensitive_rule["action"].get(
+                        "reason", "Sensitive document - local processing only"
+                    ),
+                    doc_characteristics=doc_characteristics,
+                )
             return self._create_decision(
                 engine="docling",
                 rule_name="sensitive_force_local",
                 reason="Sensitive document - local processing only",
             )
 
+        # Retry after an engine failure: fallback rules go first, otherwise an
+        # ordinary rule would send the document back to the failed engine
+        matched_rule = None
+        if doc_characteristics.get("engine_failed"):
+            matched_rule = self._match_rules(
+                doc_characteristics, required_condition="engine_failed"
+            )
+
         # Match against rules
-        matched_rule = self._match_rules(doc_characteristics)
+        if matched_rule is None:
+            matched_rule = self._match_rules(doc_characteristics)
 
         if matched_rule:
             engine = matched_rule["action"]["engine"]
@@ -155,6 +215,7 @@ class HybridPDFRouter:
                 rule_name=matched_rule["name"],
                 reason=matched_rule["action"]["reason"],
                 doc_characteristics=doc_characteristics,
+                cost_per_page=matched_rule["action"].get("expected_cost_per_page_usd"),
             )
         else:
             # No rule matched - use default
@@ -187,7 +248,7 @@ class HybridPDFRouter:
 
     def _analyze_document(self, file_path: str) -> Dict:
         """
-        Analyze document characteristics
+        Analyze document characteristics with the cached layout probe
 
         Returns:
             Dict with:
@@ -199,19 +260,14 @@ class HybridPDFRouter:
                 - file_size_mb: File size in MB
                 - visual_relations: List of detected visual elements
         """
-        characteristics = {
-            "doc_type": self._detect_doc_type(file_path),
-            "pages": self._estimate_pages(file_path),
-            "table_density": 0.0,  # Would need actual analysis
-            "skew_deg": 0.0,
-            "dpi": 300,  # Assume reasonable DPI
-            "file_size_mb": self._get_file_size(file_path),
-            "visual_relations": [],
-            "container_count": 0,
-            "hs_code_count": 0,
-            "line_item_count": 0,
-            "multi_stop_detected": False,
-        }
+        characteristics = self.probe.probe(
+            file_path, doc_type_indicators=self.doc_type_indicators
+        )
+
+        # Filename is the stronger signal when it names the doc type
+        name_type = self._detect_doc_type(file_path)
+        if name_type != "Other":
+            characteristics["doc_type"] = name_type
 
         self.logger.debug(f"Analyzed {Path(file_path).name}: {characteristics}")
         return characteristics
@@ -232,15 +288,10 @@ class HybridPDFRouter:
             return "Other"
 
     def _estimate_pages(self, file_path: str) -> int:
-        """Estimate page count (simplified - would need actual PDF reading)"""
-        try:
-            # Rough estimate based on file size
-            file_size_mb = self._get_file_size(file_path)
-            # Assume ~100KB per page average
-            estimated_pages = max(1, int(file_size_mb * 10))
-            return estimated_pages
-        except:
-            return 1
+        """Page count from the PDF page tree (via cached probe)"""
+        return self.probe.probe(
+            file_path, doc_type_indicators=self.doc_type_indicators
+        ).get("pages", 1)
 
     def _get_file_size(self, file_path: str) -> float:
         """Get file size in MB"""
@@ -254,28 +305,54 @@ class HybridPDFRouter:
         """Check if daily ADE budget is exceeded"""
         return self.budget_used >= self.daily_budget
 
+    def _document_sensitivity(
+        self, characteristics: Dict, labels: Optional[List[str]] = None
+    ) -> set:
+        """
+        Sensitivity labels of a document
+
+        Caller-supplied tags (characteristics["sensitivity"]) plus any label
+        contained in the doc type (defaults to sensitivity_force_local).
+        """
+        labels = self.sensitivity_list if labels is None else labels
+        tags = characteristics.get("sensitivity") or []
+        if isinstance(tags, str):
+            tags = [tags]
+        doc_type = (characteristics.get("doc_type") or "").lower()
+        found = {str(tag).lower() for tag in tags}
+        found.update(label for label in labels if label.lower() in doc_type)
+        return found
+
     def _is_sensitive_document(self, characteristics: Dict) -> bool:
         """Check if document is marked as sensitive"""
-        doc_type = characteristics.get("doc_type", "").lower()
-        # Check against sensitivity list
-        return any(sensitive in doc_type for sensitive in self.sensitivity_list)
+        local_only = {label.lower() for label in self.sensitivity_list}
+        return bool(self._document_sensitivity(characteristics) & local_only)
 
-    def _match_rules(self, characteristics: Dict) -> Optional[Dict]:
+    def _match_rules(
+        self, characteristics: Dict, required_condition: Optional[str] = None
+    ) -> Optional[Dict]:
         """
         Match document characteristics against rules
 
+        Args:
+            characteristics: Probe result (plus caller fields)
+            required_condition: Only consider rules whose 'when' has this key
+
         Returns matched rule or None
         """
         doc_type = characteristics.get("doc_type")
 
-        # Sort rules by priority (higher priority first)
+        # Sort rules by priority (higher priority first unless ascending)
         sorted_rules = sorted(
             self.rules.get("rules", []),
             key=lambda r: r.get("priority", 0),
-            reverse=True,
+            reverse=self.rules.get("priority_order") != "ascending",
         )
 
         for rule in sorted_rules:
+            if required_condition and required_condition not in rule.get("when", {}):
+                continue
+
             # Check if rule applies to this doc type
             rule_doc_types = rule.get("doc_types", [])
             if rule_doc_types and doc_type not in rule_doc_types:
@@ -299,9 +376,26 @@ class HybridPDFRouter:
             elif condition == "pages_gte":
                 if characteristics.get("pages", 0) < value:
                     return False
+            elif condition == "pages_lte":
+                if characteristics.get("pages", 0) > value:
+                    return False
             elif condition == "table_density_gte":
                 if characteristics.get("table_density", 0) < value:
                     return False
+            elif condition == "table_density_lte":
+                if characteristics.get("table_density", 0) > value:
+                    return False
+            elif condition == "doc_type_in":
+                doc_type = (characteristics.get("doc_type") or "").lower()
+                if doc_type not in {str(v).lower() for v in value}:
+                    return False
+            elif condition == "metadata_contains_any":
+                sample = " ".join(
+                    str(characteristics.get(key) or "")
+                    for key in ("text_sample", "metadata")
+                ).lower()
+                if not any(str(term).lower() in sample for term in value):
+                    return False
             elif condition == "skew_deg_gte":
                 if characteristics.get("skew_deg", 0) < value:
                     return False
@@ -326,8 +420,9 @@ class HybridPDFRouter:
                 if not any(rel in doc_relations for rel in required_relations):
                     return False
             elif condition == "sensitivity_in":
-                # Already handled separately
-                pass
+                labels = {str(v).lower() for v in value}
+                if not self._document_sensitivity(characteristics, value) & labels:
+                    return False
             elif condition == "ade_budget_exceeded":
                 if value != self._is_budget_exceeded():
                     return False
@@ -335,6 +430,9 @@ class HybridPDFRouter:
                 # Would be set by caller in retry scenarios
                 if not characteristics.get("engine_failed", False):
                     return False
+            elif condition == "failed_engine":
+                if characteristics.get("failed_engine") != value:
+                    return False
 
         return True
 
@@ -356,6 +454,7 @@ class HybridPDFRouter:
         rule_name: str,
         reason: str,
         doc_characteristics: Optional[Dict] = None,
+        cost_per_page: Optional[float] = None,
     ) -> Dict:
         """Create routing decision dictionary"""
         decision = {
@@ -368,12 +467,17 @@ class HybridPDFRouter:
             "ade_cost_usd": 0.0,
         }
 
+        if doc_characteristics and "probe_ms" in doc_characteristics:
+            decision["probe_ms"] = doc_characteristics["probe_ms"]
+            decision["probe_cache_hit"] = doc_characteristics.get("cache_hit", False)
+
         # Estimate ADE cost if using ADE
         if engine == "ade" and doc_characteristics:
             pages = doc_characteristics.get("pages", 1)
-            cost_per_page = self.rules.get("cost_management", {}).get(
-                "ade_cost_per_page_usd", 0.01
-            )
+            if cost_per_page is None:
+                cost_per_page = self.rules.get("cost_management", {}).get(
+                    "ade_cost_per_page_usd", 0.01
+                )
             decision["ade_cost_usd"] = pages * cost_per_page
 
         # Adjust confidence based on engine and doc type
@@ -441,6 +545,7 @@ class HybridPDFRouter:
             "ade_percentage": (ade_count / total * 100) if total > 0 else 0,
             "total_ade_cost_usd": total_ade_cost,
             "budget_status": self.get_budget_status(),
+            "probe_metrics": self.probe.get_metrics(),
         }
 
 
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Cheap PDF Layout Probe for HVDC Routing
+
+Collects the document characteristics used by routing rules without running
+a full parse:
+- Page count from the xref/page tree (/Count), not from file size
+- First-page text sample (doc type indicators, containers, HS codes)
+- Table density estimate from tabular text lines and ruling lines
+- Scan DPI estimate from first-page images
+
+Results are cached by file content hash (in memory, optionally on disk),
+so HybridPDFRouter and the hybrid_doc_system worker can share one probe.
+
+This module has no package-relative imports so the worker can load it
+directly from 00_Shared/hybrid_integration.
+"""
+
+from typing import Dict, List, Optional
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+
+# Container number (ISO 6346) / HS code patterns used for feature counts
+CONTAINER_PATTERN = re.compile(r"\b[A-Z]{4}\d{7}\b")
+HS_CODE_PATTERN = re.compile(r"\b\d{4}\.\d{2}(?:\.\d{2,4})?\b")
+NUMBER_PATTERN = re.compile(r"^[\-\(]?[\d,]+(?:\.\d+)?\)?$")
+MULTI_STOP_PATTERN = re.compile(r"\b(?:STOP|DROP)\s*(?:#|NO\.?)?\s*[2-9]\b", re.I)
+
+# Raw page tree fallbacks (no PDF library available)
+RAW_PAGES_COUNT = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)", re.S)
+RAW_PAGE_OBJECT = re.compile(rb"/Type\s*/Page\b(?!s)")
+
+DEFAULT_DOC_TYPE_INDICATORS = {
+    "BOE": ["Bill of Entry", "Entry No", "Customs Office", "HS Code", "Tariff"],
+    "DO": ["Delivery Order", "DO No", "Container Release", "Free Days"],
+    "DN": ["Delivery Note", "Loading Point", "Vehicle Type", "Driver"],
+    "CarrierInvoice": ["Carrier Invoice", "Freight Charges", "Tax Invoice"],
+}
+
+# Bumped whenever extracted features change so stale disk cache is ignored
+PROBE_VERSION = 2
+
+# Per-file fields recomputed on every probe call (never cached by content hash)
+NAME_DEPENDENT_FIELDS = ("doc_type",)
+
+
+class PDFProbe:
+    """
+    Content-hash cached PDF characteristics probe
+
+    Features:
+    - Page count from /Count in the page tree (pypdf/PyPDF2, raw fallback)
+    - Sampled first-page text + table density (pdfplumber)
+    - In-memory LRU cache keyed by SHA-256, optional JSON disk cache
+    - Probe latency / cache hit metrics
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_cache_entries: int = 1024,
+        sample_chars: int = 4000,
+        doc_type_indicators: Optional[Dict[str, List[str]]] = None,
+        log_level: str = "INFO",
+        latency_window: int = 1024,
+    ):
+        """
+        Initialize probe
+
+        Args:
+            cache_dir: Optional directory for persisted probe results
+            max_cache_entries: In-memory cache size (LRU)
+            sample_chars: Max first-page text characters kept in results
+            doc_type_indicators: Default text indicators per doc type
+                (callers may pass their own per probe() call)
+            log_level: Logging level
+            latency_window: Number of recent probe latencies kept for metrics
+        """
+        self.logger = logging.getLogger("PDFProbe")
+        self.logger.setLevel(getattr(logging, log_level))
+
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_cache_entries = max_cache_entries
+        self.sample_chars = sample_chars
+        self.doc_type_indicators = doc_type_indicators or DEFAULT_DOC_TYPE_INDICATORS
+
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.probe_count = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.latencies_ms: "deque[float]" = deque(maxlen=latency_window)
+
+    def probe(
+        self,
+        file_path: str,
+        doc_type_indicators: Optional[Dict[str, List[str]]] = None,
+    ) -> Dict:
+        """
+        Probe a PDF file (cached by content hash)
+
+        Only content-derived fields are cached. doc_type depends on the file
+        name, so it is detected on every call: filename first, then the
+        cached first-page text sample with doc_type_indicators (defaults to
+        the probe's indicators).
+
+        Returns:
+            Dict with routing characteristics (doc_type, pages, table_density,
+            skew_deg, dpi, file_size_mb, visual_relations, container_count,
+            hs_code_count, line_item_count, multi_stop_detected) plus
+            file_hash, text_sample, has_text_layer, probe_ms, cache_hit
+        """
+        start = time.perf_counter()
+        self.probe_count += 1
+
+        try:
+            file_hash = self.file_hash(file_path)
+        except OSError as e:
+            self.logger.warning(f"Probe failed for {file_path}: {e}")
+            result = self._empty_characteristics(file_path)
+            result["doc_type"] = self._detect_doc_type(
+                file_path, "", doc_type_indicators
+            )
+            return self._finish(result, start, cache_hit=False)
+
+        cached = self._cache_get(file_hash)
+        cache_hit = cached is not None
+        if cache_hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+            cached = self._probe_uncached(file_path)
+            cached["file_hash"] = file_hash
+            self._cache_put(file_hash, cached)
+
+        result = dict(cached)
+        result["doc_type"] = self._detect_doc_type(
+            file_path, result.get("text_sample", ""), doc_type_indicators
+        )
+        return self._finish(result, start, cache_hit=cache_hit)
+
+    @staticmethod
+    def file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+        """SHA-256 of file content"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get_metrics(self) -> Dict:
+        """Probe latency and cache statistics"""
+        latencies = sorted(self.latencies_ms)
+        n = len(latencies)
+
+        def pct(p: float) -> float:
+            if not n:
+                return 0.0
+            return latencies[min(n - 1, int(round(p * (n - 1))))]
+
+        return {
+            "probe_count": self.probe_count,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": (
+                (self.cache_hits / self.probe_count) if self.probe_count else 0.0
+            ),
+            "avg_latency_ms": (sum(latencies) / n) if n else 0.0,
+            "p50_latency_ms": pct(0.50),
+            "p95_latency_ms": pct(0.95),
+            "max_latency_ms": latencies[-1] if n else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Probe internals
+    # ------------------------------------------------------------------
+
+    def _probe_uncached(self, file_path: str) -> Dict:
+        """Content-derived characteristics (no name-dependent fields)"""
+        result = self._empty_characteristics(file_path)
+        for field in NAME_DEPENDENT_FIELDS:
+            result.pop(field, None)
+        result["pages"] = self._count_pages(file_path)
+
+        first_page = self._sample_first_page(file_path)
+        text = first_page.get("text", "")
+        upper = text.upper()
+
+        result["has_text_layer"] = bool(text.strip())
+        result["text_sample"] = text[: self.sample_chars]
+        result["table_density"] = first_page.get("table_density", 0.0)
+        result["line_item_count"] = first_page.get("line_item_count", 0)
+        result["dpi"] = first_page.get("dpi", result["dpi"])
+        result["container_count"] = len(set(CONTAINER_PATTERN.findall(upper)))
+        result["hs_code_count"] = len(set(HS_CODE_PATTERN.findall(text)))
+        result["multi_stop_detected"] = bool(MULTI_STOP_PATTERN.search(text))
+
+        return result
+
+    def _empty_characteristics(self, file_path: str) -> Dict:
+        return {
+            "doc_type": "Other",
+            "pages": 1,
+            "table_density": 0.0,
+            "skew_deg": 0.0,  # Not measured by the cheap probe
+            "dpi": 300,
+            "file_size_mb": self._get_file_size(file_path),
+            "visual_relations": [],
+            "container_count": 0,
+            "hs_code_count": 0,
+            "line_item_count": 0,
+            "multi_stop_detected": False,
+            "has_text_layer": False,
+            "text_sample": "",
+            "file_hash": None,
+            "probe_version": PROBE_VERSION,
+        }
+
+    def _count_pages(self, file_path: str) -> int:
+        """Page count from the page tree root (/Count)"""
+        try:
+            try:
+                from pypdf import PdfReader
+            except ImportError:
+                from PyPDF2 import PdfReader  # type: ignore
+
+            reader = PdfReader(file_path, strict=False)
+            return max(1, len(reader.pages))
+        except Exception as e:
+            self.logger.debug(f"pypdf page count failed for {file_path}: {e}")
+
+        try:
+            data = Path(file_path).read_bytes()
+            counts = [int(c) for c in RAW_PAGES_COUNT.findall(data)]
+            if counts:
+                # Root /Pages node carries the largest /Count
+                return max(1, max(counts))
+            return max(1, len(RAW_PAGE_OBJECT.findall(data)))
+        except Exception:
+            return 1
+
+    def _sample_first_page(self, file_path: str) -> Dict:
+        """Text, table density and DPI estimate from the first page only"""
+        try:
+            import pdfplumber
+        except ImportError:
+            return {}
+
+        try:
+            with pdfplumber.open(file_path) as pdf:
+                if not pdf.pages:
+                    return {}
+                page = pdf.pages[0]
+                text = page.extract_text() or ""
+                ruling_count = len(page.lines) + len(page.rects)
+                images = page.images
+                page_width = float(page.width or 0)
+        except Exception as e:
+            self.logger.debug(f"First-page sample failed for {file_path}: {e}")
+            return {}
+
+        lines = [ln for ln in text.splitlines() if ln.strip()]
+        tabular = [ln for ln in lines if self._is_tabular_line(ln)]
+        density = 0.0
+        if lines:
+            density = len(tabular) / len(lines)
+        # Ruled grids raise density even when cells are mostly text
+        density = min(1.0, density + min(0.3, ruling_count / 200.0))
+
+        return {
+            "text": text,
+            "table_density": round(density, 3),
+            "line_item_count": len(tabular),
+            "dpi": self._estimate_dpi(images, page_width),
+        }
+
+    @staticmethod
+    def _is_tabular_line(line: str) -> bool:
+        """Line with 3+ tokens of which at least one is numeric"""
+        tokens = line.split()
+        if len(tokens) < 3:
+            return False
+        return any(NUMBER_PATTERN.match(t) for t in tokens)
+
+    @staticmethod
+    def _estimate_dpi(images: List[Dict], page_width: float) -> int:
+        """Effective DPI of the widest first-page image (scans), else 300"""
+        best = None
+        for img in images or []:
+            src = img.get("srcsize") or (None, None)
+            width_pt = float(img.get("x1", 0)) - float(img.get("x0", 0))
+            if not src[0] or width_pt <= 0:
+                continue
+            if page_width and width_pt < page_width * 0.5:
+                continue  # logos/stamps, not a page scan
+            dpi = int(round(src[0] / (width_pt / 72.0)))
+            best = dpi if best is None else min(best, dpi)
+        return best if best else 300
+
+    def _detect_doc_type_from_name(self, file_path: str) -> str:
+        """Same filename heuristics as HybridPDFRouter._detect_doc_type"""
+        filename = Path(file_path).name.upper()
+
+        if "BOE" in filename:
+            return "BOE"
+        elif "DO" in filename and "DN" not in filename:
+            return "DO"
+        elif "DN" in filename:
+            return "DN"
+        elif "CARRIER" in filename or "INVOICE" in filename:
+            return "CarrierInvoice"
+        return "Other"
+
+    def _detect_doc_type(
+        self,
+        file_path: str,
+        text: str,
+        doc_type_indicators: Optional[Dict[str, List[str]]] = None,
+    ) -> str:
+        """Filename heuristics, then first-page text indicators"""
+        doc_type = self._detect_doc_type_from_name(file_path)
+        if doc_type == "Other" and text:
+            doc_type = self._detect_doc_type_from_text(
+                text.upper(), doc_type_indicators
+            )
+        return doc_type
+
+    def _detect_doc_type_from_text(
+        self,
+        upper_text: str,
+        doc_type_indicators: Optional[Dict[str, List[str]]] = None,
+    ) -> str:
+        best_type, best_hits = "Other", 0
+        indicators_by_type = doc_type_indicators or self.doc_type_indicators
+        for doc_type, indicators in indicators_by_type.items():
+            hits = sum(1 for ind in indicators if ind.upper() in upper_text)
+            if hits > best_hits:
+                best_type, best_hits = doc_type, hits
+        return best_type
+
+    @staticmethod
+    def _get_file_size(file_path: str) -> float:
+        try:
+            return Path(file_path).stat().st_size / (1024 * 1024)
+        except OSError:
+            return 0.0
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cache_get(self, file_hash: str) -> Optional[Dict]:
+        with self._lock:
+            if file_hash in self._cache:
+                self._cache.move_to_end(file_hash)
+                return self._cache[file_hash]
+
+        if not self.cache_dir:
+            return None
+        cache_file = self.cache_dir / f"{file_hash}.json"
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if result.get("probe_version") != PROBE_VERSION:
+            return None
+        for field in NAME_DEPENDENT_FIELDS:
+            result.pop(field, None)
+        self._cache_put(file_hash, result, persist=False)
+        return result
+
+    def _cache_put(self, file_hash: str, result: Dict, persist: bool = True):
+        with self._lock:
+            self._cache[file_hash] = result
+            self._cache.move_to_end(file_hash)
+            while len(self._cache) > self.max_cache_entries:
+                self._cache.popitem(last=False)
+
+        if persist and self.cache_dir:
+            cache_file = self.cache_dir / f"{file_hash}.json"
+            try:
+                with open(cache_file, "w", encoding="utf-8") as f:
+                    json.dump(result, f, ensure_ascii=False)
+            except OSError as e:
+                self.logger.debug(f"Probe cache write failed: {e}")
+
+    def _finish(self, result: Dict, start: float, cache_hit: bool) -> Dict:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.latencies_ms.append(elapsed_ms)
+        result["probe_ms"] = round(elapsed_ms, 3)
+        result["cache_hit"] = cache_hit
+        return result
+
+
+_shared_probe: Optional[PDFProbe] = None
+
+
+def get_shared_probe(cache_dir: Optional[str] = None) -> PDFProbe:
+    """Process-wide probe instance shared by router and worker"""
+    global _shared_probe
+    if _shared_probe is None:
+        _shared_probe = PDFProbe(cache_dir=cache_dir)
+    return _shared_probe
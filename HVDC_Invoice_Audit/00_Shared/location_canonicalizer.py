@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Location Canonicalizer
+위치명 정규화 공통 엔진 (컴파일된 규칙 테이블 + 메모이제이션 + 배치 API)
+
+각 시스템의 정규화 규칙(DOMESTIC 시노님, 약어 확장, 요율 별칭 등)은 그대로 두고,
+동일 문자열 반복 호출 비용만 제거한다.
+- 규칙 테이블: 정규식/별칭을 생성 시 1회 컴파일
+- LRU 메모: 입력 문자열 → 정규화 결과 (크기 제한)
+- 정규화 결과는 intern 되어 canonical ID(int)로 조회 가능
+- canonicalize_series: pandas 컬럼을 고유값 단위로 정규화 (행 수가 아닌 고유값 수에 비례)
+
+Version: 1.0.0
+Created: 2025-10-19
+Author: MACHO-GPT v3.4-mini HVDC Project Enhancement
+"""
+
+import re
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class RegexRuleTable:
+    """
+    순서가 있는 (정규식 → 표준명) 규칙 테이블
+
+    첫 번째로 매칭되는 규칙의 표준명을 반환 (re.match 의미 유지).
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, str]], flags: int = 0):
+        self.rules: List[Tuple[re.Pattern, str]] = [
+            (re.compile(pattern, flags), canon) for pattern, canon in rules
+        ]
+
+    def lookup(self, text: str) -> Optional[str]:
+        for pattern, canon in self.rules:
+            if pattern.match(text):
+                return canon
+        return None
+
+
+class AliasRuleTable:
+    """
+    별칭 → 표준명 테이블 (대문자 키, 조회 입력은 trim 후 대문자)
+
+    lookup: 정확 일치 우선, substring=True면 등록 순서대로 부분 일치 시도.
+    """
+
+    def __init__(self, aliases: Iterable[Tuple[str, str]], substring: bool = False):
+        self.exact: Dict[str, str] = {}
+        self.ordered: List[Tuple[str, str]] = []
+        for alias, canon in aliases:
+            key = str(alias).upper()
+            self.exact.setdefault(key, canon)
+            self.ordered.append((key, canon))
+        self.substring = substring
+
+    def lookup(self, text: str) -> Optional[str]:
+        key = str(text).strip().upper()
+        if key in self.exact:
+            return self.exact[key]
+        if self.substring:
+            for alias, canon in self.ordered:
+                if alias in key:
+                    return canon
+        return None
+
+
+class LocationCanonicalizer:
+    """
+    정규화 함수 메모이제이션 래퍼
+
+    Args:
+        rules: 원본 문자열 → 정규화 문자열 함수 (순수 함수여야 함)
+        maxsize: LRU 메모 최대 항목 수
+    """
+
+    def __init__(self, rules: Callable[[object], str], maxsize: int = 65536):
+        self.rules = rules
+        self._memo = lru_cache(maxsize=maxsize, typed=True)(self._compute)
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+
+    def _compute(self, value) -> str:
+        result = self.rules(value)
+        return sys.intern(result) if type(result) is str else result
+
+    def canonicalize(self, value):
+        """단일 값 정규화 (해시 불가 값은 메모 없이 계산)"""
+        try:
+            return self._memo(value)
+        except TypeError:
+            return self.rules(value)
+
+    __call__ = canonicalize
+
+    def canonical_id(self, value) -> int:
+        """정규화 결과의 정수 ID (동일 표준명 → 동일 ID)"""
+        canon = self.canonicalize(value)
+        cid = self._ids.get(canon)
+        if cid is None:
+            cid = self._ids[canon] = len(self._names)
+            self._names.append(canon)
+        return cid
+
+    def name_of(self, cid: int) -> str:
+        """canonical ID → 표준명"""
+        return self._names[cid]
+
+    def canonicalize_series(self, series: pd.Series) -> pd.Series:
+        """
+        pandas 문자열 컬럼 배치 정규화 (고유값만 계산 후 코드로 확장)
+
+        결측값(None/NaN)은 원래 값 그대로 rules에 전달된다.
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        mapped = np.empty(len(uniques), dtype=object)
+        mapped[:] = [self.canonicalize(v) for v in uniques]
+
+        out = np.empty(len(codes), dtype=object)
+        present = codes >= 0
+        out[present] = mapped[codes[present]]
+        if not present.all():
+            out[~present] = [
+                self.canonicalize(v) for v in series.to_numpy(dtype=object)[~present]
+            ]
+        return pd.Series(out, index=series.index, name=series.name)
+
+    def cache_info(self):
+        return self._memo.cache_info()
+
+    def cache_clear(self) -> None:
+        self._memo.cache_clear()
@@ -10,10 +10,65 @@ Last Updated: 2025-10-13
 """
 
 from typing import List, Dict, Optional, Tuple, Any
-from rdflib import Graph, Namespace
 from datetime import datetime
 import logging
 
+try:
+    from rdflib import Graph, Namespace
+
+    RDFLIB_OK = True
+except ImportError:
+    RDFLIB_OK = False
+    Graph = None  # type: ignore
+    Namespace = str  # type: ignore
+
+try:
+    import numpy as np
+
+    NUMPY_OK = True
+except ImportError:
+    NUMPY_OK = False
+
+
+# ==================== Field Normalizers ====================
+
+
+def _norm_mbl(d: Dict) -> str:
+    """MBL/BL 번호 정규화 (동의어 처리)"""
+    return (d.get("mbl_no") or d.get("bl_number") or "").strip()
+
+
+def _norm_containers(d: Dict) -> List[str]:
+    """컨테이너 번호 정규화 (문자열/딕셔너리 혼재 처리)"""
+    cs = []
+    raw = d.get("containers", [])
+
+    if isinstance(raw, list):
+        for x in raw:
+            if isinstance(x, dict):
+                v = x.get("container_no")
+                if v:
+                    cs.append(v)
+            elif isinstance(x, str):
+                cs.append(x)
+    elif isinstance(raw, dict):
+        v = raw.get("container_no")
+        if v:
+            cs.append(v)
+    elif isinstance(raw, str):
+        cs.append(raw)
+
+    return sorted(set(cs))
+
+
+def _norm_weight(d: Dict) -> float:
+    """무게 필드 정규화 (다양한 필드명 지원)"""
+    w = d.get("gross_weight_kg") or d.get("weight_kg") or d.get("gross_weight")
+    try:
+        return float(w) if w else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
 
 class CrossDocValidator:
     """
@@ -24,15 +79,19 @@ class CrossDocValidator:
     - Container 번호 일치 검증
     - Weight/Quantity 일치 검증
     - Date 논리 검증
-    - SPARQL 기반 불일치 탐지
+    - Item Code 일괄(batch) 검증
+    - SPARQL 기반 불일치 탐지 (rdflib 설치 시, 선택)
     """
 
-    def __init__(self, ontology_graph: Optional[Graph] = None):
+    def __init__(self, ontology_graph: Optional["Graph"] = None):
         """
         Args:
             ontology_graph: OntologyMapper에서 생성된 RDF 그래프
         """
-        self.graph = ontology_graph if ontology_graph else Graph()
+        if ontology_graph:
+            self.graph = ontology_graph
+        else:
+            self.graph = Graph() if RDFLIB_OK else None
         self.ex = Namespace("http://samsung.com/hvdc-project#")
         self.logistics = Namespace("http://samsung.com/project-logistics#")
 
@@ -45,6 +104,9 @@ class CrossDocValidator:
             "date_tolerance_days": 1,  # 날짜 1일 허용
         }
 
+        # 날짜 파싱 캐시 (batch 검증 시 동일 날짜 반복 파싱 방지)
+        self._date_cache: Dict[str, Optional[datetime]] = {}
+
     def _setup_logger(self) -> logging.Logger:
         logger = logging.getLogger("CrossDocValidator")
         logger.setLevel(logging.INFO)
@@ -80,41 +142,6 @@ class CrossDocValidator:
             doc_type = doc.get("doc_type", "UNKNOWN")
             docs_by_type[doc_type] = doc.get("data", {})
 
-        # 공통 정규화 함수들
-        def _norm_mbl(d: Dict) -> str:
-            """MBL/BL 번호 정규화 (동의어 처리)"""
-            return (d.get("mbl_no") or d.get("bl_number") or "").strip()
-
-        def _norm_containers(d: Dict) -> List[str]:
-            """컨테이너 번호 정규화 (문자열/딕셔너리 혼재 처리)"""
-            cs = []
-            raw = d.get("containers", [])
-
-            if isinstance(raw, list):
-                for x in raw:
-                    if isinstance(x, dict):
-                        v = x.get("container_no")
-                        if v:
-                            cs.append(v)
-                    elif isinstance(x, str):
-                        cs.append(x)
-            elif isinstance(raw, dict):
-                v = raw.get("container_no")
-                if v:
-                    cs.append(v)
-            elif isinstance(raw, str):
-                cs.append(raw)
-
-            return sorted(set(cs))
-
-        def _norm_weight(d: Dict) -> float:
-            """무게 필드 정규화 (다양한 필드명 지원)"""
-            w = d.get("gross_weight_kg") or d.get("weight_kg") or d.get("gross_weight")
-            try:
-                return float(w) if w else 0.0
-            except (ValueError, TypeError):
-                return 0.0
-
         # Rule 1: MBL 일치 확인 (정규화 함수 사용)
         mbl_issues = self.validate_mbl_consistency(docs_by_type, _norm_mbl)
         issues.extend(mbl_issues)
@@ -140,6 +167,149 @@ class CrossDocValidator:
         self.logger.info(f"Item {item_code}: {len(issues)} issues found")
         return issues
 
+    # ==================== Batch Validation ====================
+
+    def group_documents_by_item(
+        self, documents: List[Dict]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+        """
+        문서를 Item Code별로 1회 그룹핑
+
+        Args:
+            documents: 파싱된 문서 리스트. {item_code, doc_type, data} 또는
+                DSVPDFParser.parse_pdf 결과 ({header: {item_code, doc_type}, data})
+
+        Returns:
+            ({item_code: {doc_type: data}}, {item_code: 문서 수})
+        """
+        grouped: Dict[str, Dict[str, Any]] = {}
+        doc_counts: Dict[str, int] = {}
+        skipped = 0
+
+        for doc in documents:
+            header = doc.get("header") or {}
+            item_code = doc.get("item_code") or header.get("item_code")
+            if not item_code:
+                skipped += 1
+                continue
+
+            doc_type = doc.get("doc_type") or header.get("doc_type") or "UNKNOWN"
+            # 동일 타입 중복 시 마지막 문서 사용 (validate_item_consistency와 동일)
+            grouped.setdefault(item_code, {})[doc_type] = doc.get("data", {})
+            doc_counts[item_code] = doc_counts.get(item_code, 0) + 1
+
+        if skipped:
+            self.logger.warning(f"{skipped} documents without item code skipped")
+
+        return grouped, doc_counts
+
+    def validate_batch(self, documents: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        전체 문서 일괄 검증 (Item Code별)
+
+        문서를 Item Code별로 1회 그룹핑한 뒤 MBL/Container/Quantity는 해시 비교,
+        Weight 허용 오차는 전체 Item에 대해 벡터 연산으로 판정.
+        Item별 이슈는 validate_item_consistency와 동일한 dict/순서로 반환.
+
+        Args:
+            documents: 파싱된 문서 리스트 (group_documents_by_item 참고)
+
+        Returns:
+            {item_code: 이슈 리스트}
+        """
+        grouped, _ = self.group_documents_by_item(documents)
+        return self._validate_grouped(grouped)
+
+    def generate_batch_reports(self, documents: List[Dict]) -> Dict[str, Dict]:
+        """
+        전체 문서 일괄 검증 보고서 생성
+
+        Returns:
+            {item_code: generate_validation_report와 동일 구조의 보고서}
+        """
+        grouped, doc_counts = self.group_documents_by_item(documents)
+        issues_by_item = self._validate_grouped(grouped)
+        timestamp = datetime.now().isoformat()
+
+        reports = {
+            item_code: self._build_report(
+                item_code, issues, doc_counts[item_code], timestamp
+            )
+            for item_code, issues in issues_by_item.items()
+        }
+
+        failed = sum(1 for r in reports.values() if r["overall_status"] == "FAIL")
+        self.logger.info(f"Batch validation: {len(reports)} items, {failed} FAIL")
+        return reports
+
+    def _validate_grouped(
+        self, grouped: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[Dict]]:
+        """그룹핑된 문서에 규칙 적용 (Rule 순서는 validate_item_consistency와 동일)"""
+        weight_issues = self._batch_weight_issues(grouped)
+
+        results = {}
+        for item_code, docs_by_type in grouped.items():
+            issues = []
+            issues.extend(self.validate_mbl_consistency(docs_by_type, _norm_mbl))
+            issues.extend(
+                self.validate_container_consistency(docs_by_type, _norm_containers)
+            )
+            issues.extend(weight_issues.get(item_code, []))
+            issues.extend(self.validate_date_logic(docs_by_type))
+            issues.extend(self.validate_quantity_consistency(docs_by_type))
+            results[item_code] = issues
+
+        return results
+
+    def _batch_weight_issues(
+        self, grouped: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[Dict]]:
+        """BOE vs DO Weight 허용 오차 일괄 판정 (validate_weight_consistency 대응)"""
+        item_codes, boe_weights, do_weights = [], [], []
+
+        for item_code, docs_by_type in grouped.items():
+            boe, do = docs_by_type.get("BOE"), docs_by_type.get("DO")
+            if not isinstance(boe, dict) or not isinstance(do, dict):
+                continue
+            boe_weight, do_weight = _norm_weight(boe), _norm_weight(do)
+            if boe_weight > 0 and do_weight > 0:
+                item_codes.append(item_code)
+                boe_weights.append(boe_weight)
+                do_weights.append(do_weight)
+
+        if not item_codes:
+            return {}
+
+        tolerance = self.validation_rules["weight_tolerance"]
+        if NUMPY_OK:
+            boe_arr = np.asarray(boe_weights, dtype=float)
+            deltas = np.abs(boe_arr - np.asarray(do_weights, dtype=float)) / boe_arr
+            flagged = np.flatnonzero(deltas > tolerance).tolist()
+            deltas = deltas.tolist()
+        else:
+            deltas = [abs(b - d) / b for b, d in zip(boe_weights, do_weights)]
+            flagged = [i for i, delta in enumerate(deltas) if delta > tolerance]
+
+        issues = {}
+        for i in flagged:
+            delta_pct = deltas[i]
+            issues[item_codes[i]] = [
+                {
+                    "type": "WEIGHT_DEVIATION",
+                    "severity": "MEDIUM",
+                    "details": f"BOE vs DO weight deviation: {delta_pct*100:.2f}%",
+                    "BOE_weight": boe_weights[i],
+                    "DO_weight": do_weights[i],
+                    "delta_pct": round(delta_pct * 100, 2),
+                    "tolerance": tolerance * 100,
+                }
+            ]
+
+        if flagged:
+            self.logger.warning(f"Weight deviation in {len(flagged)} items")
+        return issues
+
     def validate_mbl_consistency(
         self, docs_by_type: Dict, norm_mbl_func=None
     ) -> List[Dict]:
@@ -405,19 +575,28 @@ class CrossDocValidator:
         if not date_str:
             return None
 
+        if date_str in self._date_cache:
+            return self._date_cache[date_str]
+
+        parsed = None
         formats = ["%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d", "%d-%b-%Y", "%d/%b/%Y"]
 
         for fmt in formats:
             try:
-                return datetime.strptime(date_str, fmt)
+                parsed = datetime.strptime(date_str, fmt)
+                break
             except:
                 continue
 
-        return None
+        self._date_cache[date_str] = parsed
+        return parsed
 
     def run_sparql_validation(self, item_code: str) -> List[Dict]:
         """
-        SPARQL 기반 불일치 탐지
+        SPARQL 기반 불일치 탐지 (선택 기능)
+
+        Item별 그래프 self-join이므로 대량 검증에는 validate_batch 사용.
+        rdflib 미설치 시 빈 리스트 반환.
 
         Args:
             item_code: HVDC Item Code
@@ -427,6 +606,10 @@ class CrossDocValidator:
         """
         issues = []
 
+        if self.graph is None:
+            self.logger.warning("rdflib not installed - SPARQL validation skipped")
+            return issues
+
         # Query 1: MBL 불일치
         mbl_query = f"""
         PREFIX logistics: <http://samsung.com/project-logistics#>
@@ -473,7 +656,21 @@ class CrossDocValidator:
             검증 보고서 딕셔너리
         """
         issues = self.validate_item_consistency(item_code, documents)
+        report = self._build_report(item_code, issues, len(documents))
 
+        self.logger.info(
+            f"Validation report generated for {item_code}: {report['overall_status']}"
+        )
+        return report
+
+    def _build_report(
+        self,
+        item_code: str,
+        issues: List[Dict],
+        documents_validated: int,
+        timestamp: Optional[str] = None,
+    ) -> Dict:
+        """이슈 리스트로 검증 보고서 구성"""
         # 심각도별 분류
         severity_counts = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
         for issue in issues:
@@ -498,18 +695,14 @@ class CrossDocValidator:
 
         report = {
             "item_code": item_code,
-            "validation_timestamp": datetime.now().isoformat(),
+            "validation_timestamp": timestamp or datetime.now().isoformat(),
             "overall_status": overall_status,
             "total_issues": len(issues),
             "severity_breakdown": severity_counts,
             "issues_by_type": issues_by_type,
             "all_issues": issues,
-            "documents_validated": len(documents),
+            "documents_validated": documents_validated,
         }
-
-        self.logger.info(
-            f"Validation report generated for {item_code}: {overall_status}"
-        )
         return report
 
 
@@ -13,6 +13,38 @@ import pandas as pd
 from typing import Optional, Dict, Tuple
 from pathlib import Path
 
+from location_canonicalizer import AliasRuleTable, LocationCanonicalizer
+
+# Location 표준 별칭 (정확 일치 우선, 이후 등록 순서대로 부분 일치)
+LOCATION_ALIASES = AliasRuleTable(
+    [
+        ("AUH AIRPORT", "Abu Dhabi Airport"),
+        ("ABU DHABI AIRPORT", "Abu Dhabi Airport"),
+        ("DXB AIRPORT", "Dubai Airport"),
+        ("DUBAI AIRPORT", "Dubai Airport"),
+        ("KHALIFA PORT", "Khalifa Port"),
+        ("KP", "Khalifa Port"),
+        ("DSV YARD", "DSV Mussafah Yard"),
+        ("DSV MUSSAFAH", "DSV Mussafah Yard"),
+        ("MUSSAFAH YARD", "DSV Mussafah Yard"),
+        ("MOSB", "MOSB"),
+        ("MIRFA", "MIRFA"),
+        ("SHUWEIHAT", "SHUWEIHAT"),
+        ("STORAGE", "DSV Mussafah Yard"),
+    ],
+    substring=True,
+)
+
+
+def _normalize_location_rules(location: str) -> str:
+    if not location:
+        return location
+    canon = LOCATION_ALIASES.lookup(location)
+    return canon if canon is not None else location
+
+
+LOCATION_CANON = LocationCanonicalizer(_normalize_location_rules)
+
 
 class RateService:
     """운송 요율 통합 서비스"""
@@ -207,7 +239,7 @@ class RateService:
 
     def _normalize_location(self, location: str) -> str:
         """
-        Location 표준화
+        Location 표준화 (LOCATION_ALIASES, 메모이즈)
 
         Args:
             location: Location name
@@ -219,38 +251,7 @@ class RateService:
             "AUH AIRPORT" -> "Abu Dhabi Airport"
             "DSV YARD" -> "DSV Mussafah Yard"
         """
-        if not location:
-            return location
-
-        # 표준 별칭 매핑
-        aliases = {
-            "AUH AIRPORT": "Abu Dhabi Airport",
-            "ABU DHABI AIRPORT": "Abu Dhabi Airport",
-            "DXB AIRPORT": "Dubai Airport",
-            "DUBAI AIRPORT": "Dubai Airport",
-            "KHALIFA PORT": "Khalifa Port",
-            "KP": "Khalifa Port",
-            "DSV YARD": "DSV Mussafah Yard",
-            "DSV MUSSAFAH": "DSV Mussafah Yard",
-            "MUSSAFAH YARD": "DSV Mussafah Yard",
-            "MOSB": "MOSB",
-            "MIRFA": "MIRFA",
-            "SHUWEIHAT": "SHUWEIHAT",
-            "STORAGE": "DSV Mussafah Yard",
-        }
-
-        location_upper = location.upper().strip()
-
-        # 직접 매칭
-        if location_upper in aliases:
-            return aliases[location_upper]
-
-        # 부분 매칭
-        for key, value in aliases.items():
-            if key in location_upper:
-                return value
-
-        return location
+        return LOCATION_CANON.canonicalize(location)
 
     def get_lane_rate(
         self, origin: str, destination: str, unit: str = "per truck"
@@ -11,21 +11,220 @@ Author: MACHO-GPT v3.4-mini HVDC Project Integration
 import re
 import yaml
 import logging
-from typing import Dict, List, Any, Optional
+from bisect import bisect_right
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Summary 섹션 패턴 (순서 중요: 긴 키워드부터 매칭, SUB TOTAL before TOTAL)
+SUMMARY_PATTERNS = {
+    "grand_total": re.compile(
+        r"(GRAND\s*TOTAL|Grand\s*Total)\s*:?\s*([0-9,]+\.?\d*)", re.IGNORECASE
+    ),
+    "subtotal": re.compile(
+        r"(SUB\s*TOTAL|Subtotal)\s*:?\s*([0-9,]+\.?\d*)", re.IGNORECASE
+    ),
+    "total_net": re.compile(
+        r"(TOTAL\s*NET\s*AMOUNT[^:]*|Total\s*Net\s*Amount[^:]*)\s*:?\s*([0-9,]+\.?\d*)",
+        re.IGNORECASE,
+    ),
+    "vat": re.compile(
+        r"(VAT|Value\s*Added\s*Tax)\s*(?:\([^)]*\))?\s*:?\s*([0-9,]+\.?\d*)",
+        re.IGNORECASE,
+    ),
+    "total": re.compile(
+        r"(?<!SUB\s)(?<!GRAND\s)(?<!NET\s)(TOTAL|Total)(?!\s*NET)\s*:?\s*([0-9,]+\.?\d*)",
+        re.IGNORECASE,
+    ),
+}
+FX_PATTERN = re.compile(r"R\.O\.E\.\s*1\s*USD\s*=\s*([0-9.]+)\s*AED", re.IGNORECASE)
+TEXT_ITEM_PATTERN = re.compile(
+    r"([A-Za-z\s\(\)]+?)\s+(AED|USD)\s+([0-9,]+\.?\d*)", re.MULTILINE
+)
+EMBEDDED_AMOUNT_PATTERN = re.compile(r"(AED|USD)\s+([0-9,]+\.?\d*)")
+
+# extract_rate_for_category 키워드 매칭용 불용어
+RATE_STOP_WORDS = frozenset(
+    ["THE", "A", "AN", "AND", "OR", "OF", "TO", "FROM", "FOR", "IN", "ON", "AT"]
+    + ["BY", "WITH", "X"]
+    + [str(d) for d in range(10)]
+)
+
+
+def _rate_keywords(text_upper: str) -> frozenset:
+    """요율 매칭 키워드 (공백 분리, 불용어/2자 이하 제외)"""
+    return frozenset(
+        w for w in text_upper.split() if w not in RATE_STOP_WORDS and len(w) > 2
+    )
+
+
+class ParsedIR:
+    """
+    Unified IR 1회 파싱 결과 (IR 단위 캐시)
+
+    - full_text / invoice_data(items, summary 포함) 지연 계산 후 재사용
+    - unit_rate > 0 아이템에 대한 exact map, contains 검색용 결합 문자열,
+      키워드 역색인(keyword → item 위치)으로 category → rate 조회
+    - 카테고리별 조회 결과 memo
+
+    IR dict는 파싱 이후 변경하지 않는 것을 전제로 함
+    (변경 시 UnifiedIRAdapter.clear_cache() 호출).
+    """
+
+    _SEPARATOR = "\x00"
+
+    def __init__(self, unified_ir: Dict[str, Any], adapter: "UnifiedIRAdapter"):
+        self.ir = unified_ir
+        self.blocks = unified_ir.get("blocks", [])
+        self._adapter = adapter
+        self._full_text: Optional[str] = None
+        self._invoice_data: Optional[Dict[str, Any]] = None
+        self._rate_index_built = False
+        self._rate_cache: Dict[str, Optional[float]] = {}
+
+    @property
+    def full_text(self) -> str:
+        if self._full_text is None:
+            self._full_text = self._adapter._extract_full_text(self.blocks)
+        return self._full_text
+
+    @property
+    def invoice_data(self) -> Dict[str, Any]:
+        if self._invoice_data is None:
+            self._invoice_data = self._adapter._build_invoice_data(self)
+        return self._invoice_data
+
+    @property
+    def items(self) -> List[Dict]:
+        return self.invoice_data.get("items", [])
+
+    def _build_rate_index(self):
+        """unit_rate > 0 아이템 색인 (exact / contains / keyword / fuzzy)"""
+        self._rated: List[Tuple[str, float, Dict]] = []
+        for item in self.items:
+            unit_rate = item.get("unit_rate", 0.0)
+            if unit_rate > 0:
+                desc = str(item.get("description", "")).upper()
+                self._rated.append((desc, unit_rate, item))
+
+        self._exact: Dict[str, int] = {}
+        self._starts: List[int] = []
+        self._keywords: List[frozenset] = []
+        self._postings: Dict[str, List[int]] = {}
+        offset = 0
+        for pos, (desc, _, _) in enumerate(self._rated):
+            self._exact.setdefault(desc, pos)
+            self._starts.append(offset)
+            offset += len(desc) + len(self._SEPARATOR)
+            keywords = _rate_keywords(desc)
+            self._keywords.append(keywords)
+            for kw in keywords:
+                self._postings.setdefault(kw, []).append(pos)
+
+        self._joined = self._SEPARATOR.join(desc for desc, _, _ in self._rated)
+        # SequenceMatcher는 seq2(b) 분석 결과를 캐시 → 아이템별 1회만 분석
+        self._matchers: List[Optional[SequenceMatcher]] = [None] * len(self._rated)
+        self._rate_index_built = True
+
+    def rate_for_category(self, category: str) -> Optional[float]:
+        """
+        카테고리 요율 조회 (exact → contains → keyword → fuzzy)
+
+        UnifiedIRAdapter.extract_rate_for_category의 선형 탐색과 동일한 결과
+        """
+        if category in self._rate_cache:
+            return self._rate_cache[category]
+        if not self._rate_index_built:
+            self._build_rate_index()
+
+        rate = self._lookup_rate(category)
+        self._rate_cache[category] = rate
+        return rate
+
+    def _lookup_rate(self, category: str) -> Optional[float]:
+        if not self._rated:
+            return None
+        category_upper = category.upper()
+
+        # 1. 정확한 매칭 (Exact match)
+        pos = self._exact.get(category_upper)
+        if pos is not None:
+            unit_rate = self._rated[pos][1]
+            logger.info(f"[EXACT] Found rate for '{category}': {unit_rate}")
+            return unit_rate
+
+        # 2. 포함 매칭 (Contains) - 결합 문자열에서 첫 위치 검색
+        if self._SEPARATOR not in category_upper:
+            hit = self._joined.find(category_upper)
+            if hit >= 0:
+                desc, unit_rate, item = self._rated[bisect_right(self._starts, hit) - 1]
+                logger.info(
+                    f"[CONTAINS] Found rate for '{category}': {unit_rate} (from '{item['description']}')"
+                )
+                return unit_rate
+
+        # 3. 키워드 매칭 - 역색인으로 교집합이 있는 아이템만 평가
+        category_keywords = _rate_keywords(category_upper)
+        overlap: Dict[int, int] = {}
+        for kw in category_keywords:
+            for pos in self._postings.get(kw, ()):
+                overlap[pos] = overlap.get(pos, 0) + 1
+
+        best_pos, best_score = None, 0.0
+        for pos in sorted(overlap):
+            inter = overlap[pos]
+            jaccard = inter / (
+                len(category_keywords) + len(self._keywords[pos]) - inter
+            )
+            if jaccard > best_score and jaccard >= 0.2:
+                best_pos, best_score = pos, jaccard
+
+        if best_pos is not None:
+            _, unit_rate, item = self._rated[best_pos]
+            logger.info(
+                f"[KEYWORD] Found rate for '{category}': {unit_rate} (similarity: {best_score:.2f}, from '{item['description']}')"
+            )
+            return unit_rate
+
+        # 4. Fuzzy 매칭 - quick_ratio 상한으로 가지치기
+        best_pos, best_score = None, 0.0
+        for pos, (desc, _, _) in enumerate(self._rated):
+            matcher = self._matchers[pos]
+            if matcher is None:
+                matcher = SequenceMatcher(None, "", desc)
+                self._matchers[pos] = matcher
+            matcher.set_seq1(category_upper)
+
+            floor = max(best_score, 0.4)
+            if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+                continue
+            similarity = matcher.ratio()
+            if similarity > best_score and similarity >= 0.4:
+                best_pos, best_score = pos, similarity
+
+        if best_pos is not None:
+            _, unit_rate, item = self._rated[best_pos]
+            logger.info(
+                f"[FUZZY] Found rate for '{category}': {unit_rate} (similarity: {best_score:.2f}, from '{item['description']}')"
+            )
+            return unit_rate
+
+        return None
+
 
 class UnifiedIRAdapter:
     """
     Unified IR → HVDC 데이터 변환 어댑터
     """
 
-    def __init__(self, ir_schema_path: Optional[str] = None):
+    def __init__(self, ir_schema_path: Optional[str] = None, cache_size: int = 64):
         """
         Args:
             ir_schema_path: unified_ir_schema.yaml 경로
+            cache_size: ParsedIR 캐시 크기 (IR 객체 단위)
         """
         self.schema = None
         self.invoice_selectors = {}
@@ -36,6 +235,12 @@ class UnifiedIRAdapter:
             # Default selectors (embedded)
             self.invoice_selectors = self._get_default_selectors()
 
+        # 셀렉터 정규식 1회 컴파일
+        self._compiled_selectors = self._compile_selectors(self.invoice_selectors)
+
+        self.cache_size = cache_size
+        self._parsed_cache: "OrderedDict[int, ParsedIR]" = OrderedDict()
+
         logger.info("UnifiedIRAdapter initialized")
 
     def _load_schema(self, schema_path: str):
@@ -96,9 +301,48 @@ class UnifiedIRAdapter:
             "currency": {"any": [{"regex": r"\b(USD|AED|EUR|GBP)\b", "group": 1}]},
         }
 
+    def _compile_selectors(
+        self, selectors: Dict[str, Any]
+    ) -> List[Tuple[str, List[Tuple[re.Pattern, int]]]]:
+        """셀렉터 설정 → (field, [(compiled regex, group), ...])"""
+        compiled = []
+        for field_name, selector_config in selectors.items():
+            patterns = [
+                (re.compile(sel.get("regex"), re.IGNORECASE), sel.get("group", 0))
+                for sel in selector_config.get("any", [])
+            ]
+            compiled.append((field_name, patterns))
+        return compiled
+
+    def parse(self, unified_ir: Dict[str, Any]) -> ParsedIR:
+        """
+        Unified IR → ParsedIR (동일 IR 객체는 캐시 재사용)
+
+        Args:
+            unified_ir: Unified IR (Docling/ADE output)
+
+        Returns:
+            ParsedIR
+        """
+        key = id(unified_ir)
+        parsed = self._parsed_cache.get(key)
+        if parsed is not None and parsed.ir is unified_ir:
+            self._parsed_cache.move_to_end(key)
+            return parsed
+
+        parsed = ParsedIR(unified_ir, self)
+        self._parsed_cache[key] = parsed
+        while len(self._parsed_cache) > self.cache_size:
+            self._parsed_cache.popitem(last=False)
+        return parsed
+
+    def clear_cache(self):
+        """ParsedIR 캐시 초기화 (IR dict를 수정한 경우)"""
+        self._parsed_cache.clear()
+
     def extract_invoice_data(self, unified_ir: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Unified IR에서 Invoice 필드 추출
+        Unified IR에서 Invoice 필드 추출 (ParsedIR 캐시 사용)
 
         Args:
             unified_ir: Unified IR (Docling/ADE output)
@@ -118,25 +362,35 @@ class UnifiedIRAdapter:
                 "confidence": 0.95
             }
         """
+        invoice_data = self.parse(unified_ir).invoice_data
+
+        # 호출자가 결과를 수정해도 캐시가 오염되지 않도록 복사본 반환
+        result = dict(invoice_data)
+        result["items"] = [dict(item) for item in invoice_data.get("items", [])]
+        return result
+
+    def _build_invoice_data(self, parsed: ParsedIR) -> Dict[str, Any]:
+        """ParsedIR에서 Invoice 필드 추출 (IR당 1회)"""
+        unified_ir = parsed.ir
         extracted = {
             "engine_used": unified_ir.get("engine", "unknown"),
             "pages": unified_ir.get("pages", 0),
             "confidence": unified_ir.get("meta", {}).get("confidence", 0.0),
         }
 
-        blocks = unified_ir.get("blocks", [])
+        blocks = parsed.blocks
 
-        # Extract full text from all blocks
-        full_text = self._extract_full_text(blocks)
+        # Extract full text from all blocks (cached)
+        full_text = parsed.full_text
 
-        # Extract fields using selectors
-        for field_name, selector_config in self.invoice_selectors.items():
-            value = self._apply_selectors(full_text, selector_config)
+        # Extract fields using precompiled selectors
+        for field_name, patterns in self._compiled_selectors:
+            value = self._apply_compiled_selectors(full_text, patterns)
             if value:
                 extracted[field_name] = value
 
         # Extract Summary section (TOTAL, VAT, Subtotal) - NEW
-        summary = self._extract_summary_section(blocks)
+        summary = self._extract_summary_section(blocks, full_text=full_text)
 
         # Fallback: Summary 블록 (우선순위 2: 좌표 기반)
         for block in blocks:
@@ -215,6 +469,17 @@ class UnifiedIRAdapter:
 
         return None
 
+    def _apply_compiled_selectors(
+        self, text: str, patterns: List[Tuple[re.Pattern, int]]
+    ) -> Optional[str]:
+        """컴파일된 셀렉터 적용 (첫 매칭 반환)"""
+        for pattern, group in patterns:
+            match = pattern.search(text)
+            if match:
+                return match.group(group).strip()
+
+        return None
+
     def _extract_table_items(self, blocks: List[Dict]) -> List[Dict]:
         """
         Invoice line items 추출 (테이블 블록에서)
@@ -315,9 +580,7 @@ class UnifiedIRAdapter:
             # If last cell is not numeric, try to extract amount from description
             if amount == 0.0:
                 # Pattern: "Description AED/USD amount"
-                import re
-
-                match = re.search(r"(AED|USD)\s+([0-9,]+\.?\d*)", description)
+                match = EMBEDDED_AMOUNT_PATTERN.search(description)
                 if match:
                     amount = self._parse_number(match.group(2))
 
@@ -363,9 +626,7 @@ class UnifiedIRAdapter:
 
         # Pattern: "Description ... AED/USD ... amount"
         # Example: "Container Return Service Charge AED 535.00"
-        pattern = r"([A-Za-z\s\(\)]+?)\s+(AED|USD)\s+([0-9,]+\.?\d*)"
-
-        matches = re.finditer(pattern, text, re.MULTILINE)
+        matches = TEXT_ITEM_PATTERN.finditer(text)
 
         for match in matches:
             description = match.group(1).strip()
@@ -409,7 +670,9 @@ class UnifiedIRAdapter:
         logger.info(f"Extracted {len(items)} items from text (fallback)")
         return items
 
-    def _extract_summary_section(self, blocks: List[Dict]) -> Dict[str, float]:
+    def _extract_summary_section(
+        self, blocks: List[Dict], full_text: Optional[str] = None
+    ) -> Dict[str, float]:
         """
         PDF Summary 섹션에서 SUB TOTAL, VAT, TOTAL 추출
 
@@ -428,22 +691,15 @@ class UnifiedIRAdapter:
         """
         summary = {}
 
-        # 전체 텍스트 추출
-        full_text = self._extract_full_text(blocks)
+        # 전체 텍스트 추출 (ParsedIR에서 전달되면 재사용)
+        if full_text is None:
+            full_text = self._extract_full_text(blocks)
 
         # Pattern 1: 같은 줄에 라벨과 금액 (우측)
         # "SUB TOTAL    530.00" or "TOTAL:    556.50"
         # CRITICAL: 순서 중요! 긴 키워드부터 매칭 (SUB TOTAL before TOTAL)
-        summary_patterns = {
-            "grand_total": r"(GRAND\s*TOTAL|Grand\s*Total)\s*:?\s*([0-9,]+\.?\d*)",
-            "subtotal": r"(SUB\s*TOTAL|Subtotal)\s*:?\s*([0-9,]+\.?\d*)",
-            "total_net": r"(TOTAL\s*NET\s*AMOUNT[^:]*|Total\s*Net\s*Amount[^:]*)\s*:?\s*([0-9,]+\.?\d*)",
-            "vat": r"(VAT|Value\s*Added\s*Tax)\s*(?:\([^)]*\))?\s*:?\s*([0-9,]+\.?\d*)",
-            "total": r"(?<!SUB\s)(?<!GRAND\s)(?<!NET\s)(TOTAL|Total)(?!\s*NET)\s*:?\s*([0-9,]+\.?\d*)",
-        }
-
-        for key, pattern in summary_patterns.items():
-            match = re.search(pattern, full_text, re.IGNORECASE)
+        for key, pattern in SUMMARY_PATTERNS.items():
+            match = pattern.search(full_text)
             if match:
                 # 마지막 그룹이 금액
                 amount_str = match.group(match.lastindex).strip()
@@ -561,8 +817,7 @@ class UnifiedIRAdapter:
 
         # 환율 추출 (Optional)
         # Pattern: "R.O.E. 1 USD = 3.6725000 AED"
-        fx_pattern = r"R\.O\.E\.\s*1\s*USD\s*=\s*([0-9.]+)\s*AED"
-        fx_match = re.search(fx_pattern, full_text, re.IGNORECASE)
+        fx_match = FX_PATTERN.search(full_text)
         if fx_match:
             exchange_rate = self._parse_number(fx_match.group(1))
             if exchange_rate > 0:
@@ -754,9 +1009,8 @@ class UnifiedIRAdapter:
                 "matched_by": str    # 매칭 방식
             } or None
         """
-        # Extract invoice data using existing method
-        invoice_data = self.extract_invoice_data(unified_ir)
-        items = invoice_data.get("items", [])
+        # Cached line items (IR당 1회 파싱)
+        items = self.parse(unified_ir).items
 
         logger.info(f"Extracted {len(items)} line items from PDF")
 
@@ -912,6 +1166,9 @@ class UnifiedIRAdapter:
         """
         특정 Category의 요율 추출 (Fuzzy Matching + 키워드 기반)
 
+        ParsedIR 캐시 + 키워드 역색인 사용: 같은 IR에 대한 반복 조회는
+        재추출 없이 색인 조회만 수행
+
         Args:
             unified_ir: Unified IR
             category: 찾을 카테고리 (예: "INLAND TRUCKING", "DO FEE")
@@ -919,133 +1176,18 @@ class UnifiedIRAdapter:
         Returns:
             요율 (float) 또는 None
         """
-        from difflib import SequenceMatcher
+        parsed = self.parse(unified_ir)
 
-        # Extract invoice data
-        invoice_data = self.extract_invoice_data(unified_ir)
-        items = invoice_data.get("items", [])
-
-        if not items:
+        if not parsed.items:
             logger.warning(f"No items found in PDF for category '{category}'")
             return None
 
-        # 1. 정확한 매칭 (Exact match)
-        category_upper = category.upper()
-        for item in items:
-            desc = str(item.get("description", "")).upper()
-            if category_upper == desc:
-                unit_rate = item.get("unit_rate", 0.0)
-                if unit_rate > 0:
-                    logger.info(f"[EXACT] Found rate for '{category}': {unit_rate}")
-                    return unit_rate
-
-        # 2. 포함 매칭 (Contains)
-        for item in items:
-            desc = str(item.get("description", "")).upper()
-            if category_upper in desc:
-                unit_rate = item.get("unit_rate", 0.0)
-                if unit_rate > 0:
-                    logger.info(
-                        f"[CONTAINS] Found rate for '{category}': {unit_rate} (from '{item['description']}')"
-                    )
-                    return unit_rate
-
-        # 3. 키워드 매칭 (Keyword-based) - Improved
-        category_keywords = set(category_upper.split())
-
-        # Filter out common words for better matching
-        stop_words = {
-            "THE",
-            "A",
-            "AN",
-            "AND",
-            "OR",
-            "OF",
-            "TO",
-            "FROM",
-            "FOR",
-            "IN",
-            "ON",
-            "AT",
-            "BY",
-            "WITH",
-            "X",
-            "1",
-            "2",
-            "3",
-            "4",
-            "5",
-            "6",
-            "7",
-            "8",
-            "9",
-            "0",
-        }
-        category_keywords_filtered = {
-            w for w in category_keywords if w not in stop_words and len(w) > 2
-        }
-
-        best_match = None
-        best_score = 0.0
-
-        for item in items:
-            desc = str(item.get("description", "")).upper()
-            desc_keywords = set(desc.split())
-            desc_keywords_filtered = {
-                w for w in desc_keywords if w not in stop_words and len(w) > 2
-            }
-
-            # Jaccard similarity (filtered keywords only)
-            intersection = category_keywords_filtered & desc_keywords_filtered
-            union = category_keywords_filtered | desc_keywords_filtered
-            jaccard = len(intersection) / len(union) if union else 0.0
-
-            # Lower threshold for better recall
-            if (
-                jaccard > best_score and jaccard >= 0.2
-            ):  # 20% threshold (lowered from 30%)
-                unit_rate = item.get("unit_rate", 0.0)
-                if unit_rate > 0:
-                    best_score = jaccard
-                    best_match = (item, jaccard)
-
-        if best_match:
-            item, score = best_match
-            unit_rate = item.get("unit_rate", 0.0)
-            logger.info(
-                f"[KEYWORD] Found rate for '{category}': {unit_rate} (similarity: {score:.2f}, from '{item['description']}')"
+        rate = parsed.rate_for_category(category)
+        if rate is None:
+            logger.warning(
+                f"No rate found for category '{category}' (searched {len(parsed.items)} items)"
             )
-            return unit_rate
-
-        # 4. Fuzzy 매칭 (SequenceMatcher) - Lowered threshold
-        best_fuzzy_match = None
-        best_fuzzy_score = 0.0
-
-        for item in items:
-            desc = str(item.get("description", "")).upper()
-            similarity = SequenceMatcher(None, category_upper, desc).ratio()
-
-            # Lower threshold for better recall
-            if (
-                similarity > best_fuzzy_score and similarity >= 0.4
-            ):  # 40% threshold (lowered from 60%)
-                unit_rate = item.get("unit_rate", 0.0)
-                if unit_rate > 0:
-                    best_fuzzy_score = similarity
-                    best_fuzzy_match = (item, similarity)
-
-        if best_fuzzy_match:
-            item, score = best_fuzzy_match
-            unit_rate = item.get("unit_rate", 0.0)
-            logger.info(
-                f"[FUZZY] Found rate for '{category}': {unit_rate} (similarity: {score:.2f}, from '{item['description']}')"
-            )
-            return unit_rate
-
-        logger.warning(
-            f"No rate found for category '{category}' (searched {len(items)} items)"
-        )
-        return None
+        return rate
 
     def convert_to_hvdc_format(
         self, unified_ir: Dict[str, Any], doc_type: str = "invoice"
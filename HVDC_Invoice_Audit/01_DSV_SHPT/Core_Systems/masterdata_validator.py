@@ -24,6 +24,7 @@ from category_normalizer import CategoryNormalizer
 from cost_guard import get_cost_guard_band, should_auto_fail
 from portal_fee import resolve_portal_fee_usd, is_within_portal_fee_tolerance
 from rate_service import RateService
+from location_canonicalizer import AliasRuleTable, LocationCanonicalizer
 
 # PDF Integration import
 try:
@@ -552,25 +553,24 @@ class MasterDataValidator:
         return (None, None)
 
     def _normalize_location(self, location: str) -> str:
-        """위치명 정규화"""
-
-        normalization = self.config_manager.get_normalization_aliases()
-        location_upper = str(location).strip().upper()
+        """위치명 정규화 (설정 별칭 1회 컴파일 + 메모이즈)"""
+        canon = getattr(self, "_location_canon", None)
+        if canon is None:
+            normalization = self.config_manager.get_normalization_aliases()
+            # ports 우선, 이후 destinations (정확 일치)
+            aliases = AliasRuleTable(
+                list(normalization.get("ports", {}).items())
+                + list(normalization.get("destinations", {}).items())
+            )
 
-        # Check ports
-        ports = normalization.get("ports", {})
-        for alias, standard in ports.items():
-            if str(alias).upper() == location_upper:
-                return standard
+            def rules(location: str) -> str:
+                standard = aliases.lookup(location)
+                # No match found - return original
+                return standard if standard is not None else location.strip()
 
-        # Check destinations
-        destinations = normalization.get("destinations", {})
-        for alias, standard in destinations.items():
-            if str(alias).upper() == location_upper:
-                return standard
+            canon = self._location_canon = LocationCanonicalizer(rules)
 
-        # No match found - return original
-        return location.strip()
+        return canon.canonicalize(location)
 
     def calculate_delta_percent(
         self, draft_rate: float, ref_rate: float
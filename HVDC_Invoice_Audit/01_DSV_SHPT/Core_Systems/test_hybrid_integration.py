@@ -101,6 +101,37 @@ class TestUnifiedIRAdapter(unittest.TestCase):
 
         self.assertIsNone(rate)
 
+    def test_extract_rate_for_category_keyword_and_fuzzy(self):
+        """키워드/Fuzzy 단계 요율 추출 테스트"""
+        rate = self.adapter.extract_rate_for_category(
+            self.sample_ir, "CLEARANCE CUSTOMS"
+        )
+        self.assertEqual(rate, 150.00)
+
+        rate = self.adapter.extract_rate_for_category(self.sample_ir, "INLND TRUCKNG")
+        self.assertEqual(rate, 252.00)
+
+    def test_parsed_ir_cached_across_lookups(self):
+        """동일 IR 반복 조회 시 1회만 추출"""
+        with patch.object(
+            self.adapter,
+            "_build_invoice_data",
+            wraps=self.adapter._build_invoice_data,
+        ) as build:
+            self.adapter.extract_rate_for_category(self.sample_ir, "DO FEE")
+            self.adapter.extract_rate_for_category(self.sample_ir, "INLAND TRUCKING")
+            self.adapter.extract_invoice_data(self.sample_ir)
+
+        self.assertEqual(build.call_count, 1)
+
+    def test_extract_invoice_data_returns_copy(self):
+        """반환값 수정이 캐시에 영향 없음"""
+        result = self.adapter.extract_invoice_data(self.sample_ir)
+        result["items"][0]["unit_rate"] = 0.0
+
+        rate = self.adapter.extract_rate_for_category(self.sample_ir, "INLAND TRUCKING")
+        self.assertEqual(rate, 252.00)
+
     def test_get_confidence_score(self):
         """신뢰도 점수 계산 테스트"""
         confidence = self.adapter.get_confidence_score(self.sample_ir)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Location Canonicalizer Unit Tests
+00_Shared/location_canonicalizer.py + 래핑된 기존 정규화 함수 동일성 테스트
+
+각 래퍼(메모이즈/배치)의 결과가 기존 구현(규칙 함수 직접 호출 또는
+변경 전 코드)과 같은지 무작위 입력 + 경계값으로 비교한다.
+"""
+
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add paths
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT / "00_Shared"))
+sys.path.insert(0, str(ROOT / "02_DSV_DOMESTIC"))
+
+from location_canonicalizer import AliasRuleTable, LocationCanonicalizer, RegexRuleTable
+import rate_service
+import enhanced_matching
+from src.utils import location_canon, utils_normalize
+from masterdata_validator import MasterDataValidator
+
+TOKENS = [
+    "DSV",
+    "MOSB",
+    "MIR",
+    "MIRFA",
+    "PRE",
+    "SAMSUNG",
+    "SKM",
+    "SHU",
+    "KP",
+    "HE",
+    "MDAS",
+    "khalifa port",
+    "AUH airport",
+    "dsv mussafah",
+    "Storage",
+    "M44",
+    "ICAD",
+    "PMO",
+    "CICPA",
+    "Masaood",
+    "Jebel Ali",
+    "Mina Zayed",
+    "Trojan",
+    "flatbed",
+    "Low Bed",
+    "trailer",
+    "Mobile Crane",
+    "lorry",
+    "3 TON PU",
+    "(MOSB)",
+    "Site",
+]
+SEPARATORS = [" ", "  ", "-", "/", ", ", "_"]
+
+
+def _random_inputs(n: int = 1500, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    values = []
+    for _ in range(n):
+        parts = rng.sample(TOKENS, rng.randint(1, 3))
+        text = rng.choice(SEPARATORS).join(parts)
+        text = rng.choice([str.upper, str.lower, str.title, str])(text)
+        if rng.random() < 0.2:
+            text = f" {text} "
+        values.append(text)
+    return values
+
+
+EDGE_CASES = ["", " ", None, float("nan"), "MIR", "mirfa", "DSV", "KP", "XKP"]
+INPUTS = EDGE_CASES + _random_inputs()
+
+
+def _outcome(fn, value):
+    """결과 또는 예외 타입 (기존 구현과 예외 동작까지 비교)"""
+    try:
+        return "ok", fn(value)
+    except Exception as e:
+        return "error", type(e)
+
+
+# ----------------------------------------------------------------------------
+# 변경 전 구현 (location_canonicalizer 도입 이전 코드)
+# ----------------------------------------------------------------------------
+
+
+def _legacy_rate_service_location(location):
+    if not location:
+        return location
+    aliases = {
+        "AUH AIRPORT": "Abu Dhabi Airport",
+        "ABU DHABI AIRPORT": "Abu Dhabi Airport",
+        "DXB AIRPORT": "Dubai Airport",
+        "DUBAI AIRPORT": "Dubai Airport",
+        "KHALIFA PORT": "Khalifa Port",
+        "KP": "Khalifa Port",
+        "DSV YARD": "DSV Mussafah Yard",
+        "DSV MUSSAFAH": "DSV Mussafah Yard",
+        "MUSSAFAH YARD": "DSV Mussafah Yard",
+        "MOSB": "MOSB",
+        "MIRFA": "MIRFA",
+        "SHUWEIHAT": "SHUWEIHAT",
+        "STORAGE": "DSV Mussafah Yard",
+    }
+    location_upper = location.upper().strip()
+    if location_upper in aliases:
+        return aliases[location_upper]
+    for key, value in aliases.items():
+        if key in location_upper:
+            return value
+    return location
+
+
+def _legacy_masterdata_location(normalization, location):
+    location_upper = str(location).strip().upper()
+    for alias, standard in normalization.get("ports", {}).items():
+        if str(alias).upper() == location_upper:
+            return standard
+    for alias, standard in normalization.get("destinations", {}).items():
+        if str(alias).upper() == location_upper:
+            return standard
+    return location.strip()
+
+
+def _legacy_expand_location_abbrev(s):
+    if not s:
+        return ""
+    s_norm = utils_normalize._normalize_location_rules(s)
+    for pat, canon in location_canon._LOCATION_MAP.items():
+        if re.match(pat, s_norm):
+            return canon
+    return s_norm
+
+
+class TestRuleTables(unittest.TestCase):
+    """RegexRuleTable / AliasRuleTable 테스트"""
+
+    def test_regex_table_first_match_wins(self):
+        table = RegexRuleTable([(r"^MIR", "MIRFA"), (r"^MIRFA$", "UNUSED")])
+
+        self.assertEqual(table.lookup("MIRFA"), "MIRFA")
+        self.assertIsNone(table.lookup("XMIR"))
+
+    def test_alias_table_exact_before_substring(self):
+        table = AliasRuleTable(
+            [("DSV YARD", "Yard"), ("DSV", "DSV"), ("KP", "Khalifa Port")],
+            substring=True,
+        )
+
+        self.assertEqual(table.lookup(" dsv "), "DSV")
+        self.assertEqual(table.lookup("new dsv yard"), "Yard")
+        self.assertEqual(table.lookup("XKP"), "Khalifa Port")
+        self.assertIsNone(AliasRuleTable([("KP", "Khalifa Port")]).lookup("XKP"))
+
+
+class TestLocationCanonicalizer(unittest.TestCase):
+    """메모/ID/배치 API 테스트"""
+
+    def setUp(self):
+        self.calls = []
+
+        def rules(value):
+            self.calls.append(value)
+            return str(value).strip().upper()
+
+        self.canon = LocationCanonicalizer(rules, maxsize=8)
+
+    def test_memo_avoids_recompute(self):
+        self.assertEqual(self.canon("mosb "), "MOSB")
+        self.assertEqual(self.canon("mosb "), "MOSB")
+
+        self.assertEqual(self.calls, ["mosb "])
+        self.assertEqual(self.canon.cache_info().hits, 1)
+
+    def test_unhashable_value_bypasses_memo(self):
+        self.assertEqual(self.canon(["a"]), "['A']")
+        self.assertEqual(self.canon.cache_info().currsize, 0)
+
+    def test_canonical_id_shared_by_equal_names(self):
+        cid = self.canon.canonical_id("mosb")
+
+        self.assertEqual(self.canon.canonical_id(" MOSB "), cid)
+        self.assertNotEqual(self.canon.canonical_id("mirfa"), cid)
+        self.assertEqual(self.canon.name_of(cid), "MOSB")
+
+    def test_series_computes_unique_values_once(self):
+        series = pd.Series(["a", "b", "a", None, "a", np.nan], index=list("uvwxyz"))
+        result = self.canon.canonicalize_series(series)
+
+        self.assertEqual(result.tolist(), ["A", "B", "A", "NONE", "A", "NAN"])
+        self.assertEqual(list(result.index), list("uvwxyz"))
+        self.assertEqual(sorted(map(str, self.calls)), ["None", "a", "b", "nan"])
+
+
+class TestWrappedNormalizers(unittest.TestCase):
+    """래핑된 기존 정규화 함수와의 결과 동일성"""
+
+    def assertSameAsLegacy(self, wrapped, legacy, inputs=INPUTS):
+        for value in inputs:
+            expected = _outcome(legacy, value)
+            # 첫 호출(계산) / 두 번째 호출(메모) 모두 동일해야 함
+            self.assertEqual(_outcome(wrapped, value), expected, repr(value))
+            self.assertEqual(_outcome(wrapped, value), expected, repr(value))
+
+    def assertSeriesSameAsLegacy(self, wrapped_series, legacy, inputs):
+        series = pd.Series(inputs)
+        expected = [legacy(v) for v in inputs]
+        self.assertEqual(wrapped_series(series).tolist(), expected)
+
+    def test_enhanced_matching_location(self):
+        legacy = enhanced_matching._normalize_location_rules
+        self.assertSameAsLegacy(enhanced_matching.normalize_location, legacy)
+        self.assertSeriesSameAsLegacy(
+            enhanced_matching.normalize_location_series, legacy, INPUTS
+        )
+
+    def test_enhanced_matching_vehicle(self):
+        legacy = enhanced_matching._normalize_vehicle_rules
+        self.assertSameAsLegacy(enhanced_matching.normalize_vehicle, legacy)
+        self.assertSeriesSameAsLegacy(
+            enhanced_matching.normalize_vehicle_series, legacy, INPUTS
+        )
+
+    def test_enhanced_matching_region_and_vehicle_group(self):
+        self.assertSameAsLegacy(
+            enhanced_matching.get_region, enhanced_matching._region_rules
+        )
+        self.assertSameAsLegacy(
+            enhanced_matching.get_vehicle_group,
+            enhanced_matching._vehicle_group_rules,
+        )
+
+    def test_utils_normalize_location(self):
+        self.assertSameAsLegacy(
+            utils_normalize.normalize_location,
+            utils_normalize._normalize_location_rules,
+        )
+
+    def test_expand_location_abbrev(self):
+        self.assertSameAsLegacy(
+            location_canon.expand_location_abbrev, _legacy_expand_location_abbrev
+        )
+
+    def test_rate_service_location(self):
+        service = rate_service.RateService.__new__(rate_service.RateService)
+        strings = [v for v in INPUTS if not isinstance(v, float)]
+        self.assertSameAsLegacy(
+            service._normalize_location, _legacy_rate_service_location, strings
+        )
+        # 유일한 차이: 기존 구현은 NaN에서 AttributeError, 현재는 그대로 반환
+        self.assertTrue(np.isnan(service._normalize_location(float("nan"))))
+
+    def test_masterdata_validator_location(self):
+        validator = MasterDataValidator()
+        normalization = validator.config_manager.get_normalization_aliases()
+        self.assertSameAsLegacy(
+            validator._normalize_location,
+            lambda v: _legacy_masterdata_location(normalization, v),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
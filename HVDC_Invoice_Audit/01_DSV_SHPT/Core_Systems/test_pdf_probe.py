@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+PDF Probe / Hybrid Router Unit Tests
+pdf_probe.py + hybrid_pdf_router.py 테스트
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add paths (module directory, same as hybrid_doc_system worker)
+HYBRID_DIR = Path(__file__).parent.parent.parent / "00_Shared" / "hybrid_integration"
+sys.path.insert(0, str(HYBRID_DIR))
+
+from pdf_probe import DEFAULT_DOC_TYPE_INDICATORS, PDFProbe
+from hybrid_pdf_router import HybridPDFRouter
+
+ROOT = Path(__file__).parent.parent.parent
+WORKER_RULES = ROOT / "hybrid_doc_system" / "config" / "routing_rules_hvdc.json"
+
+try:
+    import pdfplumber  # noqa: F401
+
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+try:
+    sys.path.insert(0, str(ROOT))
+    from hybrid_doc_system.worker import celery_app as worker
+
+    HAS_WORKER = True
+except ImportError:
+    HAS_WORKER = False
+
+COMPLEX_INVOICE = {"doc_type": "invoice", "pages": 5, "table_density": 0.5}
+
+
+def make_pdf(text: str, pages: int = 1) -> bytes:
+    """Minimal PDF with one line of Helvetica text on every page"""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    kids = " ".join(f"{4 + i} 0 R" for i in range(pages))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    content_id = 4 + pages
+    for _ in range(pages):
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+            ).encode()
+        )
+    objects.append(
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1)
+    out += b"startxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out)
+
+
+class TestPDFProbe(unittest.TestCase):
+    """PDFProbe 캐시 / doc_type 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.pdf_bytes = make_pdf("Bill of Entry  Entry No 12345", pages=3)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name: str) -> str:
+        path = self.root / name
+        path.write_bytes(self.pdf_bytes)
+        return str(path)
+
+    def test_page_count_from_page_tree(self):
+        """페이지 수는 파일 크기가 아니라 page tree에서"""
+        probe = PDFProbe(log_level="WARNING")
+        result = probe.probe(self.write("sample_BOE.pdf"))
+
+        self.assertEqual(result["pages"], 3)
+        self.assertFalse(result["cache_hit"])
+
+    def test_cache_hit_recomputes_doc_type_from_name(self):
+        """같은 내용, 다른 파일명 → cache hit이지만 doc_type은 파일명 기준"""
+        probe = PDFProbe(log_level="WARNING")
+        first = probe.probe(self.write("HVDC-0126_BOE.pdf"))
+        second = probe.probe(self.write("HVDC-0126_DN.pdf"))
+
+        self.assertEqual(first["doc_type"], "BOE")
+        self.assertEqual(second["doc_type"], "DN")
+        self.assertTrue(second["cache_hit"])
+        self.assertEqual(second["file_hash"], first["file_hash"])
+        self.assertEqual(probe.get_metrics()["cache_hits"], 1)
+
+    @unittest.skipUnless(HAS_PDFPLUMBER, "pdfplumber not installed")
+    def test_cache_hit_falls_back_to_text_indicators(self):
+        """파일명으로 판별 불가 시 캐시된 text sample로 판별"""
+        probe = PDFProbe(log_level="WARNING")
+        probe.probe(self.write("HVDC-0126_DN.pdf"))
+        result = probe.probe(self.write("scan_0001.pdf"))
+
+        self.assertTrue(result["cache_hit"])
+        self.assertEqual(result["doc_type"], "BOE")
+
+    @unittest.skipUnless(HAS_PDFPLUMBER, "pdfplumber not installed")
+    def test_indicators_per_call_do_not_mutate_probe(self):
+        """호출별 indicators는 공유 probe 설정을 바꾸지 않음"""
+        probe = PDFProbe(log_level="WARNING")
+        path = self.write("scan_0001.pdf")
+
+        custom = probe.probe(path, doc_type_indicators={"DO": ["Entry No"]})
+        default = probe.probe(path)
+
+        self.assertEqual(custom["doc_type"], "DO")
+        self.assertEqual(default["doc_type"], "BOE")
+        self.assertEqual(probe.doc_type_indicators, DEFAULT_DOC_TYPE_INDICATORS)
+
+    def test_disk_cache_excludes_name_dependent_fields(self):
+        """디스크 캐시는 내용 기반 필드만 저장, 새 probe에서 재사용"""
+        cache_dir = self.root / "cache"
+        first = PDFProbe(cache_dir=str(cache_dir), log_level="WARNING")
+        first.probe(self.write("HVDC-0126_BOE.pdf"))
+
+        cached_files = list(cache_dir.glob("*.json"))
+        self.assertEqual(len(cached_files), 1)
+        self.assertNotIn("doc_type", json.loads(cached_files[0].read_text()))
+
+        second = PDFProbe(cache_dir=str(cache_dir), log_level="WARNING")
+        result = second.probe(self.write("HVDC-0126_DO.pdf"))
+        self.assertTrue(result["cache_hit"])
+        self.assertEqual(result["doc_type"], "DO")
+
+    def test_latency_window_is_bounded(self):
+        """latencies_ms는 latency_window 크기로 제한"""
+        probe = PDFProbe(log_level="WARNING", latency_window=3)
+        path = self.write("sample_BOE.pdf")
+        for _ in range(5):
+            probe.probe(path)
+
+        self.assertEqual(len(probe.latencies_ms), 3)
+        self.assertEqual(probe.get_metrics()["probe_count"], 5)
+
+
+class TestHybridPDFRouter(unittest.TestCase):
+    """HybridPDFRouter + 공유 probe 테스트"""
+
+    def setUp(self):
+        self.probe = PDFProbe(log_level="WARNING")
+
+    def test_router_does_not_overwrite_probe_indicators(self):
+        """router 설정 indicators는 공유 probe에 쓰지 않음"""
+        router = HybridPDFRouter(log_level="WARNING", probe=self.probe)
+
+        self.assertIsNotNone(router.doc_type_indicators)
+        self.assertEqual(self.probe.doc_type_indicators, DEFAULT_DOC_TYPE_INDICATORS)
+
+    def test_worker_rules_complex_invoice_to_ade(self):
+        """hvdc_rules: priority 1 invoice_boe_complex → ADE, rule 단가 적용"""
+        router = HybridPDFRouter(
+            config_path=str(WORKER_RULES), log_level="WARNING", probe=self.probe
+        )
+        decision = router.decide_route(
+            "invoice.pdf",
+            doc_characteristics={
+                "doc_type": "invoice",
+                "pages": 3,
+                "table_density": 0.4,
+            },
+        )
+
+        self.assertEqual(decision["rule_matched"], "invoice_boe_complex")
+        self.assertEqual(decision["engine_choice"], "ade")
+        self.assertAlmostEqual(decision["ade_cost_usd"], 0.09)
+        self.assertAlmostEqual(router.budget_used, 0.09)
+
+    def test_worker_rules_sensitivity_rule_matches(self):
+        """sensitivity 태그가 있으면 samsung_ct_priority 규칙 매칭 (local)"""
+        router = HybridPDFRouter(
+            config_path=str(WORKER_RULES), log_level="WARNING", probe=self.probe
+        )
+        characteristics = {
+            "doc_type": "invoice",
+            "pages": 3,
+            "table_density": 0.4,
+            "text_sample": "Samsung C&T Corporation - HVDC price schedule",
+            "sensitivity": ["price-sensitive"],
+        }
+        decision = router.decide_route("invoice.pdf", characteristics)
+
+        self.assertEqual(decision["rule_matched"], "samsung_ct_priority")
+        self.assertEqual(decision["engine_choice"], "docling")
+        self.assertEqual(router.budget_used, 0.0)
+
+    def test_worker_rules_budget_exceeded_stays_local(self):
+        """일일 ADE 예산 초과 시 docling"""
+        router = HybridPDFRouter(
+            config_path=str(WORKER_RULES), log_level="WARNING", probe=self.probe
+        )
+        router.budget_used = router.daily_budget
+        decision = router.decide_route(
+            "invoice.pdf",
+            doc_characteristics={
+                "doc_type": "invoice",
+                "pages": 3,
+                "table_density": 0.4,
+            },
+        )
+
+        self.assertEqual(decision["rule_matched"], "ade_budget_guard")
+        self.assertEqual(decision["engine_choice"], "docling")
+
+    def test_worker_rules_engine_failed_swaps_engine(self):
+        """retry: engine_fallback이 일반 규칙보다 먼저, 실패 엔진의 반대쪽 선택"""
+        router = HybridPDFRouter(
+            config_path=str(WORKER_RULES), log_level="WARNING", probe=self.probe
+        )
+        for failed, expected in (("ade", "docling"), ("docling", "ade")):
+            decision = router.decide_route(
+                "invoice.pdf",
+                doc_characteristics={
+                    **COMPLEX_INVOICE,
+                    "engine_failed": True,
+                    "failed_engine": failed,
+                },
+            )
+
+            self.assertEqual(decision["rule_matched"], "engine_fallback", failed)
+            self.assertEqual(decision["engine_choice"], expected, failed)
+
+    def test_shared_rules_fallback_checks_failed_engine(self):
+        """00_Shared 규칙: failed_engine 조건으로 fallback 규칙 구분"""
+        router = HybridPDFRouter(log_level="WARNING", probe=self.probe)
+        for failed, rule, expected in (
+            ("ade", "engine_fallback_ade_to_docling", "docling"),
+            ("docling", "engine_fallback_docling_to_ade", "ade"),
+        ):
+            decision = router.decide_route(
+                "HVDC_BOE.pdf",
+                doc_characteristics={
+                    "doc_type": "BOE",
+                    "pages": 2,
+                    "engine_failed": True,
+                    "failed_engine": failed,
+                },
+            )
+
+            self.assertEqual(decision["rule_matched"], rule)
+            self.assertEqual(decision["engine_choice"], expected)
+
+
+@unittest.skipUnless(HAS_WORKER, "celery worker dependencies not installed")
+class TestWorkerSelectEngine(unittest.TestCase):
+    """celery_app._select_engine (retry failed_engine 전달) 테스트"""
+
+    def setUp(self):
+        probe = PDFProbe(log_level="WARNING")
+        router = HybridPDFRouter(
+            config_path=str(WORKER_RULES), log_level="WARNING", probe=probe
+        )
+        # 5페이지 / table_density 0.5 → 일반 규칙이면 invoice_boe_complex (ade)
+        measured = {**COMPLEX_INVOICE, "probe_ms": 1.0, "cache_hit": False}
+        self.patches = [
+            patch.object(probe, "probe", side_effect=lambda *a, **k: dict(measured)),
+            patch.object(worker, "PDF_PROBE", probe),
+            patch.object(worker, "ROUTER", router),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_first_attempt_uses_rules(self):
+        self.assertEqual(worker._select_engine(Path("invoice.pdf"), "invoice"), "ade")
+
+    def test_failed_engine_not_selected_again(self):
+        for failed, expected in (("ade", "docling"), ("docling", "ade")):
+            engine = worker._select_engine(
+                Path("invoice.pdf"), "invoice", failed_engine=failed
+            )
+
+            self.assertEqual(engine, expected, failed)
+
+
+if __name__ == "__main__":
+    unittest.main()
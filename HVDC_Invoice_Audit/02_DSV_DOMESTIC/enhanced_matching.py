@@ -6,9 +6,28 @@ Enhanced Lane Matching Algorithm Module
 고급 레인 매칭 알고리즘: 정규화, 유사도, 다단계 매칭
 """
 
+import hashlib
+import json
+import logging
+import numpy as np
 import pandas as pd
 import re
-from typing import Optional, Dict, List, Tuple
+import sys
+from pathlib import Path
+from typing import Iterable, Optional, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "00_Shared"))
+from location_canonicalizer import LocationCanonicalizer
+
+try:
+    # C 구현 (bit-parallel) 편집거리
+    from rapidfuzz.distance import Levenshtein as _RFLevenshtein
+    from rapidfuzz.process import cdist as _rf_cdist
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -80,7 +99,7 @@ def normalize_text(text: str, synonym_map: Dict[str, List[str]]) -> str:
     return text
 
 
-def normalize_location(location: str) -> str:
+def _normalize_location_rules(location: str) -> str:
     """
     향상된 위치명 정규화
     
@@ -147,7 +166,7 @@ def normalize_location(location: str) -> str:
     return loc
 
 
-def normalize_vehicle(vehicle: str) -> str:
+def _normalize_vehicle_rules(vehicle: str) -> str:
     """차량 타입 정규화"""
     if pd.isna(vehicle):
         return ""
@@ -155,6 +174,31 @@ def normalize_vehicle(vehicle: str) -> str:
     return normalize_text(vehicle, VEHICLE_SYNONYMS)
 
 
+# 동일 문자열 반복 정규화 방지 (LRU 메모 + 컬럼 배치 API)
+LOCATION_CANON = LocationCanonicalizer(_normalize_location_rules)
+VEHICLE_CANON = LocationCanonicalizer(_normalize_vehicle_rules)
+
+
+def normalize_location(location: str) -> str:
+    """향상된 위치명 정규화 (메모이즈; 규칙은 _normalize_location_rules)"""
+    return LOCATION_CANON.canonicalize(location)
+
+
+def normalize_vehicle(vehicle: str) -> str:
+    """차량 타입 정규화 (메모이즈; 규칙은 _normalize_vehicle_rules)"""
+    return VEHICLE_CANON.canonicalize(vehicle)
+
+
+def normalize_location_series(series: pd.Series) -> pd.Series:
+    """위치 컬럼 배치 정규화 (고유값 단위 계산)"""
+    return LOCATION_CANON.canonicalize_series(series)
+
+
+def normalize_vehicle_series(series: pd.Series) -> pd.Series:
+    """차량 컬럼 배치 정규화 (고유값 단위 계산)"""
+    return VEHICLE_CANON.canonicalize_series(series)
+
+
 # ============================================================================
 # 2. SIMILARITY: 하이브리드 유사도 알고리즘
 # ============================================================================
@@ -169,6 +213,9 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     Returns:
         편집거리 (삽입/삭제/치환 최소 횟수)
     """
+    if RAPIDFUZZ_AVAILABLE:
+        return _RFLevenshtein.distance(s1, s2)
+    
     if len(s1) < len(s2):
         return levenshtein_distance(s2, s1)
     
@@ -199,8 +246,11 @@ def levenshtein_similarity(s1: str, s2: str) -> float:
     if pd.isna(s1) or pd.isna(s2):
         return 0.0
     
-    s1, s2 = str(s1).upper(), str(s2).upper()
-    
+    return _levenshtein_ratio(str(s1).upper(), str(s2).upper())
+
+
+def _levenshtein_ratio(s1: str, s2: str) -> float:
+    """대문자 변환된 문자열의 Levenshtein 유사도 (levenshtein_similarity 본체)"""
     if s1 == s2:
         return 1.0
     
@@ -283,6 +333,182 @@ def hybrid_similarity(s1: str, s2: str, weights: Dict[str, float] = None) -> flo
     return total_score
 
 
+# ============================================================================
+# 2-1. BATCH SIMILARITY: N×M 유사도 행렬
+# ============================================================================
+
+DEFAULT_HYBRID_WEIGHTS = {
+    "token_set": 0.4,
+    "levenshtein": 0.3,
+    "fuzzy_sort": 0.3
+}
+
+
+class _SimText:
+    """hybrid_similarity 입력 전처리 결과 (대문자/토큰 집합/정렬 토큰)"""
+    
+    __slots__ = ("na", "upper", "tokens", "sorted_tokens")
+    
+    def __init__(self, text):
+        self.na = bool(pd.isna(text))
+        if self.na:
+            self.upper = self.sorted_tokens = ""
+            self.tokens = frozenset()
+            return
+        self.upper = str(text).upper()
+        tokens = self.upper.split()
+        self.tokens = frozenset(tokens)
+        self.sorted_tokens = " ".join(sorted(tokens)).upper()
+
+
+def _levenshtein_matrix_numpy(queries: List[str], choices: List[str]) -> np.ndarray:
+    """
+    NumPy 편집거리 행렬 (rapidfuzz 미설치 시 폴백)
+    
+    query 문자 1개당 전체 choice에 대해 DP 한 행을 벡터 연산으로 갱신.
+    행 내부 의존성(current[j-1] + 1)은 누적 최소값으로 처리:
+    current[j] = min_k<=j (t[k] + j - k) = cummin(t - j) + j
+    """
+    lengths = np.array([len(c) for c in choices], dtype=np.int64)
+    width = int(lengths.max()) if len(choices) else 0
+    codes = np.full((len(choices), width), -1, dtype=np.int64)
+    for j, choice in enumerate(choices):
+        codes[j, :len(choice)] = [ord(ch) for ch in choice]
+    
+    cols = np.arange(width + 1, dtype=np.int64)
+    rows = np.arange(len(choices))
+    out = np.empty((len(queries), len(choices)), dtype=np.int64)
+    
+    for qi, query in enumerate(queries):
+        prev = np.tile(cols, (len(choices), 1))
+        for i, ch in enumerate(query, 1):
+            t = np.empty_like(prev)
+            t[:, 0] = i
+            t[:, 1:] = np.minimum(prev[:, 1:] + 1, prev[:, :-1] + (codes != ord(ch)))
+            prev = np.minimum.accumulate(t - cols, axis=1) + cols
+        out[qi] = prev[rows, lengths]
+    
+    return out
+
+
+def levenshtein_distance_matrix(queries: List[str], choices: List[str]) -> np.ndarray:
+    """
+    N×M 편집거리 행렬
+    
+    rapidfuzz(C, bit-parallel) 사용 가능 시 cdist, 아니면 NumPy DP.
+    """
+    if not queries or not choices:
+        return np.zeros((len(queries), len(choices)), dtype=np.int64)
+    
+    if RAPIDFUZZ_AVAILABLE:
+        return _rf_cdist(
+            queries, choices, scorer=_RFLevenshtein.distance, dtype=np.int64
+        )
+    
+    return _levenshtein_matrix_numpy(queries, choices)
+
+
+def _levenshtein_ratio_matrix(queries: List[str], choices: List[str]) -> np.ndarray:
+    """_levenshtein_ratio의 N×M 버전 (중복 문자열은 1회만 계산)"""
+    q_unique = list(dict.fromkeys(queries))
+    c_unique = list(dict.fromkeys(choices))
+    q_pos = {s: i for i, s in enumerate(q_unique)}
+    c_pos = {s: i for i, s in enumerate(c_unique)}
+    
+    distance = levenshtein_distance_matrix(q_unique, c_unique)
+    max_len = np.maximum(
+        np.array([len(s) for s in q_unique], dtype=np.int64)[:, None],
+        np.array([len(s) for s in c_unique], dtype=np.int64)[None, :]
+    )
+    # 동일 문자열(빈 문자열 포함)은 1.0
+    ratio = 1.0 - np.divide(
+        distance, max_len, out=np.zeros(distance.shape), where=max_len > 0
+    )
+    
+    return ratio[np.ix_([q_pos[s] for s in queries], [c_pos[s] for s in choices])]
+
+
+def _token_set_matrix(queries: List[_SimText], choices: List[_SimText]) -> np.ndarray:
+    """token_set_similarity의 N×M 버전 (토큰 incidence 행렬 곱)"""
+    vocab: Dict[str, int] = {}
+    for text in list(queries) + list(choices):
+        for token in text.tokens:
+            vocab.setdefault(token, len(vocab))
+    
+    def incidence(texts: List[_SimText]) -> np.ndarray:
+        m = np.zeros((len(texts), len(vocab)))
+        for i, text in enumerate(texts):
+            m[i, [vocab[t] for t in text.tokens]] = 1.0
+        return m
+    
+    q_inc, c_inc = incidence(queries), incidence(choices)
+    intersection = q_inc @ c_inc.T
+    union = q_inc.sum(axis=1)[:, None] + c_inc.sum(axis=1)[None, :] - intersection
+    
+    # 한쪽 토큰이 없으면 0.0 (union == 0 포함)
+    nonempty = (q_inc.sum(axis=1) > 0)[:, None] & (c_inc.sum(axis=1) > 0)[None, :]
+    return np.divide(
+        intersection, union, out=np.zeros(intersection.shape), where=nonempty
+    )
+
+
+def _hybrid_matrix_prepared(
+    queries: List[_SimText],
+    choices: List[_SimText],
+    weights: Dict[str, float] = None
+) -> np.ndarray:
+    """전처리된 입력으로 hybrid_similarity N×M 행렬 계산"""
+    if weights is None:
+        weights = DEFAULT_HYBRID_WEIGHTS
+    
+    if not queries or not choices:
+        return np.zeros((len(queries), len(choices)))
+    
+    scores = {
+        "token_set": _token_set_matrix(queries, choices),
+        "levenshtein": _levenshtein_ratio_matrix(
+            [q.upper for q in queries], [c.upper for c in choices]
+        ),
+        "fuzzy_sort": _levenshtein_ratio_matrix(
+            [q.sorted_tokens for q in queries], [c.sorted_tokens for c in choices]
+        ),
+    }
+    
+    # 가중 평균 (hybrid_similarity와 동일한 합산 순서)
+    total = np.zeros((len(queries), len(choices)))
+    for key in weights:
+        total = total + scores[key] * weights[key]
+    
+    # NaN 입력은 모든 점수 0
+    na = np.array([q.na for q in queries])[:, None] | np.array([c.na for c in choices])[None, :]
+    total[na] = 0.0
+    
+    return total
+
+
+def hybrid_similarity_matrix(
+    queries: List[str],
+    choices: List[str],
+    weights: Dict[str, float] = None
+) -> np.ndarray:
+    """
+    하이브리드 유사도 N×M 행렬
+    
+    result[i, j] == hybrid_similarity(queries[i], choices[j], weights)
+    
+    Args:
+        queries: 비교 기준 문자열 리스트 (N)
+        choices: 비교 대상 문자열 리스트 (M)
+        weights: hybrid_similarity와 동일
+    
+    Returns:
+        (N, M) float 행렬
+    """
+    return _hybrid_matrix_prepared(
+        [_SimText(q) for q in queries], [_SimText(c) for c in choices], weights
+    )
+
+
 # ============================================================================
 # 3. REGIONAL MATCHING: 권역별 매칭
 # ============================================================================
@@ -313,7 +539,7 @@ REGION_MAP = {
 }
 
 
-def get_region(location: str) -> Optional[str]:
+def _region_rules(location: str) -> Optional[str]:
     """
     위치명에서 권역 추출
     
@@ -329,6 +555,14 @@ def get_region(location: str) -> Optional[str]:
     return None
 
 
+REGION_CANON = LocationCanonicalizer(_region_rules)
+
+
+def get_region(location: str) -> Optional[str]:
+    """위치명에서 권역 추출 (메모이즈; 규칙은 _region_rules)"""
+    return REGION_CANON.canonicalize(location)
+
+
 # ============================================================================
 # 4. VEHICLE TYPE MATCHING: 차량 타입별 매칭
 # ============================================================================
@@ -341,7 +575,7 @@ VEHICLE_GROUPS = {
 }
 
 
-def get_vehicle_group(vehicle: str) -> Optional[str]:
+def _vehicle_group_rules(vehicle: str) -> Optional[str]:
     """
     차량 타입의 그룹 추출
     
@@ -357,16 +591,440 @@ def get_vehicle_group(vehicle: str) -> Optional[str]:
     return None
 
 
+VEHICLE_GROUP_CANON = LocationCanonicalizer(_vehicle_group_rules)
+
+
+def get_vehicle_group(vehicle: str) -> Optional[str]:
+    """차량 타입의 그룹 추출 (메모이즈; 규칙은 _vehicle_group_rules)"""
+    return VEHICLE_GROUP_CANON.canonicalize(vehicle)
+
+
 # ============================================================================
-# 5. MULTI-LEVEL MATCHING: 4단계 매칭 시스템
+# 5. LANE NEIGHBOR TABLE: 권역/차량그룹 fallback 사전 계산
 # ============================================================================
 
+# 테이블 구조 또는 정규화/권역 규칙 코드가 바뀌면 올려서 캐시 무효화
+LANE_NEIGHBOR_TABLE_VERSION = 1
+
+
+class LaneNeighborTable:
+    """
+    Level 3/4 fallback용 레인 이웃 테이블 (ApprovedLaneMap 기준 사전 계산)
+    
+    - region: (origin_region, dest_region, vehicle, unit) → 상위 k 레인 (레인 순서 순위)
+      → Level 3은 첫 레인 O(1) 조회
+    - vehicle_group: (vehicle_group, unit) → 후보 레인 전체
+      → Level 4는 질의 문자열과의 유사도로 순위를 매기므로 후보 목록만 사전 계산
+    
+    compute_hash(레인 필드 + 시노님/권역/차량그룹 규칙 + 버전)가 바뀌면
+    load_or_build가 자동 재구축하여 캐시 파일(JSON)을 갱신한다.
+    캐시 경로 없이 메모리에서만 구축하면 해시를 계산하지 않는다 (lanes_hash=None).
+    """
+    
+    def __init__(
+        self,
+        lanes_hash: Optional[str],
+        k: int,
+        region: Dict[Tuple[str, str, str, str], List[int]],
+        vehicle_group: Dict[Tuple[str, str], List[int]]
+    ):
+        self.lanes_hash = lanes_hash
+        self.k = k
+        self.region = region
+        self.vehicle_group = vehicle_group
+    
+    @staticmethod
+    def lane_fields(approved_lanes: List[Dict]) -> List[List[str]]:
+        """레인별 매칭 필드 (origin, destination, vehicle, unit)"""
+        return [
+            [str(lane.get(f, "per truck" if f == "unit" else ""))
+             for f in ("origin", "destination", "vehicle", "unit")]
+            for lane in approved_lanes
+        ]
+    
+    @staticmethod
+    def compute_hash(approved_lanes: List[Dict]) -> str:
+        """레인 매칭 필드 + 규칙 테이블 해시 (sha256)"""
+        payload = {
+            "version": LANE_NEIGHBOR_TABLE_VERSION,
+            "rules": [LOCATION_SYNONYMS, VEHICLE_SYNONYMS, REGION_MAP, VEHICLE_GROUPS],
+            "lanes": LaneNeighborTable.lane_fields(approved_lanes),
+        }
+        blob = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+    
+    @classmethod
+    def build(
+        cls, approved_lanes: List[Dict], k: int = 5, lanes_hash: Optional[str] = None
+    ) -> "LaneNeighborTable":
+        """레인 목록에서 테이블 구축 (레인당 권역/차량그룹 1회 계산, 해시는 전달된 값만 보관)"""
+        region: Dict[Tuple[str, str, str, str], List[int]] = {}
+        vehicle_group: Dict[Tuple[str, str], List[int]] = {}
+        
+        for i, lane in enumerate(approved_lanes):
+            lane_vehicle = normalize_vehicle(lane.get("vehicle", ""))
+            lane_unit = str(lane.get("unit", "per truck"))
+            
+            origin_region = get_region(normalize_location(lane.get("origin", "")))
+            dest_region = get_region(normalize_location(lane.get("destination", "")))
+            if origin_region and dest_region:
+                ranked = region.setdefault(
+                    (origin_region, dest_region, lane_vehicle, lane_unit), []
+                )
+                if len(ranked) < k:
+                    ranked.append(i)
+            
+            group = get_vehicle_group(lane.get("vehicle", ""))
+            if group:
+                vehicle_group.setdefault((group, lane_unit), []).append(i)
+        
+        return cls(lanes_hash, k, region, vehicle_group)
+    
+    def region_lane(
+        self, origin_region: str, dest_region: str, vehicle: str, unit: str
+    ) -> Optional[int]:
+        """Level 3: 권역 쌍 + 차량 + 단위 일치 최상위 레인"""
+        ranked = self.region.get((origin_region, dest_region, vehicle, unit))
+        return ranked[0] if ranked else None
+    
+    def vehicle_group_lanes(self, vehicle_group: str, unit: str) -> List[int]:
+        """Level 4: 차량그룹 + 단위 일치 후보 레인"""
+        return self.vehicle_group.get((vehicle_group, unit), [])
+    
+    def save(self, path: str) -> None:
+        if self.lanes_hash is None:
+            raise ValueError("lanes_hash required to save lane neighbor table")
+        data = {
+            "version": LANE_NEIGHBOR_TABLE_VERSION,
+            "lanes_hash": self.lanes_hash,
+            "k": self.k,
+            "region": [[*key, lanes] for key, lanes in self.region.items()],
+            "vehicle_group": [[*key, lanes] for key, lanes in self.vehicle_group.items()],
+        }
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp.replace(path)
+    
+    @classmethod
+    def load(cls, path: str) -> Optional["LaneNeighborTable"]:
+        """캐시 파일 로드 (없거나 손상/버전 불일치 시 None)"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != LANE_NEIGHBOR_TABLE_VERSION:
+                return None
+            return cls(
+                data["lanes_hash"],
+                data["k"],
+                {tuple(row[:4]): row[4] for row in data["region"]},
+                {tuple(row[:2]): row[2] for row in data["vehicle_group"]},
+            )
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            return None
+    
+    @classmethod
+    def load_or_build(
+        cls, approved_lanes: List[Dict], cache_path: Optional[str] = None, k: int = 5
+    ) -> "LaneNeighborTable":
+        """
+        캐시 해시가 현재 레인/규칙과 같으면 로드, 아니면 재구축 후 저장
+        
+        Args:
+            approved_lanes: ApprovedLaneMap 레인 리스트
+            cache_path: 테이블 캐시 JSON 경로 (None이면 메모리에서만 구축)
+            k: Level 3 키별 보관 레인 수
+        """
+        if not cache_path:
+            return cls.build(approved_lanes, k=k)
+        
+        lanes_hash = cls.compute_hash(approved_lanes)
+        table = cls.load(cache_path)
+        if table is not None and table.lanes_hash == lanes_hash and table.k >= k:
+            return table
+        
+        table = cls.build(approved_lanes, k=k, lanes_hash=lanes_hash)
+        try:
+            table.save(cache_path)
+        except OSError as e:
+            logger.warning("Lane neighbor table cache not saved: %s", e)
+        return table
+
+
+# ============================================================================
+# 6. MULTI-LEVEL MATCHING: 4단계 매칭 시스템
+# ============================================================================
+
+class ApprovedLaneIndex:
+    """
+    ApprovedLaneMap 사전 정규화 인덱스
+    
+    레인별 정규화 필드/유사도 전처리를 1회 계산하고, 매칭 단계별 후보 버킷을
+    구성하여 find_matching_lane_enhanced 조회 시 후보 레인만 비교한다.
+    버킷은 레인 순서를 유지하므로 매칭 결과(레벨/점수/레인)는 전체 순회와 동일.
+    
+    - exact: (origin, destination, vehicle, unit) → 첫 레인
+    - by_vehicle_unit: (vehicle, unit) → 레인 목록 (Level 2)
+    - neighbors: LaneNeighborTable (Level 3/4, neighbor_cache 지정 시 파일 캐시)
+    """
+    
+    def __init__(self, approved_lanes: List[Dict], neighbor_cache: Optional[str] = None):
+        self.lanes = approved_lanes
+        
+        self.exact: Dict[Tuple[str, str, str, str], int] = {}
+        self.by_vehicle_unit: Dict[Tuple[str, str], List[int]] = {}
+        self.neighbors = LaneNeighborTable.load_or_build(approved_lanes, neighbor_cache)
+        
+        # 레인별 유사도 전처리: 원본 origin/destination (Level 2), 정규화 (Level 4)
+        self.raw_text: List[Tuple[_SimText, _SimText]] = []
+        self.norm_text: List[Tuple[_SimText, _SimText]] = []
+        
+        for i, lane in enumerate(approved_lanes):
+            lane_origin = normalize_location(lane.get("origin", ""))
+            lane_dest = normalize_location(lane.get("destination", ""))
+            lane_vehicle = normalize_vehicle(lane.get("vehicle", ""))
+            lane_unit = str(lane.get("unit", "per truck"))
+            
+            self.exact.setdefault((lane_origin, lane_dest, lane_vehicle, lane_unit), i)
+            self.by_vehicle_unit.setdefault((lane_vehicle, lane_unit), []).append(i)
+            
+            self.raw_text.append(
+                (_SimText(lane.get("origin", "")), _SimText(lane.get("destination", "")))
+            )
+            self.norm_text.append((_SimText(lane_origin), _SimText(lane_dest)))
+    
+    def __len__(self) -> int:
+        return len(self.lanes)
+    
+    def _result(self, i: int, score: float, level: str) -> Dict:
+        return {
+            "row_index": i + 2,
+            "match_score": score,
+            "match_level": level,
+            "lane_data": self.lanes[i]
+        }
+    
+    def _best_similarity_batch(
+        self,
+        candidates: List[int],
+        lane_text: List[Tuple[_SimText, _SimText]],
+        origins: List[_SimText],
+        destinations: List[_SimText],
+        threshold: float
+    ) -> List[Tuple[Optional[int], float]]:
+        """
+        질의별로 후보 레인 중 0.6*origin + 0.4*destination 유사도 최고 레인
+        
+        N×M 유사도 행렬 + 벡터화 argmax (동점 시 앞 레인, 전체 순회와 동일).
+        """
+        if not candidates:
+            return [(None, 0.0)] * len(origins)
+        
+        origin_sim = _hybrid_matrix_prepared(origins, [lane_text[i][0] for i in candidates])
+        dest_sim = _hybrid_matrix_prepared(destinations, [lane_text[i][1] for i in candidates])
+        total_sim = 0.6 * origin_sim + 0.4 * dest_sim
+        
+        best = total_sim.argmax(axis=1)
+        best_score = total_sim[np.arange(len(origins)), best]
+        matched = (best_score > 0.0) & (best_score >= threshold)
+        
+        return [
+            (candidates[j], float(score)) if ok else (None, 0.0)
+            for j, score, ok in zip(best.tolist(), best_score.tolist(), matched.tolist())
+        ]
+    
+    def _best_similarity(
+        self,
+        candidates: List[int],
+        lane_text: List[Tuple[_SimText, _SimText]],
+        origin: _SimText,
+        destination: _SimText,
+        threshold: float
+    ) -> Tuple[Optional[int], float]:
+        """단일 질의용 _best_similarity_batch"""
+        return self._best_similarity_batch(
+            candidates, lane_text, [origin], [destination], threshold
+        )[0]
+    
+    def find_batch(
+        self, queries: Iterable[Tuple[str, str, str, str]]
+    ) -> List[Optional[Dict]]:
+        """
+        여러 인보이스 라인 일괄 매칭
+        
+        Level 2/4는 같은 후보 버킷을 쓰는 라인끼리 묶어 N×M 유사도 행렬로
+        한 번에 계산. 결과는 라인별 find()와 동일.
+        
+        Args:
+            queries: (origin, destination, vehicle, unit) 목록
+        
+        Returns:
+            라인별 매칭 결과 (find와 동일 구조) 리스트
+        """
+        queries = [(o, d, v, str(u)) for o, d, v, u in queries]
+        results: List[Optional[Dict]] = [None] * len(queries)
+        
+        keys = []
+        level2: Dict[Tuple[str, str], List[int]] = {}
+        for qi, (origin, destination, vehicle, unit) in enumerate(queries):
+            key = (normalize_location(origin), normalize_location(destination),
+                   normalize_vehicle(vehicle), unit)
+            keys.append(key)
+            
+            # LEVEL 1: 정확 매칭
+            i = self.exact.get(key)
+            if i is not None:
+                results[qi] = self._result(i, 1.0, "EXACT")
+            else:
+                level2.setdefault((key[2], unit), []).append(qi)
+        
+        texts = {}
+        for qi in (qi for group in level2.values() for qi in group):
+            texts[qi] = (_SimText(queries[qi][0]), _SimText(queries[qi][1]))
+        
+        # LEVEL 2: 향상된 유사도 매칭 (버킷별 일괄)
+        unmatched = []
+        for bucket_key, group in level2.items():
+            matches = self._best_similarity_batch(
+                self.by_vehicle_unit.get(bucket_key, []), self.raw_text,
+                [texts[qi][0] for qi in group], [texts[qi][1] for qi in group], 0.65
+            )
+            for qi, (i, score) in zip(group, matches):
+                if i is not None:
+                    results[qi] = self._result(i, score, "SIMILARITY")
+                else:
+                    unmatched.append(qi)
+        
+        # LEVEL 3: 권역별 매칭
+        level4: Dict[Tuple[str, str], List[int]] = {}
+        for qi in sorted(unmatched):
+            origin_norm, dest_norm, vehicle_norm, unit = keys[qi]
+            origin_region = get_region(origin_norm)
+            dest_region = get_region(dest_norm)
+            
+            if origin_region and dest_region:
+                i = self.neighbors.region_lane(origin_region, dest_region, vehicle_norm, unit)
+                if i is not None:
+                    results[qi] = self._result(i, 0.5, "REGION")
+                    continue
+            
+            vehicle_group = get_vehicle_group(vehicle_norm)
+            if vehicle_group:
+                level4.setdefault((vehicle_group, unit), []).append(qi)
+        
+        # LEVEL 4: 차량 타입별 매칭 (버킷별 일괄)
+        for bucket_key, group in level4.items():
+            matches = self._best_similarity_batch(
+                self.neighbors.vehicle_group_lanes(*bucket_key), self.norm_text,
+                [texts[qi][0] for qi in group], [texts[qi][1] for qi in group], 0.4
+            )
+            for qi, (i, score) in zip(group, matches):
+                if i is not None:
+                    results[qi] = self._result(i, score, "VEHICLE_TYPE")
+        
+        return results
+    
+    def find(
+        self,
+        origin: str,
+        destination: str,
+        vehicle: str,
+        unit: str,
+        verbose: bool = False
+    ) -> Optional[Dict]:
+        """4단계 매칭 (find_matching_lane_enhanced 참고)"""
+        
+        # 정규화
+        origin_norm = normalize_location(origin)
+        dest_norm = normalize_location(destination)
+        vehicle_norm = normalize_vehicle(vehicle)
+        unit = str(unit)
+        
+        if verbose:
+            print(f"\n[MATCHING] {origin} → {destination} ({vehicle})")
+            print(f"  Normalized: {origin_norm} → {dest_norm} ({vehicle_norm})")
+        
+        # LEVEL 1: 정확 매칭
+        i = self.exact.get((origin_norm, dest_norm, vehicle_norm, unit))
+        if i is not None:
+            if verbose:
+                print(f"  ✅ LEVEL 1 (EXACT): Lane {i} matched!")
+            return self._result(i, 1.0, "EXACT")
+        
+        origin_text = _SimText(origin)
+        dest_text = _SimText(destination)
+        
+        # LEVEL 2: 향상된 유사도 매칭 (차량/단위 정확 일치, 임계값 0.65)
+        i, score = self._best_similarity(
+            self.by_vehicle_unit.get((vehicle_norm, unit), []),
+            self.raw_text, origin_text, dest_text, 0.65
+        )
+        if i is not None:
+            if verbose:
+                print(f"  ✅ LEVEL 2 (SIMILARITY): Lane {i} matched (score: {score:.2f})")
+            return self._result(i, score, "SIMILARITY")
+        
+        # LEVEL 3: 권역별 매칭 (권역 매칭 점수: 0.5 고정, 첫 레인)
+        origin_region = get_region(origin_norm)
+        dest_region = get_region(dest_norm)
+        
+        if origin_region and dest_region:
+            i = self.neighbors.region_lane(origin_region, dest_region, vehicle_norm, unit)
+            if i is not None:
+                if verbose:
+                    print(f"  ✅ LEVEL 3 (REGION): Lane {i} matched (region: {origin_region}→{dest_region})")
+                return self._result(i, 0.5, "REGION")
+        
+        # LEVEL 4: 차량 타입별 매칭 (단위만 일치, 임계값 0.4)
+        vehicle_group = get_vehicle_group(vehicle_norm)
+        
+        if vehicle_group:
+            i, score = self._best_similarity(
+                self.neighbors.vehicle_group_lanes(vehicle_group, unit),
+                self.norm_text, origin_text, dest_text, 0.4
+            )
+            if i is not None:
+                if verbose:
+                    print(f"  ✅ LEVEL 4 (VEHICLE_TYPE): Lane {i} matched (group: {vehicle_group}, score: {score:.2f})")
+                return self._result(i, score, "VEHICLE_TYPE")
+        
+        if verbose:
+            print(f"  ❌ NO MATCH")
+        
+        return None
+
+
+# 레인 리스트를 직접 넘기는 호출자용: 직전 (리스트, 매칭 필드) → 인덱스
+_LAST_LANE_INDEX: Dict[str, object] = {}
+
+
+def _lane_index_for(approved_lanes: List[Dict]) -> ApprovedLaneIndex:
+    """
+    같은 리스트 객체 + 같은 매칭 필드면 직전 ApprovedLaneIndex 재사용
+    
+    필드 비교로 리스트 제자리 수정(추가/삭제/값 변경)도 감지하여 재구축한다.
+    """
+    fields = LaneNeighborTable.lane_fields(approved_lanes)
+    cached = _LAST_LANE_INDEX.get("index")
+    if (
+        cached is not None
+        and cached.lanes is approved_lanes
+        and _LAST_LANE_INDEX.get("fields") == fields
+    ):
+        return cached
+    
+    index = ApprovedLaneIndex(approved_lanes)
+    _LAST_LANE_INDEX.update(index=index, fields=fields)
+    return index
+
+
 def find_matching_lane_enhanced(
     origin: str,
     destination: str,
     vehicle: str,
     unit: str,
-    approved_lanes: List[Dict],
+    approved_lanes,
     verbose: bool = False
 ) -> Optional[Dict]:
     """
@@ -382,7 +1040,8 @@ def find_matching_lane_enhanced(
         destination: 목적지
         vehicle: 차량 타입
         unit: 단위 (per truck, per ton 등)
-        approved_lanes: ApprovedLaneMap 레인 리스트
+        approved_lanes: ApprovedLaneMap 레인 리스트 또는 ApprovedLaneIndex
+            (리스트는 같은 객체/필드로 재호출 시 직전 인덱스 재사용)
         verbose: 상세 로그 출력
     
     Returns:
@@ -393,166 +1052,14 @@ def find_matching_lane_enhanced(
             "lane_data": dict
         } or None
     """
+    if not isinstance(approved_lanes, ApprovedLaneIndex):
+        approved_lanes = _lane_index_for(approved_lanes)
     
-    # 정규화
-    origin_norm = normalize_location(origin)
-    dest_norm = normalize_location(destination)
-    vehicle_norm = normalize_vehicle(vehicle)
-    
-    if verbose:
-        print(f"\n[MATCHING] {origin} → {destination} ({vehicle})")
-        print(f"  Normalized: {origin_norm} → {dest_norm} ({vehicle_norm})")
-    
-    best_match = None
-    best_score = 0.0
-    
-    # ========================================================================
-    # LEVEL 1: 정확 매칭
-    # ========================================================================
-    for i, lane in enumerate(approved_lanes):
-        lane_origin = normalize_location(lane.get("origin", ""))
-        lane_dest = normalize_location(lane.get("destination", ""))
-        lane_vehicle = normalize_vehicle(lane.get("vehicle", ""))
-        lane_unit = str(lane.get("unit", "per truck"))
-        
-        if (lane_origin == origin_norm and
-            lane_dest == dest_norm and
-            lane_vehicle == vehicle_norm and
-            lane_unit == str(unit)):
-            
-            if verbose:
-                print(f"  ✅ LEVEL 1 (EXACT): Lane {i} matched!")
-            
-            return {
-                "row_index": i + 2,
-                "match_score": 1.0,
-                "match_level": "EXACT",
-                "lane_data": lane
-            }
-    
-    # ========================================================================
-    # LEVEL 2: 향상된 유사도 매칭 (하이브리드)
-    # ========================================================================
-    for i, lane in enumerate(approved_lanes):
-        lane_origin = lane.get("origin", "")
-        lane_dest = lane.get("destination", "")
-        lane_vehicle = normalize_vehicle(lane.get("vehicle", ""))
-        lane_unit = str(lane.get("unit", "per truck"))
-        
-        # 차량 및 단위는 정확히 일치해야 함
-        if lane_vehicle != vehicle_norm or lane_unit != str(unit):
-            continue
-        
-        # 하이브리드 유사도 계산
-        origin_sim = hybrid_similarity(origin, lane_origin)
-        dest_sim = hybrid_similarity(destination, lane_dest)
-        
-        # 가중 평균 (Origin 60%, Destination 40%)
-        total_sim = 0.6 * origin_sim + 0.4 * dest_sim
-        
-        # 임계값: 0.65 이상
-        if total_sim > best_score and total_sim >= 0.65:
-            best_match = {
-                "row_index": i + 2,
-                "match_score": total_sim,
-                "match_level": "SIMILARITY",
-                "lane_data": lane
-            }
-            best_score = total_sim
-    
-    if best_match and verbose:
-        print(f"  ✅ LEVEL 2 (SIMILARITY): Lane {best_match['row_index']-2} matched (score: {best_score:.2f})")
-    
-    if best_match:
-        return best_match
-    
-    # ========================================================================
-    # LEVEL 3: 권역별 매칭
-    # ========================================================================
-    origin_region = get_region(origin_norm)
-    dest_region = get_region(dest_norm)
-    
-    if origin_region and dest_region:
-        for i, lane in enumerate(approved_lanes):
-            lane_origin = normalize_location(lane.get("origin", ""))
-            lane_dest = normalize_location(lane.get("destination", ""))
-            lane_vehicle = normalize_vehicle(lane.get("vehicle", ""))
-            lane_unit = str(lane.get("unit", "per truck"))
-            
-            # 차량 및 단위 일치
-            if lane_vehicle != vehicle_norm or lane_unit != str(unit):
-                continue
-            
-            lane_origin_region = get_region(lane_origin)
-            lane_dest_region = get_region(lane_dest)
-            
-            if lane_origin_region == origin_region and lane_dest_region == dest_region:
-                # 권역 매칭 점수: 0.5 고정
-                score = 0.5
-                
-                if score > best_score:
-                    best_match = {
-                        "row_index": i + 2,
-                        "match_score": score,
-                        "match_level": "REGION",
-                        "lane_data": lane
-                    }
-                    best_score = score
-        
-        if best_match and verbose:
-            print(f"  ✅ LEVEL 3 (REGION): Lane {best_match['row_index']-2} matched (region: {origin_region}→{dest_region})")
-    
-    if best_match:
-        return best_match
-    
-    # ========================================================================
-    # LEVEL 4: 차량 타입별 매칭
-    # ========================================================================
-    vehicle_group = get_vehicle_group(vehicle_norm)
-    
-    if vehicle_group:
-        for i, lane in enumerate(approved_lanes):
-            lane_origin = normalize_location(lane.get("origin", ""))
-            lane_dest = normalize_location(lane.get("destination", ""))
-            lane_vehicle = lane.get("vehicle", "")
-            lane_unit = str(lane.get("unit", "per truck"))
-            
-            # 단위만 일치하면 됨
-            if lane_unit != str(unit):
-                continue
-            
-            lane_vehicle_group = get_vehicle_group(lane_vehicle)
-            
-            if lane_vehicle_group == vehicle_group:
-                # 출발지/목적지 유사도 계산
-                origin_sim = hybrid_similarity(origin, lane_origin)
-                dest_sim = hybrid_similarity(destination, lane_dest)
-                total_sim = 0.6 * origin_sim + 0.4 * dest_sim
-                
-                # 임계값: 0.4 이상
-                if total_sim >= 0.4 and total_sim > best_score:
-                    best_match = {
-                        "row_index": i + 2,
-                        "match_score": total_sim,
-                        "match_level": "VEHICLE_TYPE",
-                        "lane_data": lane
-                    }
-                    best_score = total_sim
-        
-        if best_match and verbose:
-            print(f"  ✅ LEVEL 4 (VEHICLE_TYPE): Lane {best_match['row_index']-2} matched (group: {vehicle_group}, score: {best_score:.2f})")
-    
-    if best_match:
-        return best_match
-    
-    if verbose:
-        print(f"  ❌ NO MATCH")
-    
-    return None
+    return approved_lanes.find(origin, destination, vehicle, unit, verbose=verbose)
 
 
 # ============================================================================
-# 6. UTILITY FUNCTIONS
+# 7. UTILITY FUNCTIONS
 # ============================================================================
 
 def compare_matching_results(
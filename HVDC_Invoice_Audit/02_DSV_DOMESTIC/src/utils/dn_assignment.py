@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+인보이스 × DN 용량 제약 할당
+- greedy: 점수 내림차순 전역 그리디 (기존 방식)
+- optimal: 총 점수 최대화 (DN 용량만큼 슬롯 복제 + Hungarian)
+
+후보는 희소 (score, row, dn) 목록으로만 다루며, 후보 그래프의
+연결 성분별로 나누어 풀기 때문에 수천 건 규모에서도 행렬이 작게 유지된다.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    from scipy.optimize import linear_sum_assignment
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# (score, row_index, dn_index)
+Candidate = Tuple[float, int, int]
+
+
+def greedy_assign(
+    candidates: Sequence[Candidate], capacity: Dict[int, int]
+) -> Dict[int, int]:
+    """
+    점수 내림차순 그리디 할당 (동점은 입력 순서 유지)
+
+    Args:
+        candidates: (score, row, dn) 후보 목록
+        capacity: {dn_index: 허용 매칭 수}
+
+    Returns:
+        Dict[row, dn]: 할당 결과
+    """
+    remaining = dict(capacity)
+    assigned: Dict[int, int] = {}
+    for _, i, j in sorted(candidates, key=lambda c: c[0], reverse=True):
+        if i in assigned or remaining.get(j, 0) <= 0:
+            continue
+        assigned[i] = j
+        remaining[j] -= 1
+    return assigned
+
+
+def _components(candidates: Sequence[Candidate]) -> List[List[Candidate]]:
+    """후보 그래프(row ↔ dn)의 연결 성분 분리 (union-find)"""
+    parent: Dict[Tuple[str, int], Tuple[str, int]] = {}
+
+    def find(x):
+        root = x
+        while parent.setdefault(root, root) != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    for _, i, j in candidates:
+        ra, rb = find(("r", i)), find(("d", j))
+        if ra != rb:
+            parent[ra] = rb
+
+    groups: Dict[Tuple[str, int], List[Candidate]] = {}
+    for cand in candidates:
+        groups.setdefault(find(("r", cand[1])), []).append(cand)
+    return list(groups.values())
+
+
+def optimal_assign(
+    candidates: Sequence[Candidate], capacity: Dict[int, int]
+) -> Dict[int, int]:
+    """
+    총 점수 최대 용량 제약 할당
+
+    DN j를 min(capacity[j], 후보 row 수)개 슬롯으로 복제한 뒤
+    성분별 row × slot 행렬에 linear_sum_assignment(maximize)를 적용.
+    후보가 아닌 칸은 0점이므로 배정되더라도 결과에서 제외된다.
+    같은 이유로 0점 후보(DN_MIN_SCORE <= 0)도 할당하지 않는다.
+
+    Args:
+        candidates: (score, row, dn) 후보 목록 (점수 > 0)
+        capacity: {dn_index: 허용 매칭 수}
+
+    Returns:
+        Dict[row, dn]: 할당 결과
+    """
+    if not SCIPY_AVAILABLE:
+        raise ImportError("scipy is required for optimal DN assignment")
+
+    assigned: Dict[int, int] = {}
+    for comp in _components(candidates):
+        rows = sorted({i for _, i, _ in comp})
+        dn_rows: Dict[int, int] = {}
+        for _, i, j in comp:
+            dn_rows[j] = dn_rows.get(j, 0) + 1
+
+        slots: List[int] = []
+        for j in sorted(dn_rows):
+            slots.extend([j] * min(max(capacity.get(j, 0), 0), dn_rows[j]))
+        if not slots:
+            continue
+
+        row_pos = {i: p for p, i in enumerate(rows)}
+        slot_pos: Dict[int, List[int]] = {}
+        for p, j in enumerate(slots):
+            slot_pos.setdefault(j, []).append(p)
+
+        weights = np.zeros((len(rows), len(slots)))
+        for sc, i, j in comp:
+            for p in slot_pos.get(j, ()):
+                weights[row_pos[i], p] = sc
+
+        r_idx, c_idx = linear_sum_assignment(weights, maximize=True)
+        for r, c in zip(r_idx, c_idx):
+            if weights[r, c] > 0:
+                assigned[rows[r]] = slots[c]
+    return assigned
+
+
+def total_score(candidates: Sequence[Candidate], assigned: Dict[int, int]) -> float:
+    """할당 결과의 총 점수"""
+    scores = {(i, j): sc for sc, i, j in candidates}
+    return sum(scores[(i, j)] for i, j in assigned.items())
+
+
+def assign_dns(
+    candidates: Sequence[Candidate], capacity: Dict[int, int], mode: str = "optimal"
+) -> Tuple[Dict[int, int], str]:
+    """
+    모드별 할당 실행 (optimal 불가 시 greedy 폴백)
+
+    Returns:
+        (Dict[row, dn], 실제 사용된 모드)
+    """
+    if mode == "optimal" and SCIPY_AVAILABLE:
+        return optimal_assign(candidates, capacity), "optimal"
+    return greedy_assign(candidates, capacity), "greedy"
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
 # location_canon.py — structural
-import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "00_Shared"))
+from location_canonicalizer import LocationCanonicalizer, RegexRuleTable
+
 from .utils_normalize import normalize_location
 
 # 약어/변형 → 표준 지명 매핑 (필요시 항목 추가)
@@ -24,6 +29,23 @@ _LOCATION_MAP = {
 }
 
 
+# 약어 규칙 1회 컴파일 (정규화된 문자열 기준 re.match)
+_LOCATION_RULES = RegexRuleTable(_LOCATION_MAP.items())
+
+
+def _expand_location_abbrev_rules(s: str) -> str:
+    if not s:
+        return ""
+
+    s_norm = normalize_location(s)
+    canon = _LOCATION_RULES.lookup(s_norm)
+    return canon if canon is not None else s_norm
+
+
+# 동일 약어/지명 반복 확장 방지 (LRU 메모 + 컬럼 배치 API)
+LOCATION_ABBREV_CANON = LocationCanonicalizer(_expand_location_abbrev_rules)
+
+
 def expand_location_abbrev(s: str) -> str:
     """
     파일명 약어/짧은 토큰을 표준 지명으로 확장.
@@ -35,13 +57,4 @@ def expand_location_abbrev(s: str) -> str:
     Returns:
         확장된 표준 지명
     """
-    if not s:
-        return ""
-
-    s_norm = normalize_location(s)
-
-    for pat, canon in _LOCATION_MAP.items():
-        if re.match(pat, s_norm):
-            return canon
-
-    return s_norm
+    return LOCATION_ABBREV_CANON.canonicalize(s)
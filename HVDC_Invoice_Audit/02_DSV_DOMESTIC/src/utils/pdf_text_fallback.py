@@ -11,26 +11,41 @@ from pathlib import Path
 from typing import Optional
 
 
-def _try_pymupdf(pdf_path: str) -> str:
-    """PyMuPDF(fitz)로 텍스트 추출 - 다단/표 혼합 문서에 강함"""
+def open_pymupdf(pdf_path: str):
+    """PyMuPDF(fitz) 문서 열기 - 미설치/실패 시 None"""
     try:
         import fitz  # PyMuPDF
 
-        doc = fitz.open(pdf_path)
-        texts = []
-        for page in doc:
-            try:
-                # 레이아웃 보존력이 높은 모드 조합
-                t = page.get_text("text") or ""
-                if not t.strip():
-                    t = page.get_text() or ""
-                texts.append(t)
-            except Exception:
-                continue
-        doc.close()
-        return "\n".join(texts)
+        return fitz.open(pdf_path)
+    except Exception:
+        return None
+
+
+def pymupdf_page_text(doc, index: int) -> Optional[str]:
+    """PyMuPDF 단일 페이지 텍스트 - 실패 시 None (페이지 단위 폴백용)"""
+    try:
+        page = doc[index]
+        # 레이아웃 보존력이 높은 모드 조합
+        t = page.get_text("text") or ""
+        if not t.strip():
+            t = page.get_text() or ""
+        return t
+    except Exception:
+        return None
+
+
+def _try_pymupdf(pdf_path: str) -> str:
+    """PyMuPDF(fitz)로 텍스트 추출 - 다단/표 혼합 문서에 강함"""
+    doc = open_pymupdf(pdf_path)
+    if doc is None:
+        return ""
+    try:
+        texts = (pymupdf_page_text(doc, i) for i in range(len(doc)))
+        return "\n".join(t for t in texts if t is not None)
     except Exception:
         return ""
+    finally:
+        doc.close()
 
 
 def _try_pypdf(pdf_path: str) -> str:
@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 # utils_normalize.py — structural
 import re
+import sys
+from pathlib import Path
 from typing import Set
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "00_Shared"))
+from location_canonicalizer import LocationCanonicalizer
+
 # DN 문서 접두/기관 표기 등 비교에 불필요한 토큰
 STOPWORDS: Set[str] = {"CICPA", "PMO"}
 
@@ -12,7 +17,7 @@ def _squash(s: str) -> str:
     return re.sub(r"\s+", " ", s).strip()
 
 
-def normalize_location(s: str) -> str:
+def _normalize_location_rules(s: str) -> str:
     """
     지명/시설명을 비교 가능한 표준 문자열로 정규화:
       - 대문자화
@@ -29,6 +34,15 @@ def normalize_location(s: str) -> str:
     return " ".join(toks)
 
 
+# 동일 지명 반복 정규화 방지 (LRU 메모 + 컬럼 배치 API)
+LOCATION_CANON = LocationCanonicalizer(_normalize_location_rules)
+
+
+def normalize_location(s: str) -> str:
+    """지명 정규화 (메모이즈; 규칙은 _normalize_location_rules)"""
+    return LOCATION_CANON.canonicalize(s)
+
+
 def token_set_jaccard(a: str, b: str) -> float:
     """
     간단·견고한 토큰 세트 자카드 유사도.
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""
+XLSX 시트 교체/추가 스트리밍 병합기
+- 원본 워크북 zip 파트를 그대로 복사 (변경 없는 시트는 XML 파싱/재작성 없음)
+- 교체·추가 시트만 DataFrame → sheet XML 스트리밍 기록 (inline string)
+- 스타일은 원본 styles.xml 뒤에 추가, 동일 스펙은 1회만 등록(캐시)
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import math
+import posixpath
+import re
+import shutil
+import zipfile
+from typing import Dict, Iterable, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_REL_WORKSHEET = _NS_REL + "/worksheet"
+_REL_CALCCHAIN = _NS_REL + "/calcChain"
+_CT_WORKSHEET = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+)
+
+# pandas to_excel 기본 datetime/date 서식
+DATETIME_FORMAT = "YYYY-MM-DD HH:MM:SS"
+DATE_FORMAT = "YYYY-MM-DD"
+
+_EXCEL_EPOCH = _dt.datetime(1899, 12, 30)
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def col_letter(idx: int) -> str:
+    """0-based 열 번호 → Excel 열 문자 (0 → A)"""
+    letters = ""
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+class StyleRegistry:
+    """
+    원본 styles.xml에 셀 서식(xf)을 추가 등록
+
+    add(...)는 동일 스펙이면 같은 xf 인덱스를 반환 (공유 캐시).
+    """
+
+    def __init__(self, styles_xml: str):
+        self.xml = styles_xml
+        self._cache: Dict[tuple, int] = {}
+        self._num_fmts: Dict[str, int] = {
+            code: int(fid)
+            for fid, code in re.findall(
+                r'<numFmt\b[^>]*numFmtId="(\d+)"[^>]*formatCode="([^"]*)"', styles_xml
+            )
+        }
+        self._next_fmt = max([163] + list(self._num_fmts.values())) + 1
+        base = re.search(
+            r"<fonts\b[^>]*>\s*<font\b[^>]*>(.*?)</font>", styles_xml, re.S
+        )
+        # 기본 폰트의 크기/이름 등은 유지하고 굵게/밑줄/색만 덧붙임
+        self._base_font = re.sub(
+            r"<(b|i|u|color)\b[^>]*/>|<color\b[^>]*>.*?</color>",
+            "",
+            base.group(1) if base else '<sz val="11"/><name val="Calibri"/>',
+        )
+
+    def _append(self, section: str, element: str) -> int:
+        """section(fonts/fills/borders/cellXfs/numFmts)에 요소 추가 → 새 인덱스"""
+        m = re.search(rf"<{section}\b([^>]*?)(/?)>", self.xml)
+        if m is None:
+            # numFmts가 없는 styles.xml: styleSheet 바로 뒤에 생성
+            root = re.search(r"<styleSheet\b[^>]*>", self.xml)
+            self.xml = (
+                self.xml[: root.end()]
+                + f'<{section} count="1">{element}</{section}>'
+                + self.xml[root.end() :]
+            )
+            return 0
+        count_m = re.search(r'count="(\d+)"', m.group(1))
+        count = int(count_m.group(1)) if count_m else 0
+        attrs = re.sub(r'\s*count="\d+"', "", m.group(1))
+        opening = f'<{section} count="{count + 1}"{attrs}>'
+        if m.group(2):  # <section/> 자체 닫힘
+            new = opening + element + f"</{section}>"
+            self.xml = self.xml[: m.start()] + new + self.xml[m.end() :]
+        else:
+            close = self.xml.index(f"</{section}>", m.end())
+            self.xml = (
+                self.xml[: m.start()]
+                + opening
+                + self.xml[m.end() : close]
+                + element
+                + self.xml[close:]
+            )
+        return count
+
+    def _num_fmt_id(self, code: Optional[str]) -> int:
+        if not code:
+            return 0
+        if code not in self._num_fmts:
+            fid = self._next_fmt
+            self._next_fmt += 1
+            self._append(
+                "numFmts", f'<numFmt numFmtId="{fid}" formatCode={quoteattr(code)}/>'
+            )
+            self._num_fmts[code] = fid
+        return self._num_fmts[code]
+
+    def add(
+        self,
+        bold: bool = False,
+        underline: bool = False,
+        font_color: Optional[str] = None,
+        bg_color: Optional[str] = None,
+        border: bool = False,
+        num_format: Optional[str] = None,
+    ) -> int:
+        key = (bold, underline, font_color, bg_color, border, num_format)
+        if key in self._cache:
+            return self._cache[key]
+
+        font_id = fill_id = border_id = 0
+        if bold or underline or font_color:
+            font = ("<b/>" if bold else "") + ("<u/>" if underline else "")
+            if font_color:
+                font += f'<color rgb="{_argb(font_color)}"/>'
+            font_id = self._append("fonts", f"<font>{font}{self._base_font}</font>")
+        if bg_color:
+            fill_id = self._append(
+                "fills",
+                '<fill><patternFill patternType="solid">'
+                f'<fgColor rgb="{_argb(bg_color)}"/><bgColor indexed="64"/>'
+                "</patternFill></fill>",
+            )
+        if border:
+            side = '<{0} style="thin"><color auto="1"/></{0}>'
+            border_id = self._append(
+                "borders",
+                "<border>"
+                + "".join(side.format(s) for s in ("left", "right", "top", "bottom"))
+                + "<diagonal/></border>",
+            )
+        fmt_id = self._num_fmt_id(num_format)
+
+        xf = (
+            f'<xf numFmtId="{fmt_id}" fontId="{font_id}" fillId="{fill_id}" '
+            f'borderId="{border_id}" xfId="0"'
+            + (' applyNumberFormat="1"' if fmt_id else "")
+            + (' applyFont="1"' if font_id else "")
+            + (' applyFill="1"' if fill_id else "")
+            + (' applyBorder="1"' if border_id else "")
+            + "/>"
+        )
+        self._cache[key] = self._append("cellXfs", xf)
+        return self._cache[key]
+
+
+_NAMED_COLORS = {"blue": "0000FF", "red": "FF0000", "black": "000000"}
+
+
+def _argb(color: str) -> str:
+    color = _NAMED_COLORS.get(color.lower(), color.lstrip("#"))
+    return "FF" + color.upper()
+
+
+class SheetData:
+    """
+    교체/추가할 시트 내용
+
+    Args:
+        df: 기록할 DataFrame (헤더 1행 + 데이터)
+        header_style: 헤더 셀 xf 인덱스
+        column_styles: {열 번호: xf 인덱스} (값이 있는 셀에 적용)
+        cell_styles: {(행 번호, 열 번호): xf 인덱스} (0-based 데이터 행, column_styles보다 우선)
+        hyperlinks: {(행 번호, 열 번호): "Sheet!A1"} 내부 링크 (0-based 데이터 행)
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        header_style: int = 0,
+        column_styles: Optional[Dict[int, int]] = None,
+        cell_styles: Optional[Dict[Tuple[int, int], int]] = None,
+        hyperlinks: Optional[Dict[Tuple[int, int], str]] = None,
+    ):
+        self.df = df
+        self.header_style = header_style
+        self.column_styles = column_styles or {}
+        self.cell_styles = cell_styles or {}
+        self.hyperlinks = hyperlinks or {}
+
+
+def _excel_serial(value) -> float:
+    if isinstance(value, pd.Timestamp):
+        value = value.tz_localize(None) if value.tzinfo else value
+        value = value.to_pydatetime()
+    elif isinstance(value, _dt.datetime) and value.tzinfo:
+        value = value.replace(tzinfo=None)
+    elif isinstance(value, _dt.date) and not isinstance(value, _dt.datetime):
+        value = _dt.datetime(value.year, value.month, value.day)
+    delta = value - _EXCEL_EPOCH
+    return delta.days + (delta.seconds + delta.microseconds / 1e6) / 86400.0
+
+
+def _string_cell(ref: str, text: str, style: int) -> str:
+    text = _ILLEGAL_XML.sub("", text)
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    s = f' s="{style}"' if style else ""
+    return f'<c r="{ref}"{s} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+
+def _cell_xml(ref: str, value, style: int, date_styles: Tuple[int, int]) -> str:
+    """단일 셀 XML (pandas to_excel 값 변환 규칙과 동일; 결측은 빈 문자열)"""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return ""
+    if isinstance(value, (bool, np.bool_)):
+        s = f' s="{style}"' if style else ""
+        return f'<c r="{ref}"{s} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        if isinstance(value, (float, np.floating)) and not math.isfinite(value):
+            return ""
+        s = f' s="{style}"' if style else ""
+        return f'<c r="{ref}"{s}><v>{repr(float(value)) if isinstance(value, (float, np.floating)) else int(value)}</v></c>'
+    if isinstance(value, (_dt.datetime, _dt.date, pd.Timestamp)):
+        is_date = isinstance(value, _dt.date) and not isinstance(value, _dt.datetime)
+        style = style or date_styles[1 if is_date else 0]
+        return f'<c r="{ref}" s="{style}"><v>{_excel_serial(value)!r}</v></c>'
+    if isinstance(value, (_dt.timedelta, pd.Timedelta)):
+        s = f' s="{style}"' if style else ""
+        return f'<c r="{ref}"{s}><v>{pd.Timedelta(value).total_seconds() / 86400.0!r}</v></c>'
+    return _string_cell(ref, str(value), style)
+
+
+def _write_sheet(stream, sheet: SheetData, date_styles: Tuple[int, int]) -> None:
+    """DataFrame → worksheet XML 행 단위 스트리밍 기록"""
+    df = sheet.df
+    ncols = len(df.columns)
+    letters = [col_letter(c) for c in range(ncols)]
+    last = letters[-1] if letters else "A"
+
+    def out(text: str) -> None:
+        stream.write(text.encode("utf-8"))
+
+    out(
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<worksheet xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}">'
+        f'<dimension ref="A1:{last}{len(df) + 1}"/><sheetData>'
+    )
+
+    header = "".join(
+        _string_cell(f"{letters[c]}1", str(name), sheet.header_style)
+        for c, name in enumerate(df.columns)
+    )
+    out(f'<row r="1">{header}</row>')
+
+    col_styles = [sheet.column_styles.get(c, 0) for c in range(ncols)]
+    cell_styles = sheet.cell_styles
+    columns = [df.iloc[:, c].to_numpy(dtype=object) for c in range(ncols)]
+    chunk = []
+    for r in range(len(df)):
+        excel_row = r + 2
+        cells = []
+        for c in range(ncols):
+            value = columns[c][r]
+            if isinstance(value, float) and math.isnan(value):
+                continue
+            style = cell_styles.get((r, c), col_styles[c])
+            cells.append(
+                _cell_xml(f"{letters[c]}{excel_row}", value, style, date_styles)
+            )
+        chunk.append(f'<row r="{excel_row}">{"".join(cells)}</row>')
+        if len(chunk) >= 1000:
+            out("".join(chunk))
+            chunk = []
+    out("".join(chunk))
+    out("</sheetData>")
+
+    if sheet.hyperlinks:
+        links = "".join(
+            f'<hyperlink ref="{letters[c]}{r + 2}" location={quoteattr(target)} '
+            f"display={quoteattr(target)}/>"
+            for (r, c), target in sorted(sheet.hyperlinks.items())
+        )
+        out(f"<hyperlinks>{links}</hyperlinks>")
+
+    out(
+        '<pageMargins left="0.7" right="0.7" top="0.75" bottom="0.75" '
+        'header="0.3" footer="0.3"/></worksheet>'
+    )
+
+
+def _read_text(zin: zipfile.ZipFile, name: str) -> str:
+    return zin.read(name).decode("utf-8")
+
+
+def _rels_path(part: str) -> str:
+    folder, fname = posixpath.split(part)
+    return posixpath.join(folder, "_rels", fname + ".rels")
+
+
+def _attr(tag: str, name: str) -> Optional[str]:
+    m = re.search(rf'\b{name}="([^"]*)"', tag)
+    return m.group(1) if m else None
+
+
+class WorkbookMerger:
+    """
+    원본 xlsx에 시트를 교체/추가하여 새 파일로 저장
+
+    Usage:
+        merger = WorkbookMerger(src)
+        header = merger.styles.add(bold=True, bg_color="#D7E4BC", border=True)
+        merger.save(dst, {"items": SheetData(df, header_style=header)})
+    """
+
+    def __init__(self, src_path: str):
+        self.src_path = src_path
+        with zipfile.ZipFile(src_path) as zin:
+            self.names = zin.namelist()
+            self.workbook_xml = _read_text(zin, "xl/workbook.xml")
+            self.rels_xml = _read_text(zin, "xl/_rels/workbook.xml.rels")
+            self.content_types = _read_text(zin, "[Content_Types].xml")
+            self.styles = StyleRegistry(_read_text(zin, "xl/styles.xml"))
+
+        self.rel_prefix = re.search(
+            rf'xmlns:(\w+)="{re.escape(_NS_REL)}"', self.workbook_xml
+        ).group(1)
+        self.rels = {
+            _attr(tag, "Id"): tag
+            for tag in re.findall(r"<Relationship\b[^>]*/>", self.rels_xml)
+        }
+        self.sheets: Dict[str, str] = {}  # sheet name -> part path
+        for tag in re.findall(r"<sheet\b[^>]*/>", self.workbook_xml):
+            rid = _attr(tag, f"{self.rel_prefix}:id")
+            target = _attr(self.rels[rid], "Target")
+            if target.startswith("/"):
+                part = target.lstrip("/")
+            else:
+                part = posixpath.normpath(posixpath.join("xl", target))
+            self.sheets[_unescape_attr(_attr(tag, "name"))] = part
+
+    def sheet_names(self) -> Iterable[str]:
+        return list(self.sheets)
+
+    def _add_sheet(self, name: str) -> str:
+        """workbook/rels/content-types에 새 시트 등록 → 파트 경로"""
+        n = 1
+        while f"xl/worksheets/sheet{n}.xml" in self.names or (
+            f"xl/worksheets/sheet{n}.xml" in self.sheets.values()
+        ):
+            n += 1
+        part = f"xl/worksheets/sheet{n}.xml"
+
+        k = 1
+        while f"rId{k}" in self.rels:
+            k += 1
+        rid = f"rId{k}"
+        rel = (
+            f'<Relationship Id="{rid}" Type="{_REL_WORKSHEET}" '
+            f'Target="worksheets/sheet{n}.xml"/>'
+        )
+        self.rels[rid] = rel
+        self.rels_xml = self.rels_xml.replace(
+            "</Relationships>", rel + "</Relationships>"
+        )
+
+        sheet_ids = [
+            int(x)
+            for x in re.findall(r'<sheet\b[^>]*\bsheetId="(\d+)"', self.workbook_xml)
+        ]
+        sheet_tag = (
+            f'<sheet name={quoteattr(name)} sheetId="{max(sheet_ids + [0]) + 1}" '
+            f'{self.rel_prefix}:id="{rid}"/>'
+        )
+        self.workbook_xml = self.workbook_xml.replace(
+            "</sheets>", sheet_tag + "</sheets>"
+        )
+        self.content_types = self.content_types.replace(
+            "</Types>",
+            f'<Override PartName="/{part}" ContentType="{_CT_WORKSHEET}"/></Types>',
+        )
+        self.sheets[name] = part
+        return part
+
+    def _drop_calc_chain(self) -> Optional[str]:
+        """교체 시트 수식 참조가 남지 않도록 calcChain 제거 (Excel이 재생성)"""
+        for rid, tag in list(self.rels.items()):
+            if _attr(tag, "Type") == _REL_CALCCHAIN:
+                self.rels_xml = self.rels_xml.replace(tag, "")
+                del self.rels[rid]
+                self.content_types = re.sub(
+                    r'<Override\b[^>]*PartName="/xl/calcChain.xml"[^>]*/>',
+                    "",
+                    self.content_types,
+                )
+                return "xl/calcChain.xml"
+        return None
+
+    def save(self, dst_path: str, sheets: Dict[str, SheetData]) -> None:
+        """
+        sheets의 시트를 교체(동일 이름 존재 시) 또는 추가하여 dst_path로 저장
+        나머지 파트는 압축 해제 스트림 그대로 복사.
+        """
+        date_styles = (
+            self.styles.add(num_format=DATETIME_FORMAT),
+            self.styles.add(num_format=DATE_FORMAT),
+        )
+
+        replaced = {}
+        for name in sheets:
+            part = self.sheets.get(name) or self._add_sheet(name)
+            replaced[part] = sheets[name]
+
+        skip = {"xl/workbook.xml", "xl/_rels/workbook.xml.rels"}
+        skip |= {"[Content_Types].xml", "xl/styles.xml"}
+        skip |= set(replaced) | {_rels_path(p) for p in replaced}
+        calc_chain = self._drop_calc_chain()
+        if calc_chain:
+            skip.add(calc_chain)
+
+        with zipfile.ZipFile(self.src_path) as zin, zipfile.ZipFile(
+            dst_path, "w", zipfile.ZIP_DEFLATED
+        ) as zout:
+            zout.writestr("[Content_Types].xml", self.content_types)
+            for info in zin.infolist():
+                if info.filename in skip:
+                    continue
+                with zin.open(info) as src, zout.open(info.filename, "w") as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+            zout.writestr("xl/workbook.xml", self.workbook_xml)
+            zout.writestr("xl/_rels/workbook.xml.rels", self.rels_xml)
+            zout.writestr("xl/styles.xml", self.styles.xml)
+            for part, sheet in replaced.items():
+                with zout.open(part, "w") as stream:
+                    _write_sheet(stream, sheet, date_styles)
+
+
+def _unescape_attr(value: str) -> str:
+    return (
+        value.replace("&lt;", "<")
+        .replace("&gt;", ">")
+        .replace("&quot;", '"')
+        .replace("&apos;", "'")
+        .replace("&amp;", "&")
+    )
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+DN Assignment Unit Tests
+src/utils/dn_assignment.py + cross_validate_invoice_dn 할당 테스트
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import validate_domestic_with_pdf as vd
+from src.utils.dn_assignment import (
+    SCIPY_AVAILABLE,
+    assign_dns,
+    greedy_assign,
+    optimal_assign,
+    total_score,
+)
+
+# greedy는 row 0 → dn 0(0.9)을 먼저 잡아 row 1이 미매칭(총 0.9),
+# optimal은 row 0 → dn 1, row 1 → dn 0 (총 1.5)
+CROSSED = [(0.9, 0, 0), (0.8, 0, 1), (0.7, 1, 0)]
+
+
+class TestAssignment(unittest.TestCase):
+    """greedy / optimal 할당 테스트"""
+
+    def test_greedy_takes_best_pair_first(self):
+        assigned = greedy_assign(CROSSED, {0: 1, 1: 1})
+
+        self.assertEqual(assigned, {0: 0})
+        self.assertAlmostEqual(total_score(CROSSED, assigned), 0.9)
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not installed")
+    def test_optimal_beats_greedy(self):
+        assigned = optimal_assign(CROSSED, {0: 1, 1: 1})
+
+        self.assertEqual(assigned, {0: 1, 1: 0})
+        self.assertAlmostEqual(total_score(CROSSED, assigned), 1.5)
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not installed")
+    def test_capacity_two_dn(self):
+        """capacity 2인 DN은 두 row까지 할당, 세 번째는 차순위 DN"""
+        candidates = [
+            (0.9, 0, 0),
+            (0.8, 1, 0),
+            (0.7, 2, 0),
+            (0.5, 2, 1),
+        ]
+        capacity = {0: 2, 1: 1}
+
+        for mode in ("optimal", "greedy"):
+            assigned, used = assign_dns(candidates, capacity, mode)
+            self.assertEqual(used, mode)
+            self.assertEqual(assigned, {0: 0, 1: 0, 2: 1})
+            self.assertEqual(list(assigned.values()).count(0), 2)
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not installed")
+    def test_zero_capacity_dn_never_assigned(self):
+        assigned = optimal_assign(CROSSED, {0: 0, 1: 1})
+
+        self.assertEqual(assigned, {0: 1})
+
+    def test_assign_dns_greedy_mode(self):
+        assigned, used = assign_dns(CROSSED, {0: 1, 1: 1}, "greedy")
+
+        self.assertEqual(used, "greedy")
+        self.assertEqual(assigned, {0: 0})
+
+
+def _dn(name: str, origin: str, dest: str, vehicle: str) -> dict:
+    return {
+        "meta": {"filename": f"{name}.pdf", "shipment_ref_from_folder": name},
+        "header": {"parse_status": "SUCCESS"},
+        "data": {"loading_point": origin, "destination": dest, "vehicle_type": vehicle},
+    }
+
+
+class TestCrossValidateAssignment(unittest.TestCase):
+    """cross_validate_invoice_dn 할당 결과/리포트 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.invoice = str(Path(self.tmp.name) / "invoice.xlsx")
+        self.patches = [
+            patch.object(vd, "DN_DUMP_SUPPLY", False),
+            patch.object(vd, "DN_DUMP_TOPN", 0),
+            patch.dict("os.environ", {"DN_AUTO_CAPACITY_BUMP": "false"}),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    def write_items(self, rows: list) -> None:
+        pd.DataFrame(
+            rows, columns=["origin", "destination", "vehicle", "draft_usd"]
+        ).to_excel(self.invoice, sheet_name="items", index=False)
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not installed")
+    def test_optimal_gain_reported(self):
+        """row 0: DN-A 1.0 / DN-B 0.55, row 1: DN-A 0.55만 → optimal +0.1"""
+        self.write_items(
+            [
+                ["SAMSUNG MOSB", "SAMSUNG MIRFA", "FLATBED", 100],
+                ["ICAD", "SAMSUNG MIRFA", "FLATBED", 100],
+            ]
+        )
+        dns = [
+            _dn("DN-A", "MOSB", "MIRFA", "FLATBED"),
+            _dn("DN-B", "MOSB", "SHUWEIHAT", "FLATBED"),
+        ]
+
+        with patch.object(vd, "DN_ASSIGN_MODE", "optimal"):
+            result = vd.cross_validate_invoice_dn(self.invoice, dns)
+
+        assignment = result["assignment"]
+        self.assertEqual(assignment["mode"], "optimal")
+        self.assertAlmostEqual(assignment["greedy_total_score"], 1.0)
+        self.assertAlmostEqual(assignment["total_score"], 1.1)
+        self.assertAlmostEqual(assignment["score_gain"], 0.1)
+        self.assertEqual(result["dn_matched"], 2)
+        refs = [r["matched_shipment_ref"] for r in result["results"]]
+        self.assertEqual(refs, ["DN-B", "DN-A"])
+
+    def test_capacity_two_dn_matches_both_rows(self):
+        self.write_items(
+            [
+                ["SAMSUNG MOSB", "SAMSUNG MIRFA", "FLATBED", 100],
+                ["SAMSUNG MOSB", "SAMSUNG MIRFA", "FLATBED", 100],
+            ]
+        )
+        dn = _dn("DN-A", "MOSB", "MIRFA", "FLATBED")
+        dn["data"]["capacity"] = 2
+
+        result = vd.cross_validate_invoice_dn(self.invoice, [dn])
+
+        self.assertEqual(result["dn_matched"], 2)
+        self.assertAlmostEqual(result["assignment"]["score_gain"], 0.0)
+
+    def test_capacity_exhausted_reason(self):
+        self.write_items(
+            [
+                ["SAMSUNG MOSB", "SAMSUNG MIRFA", "FLATBED", 100],
+                ["SAMSUNG MOSB", "SAMSUNG MIRFA", "FLATBED", 100],
+            ]
+        )
+        result = vd.cross_validate_invoice_dn(
+            self.invoice, [_dn("DN-A", "MOSB", "MIRFA", "FLATBED")]
+        )
+
+        self.assertEqual(result["dn_matched"], 1)
+        reasons = [r["matches"].get("unmatched_reason") for r in result["results"]]
+        self.assertIn("DN_CAPACITY_EXHAUSTED", reasons)
+
+    def test_non_positive_min_score_keeps_zero_overlap_pairs(self):
+        """DN_MIN_SCORE <= 0: 토큰 미공유(0점) 쌍도 greedy 할당 대상"""
+        self.write_items([["ICAD", "RUWAIS", "LOWBED", 100]])
+        dns = [_dn("DN-A", "MOSB", "MIRFA", "FLATBED")]
+
+        with patch.object(vd, "DN_MIN_SCORE", 0.0), patch.object(
+            vd, "DN_ASSIGN_MODE", "greedy"
+        ):
+            result = vd.cross_validate_invoice_dn(self.invoice, dns)
+
+        self.assertEqual(result["dn_matched"], 1)
+        self.assertEqual(result["results"][0]["match_score"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Enhanced Matching Unit Tests
+enhanced_matching.py LaneNeighborTable 캐시 + find_matching_lane_enhanced 인덱스 재사용 테스트
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import enhanced_matching as em
+
+LANES = [
+    {"origin": "DSV MUSSAFAH", "destination": "MIRFA SITE", "vehicle": "FLATBED"},
+    {"origin": "ICAD", "destination": "SHUWEIHAT SITE", "vehicle": "LOWBED"},
+]
+
+
+class TestLaneNeighborTable(unittest.TestCase):
+    """LaneNeighborTable.load_or_build 테스트"""
+
+    def test_no_cache_path_skips_hash(self):
+        with patch.object(em.LaneNeighborTable, "compute_hash") as compute_hash:
+            table = em.LaneNeighborTable.load_or_build(LANES)
+
+        compute_hash.assert_not_called()
+        self.assertIsNone(table.lanes_hash)
+
+    def test_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "neighbors.json")
+            built = em.LaneNeighborTable.load_or_build(LANES, path)
+            loaded = em.LaneNeighborTable.load_or_build(LANES, path)
+
+        self.assertEqual(loaded.lanes_hash, em.LaneNeighborTable.compute_hash(LANES))
+        self.assertEqual(loaded.region, built.region)
+        self.assertEqual(loaded.vehicle_group, built.vehicle_group)
+
+    def test_save_failure_logged(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "missing" / "neighbors.json")
+            with self.assertLogs(em.logger, "WARNING"):
+                table = em.LaneNeighborTable.load_or_build(LANES, path)
+
+        self.assertIsNotNone(table.lanes_hash)
+
+
+class TestFindMatchingLaneIndexReuse(unittest.TestCase):
+    """레인 리스트 직접 전달 시 ApprovedLaneIndex 재사용"""
+
+    def setUp(self):
+        em._LAST_LANE_INDEX.clear()
+        self.lanes = [dict(lane) for lane in LANES]
+
+    def find(self, origin: str = "DSV MUSSAFAH") -> dict:
+        return em.find_matching_lane_enhanced(
+            origin, "MIRFA SITE", "FLATBED", "per truck", self.lanes
+        )
+
+    def test_same_list_reuses_index(self):
+        first = self.find()
+        index = em._LAST_LANE_INDEX["index"]
+        second = self.find()
+
+        self.assertIs(em._LAST_LANE_INDEX["index"], index)
+        self.assertEqual(first["match_level"], "EXACT")
+        self.assertEqual(second, first)
+
+    def test_mutated_list_rebuilds_index(self):
+        self.find()
+        index = em._LAST_LANE_INDEX["index"]
+        self.lanes.insert(
+            0, {"origin": "MOSB", "destination": "MIRFA SITE", "vehicle": "FLATBED"}
+        )
+
+        result = self.find("MOSB")
+
+        self.assertEqual(result["match_level"], "EXACT")
+        self.assertEqual(result["row_index"], 2)  # Excel 행 (헤더 + 1-based)
+        self.assertIsNot(em._LAST_LANE_INDEX["index"], index)
+
+
+if __name__ == "__main__":
+    unittest.main()
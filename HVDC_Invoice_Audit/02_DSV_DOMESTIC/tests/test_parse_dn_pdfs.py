@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+DN PDF Parallel Parsing Unit Tests
+parse_dn_pdfs 프로세스 풀 (순서 유지 / timeout / 워커 비정상 종료) 테스트
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import validate_domestic_with_pdf as vd
+
+
+class StubParser:
+    """파일명 접두어로 동작을 정하는 DSVPDFParser 대역 (pickle 가능)"""
+
+    def parse_pdf(self, pdf_path: str, doc_type: str = "DN") -> dict:
+        name = Path(pdf_path).name
+        if name.startswith("hang"):
+            time.sleep(60)
+        elif name.startswith("crash"):
+            os._exit(1)
+        elif name.startswith("slow"):
+            time.sleep(0.3)
+        return {
+            "header": {"doc_type": doc_type, "parse_status": "SUCCESS"},
+            "raw_text": f"stub {name}",
+            "data": {"loading_point": name},
+        }
+
+
+def _pdf_infos(names: list) -> list:
+    return [
+        {
+            "pdf_path": f"/nonexistent/{name}",
+            "filename": name,
+            "folder": "stub",
+            "shipment_ref": f"REF-{i}",
+        }
+        for i, name in enumerate(names)
+    ]
+
+
+class TestParseDnPdfs(unittest.TestCase):
+    """parse_dn_pdfs 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.report = str(Path(self.tmp.name) / "reports" / "dn_ingest_report.json")
+        self.patches = [
+            patch.object(vd, "HYBRID_INTEGRATION_AVAILABLE", False),
+            patch.object(vd, "DN_INGEST_REPORT_PATH", ""),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    def parse(self, names: list, workers: int, timeout: float = 30.0) -> list:
+        return vd.parse_dn_pdfs(
+            _pdf_infos(names),
+            StubParser(),
+            workers=workers,
+            timeout=timeout,
+            report_path=self.report,
+        )
+
+    def report_json(self) -> dict:
+        with open(self.report, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_parallel_results_keep_input_order(self):
+        names = ["slow_0.pdf", "a_1.pdf", "slow_2.pdf", "b_3.pdf", "c_4.pdf"]
+        results = self.parse(names, workers=3)
+
+        self.assertEqual([r["meta"]["filename"] for r in results], names)
+        self.assertTrue(all(r["header"]["parse_status"] == "SUCCESS" for r in results))
+        report = self.report_json()
+        self.assertEqual(report["success"], 5)
+        self.assertEqual(report["routes"]["parser"], 5)
+
+    def test_sequential_matches_parallel(self):
+        names = ["slow_0.pdf", "a_1.pdf", "b_2.pdf"]
+        sequential = self.parse(names, workers=1)
+        parallel = self.parse(names, workers=2)
+
+        self.assertEqual(sequential, parallel)
+
+    def test_timeout_marks_only_hung_file(self):
+        names = ["a_0.pdf", "hang_1.pdf", "b_2.pdf", "c_3.pdf"]
+        start = time.monotonic()
+        results = self.parse(names, workers=2, timeout=1.0)
+
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertEqual([r["meta"]["filename"] for r in results], names)
+        self.assertEqual(results[1]["header"]["parse_status"], "FAILED")
+        self.assertTrue(results[1]["header"]["error"].startswith("TIMEOUT"))
+        for i in (0, 2, 3):
+            self.assertEqual(results[i]["header"]["parse_status"], "SUCCESS")
+        self.assertEqual(self.report_json()["routes"]["timeout"], 1)
+
+    def test_worker_crash_fails_only_crashing_file(self):
+        names = ["a_0.pdf", "crash_1.pdf", "slow_2.pdf", "b_3.pdf"]
+        results = self.parse(names, workers=2)
+
+        self.assertEqual([r["meta"]["filename"] for r in results], names)
+        self.assertEqual(results[1]["header"]["parse_status"], "FAILED")
+        self.assertTrue(results[1]["header"]["error"].startswith("WORKER_ERROR"))
+        for i in (0, 2, 3):
+            self.assertEqual(results[i]["header"]["parse_status"], "SUCCESS")
+        report = self.report_json()
+        self.assertEqual(report["success"], 3)
+        self.assertEqual(report["routes"]["failed"], 1)
+
+    def test_report_not_written_without_path(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            vd.parse_dn_pdfs(_pdf_infos(["a_0.pdf"]), StubParser(), workers=1)
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+XLSX Merge Unit Tests
+src/utils/xlsx_merge.py WorkbookMerger + add_pdf_validation_to_excel 저장 경로 테스트
+"""
+
+import datetime as dt
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import openpyxl
+import pandas as pd
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import validate_domestic_with_pdf as vd
+from src.utils.xlsx_merge import SheetData, WorkbookMerger
+
+SHEETS = ["items", "comparison", "patterns_applied", "ApprovedLaneMap"]
+MONEY = '"$"#,##0.00'
+
+
+def _build_source(path: str) -> None:
+    """Enhanced Matching 결과와 같은 시트 구성의 원본 워크북 (openpyxl)"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "items"
+    ws.append(["origin", "destination", "vehicle", "unit", "draft_usd", "ref_adj"])
+    ws.append(["DSV MUSSAFAH", "MIRFA SITE", "FLATBED", "per truck", 1200.5, 1100.0])
+    ws.append(["SAMSUNG MOSB", "SHUWEIHAT SITE", "LOWBED", "per truck", 900, None])
+    ws.append(["ICAD", "MIRFA SITE", "FLATBED", "per truck", 800, 750.25])
+
+    ws = wb.create_sheet("comparison")
+    ws.append(["invoice_date", "amount", "ratio", "note"])
+    ws.append([dt.datetime(2025, 9, 14, 8, 30), 1234567.891, 0.125, "first"])
+    ws.append([dt.datetime(2025, 9, 15), -42.5, 0.5, "second"])
+    for row in ws.iter_rows(min_row=2):
+        row[0].number_format = "DD/MM/YYYY HH:MM"
+        row[1].number_format = "#,##0.00"
+        row[2].number_format = "0.0%"
+
+    ws = wb.create_sheet("patterns_applied")
+    ws.append(["pattern", "count"])
+    ws.append(["region", 14])
+
+    ws = wb.create_sheet("ApprovedLaneMap")
+    ws.append(["origin", "destination", "vehicle", "unit", "rate_usd"])
+    ws.append(["DSV MUSSAFAH", "MIRFA SITE", "FLATBED", "per truck", 1100.0])
+    ws.append(["ICAD", "MIRFA SITE", "FLATBED", "per truck", 750.25])
+    wb.save(path)
+
+
+class TestWorkbookMerger(unittest.TestCase):
+    """WorkbookMerger 시트 교체/추가 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = str(Path(self.tmp.name) / "source.xlsx")
+        self.dst = str(Path(self.tmp.name) / "merged.xlsx")
+        _build_source(self.src)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def merge(self) -> openpyxl.Workbook:
+        items = pd.DataFrame(
+            {
+                "origin": ["DSV MUSSAFAH", "ICAD"],
+                "ref_adj": [1100.0, 750.25],
+                "count": [3, 7],
+                "flag": [True, False],
+                "invoice_date": [dt.date(2025, 9, 14), dt.date(2025, 9, 30)],
+                "loaded_at": pd.to_datetime(["2025-09-14 08:30", "2025-09-30 17:45"]),
+                "note": ["  padded", None],
+            }
+        )
+        merger = WorkbookMerger(self.src)
+        header = merger.styles.add(bold=True, bg_color="#D7E4BC", border=True)
+        money = merger.styles.add(num_format=MONEY)
+        money_link = merger.styles.add(
+            underline=True, font_color="blue", num_format=MONEY
+        )
+        merger.save(
+            self.dst,
+            {
+                "items": SheetData(
+                    items,
+                    header_style=header,
+                    column_styles={1: money},
+                    cell_styles={(0, 1): money_link},
+                    hyperlinks={(0, 1): "ApprovedLaneMap!A2"},
+                ),
+                "DN_Validation": SheetData(
+                    pd.DataFrame({"invoice_index": [0, 1], "dn_found": [True, False]}),
+                    header_style=header,
+                ),
+            },
+        )
+        return openpyxl.load_workbook(self.dst)
+
+    def test_sheet_order_and_names_preserved(self):
+        wb = self.merge()
+
+        self.assertEqual(wb.sheetnames, SHEETS + ["DN_Validation"])
+
+    def test_untouched_sheet_values_and_formats_preserved(self):
+        wb = self.merge()
+        src = openpyxl.load_workbook(self.src)
+
+        for name in ("comparison", "patterns_applied", "ApprovedLaneMap"):
+            got = [[c.value for c in row] for row in wb[name].iter_rows()]
+            want = [[c.value for c in row] for row in src[name].iter_rows()]
+            self.assertEqual(got, want, name)
+
+        ws = wb["comparison"]
+        self.assertEqual(ws["A2"].value, dt.datetime(2025, 9, 14, 8, 30))
+        self.assertEqual(ws["A2"].number_format, "DD/MM/YYYY HH:MM")
+        self.assertEqual(ws["B2"].number_format, "#,##0.00")
+        self.assertEqual(ws["C3"].number_format, "0.0%")
+
+    def test_replaced_sheet_values_formats_and_hyperlink(self):
+        ws = self.merge()["items"]
+
+        self.assertEqual(
+            [c.value for c in ws[1]],
+            ["origin", "ref_adj", "count", "flag", "invoice_date", "loaded_at", "note"],
+        )
+        self.assertTrue(ws["A1"].font.b)
+        self.assertEqual(ws["B2"].value, 1100.0)
+        self.assertEqual(ws["B2"].number_format, MONEY)
+        self.assertEqual(ws["B2"].hyperlink.location, "ApprovedLaneMap!A2")
+        self.assertTrue(ws["B2"].font.u)
+        self.assertEqual(ws["B3"].number_format, MONEY)
+        self.assertIsNone(ws["B3"].hyperlink)
+        self.assertEqual(ws["C3"].value, 7)
+        self.assertIs(ws["D2"].value, True)
+        self.assertEqual(ws["E2"].value, dt.datetime(2025, 9, 14))
+        self.assertEqual(ws["E2"].number_format, "YYYY-MM-DD")
+        self.assertEqual(ws["F3"].value, dt.datetime(2025, 9, 30, 17, 45))
+        self.assertEqual(ws["F3"].number_format, "YYYY-MM-DD HH:MM:SS")
+        self.assertEqual(ws["G2"].value, "  padded")
+        self.assertIsNone(ws["G3"].value)
+
+    def test_added_sheet(self):
+        ws = self.merge()["DN_Validation"]
+
+        self.assertEqual(
+            [[c.value for c in row] for row in ws.iter_rows()],
+            [["invoice_index", "dn_found"], [0, True], [1, False]],
+        )
+
+
+class TestAddPdfValidationToExcel(unittest.TestCase):
+    """스트리밍 병합 vs XLSX_MERGE_STREAMING=false 전체 재작성 결과 비교"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = str(Path(self.tmp.name) / "enhanced.xlsx")
+        _build_source(self.src)
+        self.result = {
+            "results": [
+                {
+                    "invoice_index": i,
+                    "dn_found": i == 0,
+                    "matched_shipment_ref": "HVDC-ADOPT-SCT-0126" if i == 0 else "",
+                    "match_score": 0.9 if i == 0 else 0.0,
+                    "matches": {"validation_status": "PASS"} if i == 0 else {},
+                    "issues": [],
+                }
+                for i in range(3)
+            ]
+        }
+        self.patches = [
+            patch.object(vd, "LANE_NEIGHBOR_CACHE_ENABLED", True),
+            patch.object(vd, "LANE_NEIGHBOR_CACHE", ""),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    def write(self, streaming: bool) -> str:
+        out = str(Path(self.tmp.name) / f"out_{streaming}.xlsx")
+        with patch.object(vd, "XLSX_MERGE_STREAMING", streaming):
+            vd.add_pdf_validation_to_excel(self.src, self.result, out)
+        return out
+
+    def test_streaming_matches_full_rewrite(self):
+        streamed = self.write(True)
+        full = self.write(False)
+
+        got = pd.read_excel(streamed, sheet_name=None)
+        want = pd.read_excel(full, sheet_name=None)
+        self.assertEqual(list(got), SHEETS + ["DN_Validation"])
+        self.assertEqual(list(got), list(want))
+        for name in want:
+            pd.testing.assert_frame_equal(got[name], want[name], check_dtype=False)
+
+    def test_neighbor_cache_defaults_to_output_folder(self):
+        out_dir = Path(self.tmp.name) / "out"
+        out_dir.mkdir()
+        vd.add_pdf_validation_to_excel(self.src, self.result, str(out_dir / "o.xlsx"))
+
+        self.assertTrue((out_dir / "lane_neighbor_table.json").exists())
+        self.assertFalse(Path("lane_neighbor_table.json").exists())
+
+    def test_ref_adj_hyperlinks_in_both_modes(self):
+        for streaming in (True, False):
+            ws = openpyxl.load_workbook(self.write(streaming))["items"]
+            col = [c.value for c in ws[1]].index("ref_adj") + 1
+            links = {
+                r: ws.cell(r, col).hyperlink.location
+                for r in range(2, ws.max_row + 1)
+                if ws.cell(r, col).hyperlink is not None
+            }
+
+            self.assertEqual(
+                links, {2: "ApprovedLaneMap!A2", 4: "ApprovedLaneMap!A3"}, streaming
+            )
+            self.assertEqual(ws.cell(2, col).value, 1100.0)
+            self.assertEqual(ws.cell(2, col).number_format, MONEY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,6 +20,7 @@ import pandas as pd
 import json
 from datetime import datetime
 import re
+import time
 
 # NEW: normalization & pdf-field utils
 from src.utils.utils_normalize import normalize_location, token_set_jaccard
@@ -31,6 +32,8 @@ from src.utils.dn_capacity import (
     apply_capacity_overrides,
     auto_capacity_bump,
 )
+from src.utils.dn_assignment import assign_dns, greedy_assign, total_score
+from src.utils.xlsx_merge import SheetData, WorkbookMerger
 
 # DN 매칭 임계값 (환경변수로 조정 가능)
 ORIGIN_THR: float = float(os.getenv("DN_ORIGIN_THR", "0.27"))
@@ -46,8 +49,13 @@ USE_PDF_FIELDS_FIRST: bool = (
 DN_CAPACITY_DEFAULT: int = int(os.getenv("DN_CAPACITY_DEFAULT", "1"))
 
 # 매칭 스코어(원/목/차 가중합) 최소 허용치
+# 0 이하이면 토큰이 겹치지 않는 0점 쌍도 후보가 되어 전체 DN을 채점한다.
+# (greedy는 0점 쌍도 할당, optimal은 총점에 기여하지 않는 0점 쌍은 할당하지 않음)
 DN_MIN_SCORE: float = float(os.getenv("DN_MIN_SCORE", "0.40"))
 
+# DN 할당 방식: optimal(총점 최대, scipy 필요) | greedy(기존 전역 그리디, 롤백용)
+DN_ASSIGN_MODE: str = os.getenv("DN_ASSIGN_MODE", "optimal").lower()
+
 # TopN 후보 덤프
 DN_DUMP_TOPN: int = int(os.getenv("DN_DUMP_TOPN", "0"))  # 0이면 비활성
 DN_DUMP_PATH: str = os.getenv("DN_DUMP_PATH", "dn_candidate_dump.csv")
@@ -56,6 +64,26 @@ DN_DUMP_PATH: str = os.getenv("DN_DUMP_PATH", "dn_candidate_dump.csv")
 DN_DUMP_SUPPLY: bool = os.getenv("DN_DUMP_SUPPLY", "true").lower() == "true"
 DN_DUMP_SUPPLY_PATH: str = os.getenv("DN_DUMP_SUPPLY_PATH", "dn_supply_demand.csv")
 
+# DN PDF 병렬 파싱: 워커 프로세스 수(1이면 순차), 파일당 제한 시간(초)
+DN_PARSE_WORKERS: int = int(
+    os.getenv("DN_PARSE_WORKERS", str(min(8, os.cpu_count() or 1)))
+)
+DN_PARSE_TIMEOUT: float = float(os.getenv("DN_PARSE_TIMEOUT", "120"))
+
+# 파싱 진행/처리량 리포트 저장 (경로 미지정 시 main()의 리포트 출력 폴더)
+DN_INGEST_REPORT: bool = os.getenv("DN_INGEST_REPORT", "true").lower() == "true"
+DN_INGEST_REPORT_PATH: str = os.getenv("DN_INGEST_REPORT_PATH", "")
+
+# ApprovedLaneMap 권역/차량그룹 이웃 테이블 캐시 (레인 해시 변경 시 자동 재구축)
+# 경로 미지정 시 출력 Excel 폴더의 lane_neighbor_table.json
+LANE_NEIGHBOR_CACHE_ENABLED: bool = (
+    os.getenv("LANE_NEIGHBOR_CACHE_ENABLED", "true").lower() == "true"
+)
+LANE_NEIGHBOR_CACHE: str = os.getenv("LANE_NEIGHBOR_CACHE", "")
+
+# Step 4 Excel 저장: 원본 시트 파트 복사 + 변경 시트만 스트리밍 기록 (false면 전체 재작성)
+XLSX_MERGE_STREAMING: bool = os.getenv("XLSX_MERGE_STREAMING", "true").lower() == "true"
+
 
 # PDF 파서 시스템 import
 sys.path.append(str(Path(__file__).parent.parent.parent / "PDF"))
@@ -146,149 +174,360 @@ def extract_shipment_ref(folder_name: str) -> str:
     return folder_name.strip()
 
 
-def parse_dn_pdfs(pdf_files: list, parser: DSVPDFParser) -> list:
-    """
-    DN PDF 파일들을 파싱
+def _failed_dn_result(pdf_info: dict, error: str) -> dict:
+    """파싱 실패 DN 결과 (cross-validation에서 제외됨)"""
+    return {
+        "header": {
+            "doc_type": "DN",
+            "parse_status": "FAILED",
+            "error": error,
+        },
+        "meta": pdf_info,
+        "data": {},
+    }
 
-    Args:
-        pdf_files: scan_supporting_documents 결과
-        parser: DSVPDFParser 인스턴스
+
+def _parse_single_dn(pdf_info: dict, parser, hybrid_integration=None) -> tuple:
+    """
+    DN PDF 1건 파싱 (Hybrid → DSVPDFParser → 텍스트 폴백 체인)
 
     Returns:
-        list of dicts: 파싱 결과
+        tuple: (결과 dict, 사용 경로 "hybrid" | "parser" | "failed")
     """
-    parsed_results = []
+    try:
+        # Try hybrid parsing first
+        if hybrid_integration:
+            try:
+                hybrid_result = hybrid_integration.parse_dn_with_routing(
+                    pdf_info["pdf_path"],
+                    shipment_ref=pdf_info.get("shipment_ref", ""),
+                )
+
+                # Convert to DSVPDFParser-compatible format
+                result = {
+                    "header": {
+                        "doc_type": "DN",
+                        "parse_status": "SUCCESS",
+                        "file_path": hybrid_result["file_path"],
+                    },
+                    "raw_text": hybrid_result.get("text", ""),
+                    "data": {
+                        "loading_point": hybrid_result.get("origin", ""),
+                        "destination": hybrid_result.get("destination", ""),
+                        "vehicle_type": hybrid_result.get("vehicle_type", ""),
+                        "waybill_no": hybrid_result.get("do_number", ""),
+                        "destination_code": hybrid_result.get("destination_code", ""),
+                        "capacity": DN_CAPACITY_DEFAULT,
+                    },
+                    "meta": {
+                        "folder": pdf_info["folder"],
+                        "filename": pdf_info["filename"],
+                        "shipment_ref_from_folder": pdf_info["shipment_ref"],
+                        "routing_metadata": hybrid_result.get("routing_metadata", {}),
+                    },
+                }
+                return result, "hybrid"
+
+            except Exception:
+                pass  # Fall through to existing DSVPDFParser logic below
+
+        # PDF 파싱
+        result = parser.parse_pdf(
+            pdf_path=pdf_info["pdf_path"], doc_type="DN"  # Delivery Note
+        )
+
+        # --- [FIX-1] raw_text 누락 시 폴백 텍스트 추출 ---
+        raw_text = result.get("raw_text") or result.get("text", "")
+        if not raw_text:
+            try:
+                raw_text = extract_text_any(pdf_info["pdf_path"])
+            except Exception:
+                raw_text = ""
+            if raw_text:
+                result["raw_text"] = raw_text  # 디버깅/재사용 목적
+
+        # PDF 본문에서 핵심 필드 추출 → dn_data에 직접 덮어쓰기 ⭐
+        fields = extract_from_pdf_text(raw_text)
+        dn_data = result.get("data", {})
+        if dn_data is None:
+            dn_data = {}
+
+        if fields.get("dest_code"):
+            dn_data["destination_code"] = fields["dest_code"]
+        if fields.get("destination"):
+            dn_data["destination"] = fields["destination"]
+        if fields.get("loading_point"):
+            dn_data["loading_point"] = fields["loading_point"]
+        if fields.get("waybill"):
+            dn_data["waybill_no"] = dn_data.get("waybill_no") or fields["waybill"]
+
+        # DN 용량(기본 1). 필요시 dn_data["capacity"]로 오버라이드 가능
+        if "capacity" not in dn_data:
+            dn_data["capacity"] = DN_CAPACITY_DEFAULT
+
+        result["data"] = dn_data
+
+        # 결과에 메타데이터 추가
+        result["meta"] = {
+            "folder": pdf_info["folder"],
+            "filename": pdf_info["filename"],
+            "shipment_ref_from_folder": pdf_info["shipment_ref"],
+        }
+        return result, "parser"
 
-    # Initialize hybrid integration if available
-    hybrid_integration = None
-    if HYBRID_INTEGRATION_AVAILABLE:
+    except Exception as e:
+        return _failed_dn_result(pdf_info, str(e)), "failed"
+
+
+# 워커 프로세스별 파서/Hybrid 인스턴스 (initializer에서 1회 생성)
+_DN_WORKER_STATE: dict = {}
+
+
+def _init_dn_worker(parser, use_hybrid: bool, pid_queue=None) -> None:
+    """DN 파싱 워커 초기화: 프로세스당 파서·Hybrid 라우터 1회 준비"""
+    if pid_queue is not None:
+        pid_queue.put(os.getpid())  # 풀 소유자가 멈춘 워커를 종료할 수 있도록
+    _DN_WORKER_STATE["parser"] = parser
+    _DN_WORKER_STATE["hybrid"] = None
+    if use_hybrid:
         try:
-            hybrid_integration = create_domestic_hybrid_integration(log_level="INFO")
-            print("[HYBRID] Using Hybrid Docling/ADE routing for DN parsing...")
-        except Exception as e:
-            print(f"[WARN] Hybrid integration init failed: {e}")
-            hybrid_integration = None
+            _DN_WORKER_STATE["hybrid"] = create_domestic_hybrid_integration(
+                log_level="WARNING"
+            )
+        except Exception:
+            pass
 
-    print(f"\nDN PDF parsing started... (Total: {len(pdf_files)})")
 
-    for i, pdf_info in enumerate(pdf_files, 1):
+def _dn_worker(index: int, pdf_info: dict) -> tuple:
+    """워커에서 DN 1건 폴백 체인 실행 → (index, 결과, 경로, 소요초)"""
+    start = time.perf_counter()
+    result, route = _parse_single_dn(
+        pdf_info, _DN_WORKER_STATE.get("parser"), _DN_WORKER_STATE.get("hybrid")
+    )
+    return index, result, route, time.perf_counter() - start
+
+
+def _terminate_pool(executor, pid_queue) -> None:
+    """
+    멈춘 워커를 포함해 프로세스 풀 강제 종료
+
+    워커 PID는 _init_dn_worker가 pid_queue로 보고한 값만 사용
+    (executor 내부 속성에 의존하지 않음).
+    """
+    import queue
+    import signal
+
+    executor.shutdown(wait=False, cancel_futures=True)
+    while True:
+        try:
+            pid = pid_queue.get_nowait()
+        except queue.Empty:
+            break
         try:
-            print(f"  [{i}/{len(pdf_files)}] {pdf_info['filename']}", end=" ... ")
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass  # 이미 종료된 워커
+    pid_queue.close()
 
-            # Try hybrid parsing first
-            if hybrid_integration:
-                try:
-                    hybrid_result = hybrid_integration.parse_dn_with_routing(
-                        pdf_info["pdf_path"],
-                        shipment_ref=pdf_info.get("shipment_ref", ""),
-                    )
 
-                    # Convert to DSVPDFParser-compatible format
-                    result = {
-                        "header": {
-                            "doc_type": "DN",
-                            "parse_status": "SUCCESS",
-                            "file_path": hybrid_result["file_path"],
-                        },
-                        "raw_text": hybrid_result.get("text", ""),
-                        "data": {
-                            "loading_point": hybrid_result.get("origin", ""),
-                            "destination": hybrid_result.get("destination", ""),
-                            "vehicle_type": hybrid_result.get("vehicle_type", ""),
-                            "waybill_no": hybrid_result.get("do_number", ""),
-                            "destination_code": hybrid_result.get(
-                                "destination_code", ""
-                            ),
-                            "capacity": DN_CAPACITY_DEFAULT,
-                        },
-                        "meta": {
-                            "folder": pdf_info["folder"],
-                            "filename": pdf_info["filename"],
-                            "shipment_ref_from_folder": pdf_info["shipment_ref"],
-                            "routing_metadata": hybrid_result.get(
-                                "routing_metadata", {}
-                            ),
-                        },
-                    }
+def _parse_dn_pdfs_parallel(
+    pdf_files: list, parser, workers: int, timeout: float, on_done
+) -> None:
+    """
+    프로세스 풀 DN 파싱 (동시 제출 수 = workers 로 큐 제한)
 
-                    parsed_results.append(result)
-                    print("[OK] (hybrid)")
-                    continue  # Skip to next file
+    - 파일당 timeout 초 초과 시 TIMEOUT 실패로 기록하고 풀을 재생성,
+      진행 중이던 나머지 파일은 새 풀에 다시 제출
+    - 워커 비정상 종료(BrokenProcessPool) 시 함께 실행 중이던 파일은
+      단독으로 재시도하여 원인 파일만 실패 처리
+    """
+    import multiprocessing
+    from collections import deque
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    def new_pool():
+        pid_queue = multiprocessing.Queue()
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_dn_worker,
+            initargs=(parser, HYBRID_INTEGRATION_AVAILABLE, pid_queue),
+        )
+        return executor, pid_queue
 
-                except Exception as hybrid_error:
-                    print(f"[FALLBACK]", end=" ... ")
-                    # Fall through to existing DSVPDFParser logic below
+    pending = deque(range(len(pdf_files)))
+    suspects = deque()  # 워커 비정상 종료 시 실행 중이던 파일 (단독 재시도)
+    inflight = {}  # future -> (index, deadline)
+    solo = False  # suspect 단독 실행 중 여부
+    executor, pid_queue = new_pool()
+    try:
+        while pending or suspects or inflight:
+            if not inflight and suspects:
+                idx = suspects.popleft()
+                inflight[executor.submit(_dn_worker, idx, pdf_files[idx])] = (
+                    idx,
+                    time.monotonic() + timeout,
+                )
+                solo = True
+            while not solo and pending and len(inflight) < workers:
+                idx = pending.popleft()
+                inflight[executor.submit(_dn_worker, idx, pdf_files[idx])] = (
+                    idx,
+                    time.monotonic() + timeout,
+                )
 
-            # PDF 파싱
-            result = parser.parse_pdf(
-                pdf_path=pdf_info["pdf_path"], doc_type="DN"  # Delivery Note
+            next_deadline = min(deadline for _, deadline in inflight.values())
+            done, _ = wait(
+                list(inflight),
+                timeout=max(0.0, next_deadline - time.monotonic()),
+                return_when=FIRST_COMPLETED,
             )
 
-            # --- [FIX-1] raw_text 누락 시 폴백 텍스트 추출 ---
-            raw_text = result.get("raw_text") or result.get("text", "")
-            if not raw_text:
+            broken = False
+            for future in done:
+                idx, _ = inflight.pop(future)
                 try:
-                    raw_text = extract_text_any(pdf_info["pdf_path"])
-                except Exception:
-                    raw_text = ""
-                if raw_text:
-                    result["raw_text"] = raw_text  # 디버깅/재사용 목적
-
-            # PDF 본문에서 핵심 필드 추출 → dn_data에 직접 덮어쓰기 ⭐
-            fields = extract_from_pdf_text(raw_text)
-            dn_data = result.get("data", {})
-            if dn_data is None:
-                dn_data = {}
-
-            if fields.get("dest_code"):
-                dn_data["destination_code"] = fields["dest_code"]
-            if fields.get("destination"):
-                dn_data["destination"] = fields["destination"]
-            if fields.get("loading_point"):
-                dn_data["loading_point"] = fields["loading_point"]
-            if fields.get("waybill"):
-                dn_data["waybill_no"] = dn_data.get("waybill_no") or fields["waybill"]
-
-            # DN 용량(기본 1). 필요시 dn_data["capacity"]로 오버라이드 가능
-            if "capacity" not in dn_data:
-                dn_data["capacity"] = DN_CAPACITY_DEFAULT
-
-            result["data"] = dn_data
-
-            # 결과에 메타데이터 추가
-            result["meta"] = {
-                "folder": pdf_info["folder"],
-                "filename": pdf_info["filename"],
-                "shipment_ref_from_folder": pdf_info["shipment_ref"],
-            }
+                    _, result, route, elapsed = future.result()
+                except Exception as e:  # BrokenProcessPool 등 워커 비정상 종료
+                    broken = True
+                    if not solo:
+                        suspects.append(idx)
+                        continue
+                    result = _failed_dn_result(pdf_files[idx], f"WORKER_ERROR: {e}")
+                    route, elapsed = "failed", 0.0
+                on_done(idx, result, route, elapsed)
+
+            now = time.monotonic()
+            expired = [f for f, (_, dl) in inflight.items() if dl <= now]
+            if not inflight:
+                solo = False
+            if not expired and not broken:
+                continue
 
-            parsed_results.append(result)
-            print("✅")
+            for future in expired:
+                idx, _ = inflight.pop(future)
+                result = _failed_dn_result(
+                    pdf_files[idx], f"TIMEOUT: {timeout:.0f}s 초과"
+                )
+                on_done(idx, result, "timeout", timeout)
+
+            # 멈춘/깨진 워커 정리 후 진행 중이던 파일 재제출
+            for idx, _ in sorted(inflight.values(), reverse=True):
+                (suspects if broken else pending).appendleft(idx)
+            inflight.clear()
+            solo = False
+            _terminate_pool(executor, pid_queue)
+            executor, pid_queue = new_pool()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        pid_queue.close()
+
+
+def parse_dn_pdfs(
+    pdf_files: list,
+    parser: DSVPDFParser,
+    workers: int = None,
+    timeout: float = None,
+    report_path: str = None,
+) -> list:
+    """
+    DN PDF 파일들을 파싱 (프로세스 풀 병렬, 입력 순서 유지)
 
-        except Exception as e:
-            print(f"❌ {str(e)[:50]}")
-            parsed_results.append(
-                {
-                    "header": {
-                        "doc_type": "DN",
-                        "parse_status": "FAILED",
-                        "error": str(e),
-                    },
-                    "meta": pdf_info,
-                    "data": {},
-                }
-            )
+    Args:
+        pdf_files: scan_supporting_documents 결과
+        parser: DSVPDFParser 인스턴스
+        workers: 워커 프로세스 수 (기본 DN_PARSE_WORKERS, 1 이하면 순차)
+        timeout: 파일당 제한 시간(초, 기본 DN_PARSE_TIMEOUT; 병렬 모드에서 적용)
+        report_path: 파싱 리포트 JSON 경로 (기본 DN_INGEST_REPORT_PATH,
+            둘 다 비어 있으면 저장하지 않음)
 
-    success_count = sum(
-        1 for r in parsed_results if r["header"].get("parse_status") != "FAILED"
+    Returns:
+        list of dicts: 파싱 결과 (pdf_files와 동일 순서)
+    """
+    workers = DN_PARSE_WORKERS if workers is None else workers
+    timeout = DN_PARSE_TIMEOUT if timeout is None else timeout
+    workers = max(1, min(workers, len(pdf_files)))
+
+    total = len(pdf_files)
+    parsed_results = [None] * total
+    routes = {"hybrid": 0, "parser": 0, "failed": 0, "timeout": 0}
+    durations = []
+    start = time.perf_counter()
+
+    def on_done(idx, result, route, elapsed):
+        parsed_results[idx] = result
+        routes[route] = routes.get(route, 0) + 1
+        durations.append((elapsed, pdf_files[idx]["filename"]))
+        done = len(durations)
+        rate = done / max(time.perf_counter() - start, 1e-9)
+        mark = {"hybrid": "[OK] (hybrid)", "parser": "✅"}.get(route)
+        if mark is None:
+            mark = f"❌ {result['header'].get('error', '')[:50]}"
+        print(
+            f"  [{done}/{total}] {pdf_files[idx]['filename']} ... {mark}"
+            f"  ({elapsed:.1f}s, {rate:.2f} files/s)"
+        )
+
+    print(f"\nDN PDF parsing started... (Total: {total}, workers: {workers})")
+
+    if workers > 1:
+        _parse_dn_pdfs_parallel(pdf_files, parser, workers, timeout, on_done)
+    else:
+        # Initialize hybrid integration if available
+        hybrid_integration = None
+        if HYBRID_INTEGRATION_AVAILABLE:
+            try:
+                hybrid_integration = create_domestic_hybrid_integration(
+                    log_level="INFO"
+                )
+                print("[HYBRID] Using Hybrid Docling/ADE routing for DN parsing...")
+            except Exception as e:
+                print(f"[WARN] Hybrid integration init failed: {e}")
+                hybrid_integration = None
+
+        for idx, pdf_info in enumerate(pdf_files):
+            t0 = time.perf_counter()
+            result, route = _parse_single_dn(pdf_info, parser, hybrid_integration)
+            on_done(idx, result, route, time.perf_counter() - t0)
+
+        # Print hybrid routing statistics
+        if hybrid_integration:
+            hybrid_integration.print_summary()
+
+    elapsed_total = time.perf_counter() - start
+    success_count = routes["hybrid"] + routes["parser"]
+    report = {
+        "total": total,
+        "success": success_count,
+        "failed": total - success_count,
+        "routes": routes,
+        "workers": workers,
+        "timeout_sec": timeout,
+        "elapsed_sec": round(elapsed_total, 3),
+        "files_per_sec": round(total / elapsed_total, 3) if elapsed_total else 0.0,
+        "slowest": [
+            {"filename": name, "sec": round(sec, 3)}
+            for sec, name in sorted(durations, reverse=True)[:5]
+        ],
+    }
+    print(
+        f"\n[DONE] Parsing complete: {success_count}/{total} success "
+        f"({success_count/total*100 if total else 0:.1f}%) "
+        f"in {elapsed_total:.1f}s ({report['files_per_sec']:.2f} files/s)"
     )
     print(
-        f"\n[DONE] Parsing complete: {success_count}/{len(pdf_files)} success ({success_count/len(pdf_files)*100:.1f}%)"
+        f"  routes: hybrid={routes['hybrid']} parser={routes['parser']} "
+        f"failed={routes['failed']} timeout={routes['timeout']}"
     )
 
-    # Print hybrid routing statistics
-    if hybrid_integration:
-        hybrid_integration.print_summary()
+    report_path = report_path or DN_INGEST_REPORT_PATH
+    if DN_INGEST_REPORT and report_path:
+        try:
+            Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"  📊 파싱 리포트 저장: {report_path}")
+        except Exception as e:
+            print(f"  ⚠️  파싱 리포트 저장 실패: {e}")
 
     return parsed_results
 
@@ -564,11 +803,87 @@ def extract_locations_from_description(description: str) -> tuple:
     return ("", "")
 
 
+def _location_tokens(value) -> frozenset:
+    """normalize_location 후 토큰 세트 (token_set_jaccard와 동일한 분해)"""
+    return frozenset(normalize_location(value).split()) if value else frozenset()
+
+
+def _token_jaccard(a: frozenset, b: frozenset) -> float:
+    """사전 토큰화된 세트 간 자카드 (token_set_jaccard와 동일 결과)"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _dn_match_features(dn: dict) -> dict:
+    """
+    DN 1건의 매칭용 필드를 한 번만 추출 (본문 우선, 파일명 폴백)
+
+    dn_data["loading_point"]/["destination"]는 parse 단계에서 주입된 PDF 본문 값.
+    """
+    dn_data = dn.get("data", {}) or {}
+    fn = dn.get("meta", {}).get("filename", "")
+
+    o_guess, d_guess = extract_route_from_filename(fn)
+    dn_origin = dn_data.get("loading_point") or o_guess
+    dn_dest = dn_data.get("destination") or d_guess
+
+    dn_origin = expand_location_abbrev(dn_origin) if dn_origin else ""
+    dn_dest = expand_location_abbrev(dn_dest) if dn_dest else ""
+    dn_vehicle = extract_vehicle_from_dn(dn_data)
+
+    return {
+        "dn_origin_extracted": dn_origin,
+        "dn_dest_extracted": dn_dest,
+        "dn_vehicle_extracted": dn_vehicle,
+        "dn_dest_code": extract_destination_code_from_dn(dn_data),
+        "dn_do_number": extract_do_number_from_dn(dn_data),
+        "truck_type": dn_data.get("truck_type", ""),
+        "driver": dn_data.get("driver_name", ""),
+        "routing_metadata": dn.get("meta", {}).get("routing_metadata", {}),
+        "tokens": (
+            _location_tokens(dn_origin),
+            _location_tokens(dn_dest),
+            _location_tokens(dn_vehicle),
+        ),
+    }
+
+
+def _dn_match_info(features: dict, s_o: float, s_d: float, s_v: float) -> dict:
+    """유사도 → 상태 판정 + 출력용 매칭 정보"""
+    origin_ok = s_o >= ORIGIN_THR
+    dest_ok = s_d >= DEST_THR
+    vehicle_ok = s_v >= VEH_THR
+    if origin_ok and dest_ok and vehicle_ok:
+        status = "PASS"
+    elif origin_ok or dest_ok:
+        status = "WARN"
+    else:
+        status = "FAIL"
+
+    return {
+        "dn_origin_extracted": features["dn_origin_extracted"],
+        "dn_dest_extracted": features["dn_dest_extracted"],
+        "dn_vehicle_extracted": features["dn_vehicle_extracted"],
+        "dn_dest_code": features["dn_dest_code"],
+        "dn_do_number": features["dn_do_number"],
+        "origin_similarity": round(s_o, 3),
+        "dest_similarity": round(s_d, 3),
+        "vehicle_similarity": round(s_v, 3),
+        "status": status,
+        "score": 0.45 * s_o + 0.45 * s_d + 0.10 * s_v,
+        "truck_type": features["truck_type"],
+        "driver": features["driver"],
+        "routing_metadata": features["routing_metadata"],
+    }
+
+
 def cross_validate_invoice_dn(invoice_excel: str, dn_parsed_data: list) -> dict:
     """
-    인보이스 × DN 전역 매칭(1:1 그리디 할당) + PDF 본문 폴백 사용.
+    인보이스 × DN 전역 매칭(용량 제약 할당) + PDF 본문 폴백 사용.
     - 후보 점수 = 0.45*OriginSim + 0.45*DestSim + 0.10*VehicleSim
-    - DN/Item 각각 1회만 배정(전역 그리디)
+    - DN 특징은 1회만 추출, 토큰 역색인으로 겹치는 쌍만 채점(희소 후보)
+    - DN_ASSIGN_MODE=optimal: 총 점수 최대 할당 / greedy: 전역 그리디
 
     Args:
         invoice_excel: Enhanced 매칭 결과 Excel 파일
@@ -577,7 +892,7 @@ def cross_validate_invoice_dn(invoice_excel: str, dn_parsed_data: list) -> dict:
     Returns:
         dict: 검증 결과
     """
-    print(f"\n🔍 Cross-Document 검증 시작 (1:1 그리디 매칭)...")
+    print(f"\n🔍 Cross-Document 검증 시작 (용량 제약 할당: {DN_ASSIGN_MODE})...")
 
     # 인보이스 데이터 로드
     items_df = pd.read_excel(invoice_excel, sheet_name="items")
@@ -591,91 +906,24 @@ def cross_validate_invoice_dn(invoice_excel: str, dn_parsed_data: list) -> dict:
     print(f"  DN 데이터(성공): {len(dns)}개")
     print(f"  인보이스: {len(items_df)}개 항목")
 
-    # --- 보조: DN에서 origin/dest/vehicle/코드 추출 (본문 우선) ---
-    def _dn_fields_for_match(
-        dn: dict, invoice_origin: str, invoice_dest: str, invoice_vehicle: str
-    ):
-        dn_data = dn.get("data", {}) or {}
-        fn = dn.get("meta", {}).get("filename", "")
-
-        # origin/dest 후보 (dn_data에 이미 PDF 본문 필드가 주입되어 있음!)
-        o_guess, d_guess = extract_route_from_filename(fn)
-
-        # dn_data["loading_point"]/["destination"]는 이미 PDF 본문에서 추출된 값
-        dn_origin = (
-            dn_data.get("loading_point")  # 1순위: parse 단계에서 주입된 PDF 본문 값
-            or o_guess  # 2순위: 파일명
-        )
-        dn_dest = (
-            dn_data.get("destination")  # 1순위: parse 단계에서 주입된 PDF 본문 값
-            or d_guess  # 2순위: 파일명
-        )
-
-        dn_origin = expand_location_abbrev(dn_origin) if dn_origin else ""
-        dn_dest = expand_location_abbrev(dn_dest) if dn_dest else ""
-        dn_vehicle = extract_vehicle_from_dn(dn_data)
-        dn_code = extract_destination_code_from_dn(dn_data)
-        dn_do = extract_do_number_from_dn(dn_data)
-
-        # 유사도(정규화 후 자카드)
-        s_o = (
-            token_set_jaccard(
-                normalize_location(invoice_origin), normalize_location(dn_origin)
-            )
-            if dn_origin
-            else 0.0
-        )
-        s_d = (
-            token_set_jaccard(
-                normalize_location(invoice_dest), normalize_location(dn_dest)
-            )
-            if dn_dest
-            else 0.0
-        )
-        s_v = (
-            token_set_jaccard(
-                normalize_location(invoice_vehicle), normalize_location(dn_vehicle)
-            )
-            if dn_vehicle
-            else 0.0
-        )
-        score = 0.45 * s_o + 0.45 * s_d + 0.10 * s_v
-
-        # 상태 판정(임계값)
-        origin_ok = s_o >= ORIGIN_THR
-        dest_ok = s_d >= DEST_THR
-        vehicle_ok = s_v >= VEH_THR
-        if origin_ok and dest_ok and vehicle_ok:
-            status = "PASS"
-        elif origin_ok or dest_ok:
-            status = "WARN"
-        else:
-            status = "FAIL"
-
-        # Get routing metadata from DN meta
-        routing_meta = dn.get("meta", {}).get("routing_metadata", {})
-
-        return {
-            "dn_origin_extracted": dn_origin,
-            "dn_dest_extracted": dn_dest,
-            "dn_vehicle_extracted": dn_vehicle,
-            "dn_dest_code": dn_code,
-            "dn_do_number": dn_do,
-            "origin_similarity": round(s_o, 3),
-            "dest_similarity": round(s_d, 3),
-            "vehicle_similarity": round(s_v, 3),
-            "status": status,
-            "score": score,
-            "truck_type": dn_data.get("truck_type", ""),
-            "driver": dn_data.get("driver_name", ""),
-            "routing_metadata": routing_meta,
-        }
-
-    # --- 1. 1차 스코어링: Top 후보 집계 및 수요 파악 ---
-    candidates = []
+    # --- 0. DN 특징 사전 계산 + 필드별 토큰 역색인 ---
+    dn_features = [_dn_match_features(dn) for dn in dns]
+    token_index = ({}, {}, {})  # (origin, dest, vehicle): token -> [dn index]
+    for j, feat in enumerate(dn_features):
+        for field, toks in enumerate(feat["tokens"]):
+            for tok in toks:
+                token_index[field].setdefault(tok, []).append(j)
+
+    # --- 1. 1차 스코어링: 희소 후보 + Top 후보 집계 및 수요 파악 ---
+    # 토큰이 하나도 겹치지 않는 쌍은 점수 0이므로 채점하지 않는다.
+    # 단, DN_MIN_SCORE <= 0이면 0점 쌍도 후보이므로 전체 DN을 채점한다.
+    score_all_dns = DN_MIN_SCORE <= 0
+    candidates = []  # (score, row, dn) — row, dn 오름차순 생성
+    pair_sims = {}  # (row, dn) -> (s_o, s_d, s_v)
     top_choice_counts = {}  # dn index -> 해당 DN을 최고로 선택한 row 수
     row_valid_has = {}  # row -> valid 후보 존재여부
     row_best_all = {}  # row -> 전체 후보 중 최고점
+    row_cache = {}  # 동일 (origin, dest, vehicle) row 재사용
 
     # dn 인덱스별 참조 메타(출력용)
     dn_meta = {
@@ -689,34 +937,44 @@ def cross_validate_invoice_dn(invoice_excel: str, dn_parsed_data: list) -> dict:
     }
 
     for i, row in items_df.iterrows():
-        origin = row.get("origin", "")
-        destination = row.get("destination", "")
-        vehicle = row.get("vehicle", "")
-
-        best_dn_j = None
-        best_all = 0.0
-
-        for j, dn in enumerate(dns):
-            match_info = _dn_fields_for_match(dn, origin, destination, vehicle)
-            sc = match_info["score"]
-            best_all = max(best_all, sc)
-
-            if sc >= DN_MIN_SCORE:
-                candidates.append(
-                    {
-                        "invoice_idx": i,
-                        "dn": dn,
-                        "dn_idx": j,
-                        "score": sc,
-                        "match_info": match_info,
-                    }
-                )
-                # 최고 후보 추적
-                if best_dn_j is None or sc > best_all:
-                    best_dn_j = j
+        key = (
+            row.get("origin", ""),
+            row.get("destination", ""),
+            row.get("vehicle", ""),
+        )
+        if key not in row_cache:
+            row_toks = tuple(_location_tokens(v) for v in key)
+            if score_all_dns:
+                touched = range(len(dns))
+            else:
+                touched = set()
+                for field, toks in enumerate(row_toks):
+                    for tok in toks:
+                        touched.update(token_index[field].get(tok, ()))
+
+            valid = []
+            best_all = 0.0
+            for j in sorted(touched):
+                dn_toks = dn_features[j]["tokens"]
+                s_o = _token_jaccard(row_toks[0], dn_toks[0])
+                s_d = _token_jaccard(row_toks[1], dn_toks[1])
+                s_v = _token_jaccard(row_toks[2], dn_toks[2])
+                sc = 0.45 * s_o + 0.45 * s_d + 0.10 * s_v
+                best_all = max(best_all, sc)
+                if sc >= DN_MIN_SCORE:
+                    valid.append((sc, j, (s_o, s_d, s_v)))
+
+            # 최고 후보(동점 시 앞선 DN)
+            best_dn_j = max(valid, key=lambda v: v[0])[1] if valid else None
+            row_cache[key] = (valid, best_all, best_dn_j)
+
+        valid, best_all, best_dn_j = row_cache[key]
+        for sc, j, sims in valid:
+            candidates.append((sc, i, j))
+            pair_sims[(i, j)] = sims
 
         # 수요 카운트
-        row_valid_has[i] = any(c["invoice_idx"] == i for c in candidates)
+        row_valid_has[i] = bool(valid)
         row_best_all[i] = best_all
         if best_dn_j is not None:
             top_choice_counts[best_dn_j] = top_choice_counts.get(best_dn_j, 0) + 1
@@ -729,79 +987,67 @@ def cross_validate_invoice_dn(invoice_excel: str, dn_parsed_data: list) -> dict:
 
     auto_capacity_bump(dns, top_choice_counts)
 
-    # --- 2. 점수 기준 내림차순 정렬 ---
-    candidates.sort(key=lambda x: x["score"], reverse=True)
-
-    # --- 3. 그리디 할당 (1:1 또는 확장 용량) ---
+    # --- 2~3. 용량 제약 할당 (optimal / greedy) ---
     # DN 용량 테이블 (capacity 시스템 - 오버라이드 반영됨)
     dn_capacity = {}
     for j, dn in enumerate(dns):
         capacity = dn.get("data", {}).get("capacity", DN_CAPACITY_DEFAULT)
         dn_capacity[j] = int(capacity)
 
-    used_invoices = set()
-    dn_index_map = {id(dn): j for j, dn in enumerate(dns)}
+    greedy = greedy_assign(candidates, dn_capacity)
+    greedy_total = total_score(candidates, greedy)
+    if DN_ASSIGN_MODE == "greedy":
+        assigned, mode_used = greedy, "greedy"
+    else:
+        assigned, mode_used = assign_dns(candidates, dn_capacity, DN_ASSIGN_MODE)
+        if mode_used != DN_ASSIGN_MODE:
+            print(f"  ⚠️  scipy 미설치: {DN_ASSIGN_MODE} 할당 불가 → greedy 사용")
+    assigned_total = total_score(candidates, assigned)
+
     validation_results = [None] * len(items_df)
     matched_count = 0
 
-    for cand in candidates:
-        i = cand["invoice_idx"]
-        dn_id = id(cand["dn"])
-        dn_idx = dn_index_map.get(dn_id)
-
-        # 최소 점수 체크
-        if cand["score"] < DN_MIN_SCORE:
-            continue
-
-        # 이미 할당된 인보이스는 스킵
-        if i in used_invoices:
-            continue
-
-        # DN capacity 소진 체크
-        if dn_idx is not None and dn_capacity.get(dn_idx, 0) <= 0:
-            continue
-
-        if i not in used_invoices and dn_capacity.get(dn_idx, 0) > 0:
-            # 할당
-            match_info = cand["match_info"]
-            shipment_ref = (
-                cand["dn"].get("meta", {}).get("shipment_ref_from_folder", "")
-            )
-
-            validation = {
-                "invoice_index": i,
-                "shipment_ref": "",
-                "origin": items_df.iloc[i].get("origin", ""),
-                "destination": items_df.iloc[i].get("destination", ""),
-                "vehicle": items_df.iloc[i].get("vehicle", ""),
-                "rate_usd": items_df.iloc[i].get("draft_usd", 0),
-                "dn_found": True,
-                "matched_shipment_ref": shipment_ref,
-                "match_score": match_info["score"],
-                "matches": {
-                    "dn_origin_extracted": match_info["dn_origin_extracted"],
-                    "dn_dest_extracted": match_info["dn_dest_extracted"],
-                    "dn_dest_code": match_info["dn_dest_code"],
-                    "dn_do_number": match_info["dn_do_number"],
-                    "origin_similarity": match_info["origin_similarity"],
-                    "dest_similarity": match_info["dest_similarity"],
-                    "vehicle_similarity": match_info["vehicle_similarity"],
-                    "origin_match": match_info["origin_similarity"] >= ORIGIN_THR,
-                    "dest_match": match_info["dest_similarity"] >= DEST_THR,
-                    "vehicle_match": match_info["vehicle_similarity"] >= VEH_THR,
-                    "validation_status": match_info["status"],
-                    "truck_type": match_info["truck_type"],
-                    "routing_metadata": match_info.get("routing_metadata", {}),
-                    "driver": match_info["driver"],
-                },
-                "issues": [],
-            }
+    for i in sorted(assigned):
+        j = assigned[i]
+        match_info = _dn_match_info(dn_features[j], *pair_sims[(i, j)])
+        shipment_ref = dns[j].get("meta", {}).get("shipment_ref_from_folder", "")
+        row = items_df.iloc[i]
+
+        validation_results[i] = {
+            "invoice_index": i,
+            "shipment_ref": "",
+            "origin": row.get("origin", ""),
+            "destination": row.get("destination", ""),
+            "vehicle": row.get("vehicle", ""),
+            "rate_usd": row.get("draft_usd", 0),
+            "dn_found": True,
+            "matched_shipment_ref": shipment_ref,
+            "match_score": match_info["score"],
+            "matches": {
+                "dn_origin_extracted": match_info["dn_origin_extracted"],
+                "dn_dest_extracted": match_info["dn_dest_extracted"],
+                "dn_dest_code": match_info["dn_dest_code"],
+                "dn_do_number": match_info["dn_do_number"],
+                "origin_similarity": match_info["origin_similarity"],
+                "dest_similarity": match_info["dest_similarity"],
+                "vehicle_similarity": match_info["vehicle_similarity"],
+                "origin_match": match_info["origin_similarity"] >= ORIGIN_THR,
+                "dest_match": match_info["dest_similarity"] >= DEST_THR,
+                "vehicle_match": match_info["vehicle_similarity"] >= VEH_THR,
+                "validation_status": match_info["status"],
+                "truck_type": match_info["truck_type"],
+                "routing_metadata": match_info.get("routing_metadata", {}),
+                "driver": match_info["driver"],
+            },
+            "issues": [],
+        }
+        matched_count += 1
 
-            validation_results[i] = validation
-            used_invoices.add(i)
-            if dn_idx is not None:
-                dn_capacity[dn_idx] -= 1  # capacity 감소
-            matched_count += 1
+    print(
+        f"  📈 할당({mode_used}): 총점 {assigned_total:.3f} / "
+        f"greedy {greedy_total:.3f} (+{assigned_total - greedy_total:.3f}), "
+        f"매칭 {len(assigned)}건 / greedy {len(greedy)}건"
+    )
 
     # --- (옵션) TopN 후보 덤프 ---
     if DN_DUMP_TOPN > 0:
@@ -810,10 +1056,8 @@ def cross_validate_invoice_dn(invoice_excel: str, dn_parsed_data: list) -> dict:
             from collections import defaultdict
 
             per_row = defaultdict(list)
-            for cand in candidates:
-                per_row[cand["invoice_idx"]].append(
-                    (cand["score"], cand.get("dn_idx", 0))
-                )
+            for sc, i, j in candidates:
+                per_row[i].append((sc, j))
 
             with open(DN_DUMP_PATH, "w", newline="", encoding="utf-8") as f:
                 wr = csv.writer(f)
@@ -936,6 +1180,12 @@ def cross_validate_invoice_dn(invoice_excel: str, dn_parsed_data: list) -> dict:
         "dn_matched": matched_count,
         "match_rate": matched_count / len(items_df) * 100 if len(items_df) > 0 else 0,
         "results": validation_results,
+        "assignment": {
+            "mode": mode_used,
+            "total_score": round(assigned_total, 4),
+            "greedy_total_score": round(greedy_total, 4),
+            "score_gain": round(assigned_total - greedy_total, 4),
+        },
     }
 
 
@@ -965,12 +1215,136 @@ def check_location_match(invoice_loc: str, dn_loc: str) -> bool:
     return False
 
 
+# items 시트에 추가되는 DN 검증 컬럼: (컬럼명, 결과 필드 경로, 기본값)
+_DN_VALIDATION_COLUMNS = [
+    ("dn_origin_extracted", "matches.dn_origin_extracted", ""),
+    ("dn_dest_extracted", "matches.dn_dest_extracted", ""),
+    ("dn_dest_code", "matches.dn_dest_code", ""),
+    ("dn_do_number", "matches.dn_do_number", ""),
+    ("dn_origin_similarity", "matches.origin_similarity", 0.0),
+    ("dn_dest_similarity", "matches.dest_similarity", 0.0),
+    ("dn_vehicle_similarity", "matches.vehicle_similarity", 0.0),
+    ("dn_validation_status", "matches.validation_status", "N/A"),
+    ("dn_truck_type", "matches.truck_type", ""),
+    ("dn_driver", "matches.driver", ""),
+    ("dn_unmatched_reason", "matches.unmatched_reason", ""),
+    ("hybrid_engine", "matches.routing_metadata.engine", "N/A"),
+    ("hybrid_rule", "matches.routing_metadata.rule", "N/A"),
+    ("hybrid_confidence", "matches.routing_metadata.confidence", 0.0),
+    ("hybrid_ade_cost", "matches.routing_metadata.ade_cost_usd", 0.0),
+]
+
+_ITEMS_COLUMN_ORDER = [
+    "dn_matched",
+    "dn_shipment_ref",
+    "dn_origin_extracted",
+    "dn_dest_extracted",
+    "dn_dest_code",
+    "dn_do_number",
+    "dn_origin_similarity",
+    "dn_dest_similarity",
+    "dn_vehicle_similarity",
+    "dn_validation_status",
+    "dn_truck_type",
+    "dn_driver",
+    "dn_unmatched_reason",
+    "hybrid_engine",
+    "hybrid_rule",
+    "hybrid_confidence",
+    "hybrid_validation",
+    "hybrid_ade_cost",
+]
+
+
+def merge_validation_columns(
+    items_df: pd.DataFrame, validation_results: list
+) -> pd.DataFrame:
+    """
+    Cross-validation 결과를 invoice_index 기준으로 items_df에 일괄 조인
+
+    결과가 없는 항목은 기본값(dn_matched="No", 유사도 0.0 등)으로 채운다.
+    """
+    n = len(items_df)
+    flat = pd.json_normalize(validation_results) if validation_results else None
+    if flat is None or flat.empty:
+        flat = pd.DataFrame(index=range(0))
+    else:
+        if "invoice_index" in flat.columns:
+            flat.index = (
+                flat["invoice_index"].fillna(pd.Series(range(len(flat)))).astype(int)
+            )
+        flat = flat[~flat.index.duplicated(keep="last")]
+    flat = flat.reindex(range(n))
+
+    def field(path: str, default) -> pd.Series:
+        if path not in flat.columns:
+            return pd.Series([default] * n, dtype=object)
+        return flat[path].astype(object).where(flat[path].notna(), default)
+
+    cols = {
+        "dn_matched": field("dn_found", False)
+        .astype(bool)
+        .map({True: "Yes", False: "No"}),
+        "dn_shipment_ref": field("matched_shipment_ref", ""),
+    }
+    for name, path, default in _DN_VALIDATION_COLUMNS:
+        cols[name] = field(path, default)
+    cols["hybrid_validation"] = (
+        field("matches.routing_metadata.validation_passed", False)
+        .astype(bool)
+        .map({True: "PASS", False: "FAIL"})
+    )
+
+    for name in _ITEMS_COLUMN_ORDER:
+        items_df[name] = cols[name].to_numpy()
+    return items_df
+
+
+def _build_hyperlinks(
+    items_df: pd.DataFrame,
+    approved_df: pd.DataFrame,
+    neighbor_cache: str = None,
+) -> dict:
+    """ref_adj → ApprovedLaneMap 행 매칭 (Enhanced Matching 4-level fallback)"""
+    from enhanced_matching import ApprovedLaneIndex
+
+    # ApprovedLaneMap을 리스트로 변환 → 사전 정규화 인덱스 1회 구축
+    approved_lanes = ApprovedLaneIndex(
+        approved_df.to_dict("records"), neighbor_cache=neighbor_cache
+    )
+
+    def text(col: str, default: str) -> list:
+        if col not in items_df.columns:
+            return [default] * len(items_df)
+        return items_df[col].astype(str).str.strip().tolist()
+
+    queries = list(
+        zip(
+            text("origin", ""),
+            text("destination", ""),
+            text("vehicle", ""),
+            text("unit", "per truck"),
+        )
+    )
+
+    # 전체 라인 일괄 유사도 행렬
+    match_results = approved_lanes.find_batch(queries)
+    return {
+        pos: m["row_index"]
+        for pos, m in enumerate(match_results)
+        if m and m.get("row_index")
+    }
+
+
 def add_pdf_validation_to_excel(
     enhanced_excel: str, cross_validation_result: dict, output_file: str
 ):
     """
     Excel items 시트에 PDF 검증 결과 컬럼 추가
 
+    items 시트와 DN_Validation 시트만 새로 기록하고, 나머지 시트는
+    원본 xlsx 파트를 그대로 복사한다 (XLSX_MERGE_STREAMING=false면 전체 재작성).
+
     Args:
         enhanced_excel: Enhanced Matching 결과 Excel 파일
         cross_validation_result: Cross-validation 결과
@@ -978,125 +1352,124 @@ def add_pdf_validation_to_excel(
     """
     print(f"\n📝 Excel items 시트에 PDF 검증 결과 추가 중...")
 
-    # 기존 Excel 로드
+    # items 시트만 로드 (다른 시트는 복사 대상)
     items_df = pd.read_excel(enhanced_excel, sheet_name="items")
-    comparison_df = pd.read_excel(enhanced_excel, sheet_name="comparison")
-    patterns_df = pd.read_excel(enhanced_excel, sheet_name="patterns_applied")
-    approved_df = pd.read_excel(enhanced_excel, sheet_name="ApprovedLaneMap")
 
-    # Cross-validation 결과를 DataFrame으로 변환
     validation_results = cross_validation_result.get("results", [])
 
     print(f"  Validation results count: {len(validation_results)}")
     print(f"  Items count: {len(items_df)}")
 
-    # 새 컬럼 추가
-    dn_matched_list = []
-    dn_shipment_ref_list = []
-    dn_match_score_list = []
-    dn_description_list = []
-    dn_truck_type_list = []
-    dn_driver_list = []
-
-    # validation_results가 items_df와 같은 길이인지 확인
     if len(validation_results) != len(items_df):
         print(
             f"  ⚠️  Warning: Validation results ({len(validation_results)}) != Items ({len(items_df)})"
         )
-        print(f"  Filling with default values...")
-        validation_results = [
-            {
-                "dn_found": False,
-                "matched_shipment_ref": "",
-                "match_score": 0.0,
-                "matches": {},
-                "issues": [],
-            }
-            for _ in range(len(items_df))
-        ]
+        print(f"  Joining by invoice_index, filling missing rows with defaults...")
 
-    for result in validation_results:
-        dn_matched_list.append("Yes" if result["dn_found"] else "No")
-        dn_shipment_ref_list.append(result.get("matched_shipment_ref", ""))
-        dn_match_score_list.append(result.get("match_score", 0.0))
-
-        # DN 상세 정보
-        matches = result.get("matches", {})
-        dn_description_list.append(
-            matches.get("description", "")[:50] if matches.get("description") else ""
+    merge_validation_columns(items_df, validation_results)
+    print(f"  [OK] Added columns: 18 (13 DN + 5 Hybrid routing)")
+
+    # DN_Validation 시트용 상세 DataFrame 생성
+    dn_validation_df = pd.DataFrame(validation_results)
+
+    # 하이퍼링크 (origin/destination/vehicle 기반 매칭)
+    ref_col = (
+        list(items_df.columns).index("ref_adj")
+        if "ref_adj" in items_df.columns
+        else None
+    )
+    links = {}
+    if ref_col is not None:
+        print(f"  🔗 하이퍼링크 생성 중... (Enhanced Matching 4-level fallback)")
+        approved_df = pd.read_excel(enhanced_excel, sheet_name="ApprovedLaneMap")
+        rate_present = items_df["ref_adj"].notna().to_numpy()
+        neighbor_cache = None
+        if LANE_NEIGHBOR_CACHE_ENABLED:
+            neighbor_cache = LANE_NEIGHBOR_CACHE or str(
+                Path(output_file).parent / "lane_neighbor_table.json"
+            )
+        links = {
+            pos: target
+            for pos, target in _build_hyperlinks(
+                items_df, approved_df, neighbor_cache
+            ).items()
+            if rate_present[pos]
+        }
+        print(
+            f"  ✅ 하이퍼링크 생성 완료: {len(links)}/{len(items_df)} (ref_adj → ApprovedLaneMap)"
         )
-        dn_truck_type_list.append(matches.get("truck_type", ""))
-        dn_driver_list.append(matches.get("driver", ""))
-
-    # 유사도 및 검증 상태 추가
-    dn_origin_extracted_list = []
-    dn_dest_extracted_list = []
-    dn_dest_code_list = []
-    dn_do_number_list = []
-    dn_origin_sim_list = []
-    dn_dest_sim_list = []
-    dn_vehicle_sim_list = []
-    dn_validation_status_list = []
-    dn_unmatched_reason_list = []
-
-    # Hybrid routing metadata lists
-    hybrid_engine_list = []
-    hybrid_rule_list = []
-    hybrid_confidence_list = []
-    hybrid_validation_list = []
-    hybrid_ade_cost_list = []
 
-    for result in validation_results:
-        matches = result.get("matches", {})
-        dn_origin_extracted_list.append(matches.get("dn_origin_extracted", ""))
-        dn_dest_extracted_list.append(matches.get("dn_dest_extracted", ""))
-        dn_dest_code_list.append(matches.get("dn_dest_code", ""))
-        dn_do_number_list.append(matches.get("dn_do_number", ""))
-        dn_origin_sim_list.append(matches.get("origin_similarity", 0.0))
-        dn_dest_sim_list.append(matches.get("dest_similarity", 0.0))
-        dn_vehicle_sim_list.append(matches.get("vehicle_similarity", 0.0))
-        dn_validation_status_list.append(matches.get("validation_status", "N/A"))
-        dn_unmatched_reason_list.append(matches.get("unmatched_reason", ""))
-
-        # Extract hybrid routing metadata
-        routing_meta = matches.get("routing_metadata", {})
-        hybrid_engine_list.append(routing_meta.get("engine", "N/A"))
-        hybrid_rule_list.append(routing_meta.get("rule", "N/A"))
-        hybrid_confidence_list.append(routing_meta.get("confidence", 0.0))
-        hybrid_validation_list.append(
-            "PASS" if routing_meta.get("validation_passed", False) else "FAIL"
+    print(f"\n📊 Excel 파일 저장 중: {output_file}")
+    written = False
+    if XLSX_MERGE_STREAMING:
+        try:
+            _write_validation_workbook_streaming(
+                enhanced_excel, output_file, items_df, dn_validation_df, ref_col, links
+            )
+            written = True
+        except Exception as e:
+            print(f"  ⚠️  스트리밍 병합 실패 → 전체 재작성: {e}")
+    if not written:
+        _write_validation_workbook_full(
+            enhanced_excel, output_file, items_df, dn_validation_df, ref_col, links
         )
-        hybrid_ade_cost_list.append(routing_meta.get("ade_cost_usd", 0.0))
-
-    # items_df에 새 컬럼 추가
-    items_df["dn_matched"] = dn_matched_list
-    items_df["dn_shipment_ref"] = dn_shipment_ref_list
-    items_df["dn_origin_extracted"] = dn_origin_extracted_list
-    items_df["dn_dest_extracted"] = dn_dest_extracted_list
-    items_df["dn_dest_code"] = dn_dest_code_list
-    items_df["dn_do_number"] = dn_do_number_list
-    items_df["dn_origin_similarity"] = dn_origin_sim_list
-    items_df["dn_dest_similarity"] = dn_dest_sim_list
-    items_df["dn_vehicle_similarity"] = dn_vehicle_sim_list
-    items_df["dn_validation_status"] = dn_validation_status_list
-    items_df["dn_truck_type"] = dn_truck_type_list
-    items_df["dn_driver"] = dn_driver_list
-    items_df["dn_unmatched_reason"] = dn_unmatched_reason_list
-
-    # Hybrid routing metadata columns
-    items_df["hybrid_engine"] = hybrid_engine_list
-    items_df["hybrid_rule"] = hybrid_rule_list
-    items_df["hybrid_confidence"] = hybrid_confidence_list
-    items_df["hybrid_validation"] = hybrid_validation_list
-    items_df["hybrid_ade_cost"] = hybrid_ade_cost_list
 
-    print(f"  [OK] Added columns: 18 (13 DN + 5 Hybrid routing)")
+    print(f"  ✅ 시트 추가: DN_Validation ({len(dn_validation_df)} rows)")
+    print(f"✅ Excel 파일 저장 완료: {output_file}")
+    print(f"  - items 시트: {len(items_df)} rows × {len(items_df.columns)} columns")
+    print(f"  - DN_Validation 시트: {len(dn_validation_df)} rows")
+
+    return output_file
 
-    # DN_Validation 시트용 상세 DataFrame 생성
-    dn_validation_df = pd.DataFrame(validation_results)
 
-    # Excel 파일 재생성
-    print(f"\n📊 Excel 파일 재생성 중: {output_file}")
+def _write_validation_workbook_streaming(
+    enhanced_excel: str,
+    output_file: str,
+    items_df: pd.DataFrame,
+    dn_validation_df: pd.DataFrame,
+    ref_col,
+    links: dict,
+) -> None:
+    """원본 워크북 파트 복사 + items/DN_Validation 시트만 스트리밍 기록"""
+    merger = WorkbookMerger(enhanced_excel)
+
+    # 공유 스타일 (동일 스펙 1회 등록)
+    header = merger.styles.add(bold=True, bg_color="#D7E4BC", border=True)
+    money = merger.styles.add(num_format='"$"#,##0.00')
+    money_link = merger.styles.add(
+        underline=True, font_color="blue", num_format='"$"#,##0.00'
+    )
+
+    items_sheet = SheetData(items_df, header_style=header)
+    if ref_col is not None:
+        items_sheet.column_styles = {ref_col: money}
+        items_sheet.cell_styles = {(pos, ref_col): money_link for pos in links}
+        items_sheet.hyperlinks = {
+            (pos, ref_col): f"ApprovedLaneMap!A{target}"
+            for pos, target in links.items()
+        }
+
+    merger.save(
+        output_file,
+        {
+            "items": items_sheet,
+            "DN_Validation": SheetData(dn_validation_df, header_style=header),
+        },
+    )
+
+
+def _write_validation_workbook_full(
+    enhanced_excel: str,
+    output_file: str,
+    items_df: pd.DataFrame,
+    dn_validation_df: pd.DataFrame,
+    ref_col,
+    links: dict,
+) -> None:
+    """전체 시트 재작성 (xlsxwriter) - 스트리밍 병합 불가 시 폴백"""
+    comparison_df = pd.read_excel(enhanced_excel, sheet_name="comparison")
+    patterns_df = pd.read_excel(enhanced_excel, sheet_name="patterns_applied")
+    approved_df = pd.read_excel(enhanced_excel, sheet_name="ApprovedLaneMap")
 
     with pd.ExcelWriter(output_file, engine="xlsxwriter") as writer:
         workbook = writer.book
@@ -1120,94 +1493,23 @@ def add_pdf_validation_to_excel(
         for col_num, value in enumerate(items_df.columns.values):
             worksheet_items.write(0, col_num, value, header_format)
 
-        # 하이퍼링크 재생성 (origin/destination/vehicle 기반 매칭)
-        ref_rate_col_index = (
-            list(items_df.columns).index("ref_adj")
-            if "ref_adj" in items_df.columns
-            else None
-        )
-
-        if ref_rate_col_index is not None:
-            print(f"  🔗 하이퍼링크 생성 중... (Enhanced Matching 4-level fallback)")
-
-            # Enhanced Matching으로 hyperlink_info 수집
-            from enhanced_matching import find_matching_lane_enhanced
-
-            hyperlink_info = []
-
-            # ApprovedLaneMap을 리스트로 변환
-            approved_lanes = approved_df.to_dict("records")
-
-            for i, row in items_df.iterrows():
-                origin = str(row.get("origin", "")).strip()
-                destination = str(row.get("destination", "")).strip()
-                vehicle = str(row.get("vehicle", "")).strip()
-                unit = (
-                    str(row.get("unit", "per truck")).strip()
-                    if "unit" in row
-                    else "per truck"
-                )
-
-                # Enhanced Matching 사용 (4-level fallback)
-                match_result = find_matching_lane_enhanced(
-                    origin=origin,
-                    destination=destination,
-                    vehicle=vehicle,
-                    unit=unit,
-                    approved_lanes=approved_lanes,
-                    verbose=False,
-                )
-
-                if match_result and match_result.get("row_index"):
-                    hyperlink_info.append(
-                        {
-                            "item_row": i + 2,  # Excel 1-based + header
-                            "target_row": match_result["row_index"],
-                        }
-                    )
-
-            # 수집된 hyperlink_info로 하이퍼링크 생성
-            hyperlinks_created = 0
-            for link_info in hyperlink_info:
-                item_row = link_info["item_row"]
-                target_row = link_info["target_row"]
-
-                # 실제 요율 값
-                rate_value = items_df.iloc[item_row - 2, ref_rate_col_index]
-
-                if pd.notna(rate_value) and target_row:
-                    # 하이퍼링크 생성
-                    hyperlink_url = f"internal:ApprovedLaneMap!A{target_row}"
+        if ref_col is not None:
+            for pos, rate_value in enumerate(items_df.iloc[:, ref_col]):
+                if pd.isna(rate_value):
+                    continue
+                if pos in links:
                     worksheet_items.write_url(
-                        item_row - 1,  # Excel 0-based
-                        ref_rate_col_index,
-                        hyperlink_url,
+                        pos + 1,  # Excel 0-based + header
+                        ref_col,
+                        f"internal:ApprovedLaneMap!A{links[pos]}",
                         hyperlink_format,
-                        items_df.iloc[item_row - 2, ref_rate_col_index],
                     )
-                    hyperlinks_created += 1
-                elif pd.notna(rate_value):
-                    # 매칭 없는 경우 일반 값
-                    worksheet_items.write(
-                        item_row - 1,
-                        ref_rate_col_index,
-                        items_df.iloc[item_row - 2, ref_rate_col_index],
-                        normal_format,
+                    # 링크 유지한 채 셀 값을 숫자로 덮어쓰기 (write_url은 문자열만 허용)
+                    worksheet_items.write_number(
+                        pos + 1, ref_col, rate_value, hyperlink_format
                     )
-
-            # 매칭 안된 항목도 일반 값으로 작성
-            matched_rows = {info["item_row"] for info in hyperlink_info}
-            for i in range(len(items_df)):
-                if (i + 2) not in matched_rows:
-                    rate_value = items_df.iloc[i, ref_rate_col_index]
-                    if pd.notna(rate_value):
-                        worksheet_items.write(
-                            i + 1, ref_rate_col_index, rate_value, normal_format
-                        )
-
-            print(
-                f"  ✅ 하이퍼링크 생성 완료: {hyperlinks_created}/{len(items_df)} (ref_adj → ApprovedLaneMap)"
-            )
+                else:
+                    worksheet_items.write(pos + 1, ref_col, rate_value, normal_format)
 
         # 다른 시트들
         comparison_df.to_excel(writer, sheet_name="comparison", index=False)
@@ -1224,14 +1526,6 @@ def add_pdf_validation_to_excel(
                 0, col_num, dn_validation_df.columns[col_num], header_format
             )
 
-        print(f"  ✅ 시트 추가: DN_Validation ({len(dn_validation_df)} rows)")
-
-    print(f"✅ Excel 파일 저장 완료: {output_file}")
-    print(f"  - items 시트: {len(items_df)} rows × {len(items_df.columns)} columns")
-    print(f"  - DN_Validation 시트: {len(dn_validation_df)} rows")
-
-    return output_file
-
 
 def generate_comprehensive_report(
     enhanced_matching_result: dict,
@@ -1473,7 +1767,12 @@ def main():
     if PDF_PARSER_AVAILABLE:
         print("\n📄 Step 2: DN PDF 파싱...")
         parser = DSVPDFParser(log_level="WARNING")
-        parsed_data = parse_dn_pdfs(pdf_files, parser)
+        parsed_data = parse_dn_pdfs(
+            pdf_files,
+            parser,
+            report_path=DN_INGEST_REPORT_PATH
+            or str(Path(output_report).parent / "dn_ingest_report.json"),
+        )
     else:
         print("\n⚠️  Step 2 SKIPPED: PDF Parser not available")
         parsed_data = []
@@ -9,10 +9,11 @@ Created: 2025-10-14
 
 from celery import Celery
 import os
+import sys
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 
 # Load .env
@@ -57,19 +58,49 @@ try:
 except Exception as e:
     logger.warning(f"Routing rules load failed: {e}. Using default engine.")
 
+# Shared layout probe + HybridPDFRouter (same modules/cache as 00_Shared).
+# Loaded from the module directory so the hybrid_integration package
+# __init__ (adapters/validator) is not required in the worker.
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[2] / "00_Shared" / "hybrid_integration")
+)
+try:
+    from pdf_probe import get_shared_probe
+    from hybrid_pdf_router import HybridPDFRouter
+
+    PDF_PROBE = get_shared_probe(cache_dir=os.getenv("PDF_PROBE_CACHE_DIR"))
+    ROUTER = HybridPDFRouter(
+        config_path=routing_rules_path,
+        log_level=os.getenv("LOG_LEVEL", "INFO"),
+        probe=PDF_PROBE,
+    )
+except ImportError as e:
+    logger.warning(f"PDF probe not available: {e}. Using file-size heuristics.")
+    PDF_PROBE = None
+    ROUTER = None
+
 
 @celery_app.task(name="parse_pdf", bind=True, max_retries=3)
-def parse_pdf_task(self, pdf_path: str, doc_type: str = "invoice") -> Dict[str, Any]:
+def parse_pdf_task(
+    self,
+    pdf_path: str,
+    doc_type: str = "invoice",
+    sensitivity: Optional[List[str]] = None,
+    failed_engine: Optional[str] = None,
+) -> Dict[str, Any]:
     """
     PDF 파싱 Celery Task
 
     Args:
         pdf_path: PDF 파일 경로
         doc_type: 문서 타입
+        sensitivity: 민감도 태그 (예: ["contract"]) - sensitivity_in 규칙 평가용
+        failed_engine: 이전 시도에서 실패한 엔진 (retry 시 engine_fallback swap)
 
     Returns:
         Unified IR (blocks + coords)
     """
+    engine = None
     try:
         logger.info(f"[START] Parsing {pdf_path} ({doc_type})")
 
@@ -79,7 +110,7 @@ def parse_pdf_task(self, pdf_path: str, doc_type: str = "invoice") -> Dict[str,
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
         # 2. Routing Engine 선택
-        engine = _select_engine(pdf_file, doc_type)
+        engine = _select_engine(pdf_file, doc_type, sensitivity, failed_engine)
         logger.info(f"[ENGINE] Selected: {engine}")
 
         # 3. 파싱 실행
@@ -109,7 +140,12 @@ def parse_pdf_task(self, pdf_path: str, doc_type: str = "invoice") -> Dict[str,
                 f"[RETRY] Attempt {self.request.retries + 1}/{self.max_retries}"
             )
             raise self.retry(
-                exc=exc, countdown=int(os.getenv("CELERY_RETRY_DELAY", 60))
+                exc=exc,
+                countdown=int(os.getenv("CELERY_RETRY_DELAY", 60)),
+                kwargs={
+                    "sensitivity": sensitivity,
+                    "failed_engine": engine or failed_engine,
+                },
             )
         else:
             return {
@@ -120,20 +156,60 @@ def parse_pdf_task(self, pdf_path: str, doc_type: str = "invoice") -> Dict[str,
             }
 
 
-def _select_engine(pdf_file: Path, doc_type: str) -> str:
+@celery_app.task(name="probe_metrics")
+def probe_metrics_task() -> Dict[str, Any]:
+    """PDF probe latency / cache hit 메트릭 (worker 프로세스 기준)"""
+    if PDF_PROBE is None:
+        return {"probe_count": 0, "available": False}
+    return {**PDF_PROBE.get_metrics(), "available": True}
+
+
+def _select_engine(
+    pdf_file: Path,
+    doc_type: str,
+    sensitivity: Optional[List[str]] = None,
+    failed_engine: Optional[str] = None,
+) -> str:
     """
     Routing Rules 기반 엔진 선택
 
+    PDF probe(page tree + 1페이지 샘플)로 문서 특성을 측정한 뒤
+    HybridPDFRouter.decide_route로 hvdc_rules를 priority 순으로 평가.
+    ADE 일일 예산(ade_budget_exceeded)과 민감 문서 로컬 처리는 router가 담당.
+
     Returns:
         "docling" or "ade"
     """
     # Default
     default_engine = ROUTING_RULES.get("default_engine", "docling")
 
-    # Check budget guard
-    # TODO: Implement budget tracking
+    if ROUTER is None:
+        return _select_engine_by_size(pdf_file, doc_type, default_engine)
+
+    characteristics = PDF_PROBE.probe(
+        str(pdf_file), doc_type_indicators=ROUTER.doc_type_indicators
+    )
+    logger.info(
+        f"[PROBE] {pdf_file.name}: pages={characteristics['pages']}, "
+        f"table_density={characteristics['table_density']:.2f}, "
+        f"{characteristics['probe_ms']:.1f}ms"
+        f"{' (cache)' if characteristics['cache_hit'] else ''}"
+    )
+
+    # hvdc_rules의 doc_type_in은 호출자 문서 타입(invoice/boe/do/dn/bl) 기준
+    characteristics["doc_type"] = doc_type
+    characteristics["sensitivity"] = list(sensitivity or [])
+    if failed_engine:
+        characteristics["engine_failed"] = True
+        characteristics["failed_engine"] = failed_engine
+
+    decision = ROUTER.decide_route(str(pdf_file), doc_characteristics=characteristics)
+    logger.info(f"[RULE] {decision['rule_matched']} -> {decision['engine_choice']}")
+    return decision["engine_choice"]
+
 
-    # Simple heuristics (실제로는 PDF 메타데이터 분석 필요)
+def _select_engine_by_size(pdf_file: Path, doc_type: str, default_engine: str) -> str:
+    """Probe 미사용 시 기존 파일 크기/문서 타입 휴리스틱"""
     file_size_mb = pdf_file.stat().st_size / 1024 / 1024
 
     # Rule: Large file → ADE
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lane Matching Candidate Blocking Benchmark
+==========================================
+
+ML 가중 레인 매칭 처리량/재현율 비교:
+- exhaustive: 전 레인 순회 (cap=None)
+- blocked: 정확 해시 + 토큰/trigram 역색인 후보 상위 cap개만 유사도 계산
+
+대상:
+- UnifiedMLPipeline._predict_matching (LaneMatchIndex)
+- ml_integration.find_matching_lane_ml (MLLaneIndex)
+
+exhaustive는 느리므로 --sample 건에서만 실행하고 처리량은 그 표본 기준.
+재현율 = exhaustive 매칭 중 blocked가 같은 레인을 찾은 비율.
+
+Usage:
+    python benchmark_lane_blocking.py [--invoices 10000] [--lanes 5000] [--cap 64] [--sample 200]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(
+    0, str(Path(__file__).parent.parent / "HVDC_Invoice_Audit" / "02_DSV_DOMESTIC")
+)
+
+from ml_integration import MLLaneIndex, find_matching_lane_ml
+from unified_ml_pipeline import DEFAULT_CONFIG, LaneMatchIndex, UnifiedMLPipeline
+
+PLACES = [
+    "DSV MUSSAFAH YARD",
+    "M44 WAREHOUSE",
+    "AL MARKAZ WAREHOUSE",
+    "ICAD WAREHOUSE",
+    "MIRFA SITE",
+    "SHUWEIHAT SITE",
+    "AL MASAOOD MOSB",
+    "MINA ZAYED PORT",
+    "JEBEL ALI PORT",
+    "KHALIFA PORT",
+    "TROJAN MUSSAFAH",
+    "SURTI INDUSTRIES JEBEL ALI",
+    "RUWAIS PLANT",
+    "TAWEELAH SITE",
+    "KIZAD AREA",
+    "ABU DHABI AIRPORT",
+]
+SUFFIXES = ["", " YARD", " GATE 2", " LAYDOWN", " BLOCK A", " PHASE 3", " WH 5"]
+VEHICLES = ["FLATBED", "LOWBED", "TRAILER", "TRUCK", "CRANE", "3 TON PICKUP"]
+UNITS = ["per truck", "per trip", "per ton"]
+
+
+def make_lanes(n: int, rng: random.Random) -> list:
+    lanes = []
+    for i in range(n):
+        lanes.append(
+            {
+                "origin": f"{rng.choice(PLACES)}{rng.choice(SUFFIXES)} {i % 97}",
+                "destination": f"{rng.choice(PLACES)}{rng.choice(SUFFIXES)} {i % 89}",
+                "vehicle": rng.choice(VEHICLES),
+                "unit": rng.choice(UNITS),
+            }
+        )
+    return lanes
+
+
+def perturb(text: str, rng: random.Random) -> str:
+    """오타/토큰 순서/약어 변형"""
+    tokens = text.split()
+    r = rng.random()
+    if r < 0.25 and len(tokens) > 1:
+        rng.shuffle(tokens)
+    elif r < 0.5:
+        t = rng.randrange(len(tokens))
+        w = tokens[t]
+        if len(w) > 3:
+            k = rng.randrange(len(w))
+            tokens[t] = w[:k] + w[k + 1 :]
+    elif r < 0.6:
+        tokens = [rng.choice(PLACES)]
+    text = " ".join(tokens)
+    return text.lower() if rng.random() < 0.3 else text.title()
+
+
+def make_invoices(n: int, lanes: list, rng: random.Random) -> pd.DataFrame:
+    rows = []
+    for _ in range(n):
+        lane = rng.choice(lanes)
+        rows.append(
+            {
+                "Origin": perturb(lane["origin"], rng),
+                "Destination": perturb(lane["destination"], rng),
+                "Vehicle": (
+                    lane["vehicle"] if rng.random() < 0.8 else rng.choice(VEHICLES)
+                ),
+                "Unit": lane["unit"],
+                "UoM": "per truck",
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def lane_id(result):
+    return None if result is None else result["row_index"]
+
+
+def compare(name: str, run_blocked, run_exhaustive, n_total: int, sample: list):
+    t = time.perf_counter()
+    blocked = [run_blocked(i) for i in range(n_total)]
+    t_blocked = time.perf_counter() - t
+
+    t = time.perf_counter()
+    exhaustive = {i: run_exhaustive(i) for i in sample}
+    t_exhaustive = time.perf_counter() - t
+
+    matched = [i for i in sample if exhaustive[i] is not None]
+    same = sum(1 for i in matched if lane_id(blocked[i]) == lane_id(exhaustive[i]))
+    agree = sum(1 for i in sample if lane_id(blocked[i]) == lane_id(exhaustive[i]))
+
+    print(f"\n[{name}]")
+    print(
+        f"  blocked    : {n_total} invoices in {t_blocked:.2f}s "
+        f"({n_total / t_blocked:,.0f} invoices/s)"
+    )
+    print(
+        f"  exhaustive : {len(sample)} invoices in {t_exhaustive:.2f}s "
+        f"({len(sample) / t_exhaustive:,.1f} invoices/s)"
+    )
+    print(
+        f"  speedup    : {(t_exhaustive / len(sample)) / (t_blocked / n_total):,.0f}x"
+    )
+    print(
+        f"  recall     : {same}/{len(matched)} "
+        f"({same / max(len(matched), 1):.1%}) of exhaustive matches, "
+        f"agreement {agree}/{len(sample)} ({agree / max(len(sample), 1):.1%})"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--invoices", type=int, default=10000)
+    ap.add_argument("--lanes", type=int, default=5000)
+    ap.add_argument("--cap", type=int, default=64)
+    ap.add_argument("--sample", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    lanes = make_lanes(args.lanes, rng)
+    invoices = make_invoices(args.invoices, lanes, rng)
+    sample = sorted(rng.sample(range(args.invoices), min(args.sample, args.invoices)))
+    rows = [row for _, row in invoices.iterrows()]
+
+    print(
+        f"Lanes: {args.lanes:,}  Invoices: {args.invoices:,}  "
+        f"cap: {args.cap}  exhaustive sample: {len(sample)}"
+    )
+
+    # 1. UnifiedMLPipeline._predict_matching
+    pipeline = UnifiedMLPipeline.__new__(UnifiedMLPipeline)
+    pipeline.config = DEFAULT_CONFIG
+    from unified_ml_pipeline import MLWeightsManager
+
+    pipeline.weights_manager = MLWeightsManager()
+    t = time.perf_counter()
+    blocked_index = LaneMatchIndex(lanes, cap=args.cap)
+    print(f"\nLaneMatchIndex build: {time.perf_counter() - t:.2f}s")
+    full_index = LaneMatchIndex(lanes, cap=None)
+    compare(
+        "UnifiedMLPipeline._predict_matching",
+        lambda i: pipeline._predict_matching(rows[i], blocked_index),
+        lambda i: pipeline._predict_matching(rows[i], full_index),
+        args.invoices,
+        sample,
+    )
+
+    # 2. ml_integration.find_matching_lane_ml
+    t = time.perf_counter()
+    blocked_ml = MLLaneIndex(lanes, cap=args.cap)
+    print(f"\nMLLaneIndex build: {time.perf_counter() - t:.2f}s")
+    full_ml = MLLaneIndex(lanes, cap=None)
+
+    def query(i):
+        r = rows[i]
+        return r["Origin"], r["Destination"], r["Vehicle"], r["Unit"]
+
+    compare(
+        "ml_integration.find_matching_lane_ml",
+        lambda i: find_matching_lane_ml(*query(i), blocked_ml),
+        lambda i: find_matching_lane_ml(*query(i), full_ml),
+        args.invoices,
+        sample,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Candidate Blocking for Lane Matching
+====================================
+레인 매칭 후보 생성 (blocking) 레이어
+
+정확 매칭은 호출측 해시 조회로 처리하고, 유사도 매칭 전에 이 인덱스로
+후보 레인을 상위 cap개로 줄인다. ML 가중 유사도는 후보(shortlist)에만 계산.
+
+- 그램: 대문자 토큰("#TOKEN") + 패딩된 문자 trigram
+- 필드별(origin/destination) 역색인: gram → 레인 id 배열
+- 후보 점수: 0.6 * Dice(origin) + 0.4 * Dice(destination) (np.bincount 일괄 집계)
+- 겹치는 그램이 없는 레인은 후보에서 제외
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+# 기본 후보 상한 (질의당 ML 유사도 계산 레인 수)
+DEFAULT_CANDIDATE_CAP = 64
+
+
+def text_grams(text) -> Set[str]:
+    """대문자 토큰 + 문자 trigram 집합 (결측/빈 문자열 → 빈 집합)"""
+    if text is None or (not isinstance(text, str) and pd.isna(text)):
+        return set()
+
+    s = " ".join(str(text).upper().split())
+    if not s:
+        return set()
+
+    grams = {"#" + token for token in s.split()}
+    padded = f" {s} "
+    grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramBlocker:
+    """
+    (origin, destination) 텍스트 쌍 역색인 기반 후보 생성기
+
+    Args:
+        origins: 레인별 출발지 텍스트
+        destinations: 레인별 도착지 텍스트
+        weights: (origin, destination) 후보 점수 가중치
+    """
+
+    def __init__(
+        self,
+        origins: Sequence,
+        destinations: Sequence,
+        weights: Sequence[float] = (0.6, 0.4),
+    ):
+        if len(origins) != len(destinations):
+            raise ValueError("origins and destinations must have the same length")
+
+        self.n_lanes = len(origins)
+        self.weights = tuple(weights)
+        self.postings: List[Dict[str, np.ndarray]] = []
+        self.sizes: List[np.ndarray] = []
+
+        for texts in (origins, destinations):
+            postings: Dict[str, List[int]] = {}
+            sizes = np.zeros(self.n_lanes, dtype=np.float64)
+            for i, text in enumerate(texts):
+                grams = text_grams(text)
+                sizes[i] = len(grams)
+                for gram in grams:
+                    postings.setdefault(gram, []).append(i)
+            self.postings.append(
+                {g: np.asarray(ids, dtype=np.int64) for g, ids in postings.items()}
+            )
+            self.sizes.append(sizes)
+
+    def scores(self, origin, destination) -> np.ndarray:
+        """전체 레인 후보 점수 (그램 Dice 가중합)"""
+        total = np.zeros(self.n_lanes, dtype=np.float64)
+        for field, (text, weight) in enumerate(
+            zip((origin, destination), self.weights)
+        ):
+            grams = text_grams(text)
+            hits = [self.postings[field][g] for g in grams if g in self.postings[field]]
+            if not hits:
+                continue
+            shared = np.bincount(np.concatenate(hits), minlength=self.n_lanes)
+            total += weight * 2.0 * shared / (len(grams) + self.sizes[field])
+        return total
+
+    def shortlist(
+        self,
+        origin,
+        destination,
+        within: Optional[np.ndarray] = None,
+        cap: Optional[int] = DEFAULT_CANDIDATE_CAP,
+    ) -> List[int]:
+        """
+        후보 레인 id (오름차순 = 원래 레인 순서, 동점 처리 전체 순회와 동일)
+
+        Args:
+            origin, destination: 질의 텍스트
+            within: 후보 범위로 제한할 레인 id 배열 (차량/단위 버킷 등)
+            cap: 후보 상한 (None이면 blocking 없이 범위 전체 반환)
+        """
+        if cap is None:
+            ids = np.arange(self.n_lanes) if within is None else np.asarray(within)
+            return ids.tolist()
+
+        scores = self.scores(origin, destination)
+        if within is not None:
+            ids = np.asarray(within, dtype=np.int64)
+            scores = scores[ids]
+        else:
+            ids = np.arange(self.n_lanes)
+
+        hit = scores > 0
+        ids, scores = ids[hit], scores[hit]
+        if len(ids) > cap:
+            # 점수 내림차순, 동점은 앞 레인 우선
+            top = np.lexsort((ids, -scores))[:cap]
+            ids = ids[top]
+        return np.sort(ids).tolist()
+
+
+def first_index(keys: Iterable) -> Dict:
+    """키 → 첫 등장 위치 (정확 매칭 해시; 전체 순회 시 첫 레인과 동일)"""
+    index: Dict = {}
+    for i, key in enumerate(keys):
+        index.setdefault(key, i)
+    return index
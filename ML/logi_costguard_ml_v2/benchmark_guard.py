@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+guard.banding / canon rate_usd 벡터화 벤치마크
+
+- legacy: 행 단위 flags 리스트 컴프리헨션 + Series.apply(tier) + 통화 apply(axis=1)
+- vectorized: np.select 밴드 + flag_bits 비트 컬럼 + 환율 map 벡터
+
+동일성: band/delta_pct/ref_rate_usd/rate_usd 및 compose() export 시 flags 문자열 비교
+
+Usage:
+    python benchmark_guard.py [--rows 10000 100000 1000000] [--legacy-max 1000000]
+"""
+
+import argparse, json, sys, time
+from pathlib import Path
+
+import numpy as np, pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from src.guard import banding
+from src.reporter import compose
+
+CONF=json.loads((Path(__file__).parent / "config" / "schema.json").read_text(encoding="utf-8"))
+
+def legacy_rate_usd(d:pd.DataFrame, fx:dict)->pd.Series:
+    return d.apply(lambda r: float(r["rate"])*fx.get(r["currency"],1.0), axis=1)
+
+def legacy_banding(df:pd.DataFrame, bands:dict, tolerance:float, auto_fail:float)->pd.DataFrame:
+    d=df.copy()
+    d["ref_rate_usd"]=d["ref_rate_usd"].fillna(d.get("rate_ml"))
+    d["delta_pct"]= (d["rate_usd"]-d["ref_rate_usd"])/d["ref_rate_usd"]*100.0
+    if "rate_source" in d.columns:
+        at_cost_mask = d["rate_source"].str.upper().eq("AT-COST")
+        if "evidence_aed" in d.columns:
+            ref_at = d.loc[at_cost_mask, "evidence_aed"] * (1/3.6725)
+            d.loc[at_cost_mask, "ref_rate_usd"] = ref_at
+            d.loc[at_cost_mask, "delta_pct"] = (d.loc[at_cost_mask,"rate_usd"] - ref_at) / ref_at * 100.0
+    flags=[]
+    flags.append(d["ref_rate_usd"].isna().map({True:"MISSING_REF", False:""}))
+    flags.append(d["uom"].isna().map({True:"UNIT_MISMATCH", False:""}))
+    flags.append(d["currency"].ne("USD").map({True:"CURRENCY_MISMATCH", False:""}))
+    if "rate_source" in d.columns:
+        need_ev = d["rate_source"].str.upper().eq("AT-COST") & d["evidence_aed"].isna()
+        flags.append(need_ev.map({True:"EVIDENCE_INSUFFICIENT", False:""}))
+    d["flags"]=pd.Series([";".join([f[i] for f in flags if f[i]]) for i in range(len(d))])
+    def tier(v):
+        if pd.isna(v): return "NA"
+        a=abs(v)
+        if a > auto_fail: return "CRITICAL"
+        if a <= bands["pass"]: return "PASS"
+        if a <= bands["warn"]: return "WARN"
+        if a <= bands["high"]: return "HIGH"
+        return "CRITICAL"
+    d["band"]=d["delta_pct"].apply(tier)
+    if "anomaly_score" in d.columns:
+        mask = d["band"].isin(["HIGH","CRITICAL"]) & (d["anomaly_score"]<0.20)
+        d.loc[mask,"band"]="WARN"
+    return d
+
+def make_lines(n:int, seed:int=7)->pd.DataFrame:
+    rng=np.random.default_rng(seed)
+    ref=rng.uniform(50, 2000, n)
+    ref[rng.random(n)<0.05]=np.nan
+    rate_ml=np.where(rng.random(n)<0.5, ref*rng.normal(1, 0.05, n), np.nan)
+    currency=rng.choice(np.array(["USD","AED","EUR"], dtype=object), n, p=[0.6,0.35,0.05])
+    rate=np.round(np.nan_to_num(ref, nan=500.0)*rng.normal(1, 0.08, n), 2)
+    rate[rng.random(n)<0.01]=np.nan
+    d=pd.DataFrame({
+        "rate": rate, "currency": currency,
+        "ref_rate_usd": ref, "rate_ml": rate_ml,
+        "uom": np.where(rng.random(n)<0.03, None, rng.choice(np.array(["TRIP","TON","CBM"], dtype=object), n)),
+        "rate_source": np.where(rng.random(n)<0.1, "AT-COST", np.where(rng.random(n)<0.5, "CONTRACT", None)),
+        "evidence_aed": np.where(rng.random(n)<0.5, rng.uniform(100, 5000, n), np.nan),
+        "anomaly_score": rng.random(n),
+    })
+    return d
+
+def run(n:int, legacy:bool):
+    guard=CONF["guard"]; fx=CONF["fx"]
+    base=make_lines(n)
+
+    t=time.perf_counter()
+    new=base.copy()
+    new["rate_usd"]=new["rate"].astype(float)*new["currency"].map(fx).fillna(1.0).astype(float)
+    t_fx=time.perf_counter()-t
+    t=time.perf_counter()
+    new=banding(new, guard["bands"], guard["tolerance"], guard["auto_fail"])
+    t_band=time.perf_counter()-t
+    t=time.perf_counter()
+    rep_new=compose(new)
+    t_export=time.perf_counter()-t
+    print(f"\n[{n:,} rows]")
+    print(f"  vectorized : fx {t_fx:.3f}s  banding {t_band:.3f}s  export(decode) {t_export:.3f}s")
+
+    if not legacy:
+        print("  legacy     : skipped (--legacy-max)")
+        return
+    t=time.perf_counter()
+    old=base.copy()
+    old["rate_usd"]=legacy_rate_usd(old, fx)
+    t_fx_old=time.perf_counter()-t
+    t=time.perf_counter()
+    old=legacy_banding(old, guard["bands"], guard["tolerance"], guard["auto_fail"])
+    t_band_old=time.perf_counter()-t
+    rep_old=compose(old)
+    print(f"  legacy     : fx {t_fx_old:.3f}s  banding {t_band_old:.3f}s")
+    print(f"  speedup    : fx {t_fx_old/t_fx:,.0f}x  banding {t_band_old/t_band:,.0f}x")
+
+    cols=["rate_usd","ref_rate_usd","delta_pct","band"]
+    pd.testing.assert_frame_equal(new[cols], old[cols])
+    pd.testing.assert_frame_equal(rep_new, rep_old)
+    print("  identical  : yes")
+
+def main():
+    ap=argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--legacy-max", type=int, default=1_000_000)
+    args=ap.parse_args()
+    for n in args.rows:
+        run(n, legacy=n<=args.legacy_max)
+
+if __name__=="__main__":
+    main()
@@ -1,61 +1,50 @@
 
-import argparse, json
+import argparse, json, time
+from pathlib import Path
 import pandas as pd
 from src.io_utils import load_config, read_table, map_columns, write_excel
 from src.canon import canon
 from src.rules_ref import ref_join
 from src.model_reg import infer as infer_reg
 from src.model_iso import score as score_iso
+from src.model_store import ModelStore
 from src.guard import banding
 from src.reporter import compose
 from src.artifact import save_artifact
-from src.similarity import suggest_lane
+from src.similarity import LaneSuggester
 
-if __name__=="__main__":
-    ap=argparse.ArgumentParser()
-    ap.add_argument("--data", required=True)
-    ap.add_argument("--conf", default="config/schema.json")
-    ap.add_argument("--ref", default="ref/ref_rates.csv")
-    ap.add_argument("--lane", default="ref/lane_median_ewma.csv")
-    ap.add_argument("--models", default="models")
-    ap.add_argument("--out", default="out/costguard_report.xlsx")
-    args=ap.parse_args()
-
-    conf=load_config(args.conf)
-    df=read_table(args.data)
-    df=map_columns(df, conf)
-    try:
-        lane_map = pd.read_csv("ref/ApprovedLaneMap.csv")
-    except Exception:
-        lane_map = None
-    df=canon(df, conf["fx"], lane_map)
-
-    ref_rates=None; lane_median=None; unit_map=None
-    try: ref_rates=read_table(args.ref)
+def load_refs(args)->dict:
+    refs={"lane_map":None, "ref_rates":None, "lane_median":None, "unit_map":None}
+    try: refs["lane_map"]=pd.read_csv("ref/ApprovedLaneMap.csv")
+    except Exception: pass
+    try: refs["ref_rates"]=read_table(args.ref)
+    except Exception: pass
+    try: refs["lane_median"]=read_table(args.lane)
     except Exception: pass
-    try: lane_median=read_table(args.lane)
+    try: refs["unit_map"]=pd.read_csv("ref/unit_map.csv")
     except Exception: pass
-    try: unit_map=pd.read_csv("ref/unit_map.csv")
-    except Exception: unit_map=None
+    refs["suggester"]=LaneSuggester(refs["lane_median"])
+    return refs
 
-    df=ref_join(df, ref_rates, lane_median, unit_map)
-    df=infer_reg(df, args.models)
+def score_batch(data_path:str, out_path:str, artifact_path:str, conf:dict, refs:dict, store:ModelStore, quantiles:bool=True):
+    df=read_table(data_path)
+    df=map_columns(df, conf)
+    df=canon(df, conf["fx"], refs["lane_map"])
+
+    df=ref_join(df, refs["ref_rates"], refs["lane_median"], refs["unit_map"])
+    df=infer_reg(df, str(store.model_dir), store=store, quantiles=quantiles)
     try:
-        df=score_iso(df, f"{args.models}/iforest.joblib")
+        df=score_iso(df, str(store.path("iso")), store=store)
     except Exception:
         df["anomaly_score"]=0.0
 
     guard=conf["guard"]; bands=guard["bands"]
     df=banding(df, bands, guard["tolerance"], guard["auto_fail"])
 
-    suggestions={}
-    if lane_median is not None and not lane_median.empty:
-        for idx, row in df.iterrows():
-            sug = suggest_lane(row, lane_median, thr=conf.get("lane_similarity_threshold",0.60))
-            if sug: suggestions[idx]=sug
+    suggestions=refs["suggester"].suggest_frame(df, thr=conf.get("lane_similarity_threshold",0.60))
 
     rep=compose(df)
-    write_excel(rep, args.out)
+    write_excel(rep, out_path)
 
     try:
         with open("out/metrics.json","r",encoding="utf-8") as f:
@@ -69,5 +58,51 @@ if __name__=="__main__":
         "auto_fail_pct": guard["auto_fail"],
         "bands": bands
     }
-    save_artifact(rep, "out/proof_artifact.json", policy=policy, suggestions=suggestions, metrics=metrics)
-    print(f"✅ saved: {args.out}")
+    save_artifact(rep, artifact_path, policy=policy, suggestions=suggestions, metrics=metrics)
+    print(f"✅ saved: {out_path}")
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("--data", required=True, nargs="+", help="배치 파일(여러 개면 모델을 상주시킨 채 순차 처리)")
+    ap.add_argument("--conf", default="config/schema.json")
+    ap.add_argument("--ref", default="ref/ref_rates.csv")
+    ap.add_argument("--lane", default="ref/lane_median_ewma.csv")
+    ap.add_argument("--models", default="models")
+    ap.add_argument("--out", default="out/costguard_report.xlsx")
+    ap.add_argument("--repeat", type=int, default=1, help="같은 배치 반복 (warm 지연 측정)")
+    ap.add_argument("--no-quantiles", action="store_true", help="분위수 모델(ml_p10/ml_p90) 로드 생략")
+    ap.add_argument("--no-mmap", action="store_true")
+    args=ap.parse_args()
+
+    conf=load_config(args.conf)
+    refs=load_refs(args)
+    store=ModelStore.shared(args.models, mmap_mode=None if args.no_mmap else "r")
+
+    batches=[p for p in args.data for _ in range(args.repeat)]
+    out=Path(args.out); latency=[]
+    for i, data_path in enumerate(batches):
+        if len(batches)==1:
+            out_path, artifact_path = str(out), "out/proof_artifact.json"
+        else:
+            tag=f"{Path(data_path).stem}_{i+1}"
+            out_path=str(out.with_name(f"{out.stem}_{tag}{out.suffix}"))
+            artifact_path=f"out/proof_artifact_{tag}.json"
+        before=dict(store.load_seconds)
+        t=time.perf_counter()
+        score_batch(data_path, out_path, artifact_path, conf, refs, store, quantiles=not args.no_quantiles)
+        elapsed=time.perf_counter()-t
+        load_s=sum(v for k,v in store.load_seconds.items() if before.get(k)!=v)
+        mode="cold" if load_s>0 else "warm"
+        latency.append({"batch":data_path, "mode":mode, "seconds":round(elapsed,4), "model_load_seconds":round(load_s,4)})
+        print(f"⏱ {mode}: {elapsed:.2f}s (model load {load_s:.2f}s) — {data_path}")
+
+    cold=[r["seconds"] for r in latency if r["mode"]=="cold"]
+    warm=[r["seconds"] for r in latency if r["mode"]=="warm"]
+    summary={"cold_seconds":cold, "warm_seconds":warm,
+             "warm_mean_seconds": round(sum(warm)/len(warm),4) if warm else None,
+             "model_load_seconds":{k:round(v,4) for k,v in store.load_seconds.items()},
+             "batches":latency}
+    Path("out").mkdir(exist_ok=True)
+    with open("out/scoring_latency.json","w",encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    if warm: print(f"⏱ cold {cold[0] if cold else 0:.2f}s / warm mean {summary['warm_mean_seconds']:.2f}s")
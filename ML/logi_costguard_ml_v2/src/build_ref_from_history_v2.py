@@ -4,6 +4,10 @@ from pathlib import Path
 from io_utils import load_config, read_table, map_columns
 from canon import canon
 
+KEYS=["category","origin_canon","dest_canon","uom"]
+ALPHA=0.85
+STATE_COLS=KEYS+["median_rate_usd","last_ym","n_months"]
+
 def ewma_by_month(series, alpha=0.85):
     vals=series.values
     if len(vals)==0: return np.nan
@@ -12,11 +16,75 @@ def ewma_by_month(series, alpha=0.85):
         s = v if s is None else alpha*v + (1-alpha)*s
     return s
 
+def monthly_medians(df:pd.DataFrame)->pd.DataFrame:
+    return (df
+        .groupby(KEYS+["ym"])["rate_usd"]
+        .median()
+        .reset_index())
+
+def empty_state()->pd.DataFrame:
+    return pd.DataFrame({c: pd.Series(dtype=float if c=="median_rate_usd" else int if c=="n_months" else object)
+                         for c in STATE_COLS})
+
+def load_state(path)->pd.DataFrame:
+    if path is None or not Path(path).exists(): return empty_state()
+    return pd.read_csv(path, dtype={c:str for c in KEYS+["last_ym"]}, keep_default_na=False,
+                       na_values={"median_rate_usd":[""]}, float_precision="round_trip")
+
+def save_state(state:pd.DataFrame, path):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    state[STATE_COLS].to_csv(path, index=False)
+
+def update_ewma_state(grp:pd.DataFrame, state:pd.DataFrame|None=None, alpha:float=ALPHA)->pd.DataFrame:
+    """
+    레인별 월 중앙값 → 비조정(adjust=False) EWMA 일괄 계산
+    s_0 = v_0, s_t = alpha*v_t + (1-alpha)*s_{t-1} (ewma_by_month와 동일 연산 순서, NaN 전파 포함)
+
+    state(레인별 ewma/last_ym/n_months)가 주어지면 그 이후 월만 반영 (증분 갱신).
+    last_ym 이하 월은 이미 반영된 것으로 보고 무시.
+    """
+    state=empty_state() if state is None else state
+    lanes=(pd.concat([state[KEYS], grp[KEYS]], ignore_index=True)
+           .drop_duplicates().sort_values(KEYS, kind="stable").reset_index(drop=True))
+    lane_index=pd.MultiIndex.from_frame(lanes)
+
+    s=np.full(len(lanes), np.nan); has=np.zeros(len(lanes), dtype=bool)
+    last_ym=np.full(len(lanes), None, dtype=object); n_months=np.zeros(len(lanes), dtype=np.int64)
+    if len(state):
+        sid=lane_index.get_indexer(pd.MultiIndex.from_frame(state[KEYS]))
+        s[sid]=state["median_rate_usd"].to_numpy(dtype=float); has[sid]=True
+        last_ym[sid]=state["last_ym"].to_numpy(dtype=object); n_months[sid]=state["n_months"].to_numpy()
+
+    g=grp.sort_values(KEYS+["ym"], kind="stable")
+    codes=lane_index.get_indexer(pd.MultiIndex.from_frame(g[KEYS]))
+    ym=g["ym"].to_numpy(dtype=object)
+    last=last_ym[codes]
+    fresh=pd.isna(last) | (ym > np.where(pd.isna(last), "", last))
+    stale=int((~fresh).sum())
+    if stale: print(f"⚠️ 이미 반영된 월 {stale}건 무시 (레인별 last_ym 이하)")
+    codes, ym, vals = codes[fresh], ym[fresh], g["rate_usd"].to_numpy(dtype=float)[fresh]
+
+    # 레인 내 월 순번별로 전 레인 동시 갱신 (루프 횟수 = 최대 월 수)
+    pos=pd.Series(codes).groupby(codes).cumcount().to_numpy()
+    order=np.argsort(pos, kind="stable")
+    bounds=np.searchsorted(pos[order], np.arange(pos.max()+2 if len(pos) else 1))
+    for k in range(len(bounds)-1):
+        rows=order[bounds[k]:bounds[k+1]]
+        lane=codes[rows]; v=vals[rows]
+        s[lane]=np.where(has[lane], alpha*v + (1-alpha)*s[lane], v)
+        has[lane]=True; last_ym[lane]=ym[rows]; n_months[lane]+=1
+
+    out=lanes.copy()
+    out["median_rate_usd"]=s; out["last_ym"]=last_ym; out["n_months"]=n_months
+    return out
+
 if __name__=="__main__":
     ap=argparse.ArgumentParser()
     ap.add_argument("--data", required=True)
     ap.add_argument("--conf", required=True)
     ap.add_argument("--out", required=True)
+    ap.add_argument("--state", default=None, help="레인별 EWMA 상태 CSV (다음 실행의 증분 입력)")
+    ap.add_argument("--incremental", action="store_true", help="--data는 신규 월만 포함; --state에서 이어서 갱신")
     args=ap.parse_args()
 
     conf=load_config(args.conf)
@@ -27,19 +95,11 @@ if __name__=="__main__":
     if "ym" not in df.columns:
         raise SystemExit("date/ym not available in data. Provide date column.")
 
-    grp = (df
-        .groupby(["category","origin_canon","dest_canon","uom","ym"])["rate_usd"]
-        .median()
-        .reset_index())
+    state=load_state(args.state) if args.incremental else None
+    state=update_ewma_state(monthly_medians(df), state, alpha=ALPHA)
+    if args.state: save_state(state, args.state)
 
-    out_rows=[]
-    for key, sub in grp.groupby(["category","origin_canon","dest_canon","uom"], as_index=False):
-        sub = sub.sort_values("ym")
-        ew = ewma_by_month(sub["rate_usd"], alpha=0.85)
-        row=dict(zip(["category","origin_canon","dest_canon","uom"], key))
-        row["median_rate_usd"]=ew
-        out_rows.append(row)
-    out = pd.DataFrame(out_rows)
+    out = state[KEYS+["median_rate_usd"]]
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
     out.to_csv(args.out, index=False)
     print(f"✅ lane median (EWMA) saved: {args.out} ({len(out)} lanes)")
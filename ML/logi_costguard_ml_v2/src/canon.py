@@ -1,18 +1,30 @@
 
 import re, numpy as np, pandas as pd
+from functools import lru_cache
 
-def norm_port(x):
-    if not isinstance(x,str): return x
+_WS=re.compile(r"\s+")
+
+@lru_cache(maxsize=65536)
+def _norm_port_str(x:str)->str:
     x=x.upper().strip()
     x=x.replace(" PORT","")
-    x=re.sub(r"\s+"," ",x)
+    x=_WS.sub(" ",x)
     return x
 
+def norm_port(x):
+    if not isinstance(x,str): return x
+    return _norm_port_str(x)
+
+def norm_port_col(s:pd.Series)->pd.Series:
+    # 고유값만 정규화 후 매핑 (행 수가 아닌 고유 지명 수에 비례)
+    m={v:norm_port(v) for v in s.dropna().unique()}
+    return s.map(m).where(s.notna(), s)
+
 def apply_lane_map(df:pd.DataFrame, lane_map:pd.DataFrame|None)->pd.DataFrame:
     d=df.copy()
     if lane_map is None or lane_map.empty:
-        d["origin_canon"]=d["origin"].map(norm_port)
-        d["dest_canon"]=d["dest"].map(norm_port)
+        d["origin_canon"]=norm_port_col(d["origin"])
+        d["dest_canon"]=norm_port_col(d["dest"])
         return d
     lm=lane_map.copy()
     lm["OriginRaw"]=lm["OriginRaw"].astype(str).str.upper().str.strip()
@@ -21,8 +33,8 @@ def apply_lane_map(df:pd.DataFrame, lane_map:pd.DataFrame|None)->pd.DataFrame:
     d["dest_u"]=d["dest"].astype(str).str.upper().str.strip()
     d=d.merge(lm[["OriginRaw","OriginCanon"]], left_on="origin_u", right_on="OriginRaw", how="left")
     d=d.merge(lm[["DestinationRaw","DestinationCanon"]], left_on="dest_u", right_on="DestinationRaw", how="left")
-    d["origin_canon"]=d["OriginCanon"].fillna(d["origin_u"]).apply(norm_port)
-    d["dest_canon"]=d["DestinationCanon"].fillna(d["dest_u"]).apply(norm_port)
+    d["origin_canon"]=norm_port_col(d["OriginCanon"].fillna(d["origin_u"]))
+    d["dest_canon"]=norm_port_col(d["DestinationCanon"].fillna(d["dest_u"]))
     d=d.drop(columns=[c for c in ["origin_u","dest_u","OriginRaw","DestinationRaw","OriginCanon","DestinationCanon"] if c in d.columns])
     return d
 
@@ -32,7 +44,8 @@ def canon(df:pd.DataFrame, fx:dict, lane_map:pd.DataFrame|None)->pd.DataFrame:
         if c in d.columns: d[c]=d[c].astype(str).str.strip().str.upper()
     d=apply_lane_map(d, lane_map)
     if "rate" in d.columns:
-        d["rate_usd"]=d.apply(lambda r: float(r["rate"])*fx.get(r["currency"],1.0), axis=1)
+        # 통화별 환율 벡터 (미등록 통화는 1.0)
+        d["rate_usd"]=d["rate"].astype(float)*d["currency"].map(fx).fillna(1.0).astype(float)
     d["log_qty"]=np.log1p(d.get("qty",0))
     d["log_wt"]=np.log1p(d.get("weight",0))
     d["log_cbm"]=np.log1p(d.get("volume",0))
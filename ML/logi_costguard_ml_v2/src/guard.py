@@ -1,35 +1,48 @@
 
 import pandas as pd, numpy as np
 
+# 플래그 비트 (flag_bits 정수 컬럼; 문자열 flags는 export 시 decode_flags로 변환)
+MISSING_REF=1
+UNIT_MISMATCH=2
+CURRENCY_MISMATCH=4
+EVIDENCE_INSUFFICIENT=8
+FLAG_NAMES=[(MISSING_REF,"MISSING_REF"),(UNIT_MISMATCH,"UNIT_MISMATCH"),
+            (CURRENCY_MISMATCH,"CURRENCY_MISMATCH"),(EVIDENCE_INSUFFICIENT,"EVIDENCE_INSUFFICIENT")]
+# 비트 조합(0-15) → "A;B" 문자열 테이블
+_FLAG_TABLE=np.array([";".join(n for b,n in FLAG_NAMES if code & b) for code in range(16)], dtype=object)
+
+def decode_flags(bits)->pd.Series:
+    b=pd.Series(bits)
+    return pd.Series(_FLAG_TABLE[b.to_numpy(dtype=np.int64)], index=b.index, name="flags")
+
+def tier_bands(delta_pct, bands:dict, auto_fail:float)->np.ndarray:
+    v=np.asarray(delta_pct, dtype=float)
+    a=np.abs(v)
+    with np.errstate(invalid="ignore"):
+        return np.select([np.isnan(v), a>auto_fail, a<=bands["pass"], a<=bands["warn"], a<=bands["high"]],
+                         ["NA","CRITICAL","PASS","WARN","HIGH"], default="CRITICAL").astype(object)
+
 def banding(df:pd.DataFrame, bands:dict, tolerance:float, auto_fail:float)->pd.DataFrame:
     d=df.copy()
     d["ref_rate_usd"]=d["ref_rate_usd"].fillna(d.get("rate_ml"))
     d["delta_pct"]= (d["rate_usd"]-d["ref_rate_usd"])/d["ref_rate_usd"]*100.0
+    at_cost_mask=None
     if "rate_source" in d.columns:
         at_cost_mask = d["rate_source"].str.upper().eq("AT-COST")
         if "evidence_aed" in d.columns:
             ref_at = d.loc[at_cost_mask, "evidence_aed"] * (1/3.6725)
             d.loc[at_cost_mask, "ref_rate_usd"] = ref_at
             d.loc[at_cost_mask, "delta_pct"] = (d.loc[at_cost_mask,"rate_usd"] - ref_at) / ref_at * 100.0
-    flags=[]
-    flags.append(d["ref_rate_usd"].isna().map({True:"MISSING_REF", False:""}))
-    flags.append(d["uom"].isna().map({True:"UNIT_MISMATCH", False:""}))
-    flags.append(d["currency"].ne("USD").map({True:"CURRENCY_MISMATCH", False:""}))
-    if "rate_source" in d.columns:
-        need_ev = d["rate_source"].str.upper().eq("AT-COST") & d["evidence_aed"].isna()
-        flags.append(need_ev.map({True:"EVIDENCE_INSUFFICIENT", False:""}))
-    d["flags"]=";".join([])
-    d["flags"]=pd.Series([";".join([f[i] for f in flags if f[i]]) for i in range(len(d))])
-    def tier(v):
-        if pd.isna(v): return "NA"
-        a=abs(v)
-        if a > auto_fail: return "CRITICAL"
-        if a <= bands["pass"]: return "PASS"
-        if a <= bands["warn"]: return "WARN"
-        if a <= bands["high"]: return "HIGH"
-        return "CRITICAL"
-    d["band"]=d["delta_pct"].apply(tier)
+    bits=(d["ref_rate_usd"].isna().to_numpy()*MISSING_REF
+          | d["uom"].isna().to_numpy()*UNIT_MISMATCH
+          | d["currency"].ne("USD").to_numpy()*CURRENCY_MISMATCH)
+    if at_cost_mask is not None:
+        need_ev = at_cost_mask & d["evidence_aed"].isna()
+        bits|=need_ev.to_numpy()*EVIDENCE_INSUFFICIENT
+    d["flag_bits"]=bits.astype(np.uint8)
+    band=tier_bands(d["delta_pct"], bands, auto_fail)
     if "anomaly_score" in d.columns:
-        mask = d["band"].isin(["HIGH","CRITICAL"]) & (d["anomaly_score"]<0.20)
-        d.loc[mask,"band"]="WARN"
+        mask = np.isin(band, ["HIGH","CRITICAL"]) & (d["anomaly_score"]<0.20).to_numpy()
+        band[mask]="WARN"
+    d["band"]=band
     return d
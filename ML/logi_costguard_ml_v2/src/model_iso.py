@@ -1,21 +1,36 @@
 
 import numpy as np, pandas as pd
+from pathlib import Path
 from sklearn.ensemble import IsolationForest
 from joblib import dump, load
+from src.model_store import ModelStore
 
 FEATS=["rate_usd","ref_rate_usd","rate_ml","log_qty","log_wt","log_cbm"]
 
 def fit(df:pd.DataFrame, out_path:str):
-    x=df[FEATS].copy().fillna(df[FEATS].median())
+    med=df[FEATS].median()
+    x=df[FEATS].copy().fillna(med)
     iso=IsolationForest(n_estimators=400, contamination="auto", random_state=42)
     iso.fit(x)
-    dump({"iso":iso,"feats":FEATS}, out_path)
-
-def score(df:pd.DataFrame, model_path:str)->pd.DataFrame:
-    payload=load(model_path); iso, feats = payload["iso"], payload["feats"]
-    x=df[feats].copy().fillna(df[feats].median())
     s=-iso.score_samples(x)
+    # 학습 분포 기준 정규화용 (배치 크기와 무관한 점수)
+    ref={"min":float(np.min(s)), "max":float(np.max(s))}
+    dump({"iso":iso,"feats":FEATS,"medians":med.to_dict(),"score_ref":ref}, out_path)
+
+def normalize(s:np.ndarray, payload:dict)->np.ndarray:
+    """raw 점수(-score_samples) → 0~1. score_ref 없는 구 모델은 배치 min-max"""
+    ref=payload.get("score_ref")
+    if ref:
+        return np.clip((s - ref["min"]) / (ref["max"] - ref["min"] + 1e-9), 0.0, 1.0)
     s_min, s_max = float(np.min(s)), float(np.max(s))
-    s_norm = (s - s_min) / (s_max - s_min + 1e-9)
+    return (s - s_min) / (s_max - s_min + 1e-9)
+
+def score(df:pd.DataFrame, model_path:str, store:ModelStore|None=None)->pd.DataFrame:
+    p=Path(model_path)
+    store=store or ModelStore.shared(str(p.parent))
+    payload=store.get(p.name); iso, feats = payload["iso"], payload["feats"]
+    x=df[feats].copy().fillna(payload.get("medians") or df[feats].median())
+    s=-iso.score_samples(x)
+    s_norm = normalize(s, payload)
     d=df.copy(); d["anomaly_score"]=s_norm
     return d
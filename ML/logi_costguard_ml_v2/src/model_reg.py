@@ -1,75 +1,47 @@
 
-from joblib import dump, load
 import numpy as np, pandas as pd
+from scipy import sparse
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.model_selection import GroupKFold
-from sklearn.metrics import mean_absolute_percentage_error
+from src.model_store import ModelStore
 
 CAT=["origin_canon","dest_canon","category","uom"]
 NUM=["log_qty","log_wt","log_cbm"]
 TARGET="rate_usd"
 
-def build_rf():
-    pre=ColumnTransformer(
-        [("cat", OneHotEncoder(handle_unknown="ignore", sparse_output=False), CAT),
+def build_pre():
+    # 포트/레인 고카디널리티 컬럼 → 희소 one-hot (CSR 유지, 밀집 행렬 미생성)
+    return ColumnTransformer(
+        [("cat", OneHotEncoder(handle_unknown="ignore", sparse_output=True), CAT),
          ("num", "passthrough", NUM)],
-        remainder="drop"
+        remainder="drop", sparse_threshold=1.0
     )
-    model=RandomForestRegressor(n_estimators=500, max_depth=14, random_state=42, n_jobs=-1)
-    return Pipeline([("pre",pre),("model",model)])
 
-def build_gb_quantile(q:float):
-    pre=ColumnTransformer(
-        [("cat", OneHotEncoder(handle_unknown="ignore", sparse_output=False), CAT),
-         ("num", "passthrough", NUM)],
-        remainder="drop"
-    )
-    model=GradientBoostingRegressor(loss="quantile", alpha=q, random_state=42)
-    return Pipeline([("pre",pre),("model",model)])
-
-def evaluate_time_aware(df:pd.DataFrame, n_splits=5):
-    X=df[CAT+NUM]; y=df[TARGET]
-    if "ym" in df.columns:
-        groups = df["ym"].astype(str)
-    else:
-        groups = df["origin_canon"] + "|" + df["dest_canon"]
-    gkf=GroupKFold(n_splits=min(n_splits, max(2, groups.nunique())))
-    rf = build_rf()
-    mape_scores=[]
-    for tr, va in gkf.split(X, y, groups):
-        rf.fit(X.iloc[tr], y.iloc[tr])
-        pred=rf.predict(X.iloc[va])
-        pred=np.clip(pred,1e-6,None)
-        mape=mean_absolute_percentage_error(y.iloc[va], pred)
-        mape_scores.append(mape)
-    return float(np.mean(mape_scores))
+def predict_sparse(pipe:Pipeline, X:pd.DataFrame)->np.ndarray:
+    # 밀집 one-hot으로 학습된 기존 아티팩트는 전처리 출력만 CSR로 변환 (예측값 동일)
+    # ModelStore가 공유하는 적합된 파이프라인은 수정하지 않음
+    Xt=pipe[:-1].transform(X)
+    if not sparse.issparse(Xt): Xt=sparse.csr_matrix(Xt)
+    return pipe[-1].predict(Xt)
 
-def train(df:pd.DataFrame, out_dir:str):
-    from pathlib import Path
-    Path(out_dir).mkdir(parents=True, exist_ok=True)
-    train=df.dropna(subset=[TARGET]).copy()
-    mape = evaluate_time_aware(train)
-    rf = build_rf()
-    rf.fit(train[CAT+NUM], train[TARGET])
-    dump(rf, f"{out_dir}/rate_rf.joblib")
-    gb10=build_gb_quantile(0.10); gb50=build_gb_quantile(0.50); gb90=build_gb_quantile(0.90)
-    gb10.fit(train[CAT+NUM], train[TARGET]); dump(gb10, f"{out_dir}/gb_q10.joblib")
-    gb50.fit(train[CAT+NUM], train[TARGET]); dump(gb50, f"{out_dir}/gb_q50.joblib")
-    gb90.fit(train[CAT+NUM], train[TARGET]); dump(gb90, f"{out_dir}/gb_q90.joblib")
-    return {"mape": mape}
+def train(df:pd.DataFrame, out_dir:str, params:dict|None=None, workers:int|None=None, cache_dir:str|None=None):
+    # 인코딩 1회 공유 + 분위수 모델 동시 학습 + 폴드/모델 캐시 (src/train_engine.py)
+    from src.train_engine import TrainingEngine
+    return TrainingEngine(out_dir, params=params, workers=workers, cache_dir=cache_dir).run(df)
 
-def infer(df:pd.DataFrame, model_dir:str)->pd.DataFrame:
-    from joblib import load
-    rf=load(f"{model_dir}/rate_rf.joblib")
+def infer(df:pd.DataFrame, model_dir:str, store:ModelStore|None=None, quantiles:bool=True)->pd.DataFrame:
+    store=store or ModelStore.shared(model_dir)
+    rf=store.get("rf")
     d=df.copy()
     feats=["origin_canon","dest_canon","category","uom","log_qty","log_wt","log_cbm"]
-    d["rate_ml"]=rf.predict(d[feats])
-    try:
-        gb10=load(f"{model_dir}/gb_q10.joblib"); gb90=load(f"{model_dir}/gb_q90.joblib")
-        d["ml_p10"]=gb10.predict(d[feats]); d["ml_p90"]=gb90.predict(d[feats])
-    except Exception:
-        d["ml_p10"]=np.nan; d["ml_p90"]=np.nan
+    d["rate_ml"]=predict_sparse(rf, d[feats])
+    d["ml_p10"]=np.nan; d["ml_p90"]=np.nan
+    if quantiles:
+        # 분위수 모델은 요청 시에만 로드
+        try:
+            gb10=store.get("q10"); gb90=store.get("q90")
+            d["ml_p10"]=predict_sparse(gb10, d[feats]); d["ml_p90"]=predict_sparse(gb90, d[feats])
+        except Exception:
+            d["ml_p10"]=np.nan; d["ml_p90"]=np.nan
     return d
@@ -0,0 +1,62 @@
+
+import time
+from pathlib import Path
+from joblib import load
+
+# 모델 파일명 (train.py 산출물)
+ARTIFACTS={
+    "rf":"rate_rf.joblib",
+    "q10":"gb_q10.joblib",
+    "q50":"gb_q50.joblib",
+    "q90":"gb_q90.joblib",
+    "iso":"iforest.joblib",
+}
+# 파일명 → 모델명 (store.get("iforest.joblib")와 store.get("iso")가 같은 캐시 항목 사용)
+ARTIFACT_NAMES={v:k for k,v in ARTIFACTS.items()}
+
+class ModelStore:
+    """
+    모델 아티팩트 지연 로딩 + 상주 캐시
+
+    - joblib.load(mmap_mode="r"): 비압축 덤프의 numpy 배열을 파일에서 메모리 매핑
+    - 요청된 모델만 로드 (분위수 모델은 ml_p10/ml_p90 요청 시에만)
+    - 같은 프로세스에서 여러 배치를 처리하면 로드된 모델을 재사용 (shared)
+    - 파일 mtime이 바뀌면 해당 모델만 다시 로드
+    """
+    _shared={}
+
+    def __init__(self, model_dir:str, mmap_mode:str|None="r"):
+        self.model_dir=Path(model_dir)
+        self.mmap_mode=mmap_mode
+        self._models={}
+        self.load_seconds={}
+
+    @classmethod
+    def shared(cls, model_dir:str, mmap_mode:str|None="r")->"ModelStore":
+        key=(str(Path(model_dir).resolve()), mmap_mode)
+        if key not in cls._shared:
+            cls._shared[key]=cls(model_dir, mmap_mode)
+        return cls._shared[key]
+
+    @staticmethod
+    def key(name:str)->str:
+        return ARTIFACT_NAMES.get(name, name)
+
+    def path(self, name:str)->Path:
+        return self.model_dir / ARTIFACTS.get(name, name)
+
+    def get(self, name:str):
+        # 파일이 재학습으로 교체되면(mtime 변경) 다시 로드
+        name=self.key(name); path=self.path(name); mtime=path.stat().st_mtime_ns
+        cached=self._models.get(name)
+        if cached is None or cached[0]!=mtime:
+            t=time.perf_counter()
+            self._models[name]=(mtime, load(path, mmap_mode=self.mmap_mode))
+            self.load_seconds[name]=time.perf_counter()-t
+        return self._models[name][1]
+
+    def loaded(self)->list:
+        return list(self._models)
+
+    def clear(self):
+        self._models.clear(); self.load_seconds.clear()
@@ -1,5 +1,5 @@
 
-import difflib, pandas as pd
+import difflib, numpy as np, pandas as pd
 
 def lane_similarity(origin, dest, cand_origin, cand_dest):
     s1=difflib.SequenceMatcher(None, str(origin), str(cand_origin)).ratio()
@@ -15,3 +15,91 @@ def suggest_lane(row, lane_table:pd.DataFrame, thr:float=0.60):
     if best_s>=thr:
         return {"candidate_lane": f"{best['category']}|{best['origin_canon']}|{best['dest_canon']}|{best['uom']}", "similarity": round(float(best_s),2)}
     return None
+
+def _sm_ratio(a:str, b:str)->float:
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+class _CharIndex:
+    # 문자 1-gram 히스토그램 → SequenceMatcher.quick_ratio (ratio 상한) 일괄 계산
+    def __init__(self, texts:list):
+        self.texts=texts
+        self.alphabet={}
+        for t in texts:
+            for ch in t: self.alphabet.setdefault(ch, len(self.alphabet))
+        self.counts=np.zeros((len(texts), len(self.alphabet)+1), dtype=np.int32)
+        for i,t in enumerate(texts):
+            for ch in t: self.counts[i, self.alphabet[ch]]+=1
+        self.lengths=np.array([len(t) for t in texts], dtype=np.int64)
+
+    def upper_bound(self, text:str)->np.ndarray:
+        q=np.zeros(self.counts.shape[1], dtype=np.int32)
+        for ch in text: q[self.alphabet.get(ch, -1)]+=1   # 미등록 문자는 마지막 칸 (겹침 없음)
+        q[-1]=0
+        matches=np.minimum(self.counts, q).sum(axis=1)
+        total=self.lengths+len(text)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total>0, 2.0*matches/total, 1.0)
+
+class LaneSuggester:
+    """
+    suggest_lane 일괄 버전 (행마다 전체 레인 순회와 동일 결과)
+
+    - 레인/질의 양쪽 (origin_canon, dest_canon) 문자열 쌍 중복 제거
+    - origin/dest 고유 문자열별 문자 히스토그램으로 quick_ratio 상한 일괄 계산
+    - 상한 내림차순으로 정확 ratio 계산, 상한 < 현재 최고점이면 중단 (동점은 앞 레인 우선)
+    """
+    def __init__(self, lane_table:pd.DataFrame):
+        self.lane_table=lane_table
+        if lane_table is None or lane_table.empty:
+            self.n_pairs=0; return
+        o=lane_table["origin_canon"].map(str).to_numpy(dtype=object)
+        dd=lane_table["dest_canon"].map(str).to_numpy(dtype=object)
+        o_codes, o_uniq = pd.factorize(o)
+        d_codes, d_uniq = pd.factorize(dd)
+        # 같은 (origin, dest) 쌍은 첫 레인만 최고점이 될 수 있음
+        pair_codes=o_codes.astype(np.int64)*len(d_uniq)+d_codes
+        _, first=np.unique(pair_codes, return_index=True)
+        self.lane_pos=np.sort(first)
+        self.pair_o=o_codes[self.lane_pos]; self.pair_d=d_codes[self.lane_pos]
+        self.n_pairs=len(self.lane_pos)
+        self.origins=_CharIndex(list(o_uniq)); self.dests=_CharIndex(list(d_uniq))
+        self._o_cache={}; self._d_cache={}
+
+    def _ratio(self, cache:dict, index:_CharIndex, q:str, k:int)->float:
+        key=(q, k)
+        r=cache.get(key)
+        if r is None: r=cache[key]=_sm_ratio(q, index.texts[k])
+        return r
+
+    def best(self, origin, dest):
+        if self.n_pairs==0: return None, -1.0
+        qo, qd = str(origin), str(dest)
+        ub=0.5*self.origins.upper_bound(qo)[self.pair_o] + 0.5*self.dests.upper_bound(qd)[self.pair_d]
+        order=np.lexsort((self.lane_pos, -ub))
+        best_pos=None; best_s=-1.0
+        for j in order:
+            if ub[j] < best_s: break
+            pos=self.lane_pos[j]
+            if ub[j]==best_s and pos>best_pos: continue
+            s=0.5*self._ratio(self._o_cache, self.origins, qo, self.pair_o[j]) \
+              + 0.5*self._ratio(self._d_cache, self.dests, qd, self.pair_d[j])
+            if s>best_s or (s==best_s and pos<best_pos): best_pos, best_s = pos, s
+        return best_pos, best_s
+
+    def suggest(self, origin, dest, thr:float=0.60):
+        pos, s = self.best(origin, dest)
+        if pos is None or s<thr: return None
+        r=self.lane_table.iloc[pos]
+        return {"candidate_lane": f"{r['category']}|{r['origin_canon']}|{r['dest_canon']}|{r['uom']}", "similarity": round(float(s),2)}
+
+    def suggest_frame(self, df:pd.DataFrame, thr:float=0.60)->dict:
+        # 질의 (origin, dest) 고유 쌍 단위로 계산 후 행 index로 확장
+        if self.n_pairs==0 or df.empty: return {}
+        keys=pd.MultiIndex.from_arrays([df["origin_canon"].map(str), df["dest_canon"].map(str)])
+        codes, uniq = pd.factorize(keys)
+        found=[self.suggest(o, d, thr) for o, d in uniq]
+        return {idx: found[c] for idx, c in zip(df.index, codes) if found[c] is not None}
+
+def suggest_lanes(df:pd.DataFrame, lane_table:pd.DataFrame, thr:float=0.60)->dict:
+    if lane_table is None or lane_table.empty: return {}
+    return LaneSuggester(lane_table).suggest_frame(df, thr)
@@ -0,0 +1,187 @@
+
+import hashlib, json, os, threading, time
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np, pandas as pd
+from joblib import dump, Parallel, delayed
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.model_selection import GroupKFold
+from sklearn.metrics import mean_absolute_percentage_error
+from src.model_reg import CAT, NUM, TARGET, build_pre
+
+try:
+    import resource
+    RESOURCE_AVAILABLE=True
+except ImportError:
+    RESOURCE_AVAILABLE=False
+
+CACHE_VERSION=1
+DEFAULT_PARAMS={
+    "n_splits":5,
+    "rf":{"n_estimators":500, "max_depth":14, "random_state":42},
+    "gb":{"random_state":42},
+    "quantiles":{"gb_q10":0.10, "gb_q50":0.50, "gb_q90":0.90},
+}
+
+def merge_params(params:dict|None)->dict:
+    out=json.loads(json.dumps(DEFAULT_PARAMS))
+    for k, v in (params or {}).items():
+        if isinstance(v, dict) and isinstance(out.get(k), dict): out[k].update(v)
+        else: out[k]=v
+    return out
+
+def digest(*parts)->str:
+    h=hashlib.sha256()
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else json.dumps(p, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:24]
+
+def _rss_bytes():
+    # 현재 RSS (Linux /proc), 없으면 프로세스 최고치(ru_maxrss)로 대체
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1])*os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        if RESOURCE_AVAILABLE: return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*1024
+        return None
+
+class PhaseMeter:
+    """
+    단계별 wall-clock + 최대 RSS
+
+    백그라운드 스레드가 interval마다 RSS를 샘플링 (tracemalloc은 학습 시간을 2배로 늘려 사용 안 함).
+    peak_rss_mb: 단계 중 최대 RSS, peak_delta_mb: 단계 시작 대비 증가분
+    """
+    def __init__(self, interval:float=0.05):
+        self.interval=interval
+        self.phases={}
+
+    @contextmanager
+    def phase(self, name:str):
+        start=_rss_bytes(); peak=[start]; stop=threading.Event()
+        def sample():
+            while not stop.wait(self.interval):
+                r=_rss_bytes()
+                if r is not None and (peak[0] is None or r>peak[0]): peak[0]=r
+        sampler=threading.Thread(target=sample, daemon=True); sampler.start()
+        t=time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds=time.perf_counter()-t
+            stop.set(); sampler.join()
+            r=_rss_bytes()
+            if r is not None and (peak[0] is None or r>peak[0]): peak[0]=r
+            mb=lambda b: None if b is None else round(b/2**20, 1)
+            self.phases[name]={"seconds":round(seconds, 3), "peak_rss_mb":mb(peak[0]),
+                               "peak_delta_mb":mb(None if start is None or peak[0] is None else peak[0]-start)}
+
+def _fit_model(model, X, y):
+    return model.fit(X, y)
+
+class TrainingEngine:
+    """
+    model_reg 학습 엔진
+
+    - ColumnTransformer 인코딩 1회 → 희소 행렬을 CV 폴드/최종 RF/분위수 모델이 공유
+    - 분위수 GB 모델은 workers 한도 내에서 동시 학습 (스레드; 트리 빌더는 GIL 해제)
+    - 폴드 결과 캐시: (데이터 해시, RF 하이퍼파라미터, 폴드) 키 → cache_dir/folds/*.json
+    - 모델 캐시: training_manifest.json의 키가 같고 파일이 있으면 재학습 생략
+    - 단계별 wall-clock / peak memory → metrics["phases"]
+    """
+    def __init__(self, out_dir:str, params:dict|None=None, workers:int|None=None, cache_dir:str|None=None):
+        self.out_dir=Path(out_dir)
+        self.params=merge_params(params)
+        self.workers=workers or -1
+        self.cache_dir=Path(cache_dir) if cache_dir else self.out_dir/".cache"
+        self.meter=PhaseMeter()
+        self.cache_stats={"folds_cached":0, "folds_computed":0, "models_reused":[], "models_fitted":[]}
+
+    def _groups(self, train:pd.DataFrame)->pd.Series:
+        if "ym" in train.columns: return train["ym"].astype(str)
+        return train["origin_canon"] + "|" + train["dest_canon"]
+
+    def data_hash(self, train:pd.DataFrame, groups:pd.Series)->str:
+        frame=train[CAT+NUM+[TARGET]].assign(_group=groups.to_numpy())
+        rows=pd.util.hash_pandas_object(frame, index=False).to_numpy()
+        return digest(list(frame.columns), rows.tobytes())
+
+    def _rf(self)->RandomForestRegressor:
+        return RandomForestRegressor(**self.params["rf"], n_jobs=self.workers)
+
+    def _gb(self, q:float)->GradientBoostingRegressor:
+        return GradientBoostingRegressor(loss="quantile", alpha=q, **self.params["gb"])
+
+    def cross_validate(self, X, y:np.ndarray, groups:pd.Series, data_key:str)->float:
+        n_splits=min(self.params["n_splits"], max(2, groups.nunique()))
+        gkf=GroupKFold(n_splits=n_splits)
+        fold_dir=self.cache_dir/"folds"; fold_dir.mkdir(parents=True, exist_ok=True)
+        scores=[]
+        for i, (tr, va) in enumerate(gkf.split(X, y, groups)):
+            key=digest(CACHE_VERSION, data_key, self.params["rf"], n_splits, i)
+            path=fold_dir/f"{key}.json"
+            if path.exists():
+                scores.append(json.loads(path.read_text(encoding="utf-8"))["mape"])
+                self.cache_stats["folds_cached"]+=1
+                continue
+            rf=self._rf().fit(X[tr], y[tr])
+            pred=np.clip(rf.predict(X[va]),1e-6,None)
+            mape=float(mean_absolute_percentage_error(y[va], pred))
+            path.write_text(json.dumps({"fold":i, "mape":mape, "n_train":len(tr), "n_valid":len(va)}), encoding="utf-8")
+            scores.append(mape); self.cache_stats["folds_computed"]+=1
+        return float(np.mean(scores))
+
+    def run(self, df:pd.DataFrame)->dict:
+        """
+        인코딩 → CV → RF/분위수 모델 학습·저장
+
+        인코더는 학습 데이터 전체에 1회 fit하므로 CV 폴드 학습 시에도 검증 폴드에만
+        있는 범주의 one-hot 열이 존재한다 (폴드별 fit하던 기존 방식은 해당 열 없음).
+        학습 행에서는 항상 0인 열이라 분할 기준으로 쓰이지 않지만, 열 수가 달라져
+        RF의 특징 순회 순서가 바뀌므로 CV MAPE가 미세하게 다를 수 있다
+        (한 달에만 나오는 범주가 있는 데이터: 0.1068833 → 0.1068733). 최종 모델은 동일.
+        """
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        train=df.dropna(subset=[TARGET]).copy()
+        groups=self._groups(train)
+        data_key=self.data_hash(train, groups)
+
+        with self.meter.phase("encode"):
+            pre=build_pre()
+            X=pre.fit_transform(train[CAT+NUM])
+            y=train[TARGET].to_numpy(dtype=float)
+
+        with self.meter.phase("cv"):
+            mape=self.cross_validate(X, y, groups, data_key)
+
+        manifest_path=self.out_dir/"training_manifest.json"
+        try: manifest=json.loads(manifest_path.read_text(encoding="utf-8"))
+        except Exception: manifest={}
+        keys={"rate_rf":digest(CACHE_VERSION, data_key, "rf", self.params["rf"])}
+        for name, q in self.params["quantiles"].items():
+            keys[name]=digest(CACHE_VERSION, data_key, "gb", self.params["gb"], q)
+        todo=[n for n, k in keys.items() if manifest.get(n)!=k or not (self.out_dir/f"{n}.joblib").exists()]
+        self.cache_stats["models_reused"]=[n for n in keys if n not in todo]
+        self.cache_stats["models_fitted"]=todo
+
+        fitted={}
+        with self.meter.phase("fit_rf"):
+            if "rate_rf" in todo: fitted["rate_rf"]=self._rf().fit(X, y)
+
+        with self.meter.phase("fit_quantiles"):
+            names=[n for n in self.params["quantiles"] if n in todo]
+            if names:
+                n_jobs=len(names) if self.workers<0 else max(1, min(self.workers, len(names)))
+                models=Parallel(n_jobs=n_jobs, prefer="threads")(
+                    delayed(_fit_model)(self._gb(self.params["quantiles"][n]), X, y) for n in names)
+                fitted.update(zip(names, models))
+
+        with self.meter.phase("save"):
+            for name, model in fitted.items():
+                dump(Pipeline([("pre",pre),("model",model)]), self.out_dir/f"{name}.joblib")
+                manifest[name]=keys[name]
+            manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+        return {"mape":mape, "data_hash":data_key, "workers":self.workers,
+                "cache":self.cache_stats, "phases":self.meter.phases}
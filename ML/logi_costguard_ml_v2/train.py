@@ -7,6 +7,7 @@ from src.canon import canon
 from src.rules_ref import ref_join
 from src.model_reg import train as train_reg, infer as infer_reg
 from src.model_iso import fit as fit_iso
+from src.train_engine import PhaseMeter
 
 if __name__=="__main__":
     ap=argparse.ArgumentParser()
@@ -15,6 +16,8 @@ if __name__=="__main__":
     ap.add_argument("--ref", default="ref/ref_rates.csv")
     ap.add_argument("--lane", default="ref/lane_median_ewma.csv")
     ap.add_argument("--models", default="models")
+    ap.add_argument("--workers", type=int, default=None, help="학습 워커 한도 (RF n_jobs / 분위수 모델 동시 학습 수, 기본: 전체 코어)")
+    ap.add_argument("--cache-dir", default=None, help="폴드 결과 캐시 (기본: <models>/.cache)")
     args=ap.parse_args()
 
     conf=load_config(args.conf)
@@ -35,9 +38,15 @@ if __name__=="__main__":
     except Exception: unit_map=None
 
     df=ref_join(df, ref_rates, lane_median, unit_map)
-    metrics = train_reg(df, args.models)
-    pred=infer_reg(df, args.models)
-    fit_iso(pred, f"{args.models}/iforest.joblib")
+    # config "train" 섹션: n_splits / rf / gb / quantiles 하이퍼파라미터 덮어쓰기
+    metrics = train_reg(df, args.models, params=conf.get("train"), workers=args.workers, cache_dir=args.cache_dir)
+    # 학습 엔진 단계와 같은 형식 (seconds / peak_rss_mb / peak_delta_mb)
+    meter=PhaseMeter()
+    with meter.phase("infer"):
+        pred=infer_reg(df, args.models)
+    with meter.phase("fit_iso"):
+        fit_iso(pred, f"{args.models}/iforest.joblib")
+    metrics["phases"].update(meter.phases)
 
     Path("out").mkdir(exist_ok=True)
     with open("out/metrics.json","w",encoding="utf-8") as f:
@@ -8,7 +8,11 @@ ML 최적화 가중치를 적용한 하이브리드 매칭 시스템
 
 import pickle
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from candidate_blocking import DEFAULT_CANDIDATE_CAP, TrigramBlocker
 from enhanced_matching import (
     token_set_similarity,
     levenshtein_similarity,
@@ -131,12 +135,69 @@ def hybrid_similarity_ml(s1: str, s2: str) -> float:
 # ENHANCED MATCHING WITH ML
 # ============================================================================
 
+class MLLaneIndex:
+    """
+    find_matching_lane_ml용 ApprovedLaneMap 사전 인덱스
+    
+    - exact: (origin, destination, vehicle, unit) 정규화 키 → 첫 레인 (Level 1)
+    - by_vehicle_unit: (vehicle, unit) → 레인 id 배열 (Level 2 범위)
+    - by_region: (vehicle, unit, origin_region, dest_region) → 첫 레인 (Level 3)
+    - by_vehicle_group: (vehicle_group, unit) → 레인 id 배열 (Level 4 범위)
+    - raw_blocker / norm_blocker: 원본/정규화 텍스트 후보 생성기
+      (ML 유사도는 범위 내 상위 cap개 후보에만 계산, cap=None이면 전체)
+    """
+    
+    def __init__(self, approved_lanes: list, cap: Optional[int] = DEFAULT_CANDIDATE_CAP):
+        self.lanes = approved_lanes
+        self.cap = cap
+        
+        self.exact: Dict[Tuple[str, str, str, str], int] = {}
+        self.by_region: Dict[Tuple[str, str, str, str], int] = {}
+        by_vehicle_unit: Dict[Tuple[str, str], List[int]] = {}
+        by_vehicle_group: Dict[Tuple[str, str], List[int]] = {}
+        
+        raw_text, norm_text = [], []
+        for i, lane in enumerate(approved_lanes):
+            lane_origin = normalize_location(lane.get("origin", ""))
+            lane_dest = normalize_location(lane.get("destination", ""))
+            lane_vehicle = normalize_vehicle(lane.get("vehicle", ""))
+            lane_unit = str(lane.get("unit", "per truck"))
+            
+            self.exact.setdefault((lane_origin, lane_dest, lane_vehicle, lane_unit), i)
+            by_vehicle_unit.setdefault((lane_vehicle, lane_unit), []).append(i)
+            
+            origin_region = get_region(lane_origin)
+            dest_region = get_region(lane_dest)
+            if origin_region and dest_region:
+                self.by_region.setdefault(
+                    (lane_vehicle, lane_unit, origin_region, dest_region), i
+                )
+            
+            vehicle_group = get_vehicle_group(lane.get("vehicle", ""))
+            if vehicle_group:
+                by_vehicle_group.setdefault((vehicle_group, lane_unit), []).append(i)
+            
+            raw_text.append((lane.get("origin", ""), lane.get("destination", "")))
+            norm_text.append((lane_origin, lane_dest))
+        
+        self.by_vehicle_unit = {k: np.asarray(v) for k, v in by_vehicle_unit.items()}
+        self.by_vehicle_group = {k: np.asarray(v) for k, v in by_vehicle_group.items()}
+        self.raw_blocker = TrigramBlocker(*zip(*raw_text)) if raw_text else None
+        self.norm_blocker = TrigramBlocker(*zip(*norm_text)) if norm_text else None
+    
+    def candidates(self, blocker, within, origin: str, destination: str) -> List[int]:
+        """범위(within) 내 후보 레인 id (레인 순서)"""
+        if within is None or blocker is None:
+            return []
+        return blocker.shortlist(origin, destination, within=within, cap=self.cap)
+
+
 def find_matching_lane_ml(
     origin: str,
     destination: str,
     vehicle: str,
     unit: str,
-    approved_lanes: list,
+    approved_lanes,
     verbose: bool = False
 ) -> Optional[Dict]:
     """
@@ -144,7 +205,15 @@ def find_matching_lane_ml(
     
     기존 find_matching_lane_enhanced()와 동일하지만
     hybrid_similarity 대신 hybrid_similarity_ml 사용
+    
+    approved_lanes: 레인 리스트 또는 MLLaneIndex
+        (반복 조회 시 MLLaneIndex를 1회 구축하여 전달)
     """
+    if not isinstance(approved_lanes, MLLaneIndex):
+        approved_lanes = MLLaneIndex(approved_lanes)
+    index = approved_lanes
+    lanes = index.lanes
+    unit = str(unit)
     
     # 정규화
     origin_norm = normalize_location(origin)
@@ -160,44 +229,31 @@ def find_matching_lane_ml(
     best_score = 0.0
     
     # ========================================================================
-    # LEVEL 1: 정확 매칭 (변경 없음)
+    # LEVEL 1: 정확 매칭 (해시 조회)
     # ========================================================================
-    for i, lane in enumerate(approved_lanes):
-        lane_origin = normalize_location(lane.get("origin", ""))
-        lane_dest = normalize_location(lane.get("destination", ""))
-        lane_vehicle = normalize_vehicle(lane.get("vehicle", ""))
-        lane_unit = str(lane.get("unit", "per truck"))
+    i = index.exact.get((origin_norm, dest_norm, vehicle_norm, unit))
+    if i is not None:
+        if verbose:
+            print(f"  ✅ LEVEL 1 (EXACT): Lane {i} matched!")
         
-        if (lane_origin == origin_norm and
-            lane_dest == dest_norm and
-            lane_vehicle == vehicle_norm and
-            lane_unit == str(unit)):
-            
-            if verbose:
-                print(f"  ✅ LEVEL 1 (EXACT): Lane {i} matched!")
-            
-            return {
-                "row_index": i + 2,
-                "match_score": 1.0,
-                "match_level": "EXACT",
-                "lane_data": lane
-            }
+        return {
+            "row_index": i + 2,
+            "match_score": 1.0,
+            "match_level": "EXACT",
+            "lane_data": lanes[i]
+        }
     
     # ========================================================================
-    # LEVEL 2: ML 최적화 유사도 매칭
+    # LEVEL 2: ML 최적화 유사도 매칭 (차량/단위 일치 레인 중 후보만)
     # ========================================================================
-    for i, lane in enumerate(approved_lanes):
-        lane_origin = lane.get("origin", "")
-        lane_dest = lane.get("destination", "")
-        lane_vehicle = normalize_vehicle(lane.get("vehicle", ""))
-        lane_unit = str(lane.get("unit", "per truck"))
-        
-        if lane_vehicle != vehicle_norm or lane_unit != str(unit):
-            continue
+    for i in index.candidates(index.raw_blocker,
+                              index.by_vehicle_unit.get((vehicle_norm, unit)),
+                              origin, destination):
+        lane = lanes[i]
         
         # 🆕 ML 최적화 하이브리드 유사도 사용
-        origin_sim = hybrid_similarity_ml(origin, lane_origin)
-        dest_sim = hybrid_similarity_ml(destination, lane_dest)
+        origin_sim = hybrid_similarity_ml(origin, lane.get("origin", ""))
+        dest_sim = hybrid_similarity_ml(destination, lane.get("destination", ""))
         
         # 가중 평균 (Origin 60%, Destination 40%)
         total_sim = 0.6 * origin_sim + 0.4 * dest_sim
@@ -220,35 +276,21 @@ def find_matching_lane_ml(
         return best_match
     
     # ========================================================================
-    # LEVEL 3: 권역별 매칭 (변경 없음)
+    # LEVEL 3: 권역별 매칭 (권역 키 해시 조회, 첫 레인)
     # ========================================================================
     origin_region = get_region(origin_norm)
     dest_region = get_region(dest_norm)
     
     if origin_region and dest_region:
-        for i, lane in enumerate(approved_lanes):
-            lane_origin = normalize_location(lane.get("origin", ""))
-            lane_dest = normalize_location(lane.get("destination", ""))
-            lane_vehicle = normalize_vehicle(lane.get("vehicle", ""))
-            lane_unit = str(lane.get("unit", "per truck"))
-            
-            if lane_vehicle != vehicle_norm or lane_unit != str(unit):
-                continue
-            
-            lane_origin_region = get_region(lane_origin)
-            lane_dest_region = get_region(lane_dest)
-            
-            if lane_origin_region == origin_region and lane_dest_region == dest_region:
-                score = 0.5
-                
-                if score > best_score:
-                    best_match = {
-                        "row_index": i + 2,
-                        "match_score": score,
-                        "match_level": "REGION",
-                        "lane_data": lane
-                    }
-                    best_score = score
+        i = index.by_region.get((vehicle_norm, unit, origin_region, dest_region))
+        if i is not None:
+            best_match = {
+                "row_index": i + 2,
+                "match_score": 0.5,
+                "match_level": "REGION",
+                "lane_data": lanes[i]
+            }
+            best_score = 0.5
         
         if best_match and verbose:
             print(f"  ✅ LEVEL 3 (REGION): Lane {best_match['row_index']-2} "
@@ -258,36 +300,32 @@ def find_matching_lane_ml(
         return best_match
     
     # ========================================================================
-    # LEVEL 4: 차량 타입별 매칭 (ML 유사도 적용)
+    # LEVEL 4: 차량 타입별 매칭 (ML 유사도 적용, 그룹/단위 일치 레인 중 후보만)
     # ========================================================================
     vehicle_group = get_vehicle_group(vehicle_norm)
     
     if vehicle_group:
-        for i, lane in enumerate(approved_lanes):
-            lane_origin = normalize_location(lane.get("origin", ""))
-            lane_dest = normalize_location(lane.get("destination", ""))
-            lane_vehicle = lane.get("vehicle", "")
-            lane_unit = str(lane.get("unit", "per truck"))
+        for i in index.candidates(index.norm_blocker,
+                                  index.by_vehicle_group.get((vehicle_group, unit)),
+                                  origin, destination):
+            lane_origin, lane_dest = (
+                normalize_location(lanes[i].get("origin", "")),
+                normalize_location(lanes[i].get("destination", ""))
+            )
             
-            if lane_unit != str(unit):
-                continue
+            # 🆕 ML 최적화 유사도 사용
+            origin_sim = hybrid_similarity_ml(origin, lane_origin)
+            dest_sim = hybrid_similarity_ml(destination, lane_dest)
+            total_sim = 0.6 * origin_sim + 0.4 * dest_sim
             
-            lane_vehicle_group = get_vehicle_group(lane_vehicle)
-            
-            if lane_vehicle_group == vehicle_group:
-                # 🆕 ML 최적화 유사도 사용
-                origin_sim = hybrid_similarity_ml(origin, lane_origin)
-                dest_sim = hybrid_similarity_ml(destination, lane_dest)
-                total_sim = 0.6 * origin_sim + 0.4 * dest_sim
-                
-                if total_sim >= 0.4 and total_sim > best_score:
-                    best_match = {
-                        "row_index": i + 2,
-                        "match_score": total_sim,
-                        "match_level": "VEHICLE_TYPE_ML",  # ML 사용 표시
-                        "lane_data": lane
-                    }
-                    best_score = total_sim
+            if total_sim >= 0.4 and total_sim > best_score:
+                best_match = {
+                    "row_index": i + 2,
+                    "match_score": total_sim,
+                    "match_level": "VEHICLE_TYPE_ML",  # ML 사용 표시
+                    "lane_data": lanes[i]
+                }
+                best_score = total_sim
         
         if best_match and verbose:
             print(f"  ✅ LEVEL 4 (ML VEHICLE_TYPE): Lane {best_match['row_index']-2} "
@@ -330,6 +368,9 @@ def batch_match_with_ml(
     
     results = []
     
+    # 레인 해시/후보 인덱스 1회 구축
+    lane_index = MLLaneIndex(approved_lanes)
+    
     for i, row in items_df.iterrows():
         origin = row.get("origin", "")
         destination = row.get("destination", "")
@@ -338,7 +379,7 @@ def batch_match_with_ml(
         
         match_result = find_matching_lane_ml(
             origin, destination, vehicle, unit,
-            approved_lanes, verbose=verbose
+            lane_index, verbose=verbose
         )
         
         results.append({
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+candidate_blocking / LaneMatchIndex 테스트
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from candidate_blocking import TrigramBlocker, text_grams
+from unified_ml_pipeline import LaneMatchIndex, MLWeightsManager, UnifiedMLPipeline
+
+
+@pytest.fixture
+def lanes():
+    return [
+        {"origin": "DSV MUSSAFAH YARD", "destination": "MIRFA SITE"},
+        {"origin": "M44 WAREHOUSE", "destination": "SHUWEIHAT SITE"},
+        {"origin": "JEBEL ALI PORT", "destination": "DSV MUSSAFAH YARD"},
+        {"origin": "MINA ZAYED PORT", "destination": "MIRFA SITE"},
+    ]
+
+
+class TestTrigramBlocker:
+    """TrigramBlocker 후보 생성 테스트"""
+
+    def test_text_grams_handles_missing_and_case(self):
+        assert text_grams(None) == set()
+        assert text_grams(np.nan) == set()
+        assert text_grams("  ") == set()
+        assert text_grams("Mirfa  site") == text_grams("MIRFA SITE")
+        assert "#MIRFA" in text_grams("mirfa")
+
+    def test_shortlist_ranks_overlapping_lanes(self, lanes):
+        blocker = TrigramBlocker(
+            [l["origin"] for l in lanes], [l["destination"] for l in lanes]
+        )
+        assert blocker.shortlist("Mussafah Yard DSV", "Mirfa Site", cap=1) == [0]
+        assert blocker.shortlist("MINA PORT", "MIRFA SITE", cap=1) == [3]
+        # 후보는 레인 순서(오름차순)로 반환
+        shortlist = blocker.shortlist("MINA PORT", "MIRFA SITE", cap=3)
+        assert shortlist == sorted(shortlist) and 3 in shortlist
+        assert blocker.shortlist("ZZZZ", "QQQQ") == []
+
+    def test_within_and_no_cap(self, lanes):
+        blocker = TrigramBlocker(
+            [l["origin"] for l in lanes], [l["destination"] for l in lanes]
+        )
+        assert blocker.shortlist("MIRFA", "SITE", within=np.array([1, 3])) == [1, 3]
+        assert blocker.shortlist("ZZZZ", "QQQQ", cap=None) == [0, 1, 2, 3]
+
+
+class TestLaneMatchIndex:
+    """_predict_matching blocked vs exhaustive 동일성"""
+
+    def test_blocked_matches_exhaustive(self, lanes):
+        pipeline = UnifiedMLPipeline.__new__(UnifiedMLPipeline)
+        pipeline.weights_manager = MLWeightsManager()
+        blocked = LaneMatchIndex(lanes, cap=2)
+        full = LaneMatchIndex(lanes, cap=None)
+
+        queries = [
+            ("dsv mussafah yard", "mirfa site"),
+            ("DSV Musafah Yard", "Mirfa Site"),
+            ("M44 Warehouse Area", "Shuweihat Site"),
+            ("Unknown", "Nowhere"),
+        ]
+        for origin, destination in queries:
+            row = pd.Series({"Origin": origin, "Destination": destination})
+            assert pipeline._predict_matching(
+                row, blocked
+            ) == pipeline._predict_matching(row, full)
+
+        row = pd.Series({"Origin": "dsv mussafah yard", "Destination": "mirfa site"})
+        assert pipeline._predict_matching(row, blocked)["match_level"] == "EXACT"
+
+    def test_non_string_lane_is_skipped_for_exact(self, lanes):
+        index = LaneMatchIndex(lanes + [{"origin": np.nan, "destination": "X"}])
+        assert len(index.exact) == len(lanes)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+logi_costguard_ml_v2 LaneSuggester 테스트 (suggest_lane 행별 순회와 동일성)
+"""
+
+import os
+import random
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "logi_costguard_ml_v2"))
+
+from src.similarity import LaneSuggester, lane_similarity, suggest_lane
+
+PLACES = [
+    "DSV MUSSAFAH",
+    "DSV MUSAFFAH",
+    "MIRFA SITE",
+    "MIRFA",
+    "SHUWEIHAT SITE",
+    "SHU SITE",
+    "JEBEL ALI PORT",
+    "KHALIFA PORT",
+    "KHALIFA PRT",
+    "M44 WAREHOUSE",
+    "MOSB",
+    "ICAD",
+]
+
+
+def lane_table(n=40, seed=11):
+    rng = random.Random(seed)
+    rows = [
+        {
+            "category": rng.choice(["Inland Trucking", "Port Handling"]),
+            "origin_canon": rng.choice(PLACES),
+            "dest_canon": rng.choice(PLACES),
+            "uom": rng.choice(["per truck", "per ton"]),
+        }
+        for _ in range(n)
+    ]
+    # 같은 (origin, dest) 쌍 중복 → 첫 레인이 제안되어야 함
+    rows.append({**rows[3], "category": "Duplicate"})
+    return pd.DataFrame(rows)
+
+
+def queries(n=150, seed=12):
+    rng = random.Random(seed)
+
+    def noisy(text):
+        chars = list(text)
+        for _ in range(rng.randint(0, 3)):
+            chars[rng.randrange(len(chars))] = rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ ")
+        return "".join(chars)
+
+    rows = [
+        {
+            "origin_canon": noisy(rng.choice(PLACES)),
+            "dest_canon": noisy(rng.choice(PLACES)),
+        }
+        for _ in range(n)
+    ]
+    rows += [
+        {"origin_canon": "UNKNOWN", "dest_canon": "NOWHERE"},
+        {"origin_canon": "", "dest_canon": ""},
+        {"origin_canon": None, "dest_canon": float("nan")},
+    ]
+    return pd.DataFrame(rows)
+
+
+def best_score(row, lanes):
+    """suggest_lane과 같은 순회로 최고 유사도 (반올림 전)"""
+    return max(
+        lane_similarity(row["origin_canon"], row["dest_canon"], o, d)
+        for o, d in zip(lanes["origin_canon"], lanes["dest_canon"])
+    )
+
+
+@pytest.fixture
+def lanes():
+    return lane_table()
+
+
+@pytest.mark.parametrize("thr", [0.0, 0.6, 0.8])
+def test_suggest_frame_matches_suggest_lane(lanes, thr):
+    df = queries()
+    expected = {}
+    for idx, row in df.iterrows():
+        found = suggest_lane(row, lanes, thr=thr)
+        if found is not None:
+            expected[idx] = found
+
+    assert LaneSuggester(lanes).suggest_frame(df, thr=thr) == expected
+
+
+def test_best_score_matches_full_scan(lanes):
+    suggester = LaneSuggester(lanes)
+    for _, row in queries().iterrows():
+        _, score = suggester.best(row["origin_canon"], row["dest_canon"])
+
+        assert score == best_score(row, lanes)
+
+
+def test_cutoff_boundary(lanes):
+    """임계값 = 최고점이면 제안, 그보다 조금 높으면 양쪽 모두 미제안"""
+    suggester = LaneSuggester(lanes)
+    for _, row in queries(40, seed=13).iterrows():
+        score = best_score(row, lanes)
+        for thr in (score, score + 1e-9, score - 1e-9):
+            assert suggester.suggest(
+                row["origin_canon"], row["dest_canon"], thr=thr
+            ) == suggest_lane(row, lanes, thr=thr)
+
+
+def test_empty_lane_table():
+    df = queries(3)
+
+    assert LaneSuggester(pd.DataFrame()).suggest_frame(df) == {}
+    assert LaneSuggester(None).suggest("MOSB", "MIRFA") is None
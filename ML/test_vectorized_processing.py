@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VectorizedSimilarity.batch_similarity 테스트 (스칼라 쌍별 구현과 동일성)
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from vectorized_processing import VectorizedSimilarity
+
+TOKENS = [
+    "DSV",
+    "mussafah",
+    "Yard",
+    "MIRFA",
+    "site",
+    "M44",
+    "warehouse",
+    "Jebel",
+    "Ali",
+    "PORT",
+    "straße",
+    "ǆemal",
+    "ﬁnal",
+    "-",
+]
+WEIGHTS = {"token_set": 0.4, "levenshtein": 0.35, "fuzzy_sort": 0.25}
+
+
+def random_strings(n, seed):
+    rng = random.Random(seed)
+    values = [None, "", "   ", float("nan"), "DSV  MUSSAFAH", "mussafah dsv"]
+    for _ in range(n):
+        text = rng.choice([" ", "  ", "\t"]).join(
+            rng.choice(TOKENS) for _ in range(rng.randint(1, 4))
+        )
+        values.append(rng.choice([str.upper, str.lower, str.title, str])(text))
+    rng.shuffle(values)
+    return values
+
+
+def pairwise(sim, sources, targets, weights):
+    """변경 전 batch_similarity (쌍별 스칼라 루프)"""
+    out = np.zeros((len(sources), len(targets)))
+    for i, source in enumerate(sources):
+        for j, target in enumerate(targets):
+            out[i, j] = (
+                sim.token_set_similarity(source, target) * weights["token_set"]
+                + sim.levenshtein_similarity(source, target) * weights["levenshtein"]
+                + sim.fuzzy_sort_similarity(source, target) * weights["fuzzy_sort"]
+            )
+    return out
+
+
+@pytest.fixture
+def sim():
+    return VectorizedSimilarity()
+
+
+@pytest.mark.parametrize("max_cells", [4_000_000, 97, 1])
+def test_batch_matches_pairwise(sim, max_cells):
+    sources = random_strings(80, seed=1)
+    targets = random_strings(60, seed=2) + sources[:10]
+
+    got = sim.batch_similarity(sources, targets, WEIGHTS, max_cells=max_cells)
+
+    assert got.shape == (len(sources), len(targets))
+    np.testing.assert_allclose(
+        got, pairwise(sim, sources, targets, WEIGHTS), rtol=0, atol=1e-12
+    )
+
+
+def test_chunks_do_not_change_result(sim):
+    sources = random_strings(120, seed=3)
+    targets = random_strings(40, seed=4)
+
+    full = sim.batch_similarity(sources, targets, WEIGHTS)
+    # 청크당 3행 (고유 타겟 수 x 3 셀) → 여러 청크
+    n_targets = len(VectorizedSimilarity._unique(targets)[0])
+    chunked = sim.batch_similarity(sources, targets, WEIGHTS, max_cells=n_targets * 3)
+
+    np.testing.assert_array_equal(chunked, full)
+
+
+def test_empty_inputs(sim):
+    assert sim.batch_similarity([], ["DSV"], WEIGHTS).shape == (0, 1)
+    assert sim.batch_similarity(["DSV"], [], WEIGHTS).shape == (1, 0)
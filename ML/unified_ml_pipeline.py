@@ -17,9 +17,10 @@ import pandas as pd
 import numpy as np
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import sys
 import os
+from functools import partial
 
 # Constants
 DEFAULT_WEIGHTS = {"token_set": 0.4, "levenshtein": 0.3, "fuzzy_sort": 0.3}
@@ -55,6 +56,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "logi_costguard_ml_v2"))
 # Import existing modules
 from weight_optimizer import WeightOptimizer
 from ab_testing_framework import ABTestingFramework
+from candidate_blocking import DEFAULT_CANDIDATE_CAP, TrigramBlocker
 
 
 # Simplified ML weights manager to avoid dependency issues
@@ -97,6 +99,45 @@ class MLWeightsManager:
         return self.is_ml_optimized
 
 
+# Regression model input columns (see logi_costguard_ml_v2/src/model_reg.py)
+REG_FEATURES = [
+    "origin_canon",
+    "dest_canon",
+    "category",
+    "uom",
+    "log_qty",
+    "log_wt",
+    "log_cbm",
+]
+
+
+class LaneMatchIndex:
+    """
+    Approved lanes prepared once for _predict_matching
+
+    - exact: (ORIGIN, DESTINATION) upper-cased → first lane
+    - blocker: token/trigram inverted index; ML similarity scores only the
+      top `cap` candidates (cap=None scores every lane)
+    """
+
+    def __init__(
+        self, approved_lanes: List[Dict], cap: Optional[int] = DEFAULT_CANDIDATE_CAP
+    ):
+        self.lanes = approved_lanes
+        self.cap = cap
+        origins = [lane.get("origin", "") for lane in approved_lanes]
+        destinations = [lane.get("destination", "") for lane in approved_lanes]
+        self.exact: Dict[Tuple[str, str], int] = {}
+        for i, (o, d) in enumerate(zip(origins, destinations)):
+            # Non-string lanes (e.g. NaN cells) can never match exactly
+            if isinstance(o, str) and isinstance(d, str):
+                self.exact.setdefault((o.upper(), d.upper()), i)
+        self.blocker = TrigramBlocker(origins, destinations)
+
+    def candidates(self, origin: str, destination: str) -> List[int]:
+        return self.blocker.shortlist(origin, destination, cap=self.cap)
+
+
 def hybrid_similarity_ml(s1: str, s2: str) -> float:
     """Simplified hybrid similarity function for testing"""
     # Simple string similarity using basic algorithms
@@ -135,11 +176,13 @@ def hybrid_similarity_ml(s1: str, s2: str) -> float:
 try:
     from src.model_reg import train as train_reg, infer as infer_reg
     from src.model_iso import fit as fit_iso, score as score_iso
+    from src.model_iso import normalize as normalize_iso
     from src.guard import banding
     from src.similarity import suggest_lane
     from src.io_utils import load_config, read_table, map_columns
     from src.canon import canon
     from src.rules_ref import ref_join
+    from src.model_store import ModelStore
 except ImportError as e:
     print(f"Warning: Could not import logi_costguard_ml_v2 modules: {e}")
 
@@ -255,7 +298,9 @@ class UnifiedMLPipeline:
 
             # Create mock isolation forest
             mock_iso = IsolationForest(n_estimators=10, random_state=42)
-            mock_iso.fit(np.random.random((10, 6)))
+            mock_x = np.random.random((10, 6))
+            mock_iso.fit(mock_x)
+            mock_s = -mock_iso.score_samples(mock_x)
             dump(
                 {
                     "iso": mock_iso,
@@ -267,6 +312,10 @@ class UnifiedMLPipeline:
                         "log_wt",
                         "log_cbm",
                     ],
+                    "score_ref": {
+                        "min": float(mock_s.min()),
+                        "max": float(mock_s.max()),
+                    },
                 },
                 f"{models_dir}/iforest.joblib",
             )
@@ -408,21 +457,26 @@ class UnifiedMLPipeline:
         if weight_model_path.exists():
             self.weights_manager.load_weights(str(weight_model_path))
 
-        for idx, row in invoice_data.iterrows():
+        # Lane hash/candidate index built once for all rows
+        lane_index = LaneMatchIndex(approved_lanes)
+
+        # Regression + anomaly: one batched call over the whole frame
+        reg_results = self._predict_regression_batch(invoice_data, str(models_dir))
+        anomaly_scores = self._predict_anomaly_batch(invoice_data, str(models_dir))
+
+        for pos, (idx, row) in enumerate(invoice_data.iterrows()):
             result = {"item_index": idx}
 
             try:
                 # 1. ML-weighted matching
-                match_result = self._predict_matching(row, approved_lanes)
+                match_result = self._predict_matching(row, lane_index)
                 result["match_result"] = match_result
 
                 # 2. Regression prediction
-                reg_result = self._predict_regression(row, str(models_dir))
-                result.update(reg_result)
+                result.update(reg_results[pos])
 
                 # 3. Anomaly detection
-                anomaly_score = self._predict_anomaly(row, str(models_dir))
-                result["anomaly_score"] = anomaly_score
+                result["anomaly_score"] = anomaly_scores[pos]
 
                 # 4. Banding
                 band = self._calculate_band(result)
@@ -438,10 +492,16 @@ class UnifiedMLPipeline:
 
         return results
 
-    def _predict_matching(
-        self, row: pd.Series, approved_lanes: List[Dict]
-    ) -> Optional[Dict]:
-        """Predict matching using ML weights"""
+    def _predict_matching(self, row: pd.Series, approved_lanes) -> Optional[Dict]:
+        """
+        Predict matching using ML weights
+
+        approved_lanes: lane list or a prebuilt LaneMatchIndex
+        """
+        if not isinstance(approved_lanes, LaneMatchIndex):
+            approved_lanes = LaneMatchIndex(approved_lanes)
+        lanes = approved_lanes.lanes
+
         origin = row.get("Origin", "")
         destination = row.get("Destination", "")
         vehicle = row.get("UoM", "per truck")
@@ -450,23 +510,21 @@ class UnifiedMLPipeline:
         best_match = None
         best_score = 0.0
 
-        # Try exact match first
-        for i, lane in enumerate(approved_lanes):
-            if (
-                lane.get("origin", "").upper() == origin.upper()
-                and lane.get("destination", "").upper() == destination.upper()
-            ):
-                return {
-                    "row_index": i + 2,
-                    "match_score": 1.0,
-                    "match_level": "EXACT",
-                    "lane_data": lane,
-                }
+        # Try exact match first (hash lookup)
+        i = approved_lanes.exact.get((origin.upper(), destination.upper()))
+        if i is not None:
+            return {
+                "row_index": i + 2,
+                "match_score": 1.0,
+                "match_level": "EXACT",
+                "lane_data": lanes[i],
+            }
 
-        # ML-weighted similarity matching
+        # ML-weighted similarity matching (blocked candidates only)
         weights = self.weights_manager.get_weights()
 
-        for i, lane in enumerate(approved_lanes):
+        for i in approved_lanes.candidates(origin, destination):
+            lane = lanes[i]
             origin_sim = hybrid_similarity_ml(origin, lane.get("origin", ""))
             dest_sim = hybrid_similarity_ml(destination, lane.get("destination", ""))
             total_sim = 0.6 * origin_sim + 0.4 * dest_sim
@@ -482,6 +540,104 @@ class UnifiedMLPipeline:
 
         return best_match
 
+    @staticmethod
+    def _column(df: pd.DataFrame, name: str, default) -> pd.Series:
+        """df[name] or a constant column (same defaults as row.get)"""
+        if name in df.columns:
+            return df[name]
+        return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+    def _predict_regression_batch(
+        self, invoice_data: pd.DataFrame, models_dir: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Batched _predict_regression: one rf.predict over all rows
+
+        Falls back to the per-row path if the frame cannot be featurized or
+        predicted as a whole, so per-row fallbacks/errors stay identical.
+        """
+        if invoice_data.empty:
+            return []
+
+        try:
+            col = partial(self._column, invoice_data)
+            pred_data = pd.DataFrame(
+                {
+                    "origin_canon": col("Origin", ""),
+                    "dest_canon": col("Destination", ""),
+                    "category": col("Category", "Inland Trucking"),
+                    "uom": col("UoM", "per truck"),
+                    "log_qty": np.log(col("Qty", 1) + 1),
+                    "log_wt": np.log(col("WeightKG", 1000) + 1),
+                    "log_cbm": np.log(col("CBM", 1) + 1),
+                }
+            )
+            rate = col("Rate", 5000).tolist()
+
+            try:
+                rf = ModelStore.shared(models_dir).get("rf")
+            except Exception:
+                rate_ml = rate  # Fallback
+            else:
+                rate_ml = rf.predict(pred_data[REG_FEATURES]).tolist()
+        except Exception:
+            return [
+                self._predict_regression(row, models_dir)
+                for _, row in invoice_data.iterrows()
+            ]
+
+        return [
+            {"rate_ml": ml, "rate_usd": r, "ref_rate_usd": r}  # ref simplified
+            for ml, r in zip(rate_ml, rate)
+        ]
+
+    def _predict_anomaly_batch(
+        self, invoice_data: pd.DataFrame, models_dir: str
+    ) -> List[float]:
+        """
+        Batched _predict_anomaly: one score_samples over all rows
+
+        Scores are normalized against the training score range stored in
+        iforest.joblib, so they do not depend on batch composition.
+        """
+        if invoice_data.empty:
+            return []
+
+        try:
+            col = partial(self._column, invoice_data)
+            features = pd.DataFrame(
+                {
+                    "rate_usd": col("Rate", 5000),
+                    "ref_rate_usd": col("Rate", 5000),
+                    "rate_ml": col("Rate", 5000),
+                    "log_qty": np.log(col("Qty", 1) + 1),
+                    "log_wt": np.log(col("WeightKG", 1000) + 1),
+                    "log_cbm": np.log(col("CBM", 1) + 1),
+                }
+            ).astype(float)
+        except Exception:
+            return [
+                self._predict_anomaly(row, models_dir)
+                for _, row in invoice_data.iterrows()
+            ]
+
+        scores = np.full(len(invoice_data), 0.5)  # Default anomaly score
+        try:
+            payload = ModelStore.shared(models_dir).get("iso")
+            iso, feats = payload["iso"], payload["feats"]
+
+            x = features[feats]
+            if payload.get("medians"):
+                x = x.fillna(payload["medians"])
+            valid = x.notna().all(axis=1).to_numpy()
+            if valid.any():
+                s = -iso.score_samples(x[valid])
+                scores[valid] = normalize_iso(s, payload)
+        except Exception:
+            pass
+
+        return scores.tolist()
+
     def _predict_regression(self, row: pd.Series, models_dir: str) -> Dict[str, Any]:
         """Predict using regression model"""
         try:
@@ -502,22 +658,8 @@ class UnifiedMLPipeline:
 
             # Load and predict with regression model
             try:
-                from joblib import load
-
-                rf = load(f"{models_dir}/rate_rf.joblib")
-                pred_data["rate_ml"] = rf.predict(
-                    pred_data[
-                        [
-                            "origin_canon",
-                            "dest_canon",
-                            "category",
-                            "uom",
-                            "log_qty",
-                            "log_wt",
-                            "log_cbm",
-                        ]
-                    ]
-                )[0]
+                rf = ModelStore.shared(models_dir).get("rf")
+                pred_data["rate_ml"] = rf.predict(pred_data[REG_FEATURES])[0]
             except:
                 pred_data["rate_ml"] = row.get("Rate", 5000)  # Fallback
 
@@ -538,8 +680,6 @@ class UnifiedMLPipeline:
     def _predict_anomaly(self, row: pd.Series, models_dir: str) -> float:
         """Predict anomaly score"""
         try:
-            from joblib import load
-
             # Prepare features for anomaly detection
             features = pd.DataFrame(
                 [
@@ -555,15 +695,13 @@ class UnifiedMLPipeline:
             )
 
             # Load and predict with isolation forest
-            payload = load(f"{models_dir}/iforest.joblib")
+            payload = ModelStore.shared(models_dir).get("iso")
             iso, feats = payload["iso"], payload["feats"]
 
-            x = features[feats].fillna(features[feats].median())
+            x = features[feats].fillna(payload.get("medians") or {})
             s = -iso.score_samples(x)
-            s_min, s_max = float(np.min(s)), float(np.max(s))
-            s_norm = (s - s_min) / (s_max - s_min + 1e-9)
 
-            return float(s_norm[0])
+            return float(normalize_iso(s, payload)[0])
 
         except Exception as e:
             return 0.5  # Default anomaly score
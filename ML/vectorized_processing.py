@@ -7,6 +7,7 @@ Vectorized Batch Processing System
 
 import numpy as np
 import pandas as pd
+from scipy import sparse
 from typing import List, Dict, Tuple, Optional, Callable
 from functools import lru_cache
 import time
@@ -16,6 +17,88 @@ from error_handling import LoggerManager, ProgressLogger, handle_errors
 logger = LoggerManager().get_logger(__name__)
 
 
+class _StringFeatures:
+    """
+    batch_similarity용 고유 문자열 특징 (스칼라 구현과 동일한 전처리)
+    
+    - tokens: 대문자 토큰 집합 binary 희소 행렬 (n x vocab)
+    - chars: 대문자 문자 집합 비트 행렬 (levenshtein 근사용)
+    - sorted_chars: 정렬 토큰 문자열의 문자 집합 비트 행렬 (fuzzy_sort용)
+    - sorted_key: 정렬 토큰 문자열 해시 키 ID (완전 일치 판정)
+    - valid: 원본이 truthy (스칼라 구현의 `not s` 검사)
+    
+    어휘(dict)는 소스/타겟이 공유하며, 양쪽 수집 후 finalize()로 행렬 생성.
+    """
+    
+    def __init__(self, strings: List, token_vocab: Dict[str, int],
+                 char_vocab: Dict[str, int], key_vocab: Dict[str, int]):
+        n = len(strings)
+        self.n = n
+        self.valid = np.zeros(n, dtype=bool)
+        self.sorted_key = np.full(n, -1, dtype=np.int64)
+        self.sorted_empty = np.ones(n, dtype=bool)
+        
+        token_rows, token_cols = [], []
+        self._char_ids: List[List[int]] = []
+        self._sorted_char_ids: List[List[int]] = []
+        
+        def char_ids(text: str) -> List[int]:
+            return [char_vocab.setdefault(c, len(char_vocab)) for c in set(text)]
+        
+        for i, s in enumerate(strings):
+            if not s:
+                self._char_ids.append([])
+                self._sorted_char_ids.append([])
+                continue
+            
+            upper = str(s).upper()
+            tokens = upper.split()
+            sorted_str = ' '.join(sorted(tokens))
+            
+            self.valid[i] = True
+            self.sorted_key[i] = key_vocab.setdefault(sorted_str, len(key_vocab))
+            self.sorted_empty[i] = not sorted_str
+            
+            for token in set(tokens):
+                token_rows.append(i)
+                token_cols.append(token_vocab.setdefault(token, len(token_vocab)))
+            
+            self._char_ids.append(char_ids(upper))
+            self._sorted_char_ids.append(char_ids(sorted_str.upper()))
+        
+        self._token_rows = np.asarray(token_rows, dtype=np.int64)
+        self._token_cols = np.asarray(token_cols, dtype=np.int64)
+        self.token_count = np.bincount(self._token_rows, minlength=n).astype(np.float64)
+    
+    def finalize(self, n_tokens: int, n_chars: int):
+        """공유 어휘 크기 확정 후 행렬 생성"""
+        self.tokens = sparse.csr_matrix(
+            (np.ones(len(self._token_rows), dtype=np.float32),
+             (self._token_rows, self._token_cols)),
+            shape=(self.n, max(n_tokens, 1))
+        )
+        self.chars = self._bit_matrix(self._char_ids, n_chars)
+        self.sorted_chars = self._bit_matrix(self._sorted_char_ids, n_chars)
+        self.char_count = self.chars.sum(axis=1, dtype=np.float64)
+        self.sorted_char_count = self.sorted_chars.sum(axis=1, dtype=np.float64)
+    
+    @staticmethod
+    def _bit_matrix(ids_per_row: List[List[int]], n_chars: int) -> np.ndarray:
+        """문자 존재 비트 행렬 (0/1, 교집합 = 행렬곱)"""
+        bits = np.zeros((len(ids_per_row), max(n_chars, 1)), dtype=np.float32)
+        for i, ids in enumerate(ids_per_row):
+            bits[i, ids] = 1.0
+        return bits
+
+
+def _jaccard(inter: np.ndarray, count_a: np.ndarray, count_b: np.ndarray) -> np.ndarray:
+    """교집합 크기 행렬 → Jaccard (합집합 0이면 0)"""
+    union = count_a[:, None] + count_b[None, :] - inter
+    out = np.zeros_like(inter)
+    np.divide(inter, union, out=out, where=union > 0)
+    return out
+
+
 class VectorizedSimilarity:
     """
     벡터화된 유사도 계산
@@ -92,46 +175,96 @@ class VectorizedSimilarity:
         
         return 1.0 if sorted1 == sorted2 else VectorizedSimilarity._levenshtein_similarity_impl(sorted1, sorted2)
     
+    @staticmethod
+    def _unique(values: List) -> Tuple[List, np.ndarray]:
+        """고유값 (등장 순서) + 원래 위치 → 고유값 인덱스"""
+        index: Dict = {}
+        inverse = np.fromiter(
+            (index.setdefault((type(v), v), len(index)) for v in values),
+            dtype=np.int64, count=len(values)
+        )
+        return [v for _, v in index], inverse
+    
     def batch_similarity(
         self,
         sources: List[str],
         targets: List[str],
-        weights: Dict[str, float]
+        weights: Dict[str, float],
+        max_cells: int = 4_000_000
     ) -> np.ndarray:
         """
         배치 유사도 계산 (벡터화)
         
+        고유 문자열 단위로 계산한 뒤 행/열로 확장하며, 값은 스칼라
+        token_set / levenshtein / fuzzy_sort 구현과 동일하다.
+        - token_set: 토큰 binary 희소 행렬, 교집합 = X·Yᵀ → Jaccard
+        - levenshtein (문자 집합 근사): 문자 비트 행렬 곱 → Jaccard
+        - fuzzy_sort: 정렬 토큰 해시 키 일치 → 1.0, 아니면 정렬 문자열 문자 집합 Jaccard
+        중간 행렬은 소스 청크(청크 행 수 x 고유 타겟 수 ≤ max_cells) 단위로 계산.
+        
         Args:
             sources: 소스 문자열 리스트
             targets: 타겟 문자열 리스트  
             weights: 가중치 딕셔너리
+            max_cells: 청크당 최대 셀 수 (메모리 상한)
         
         Returns:
             유사도 행렬 (n_sources x n_targets)
         """
         n_sources = len(sources)
         n_targets = len(targets)
-        
-        # 결과 행렬 초기화
-        token_set_scores = np.zeros((n_sources, n_targets))
-        levenshtein_scores = np.zeros((n_sources, n_targets))
-        fuzzy_sort_scores = np.zeros((n_sources, n_targets))
-        
-        # 벡터화된 계산
-        for i, source in enumerate(sources):
-            for j, target in enumerate(targets):
-                token_set_scores[i, j] = self.token_set_similarity(source, target)
-                levenshtein_scores[i, j] = self.levenshtein_similarity(source, target)
-                fuzzy_sort_scores[i, j] = self.fuzzy_sort_similarity(source, target)
-        
-        # 가중치 적용 (벡터 연산)
-        hybrid_scores = (
-            token_set_scores * weights['token_set'] +
-            levenshtein_scores * weights['levenshtein'] +
-            fuzzy_sort_scores * weights['fuzzy_sort']
-        )
-        
-        return hybrid_scores
+        if n_sources == 0 or n_targets == 0:
+            return np.zeros((n_sources, n_targets))
+        
+        # 고유값 중복 제거
+        src_unique, src_inverse = self._unique(sources)
+        tgt_unique, tgt_inverse = self._unique(targets)
+        
+        token_vocab: Dict[str, int] = {}
+        char_vocab: Dict[str, int] = {}
+        key_vocab: Dict[str, int] = {}
+        src = _StringFeatures(src_unique, token_vocab, char_vocab, key_vocab)
+        tgt = _StringFeatures(tgt_unique, token_vocab, char_vocab, key_vocab)
+        for features in (src, tgt):
+            features.finalize(len(token_vocab), len(char_vocab))
+        
+        tgt_tokens_t = tgt.tokens.T.tocsc()
+        tgt_chars_t = np.ascontiguousarray(tgt.chars.T)
+        tgt_sorted_chars_t = np.ascontiguousarray(tgt.sorted_chars.T)
+        
+        n_src, n_tgt = len(src_unique), len(tgt_unique)
+        hybrid = np.empty((n_src, n_tgt))
+        step = max(1, max_cells // n_tgt)
+        
+        for lo in range(0, n_src, step):
+            rows = slice(lo, min(lo + step, n_src))
+            
+            # Token set (Jaccard): 희소 행렬 곱으로 교집합
+            inter = (src.tokens[rows] @ tgt_tokens_t).toarray().astype(np.float64)
+            token_set_scores = _jaccard(inter, src.token_count[rows], tgt.token_count)
+            
+            # 문자 집합 overlap (levenshtein 근사)
+            inter = (src.chars[rows] @ tgt_chars_t).astype(np.float64)
+            levenshtein_scores = _jaccard(inter, src.char_count[rows], tgt.char_count)
+            
+            # Fuzzy sort: 정렬 문자열 완전 일치 → 1.0, 빈 문자열 → 0.0
+            inter = (src.sorted_chars[rows] @ tgt_sorted_chars_t).astype(np.float64)
+            fuzzy_sort_scores = _jaccard(
+                inter, src.sorted_char_count[rows], tgt.sorted_char_count
+            )
+            fuzzy_sort_scores[src.sorted_empty[rows][:, None] | tgt.sorted_empty[None, :]] = 0.0
+            fuzzy_sort_scores[src.sorted_key[rows][:, None] == tgt.sorted_key[None, :]] = 1.0
+            fuzzy_sort_scores[~(src.valid[rows][:, None] & tgt.valid[None, :])] = 0.0
+            
+            # 가중치 적용 (벡터 연산)
+            hybrid[rows] = (
+                token_set_scores * weights['token_set'] +
+                levenshtein_scores * weights['levenshtein'] +
+                fuzzy_sort_scores * weights['fuzzy_sort']
+            )
+        
+        # 고유값 결과 → 원래 행/열로 확장
+        return hybrid[np.ix_(src_inverse, tgt_inverse)]
     
     def find_best_matches_vectorized(
         self,
@@ -0,0 +1,142 @@
+"""
+DSVPDFParser Field Extraction Micro-Benchmark
+==============================================
+
+문서 타입별 필드 추출 성능 비교:
+- full-scan: 필드마다 전체 텍스트 re.search (기존 방식)
+- indexed: 컴파일된 ExtractionPlan + anchor 첫 위치 색인
+
+두 방식의 추출 결과가 동일한지도 함께 검증.
+
+Usage:
+    python benchmark_parsers.py [--repeat 2000] [--pad 20]
+
+Author: HVDC Logistics Team
+Version: 1.0.0
+"""
+
+import argparse
+import dataclasses
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from praser import (
+    BOEData,
+    CarrierInvoiceData,
+    DNData,
+    DOData,
+    DocumentHeader,
+    EXTRACTION_PLANS,
+)
+
+SAMPLE_DOCUMENTS = {
+    "BOE": (
+        BOEData,
+        """DEC NO 20252101030815  DEC DATE 28-08-2025
+B/L-AWB No. MANIF. CHN2595234
+EX. VSL: CMA CGM PEGASUS VOY. NO: 0MDEIE1MA
+Manifest Reg. No. 2025082801
+GOODS DESCRIPTION: Nonelectrical luminaires and lighting fittings H.S. CODE 9405500000
+GROSS WEIGHT 53,125.7 Kgs  NET WEIGHT 48,950.0 Kgs
+USD 133,785.63  CIF: 491,359.00 Dhs  TOTAL DUTY 24,657.00
+IMPORTER: SAMSUNG C&T CORPORATION / 100123456700003
+CMAU2623154 TGHU8788690 TCNU4356762
+DEBIT NOTE 5001234 Amount: 1,250.00""",
+    ),
+    "DO": (
+        DOData,
+        """D.O. No. DOCHP00042642  D.O. Date 26-Aug-2025
+Delivery valid until 09/09/2025
+MBL No. CHN2595234  HBL No. HBL778812
+EX. VSL CMA CGM PEGASUS VOY. NO 0MDEIE1MA
+Manifest Reg. No. 2025082801
+Quantity: 749  Weight(Kgs): 53,125.7  Volume(CBM): 210.5
+Description of Goods: Nonelectrical luminaires Container
+CMAU2623154 SEAL0012
+For CMA CGM AGENCIES LLC
+EMPTY RETURN DEPOT: DP WORLD DEPOT LOCATION: JEBEL ALI
+""",
+    ),
+    "DN": (
+        DNData,
+        """Delivery Note/Waybill #: WB-2025-0091  Trip No: TR8812
+Container #: CMAU2623154  Container Type: DRY  Container Size: 40
+Seal # SEAL0012  Order Number: ORD-5512  Job Number: JOB7712
+Loading Point: KHALIFA PORT
+Destination: MIRFA SITE
+Description: Transformer parts Sender Section
+Driver Name: AHMED
+Req Truck Type: FLATBED
+Trailer Type: LOWBED
+Head Plate: AD-12345  Trailer Plate: AD-67890
+Loading Date: 01/09/2025
+ASSET RELEASE DATE & TIME: 01/09/2025 10:30
+Customer's Name: SAMSUNG C&T
+Consignee's Name: ADNOC
+Carrier: DSV SOLUTIONS
+""",
+    ),
+    "CarrierInvoice": (
+        CarrierInvoiceData,
+        """TAX INVOICE # AEINV0012345  Date: 05-Sep-2025
+Payable by 05-Oct-2025
+Bill of Lading: CHN2595234  Booking Ref: BK998877
+Vessel: CMA CGM PEGASUS
+Voyage: 0MDEIE1MA
+Load Port: SHANGHAI
+Discharge Port: KHALIFA PORT
+Invoice To: SAMSUNG C&T CORPORATION Payable to
+Total Amount: 12,345.00  Currency: AED  Total VAT 5%
+IBAN AE070331234567890123456  SWIFT: EBILAEAD
+TRN: 100123456700003  TRN: 100987654300003
+CMAU2623154 TGHU8788690""",
+    ),
+}
+
+FILLER = "Terms and conditions apply to all shipments handled under this document.\n"
+
+
+def _run(plan, data_cls, text: str, repeat: int, indexed: bool):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = plan.extract(
+            text, data_cls(header=DocumentHeader(doc_type=plan.doc_type)), indexed
+        )
+    return (time.perf_counter() - start) / repeat * 1e6, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="DSVPDFParser field extraction benchmark"
+    )
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument(
+        "--pad", type=int, default=20, help="페이지 여백 텍스트 반복 수"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'Doc Type':<16}{'full-scan(us)':>15}{'indexed(us)':>14}{'speedup':>10}  match"
+    )
+    for doc_type, (data_cls, body) in SAMPLE_DOCUMENTS.items():
+        text = FILLER * args.pad + body + "\n" + FILLER * args.pad
+        plan = EXTRACTION_PLANS[doc_type]
+
+        full_us, full = _run(plan, data_cls, text, args.repeat, indexed=False)
+        idx_us, idx = _run(plan, data_cls, text, args.repeat, indexed=True)
+        same = dataclasses.asdict(full) == dataclasses.asdict(idx)
+
+        print(
+            f"{doc_type:<16}{full_us:>15.1f}{idx_us:>14.1f}"
+            f"{full_us / idx_us:>9.2f}x  {'OK' if same else 'MISMATCH'}"
+        )
+        if not same:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
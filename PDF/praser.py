@@ -12,9 +12,11 @@ Last Updated: 2025-10-13
 
 import os
 import re
+import sys
 import json
 import hashlib
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
+from contextlib import closing
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
@@ -35,6 +37,24 @@ try:
 except ImportError:
     PYPDF2_OK = False
 
+# 페이지 단위 폴백 추출기 (02_DSV_DOMESTIC의 PyMuPDF 경로 재사용)
+_FALLBACK_UTILS_DIR = (
+    Path(__file__).resolve().parent.parent
+    / "HVDC_Invoice_Audit"
+    / "02_DSV_DOMESTIC"
+    / "src"
+    / "utils"
+)
+if str(_FALLBACK_UTILS_DIR) not in sys.path:
+    sys.path.append(str(_FALLBACK_UTILS_DIR))
+
+try:
+    from pdf_text_fallback import open_pymupdf, pymupdf_page_text
+
+    PYMUPDF_FALLBACK_OK = True
+except ImportError:
+    PYMUPDF_FALLBACK_OK = False
+
 
 # ==================== Data Classes ====================
 
@@ -283,6 +303,415 @@ class CarrierInvoiceData:
     invoiced_by_trn: Optional[str] = None
 
 
+# ==================== Extraction Plans ====================
+
+
+def _safe_float(value: str) -> Optional[float]:
+    """문자열을 float로 안전하게 변환"""
+    if not value:
+        return None
+    try:
+        # 쉼표 제거 및 변환
+        cleaned = str(value).replace(",", "").strip()
+        return float(cleaned)
+    except (ValueError, AttributeError):
+        return None
+
+
+def _safe_int(value: str) -> Optional[int]:
+    """문자열을 int로 안전하게 변환"""
+    if not value:
+        return None
+    try:
+        cleaned = str(value).replace(",", "").strip()
+        return int(float(cleaned))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _strip(value: str) -> str:
+    return value.strip()
+
+
+def _strip_200(value: str) -> str:
+    return value.strip()[:200]  # 최대 200자
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    필드 추출 규칙
+
+    anchor: 모든 매치가 시작하는 리터럴 (대소문자 무시). 지정하면 anchor의
+    첫 위치부터 검색하고, 문서에 anchor가 없으면 검색을 생략한다.
+    """
+
+    attr: str
+    regex: str
+    anchor: Optional[str] = None
+    flags: int = re.IGNORECASE
+    convert: Optional[Callable[[str], Any]] = None
+
+
+class ExtractionPlan:
+    """
+    문서 타입별 컴파일된 필드 추출 계획
+
+    필드 정규식은 모듈 로드 시 1회 컴파일. 추출 시 텍스트를 한 번 대문자로
+    정규화하여 anchor별 첫 위치를 색인하고, anchor가 존재하는 필드만 그
+    위치부터 검색한다. 필드 정규식은 항상 anchor로 시작하므로 결과는 필드별
+    re.search(text) 첫 매치와 동일하다.
+
+    required/page_budget은 페이지 지연 추출 모드에서 사용:
+    required 필드가 모두 매치되면 나머지 페이지를 읽지 않고, 최대
+    page_budget 페이지까지만 읽는다.
+    """
+
+    def __init__(
+        self,
+        doc_type: str,
+        fields: List[FieldSpec],
+        required: Tuple[str, ...] = (),
+        page_budget: Optional[int] = None,
+    ):
+        self.doc_type = doc_type
+        self.page_budget = page_budget
+        self.fields = [
+            (
+                spec,
+                re.compile(spec.regex, spec.flags),
+                spec.anchor.upper() if spec.anchor else None,
+            )
+            for spec in fields
+        ]
+        self.anchors = sorted({anchor for _, _, anchor in self.fields if anchor})
+        self.required = [f for f in self.fields if f[0].attr in required]
+
+    def anchor_positions(self, text: str) -> Optional[Dict[str, int]]:
+        """
+        anchor별 첫 위치 색인 (없으면 -1)
+
+        비ASCII 텍스트는 대문자 변환 시 길이/매칭이 정규식 IGNORECASE와
+        달라질 수 있으므로 None 반환 (전체 검색으로 폴백).
+        """
+        if not text.isascii():
+            return None
+        folded = text.upper()
+        return {anchor: folded.find(anchor) for anchor in self.anchors}
+
+    def extract(self, text: str, target: Any, indexed: bool = True) -> Any:
+        """
+        텍스트에서 필드 추출하여 target 데이터클래스에 설정
+
+        Args:
+            text: 문서 전체 텍스트
+            target: BOEData/DOData/DNData/CarrierInvoiceData
+            indexed: False면 필드마다 전체 텍스트 검색 (벤치마크/검증용)
+        """
+        positions = self.anchor_positions(text) if indexed else None
+
+        for spec, pattern, anchor in self.fields:
+            match = self._search(text, pattern, anchor, positions)
+            if match:
+                value = match.group(1)
+                setattr(
+                    target, spec.attr, spec.convert(value) if spec.convert else value
+                )
+
+        return target
+
+    def has_required(self, text: str) -> bool:
+        """required 필드가 모두 매치되는지 (페이지 조기 종료 판정)"""
+        positions = self.anchor_positions(text)
+        return all(
+            self._search(text, pattern, anchor, positions)
+            for _, pattern, anchor in self.required
+        )
+
+    @staticmethod
+    def _search(
+        text: str,
+        pattern: "re.Pattern",
+        anchor: Optional[str],
+        positions: Optional[Dict[str, int]],
+    ) -> Optional["re.Match"]:
+        if positions is not None and anchor:
+            pos = positions[anchor]
+            if pos < 0:
+                return None
+            return pattern.search(text, pos)
+        return pattern.search(text)
+
+
+CONTAINER_PATTERN = re.compile(r"(CMAU\d{7}|TGHU\d{7}|TCNU\d{7}|[A-Z]{4}\d{7})")
+CONTAINER_SEAL_PATTERN = re.compile(
+    r"(CMAU\d{7}|TGHU\d{7}|TCNU\d{7}|[A-Z]{4}\d{7})\s*([A-Z0-9]+)"
+)
+DEBIT_NOTE_PATTERN = re.compile(
+    r"DEBIT NOTE[:\s]*(\d+).*?Amount[:\s]*([\d,]+\.?\d*)", re.IGNORECASE | re.DOTALL
+)
+TRN_PATTERN = re.compile(r"TRN\s*#?[.:]?\s*(\d{15})", re.IGNORECASE)
+
+BOE_PLAN = ExtractionPlan(
+    "BOE",
+    [
+        FieldSpec("dec_no", r"DEC NO[:\s]*(\d{14})", "DEC NO"),
+        FieldSpec("dec_date", r"DEC DATE[:\s]*(\d{2}-\d{2}-\d{4})", "DEC DATE"),
+        FieldSpec(
+            "mbl_no", r"B[\\\/]L[-\s]*AWB\s+No[.:]?[\s\\]*MANIF[.\s]*([A-Z0-9]+)"
+        ),
+        FieldSpec(
+            "vessel",
+            r"EX[.\s]*VSL[:.\s]*(.+?)\s+VOY",
+            "EX",
+            re.IGNORECASE | re.DOTALL,
+            _strip,
+        ),
+        FieldSpec("voyage_no", r"VOY[.\s]*NO[:.\s]*([A-Z0-9]+)", "VOY"),
+        FieldSpec(
+            "manifest_reg_no", r"Manifest\s+Reg[.\s]*No[.:]?\s*(\d+)", "Manifest"
+        ),
+        FieldSpec("hs_code", r"H[.\s]*S[.\s]*CODE[:\s]*(\d{10})"),
+        FieldSpec(
+            "description",
+            r"GOODS DESCRIPTION[:\s]*(.+?)(?:H\.S\.|CUSTOMS)",
+            "GOODS DESCRIPTION",
+            re.IGNORECASE | re.DOTALL,
+            _strip_200,
+        ),
+        FieldSpec(
+            "gross_weight_kg",
+            r"GROSS WEIGHT[:\s]*([\d,]+\.?\d*)\s*Kgs",
+            "GROSS WEIGHT",
+            convert=_safe_float,
+        ),
+        FieldSpec(
+            "net_weight_kg",
+            r"NET WEIGHT[:\s]*([\d,]+\.?\d*)\s*Kgs",
+            "NET WEIGHT",
+            convert=_safe_float,
+        ),
+        FieldSpec("value_usd", r"USD\s+([\d,]+\.?\d*)", "USD", 0, convert=_safe_float),
+        FieldSpec(
+            "cif_value_aed",
+            r"CIF[:\s]*([\d,]+\.?\d*)\s*Dhs",
+            "CIF",
+            convert=_safe_float,
+        ),
+        FieldSpec(
+            "duty_aed",
+            r"TOTAL DUTY[:\s]*([\d,]+\.?\d*)",
+            "TOTAL DUTY",
+            convert=_safe_float,
+        ),
+        FieldSpec("importer_trn", r"IMPORTER[:\s]*.+?[\/\\](\d+)", "IMPORTER"),
+    ],
+    required=("dec_no", "mbl_no", "gross_weight_kg", "duty_aed"),
+    page_budget=4,
+)
+
+DO_PLAN = ExtractionPlan(
+    "DO",
+    [
+        FieldSpec("do_number", r"D[.\s]*O[.\s]*No[.:]?\s*([A-Z0-9]+)"),
+        FieldSpec("do_date", r"D[.\s]*O[.\s]*Date[.:]?\s*(\d{1,2}[-/]\w{3}[-/]\d{4})"),
+        FieldSpec(
+            "delivery_valid_until",
+            r"Delivery\s+valid\s+until[.:]?\s*(\d{1,2}/\d{1,2}/\d{4})",
+            "Delivery",
+        ),
+        FieldSpec("mbl_no", r"MBL\s+No[.:]?\s+([A-Z0-9]+)", "MBL"),
+        FieldSpec("hbl_no", r"HBL\s+No[.:]?\s+([A-Z0-9]+)", "HBL"),
+        FieldSpec(
+            "vessel",
+            r"EX[.\s]*VSL[.:]?\s*(.+?)\s+VOY",
+            "EX",
+            re.IGNORECASE | re.DOTALL,
+            _strip,
+        ),
+        FieldSpec("voyage_no", r"Voy[.\s]*No[.:]?\s*([A-Z0-9]+)", "Voy"),
+        FieldSpec(
+            "manifest_reg_no", r"Manifest\s+Reg[.\s]*No[.:]?\s*(\d+)", "Manifest"
+        ),
+        FieldSpec("quantity", r"Quantity[.:]?\s*(\d+)", "Quantity", convert=_safe_int),
+        FieldSpec(
+            "weight_kg",
+            r"Weight\(Kgs\)[.:]?\s*([\d,]+\.?\d*)",
+            "Weight",
+            convert=_safe_float,
+        ),
+        FieldSpec(
+            "volume_cbm",
+            r"Volume\(CBM\)[.:]?\s*([\d,]+\.?\d*)",
+            "Volume",
+            convert=_safe_float,
+        ),
+        FieldSpec(
+            "description",
+            r"Description\s+of\s+Goods[.:]?\s*(.+?)(?:Container|Marks|$)",
+            "Description",
+            re.IGNORECASE | re.DOTALL,
+            _strip_200,
+        ),
+        FieldSpec("shipping_line", r"For\s+([A-Z\s&-]+LLC)", "For", convert=_strip),
+        FieldSpec(
+            "empty_return_depot",
+            r"EMPTY RETURN DEPOT[.:]?\s*(.+?)(?:DEPOT LOCATION|$)",
+            "EMPTY RETURN DEPOT",
+            re.IGNORECASE | re.DOTALL,
+            _strip,
+        ),
+        FieldSpec(
+            "empty_return_location",
+            r"DEPOT LOCATION[.:]?\s*(.+?)(?:\n|$)",
+            "DEPOT LOCATION",
+            convert=_strip,
+        ),
+    ],
+    required=("do_number", "mbl_no", "delivery_valid_until"),
+    page_budget=2,
+)
+
+DN_PLAN = ExtractionPlan(
+    "DN",
+    [
+        FieldSpec(
+            "waybill_no",
+            r"Delivery\s+Note[/\\]Waybill\s*#[.:]?\s*([A-Z0-9-]+)",
+            "Delivery",
+        ),
+        FieldSpec("trip_no", r"Trip\s+No[.:]?\s*([A-Z0-9]+)", "Trip"),
+        FieldSpec("container_no", r"Container\s*#[.:]?\s*([A-Z]{4}\d{7})", "Container"),
+        FieldSpec("container_type", r"Container\s+Type[.:]?\s*(\w+)", "Container"),
+        FieldSpec("container_size", r"Container\s+Size[.:]?\s*(\w+)", "Container"),
+        FieldSpec("seal_no", r"Seal\s*#[.:]?\s*([A-Z0-9]+)", "Seal"),
+        FieldSpec("order_number", r"Order\s+Number[.:]?\s*([A-Z0-9-]+)", "Order"),
+        FieldSpec("job_number", r"Job\s+Number[.:]?\s*([A-Z0-9]+)", "Job"),
+        FieldSpec(
+            "loading_point",
+            r"Loading\s+Point[.:]?\s*(.+?)(?:\n|Loading Country)",
+            "Loading",
+            convert=_strip,
+        ),
+        FieldSpec(
+            "destination",
+            r"Destination[.:]?\s*(.+?)(?:\n|Offloading)",
+            "Destination",
+            convert=_strip,
+        ),
+        FieldSpec(
+            "description",
+            r"Description[.:]?\s*(.+?)(?:Sender Section|CONSIGNMENT)",
+            "Description",
+            re.IGNORECASE | re.DOTALL,
+            _strip_200,
+        ),
+        FieldSpec(
+            "driver_name",
+            r"Driver\s+Name[.:]?\s*(.+?)(?:\n|Employee)",
+            "Driver",
+            convert=_strip,
+        ),
+        FieldSpec(
+            "truck_type",
+            r"Req\s+Truck\s+Type[.:]?\s*(.+?)(?:\n|Destination)",
+            "Req",
+            convert=_strip,
+        ),
+        FieldSpec(
+            "trailer_type",
+            r"Trailer\s+Type[.:]?\s*(.+?)(?:\n|Trailer Plate)",
+            "Trailer",
+            convert=_strip,
+        ),
+        FieldSpec("head_plate", r"Head\s+Plate[.:]?\s*([A-Z0-9-]+)", "Head"),
+        FieldSpec("trailer_plate", r"Trailer\s+Plate[.:]?\s*([A-Z0-9-]+)", "Trailer"),
+        FieldSpec(
+            "loading_date", r"Loading\s+Date[.:]?\s*(\d{2}/\d{2}/\d{4})", "Loading"
+        ),
+        FieldSpec(
+            "asset_release_time_origin",
+            r"ASSET\s+RELEASE\s+DATE\s+&\s+TIME[.:]?\s*(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2})",
+            "ASSET",
+        ),
+        FieldSpec(
+            "customer_name",
+            r"Customer'?s\s+Name[.:]?\s*(.+?)(?:\n|Address)",
+            "Customer",
+            convert=_strip,
+        ),
+        FieldSpec(
+            "consignee_name",
+            r"Consignee'?s\s+Name[.:]?\s*(.+?)(?:\n|Address)",
+            "Consignee",
+            convert=_strip,
+        ),
+        FieldSpec(
+            "carrier", r"Carrier[.:]?\s*(.+?)(?:\n|Driver)", "Carrier", convert=_strip
+        ),
+    ],
+    required=("waybill_no", "container_no", "loading_point", "destination"),
+    page_budget=2,
+)
+
+CARRIER_INVOICE_PLAN = ExtractionPlan(
+    "CarrierInvoice",
+    [
+        FieldSpec("invoice_number", r"(?:TAX\s+)?INVOICE\s*#?\s*[.:]?\s*([A-Z0-9]+)"),
+        FieldSpec("invoice_date", r"Date[.:]?\s*(\d{1,2}[-/]\w{3}[-/]\d{4})", "Date"),
+        FieldSpec(
+            "payable_by",
+            r"Payable\s+by[.:]?\s*(\d{1,2}[-/]\w{3}[-/]\d{4})",
+            "Payable",
+        ),
+        FieldSpec("bl_number", r"Bill\s+of\s+Lading[.:]?\s+([A-Z0-9]+)", "Bill"),
+        FieldSpec("booking_ref", r"Booking\s+Ref[.:]?\s+([A-Z0-9]+)", "Booking"),
+        FieldSpec(
+            "vessel", r"Vessel[.:]?\s+(.+?)(?:\n|Voyage)", "Vessel", convert=_strip
+        ),
+        FieldSpec("voyage", r"Voyage[.:]?\s+([A-Z0-9]+)", "Voyage"),
+        FieldSpec(
+            "load_port",
+            r"Load\s+Port[.:]?\s+(.+?)(?:\n|Discharge)",
+            "Load",
+            convert=_strip,
+        ),
+        FieldSpec(
+            "discharge_port",
+            r"Discharge\s+Port[.:]?\s+(.+?)(?:\n|Place)",
+            "Discharge",
+            convert=_strip,
+        ),
+        FieldSpec(
+            "invoice_to",
+            r"Invoice\s+To[.:]?\s*(.+?)(?:Payable to|IBAN)",
+            "Invoice",
+            re.IGNORECASE | re.DOTALL,
+            _strip_200,
+        ),
+        FieldSpec(
+            "total_incl_tax",
+            r"Total\s+Amount[.:]?\s*([\d,]+\.?\d*)",
+            "Total",
+            convert=_safe_float,
+        ),
+        FieldSpec("currency", r"Currency[.:]?\s+([A-Z]{3})", "Currency"),
+        FieldSpec("vat_rate", r"Total\s+VAT\s+([\d.]+)%", "Total", convert=_safe_float),
+        FieldSpec("iban", r"IBAN[.:]?\s+([A-Z]{2}\d{2}[A-Z0-9]+)", "IBAN"),
+        FieldSpec("swift", r"SWIFT[.:]?\s+([A-Z0-9]{8,11})", "SWIFT"),
+    ],
+    required=("invoice_number", "bl_number", "total_incl_tax"),
+    page_budget=10,
+)
+
+EXTRACTION_PLANS = {
+    "BOE": BOE_PLAN,
+    "DO": DO_PLAN,
+    "DN": DN_PLAN,
+    "CarrierInvoice": CARRIER_INVOICE_PLAN,
+}
+
+
 # ==================== PDF Parser Engine ====================
 
 
@@ -298,8 +727,26 @@ class DSVPDFParser:
     - PortInspection
     """
 
-    def __init__(self, log_level: str = "INFO"):
+    def __init__(
+        self,
+        log_level: str = "INFO",
+        lazy_pages: bool = False,
+        page_budgets: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            log_level: 로그 레벨
+            lazy_pages: True면 페이지를 순차 추출하다 필수 필드가 모두
+                채워지면 중단 (BOE/DO/DN/CarrierInvoice)
+            page_budgets: 문서 타입별 최대 읽기 페이지 수 (lazy_pages 모드)
+        """
         self.logger = self._setup_logger(log_level)
+        self.lazy_pages = lazy_pages
+        self.page_budgets = {
+            doc_type: plan.page_budget for doc_type, plan in EXTRACTION_PLANS.items()
+        }
+        if page_budgets:
+            self.page_budgets.update(page_budgets)
 
         if not PDF_PLUMBER_OK:
             raise ImportError("pdfplumber is required. Install: pip install pdfplumber")
@@ -348,140 +795,108 @@ class DSVPDFParser:
             return match.group(1).upper()
         return None
 
-    def _extract_text_from_pdf(self, pdf_path: str) -> str:
-        """PDF에서 전체 텍스트 추출"""
-        text_content = []
+    def _iter_pdf_pages(self, pdf_path: str) -> Iterator[str]:
+        """
+        페이지 단위 텍스트 지연 추출
+
+        pdfplumber로 페이지를 하나씩 추출하고, 빈 페이지(스캔본 등)나
+        pdfplumber 오류 이후 페이지는 PyMuPDF로 폴백한다.
+        """
+        fallback = None
+        fallback_tried = False
+        pages_done = 0
+
+        def _fallback_doc():
+            nonlocal fallback, fallback_tried
+            if not fallback_tried and PYMUPDF_FALLBACK_OK:
+                fallback_tried = True
+                fallback = open_pymupdf(pdf_path)
+            return fallback
 
         try:
             with pdfplumber.open(pdf_path) as pdf:
                 for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append(page_text)
+                    try:
+                        page_text = page.extract_text() or ""
+                    except Exception as e:
+                        self.logger.debug(
+                            f"pdfplumber failed on page {pages_done + 1}: {e}"
+                        )
+                        page_text = ""
+                    finally:
+                        page.close()  # 페이지 객체 캐시 해제
+
+                    if not page_text.strip() and _fallback_doc() is not None:
+                        page_text = pymupdf_page_text(fallback, pages_done) or page_text
+
+                    pages_done += 1
+                    yield page_text
         except Exception as e:
             self.logger.error(f"Error extracting text from {pdf_path}: {e}")
+            if _fallback_doc() is not None:
+                for index in range(pages_done, len(fallback)):
+                    yield pymupdf_page_text(fallback, index) or ""
+        finally:
+            if fallback is not None:
+                fallback.close()
 
+    def _extract_text_from_pdf(self, pdf_path: str) -> str:
+        """PDF에서 전체 텍스트 추출"""
+        return "\n".join(
+            page_text for page_text in self._iter_pdf_pages(pdf_path) if page_text
+        )
+
+    def _extract_text_lazy(self, pdf_path: str, doc_type: str) -> str:
+        """
+        필요한 페이지까지만 텍스트 추출
+
+        페이지를 순차로 읽으며 문서 타입의 필수 필드가 모두 매치되거나
+        페이지 예산에 도달하면 중단. 추출 계획이 없는 타입은 전체 추출.
+        """
+        plan = EXTRACTION_PLANS.get(doc_type)
+        if plan is None:
+            return self._extract_text_from_pdf(pdf_path)
+
+        budget = self.page_budgets.get(doc_type)
+        text_content = []
+        pages_read = 0
+
+        with closing(self._iter_pdf_pages(pdf_path)) as pages:
+            for page_text in pages:
+                pages_read += 1
+                if page_text:
+                    text_content.append(page_text)
+                    if plan.has_required("\n".join(text_content)):
+                        break
+                if budget and pages_read >= budget:
+                    break
+
+        self.logger.debug(f"Lazy extraction read {pages_read} page(s): {pdf_path}")
         return "\n".join(text_content)
 
     def _safe_float(self, value: str) -> Optional[float]:
         """문자열을 float로 안전하게 변환"""
-        if not value:
-            return None
-        try:
-            # 쉼표 제거 및 변환
-            cleaned = str(value).replace(",", "").strip()
-            return float(cleaned)
-        except (ValueError, AttributeError):
-            return None
+        return _safe_float(value)
 
     def _safe_int(self, value: str) -> Optional[int]:
         """문자열을 int로 안전하게 변환"""
-        if not value:
-            return None
-        try:
-            cleaned = str(value).replace(",", "").strip()
-            return int(float(cleaned))
-        except (ValueError, AttributeError):
-            return None
+        return _safe_int(value)
 
     # ==================== BOE Parser ====================
 
     def _parse_boe(self, text: str, header: DocumentHeader) -> BOEData:
         """Bill of Entry 파싱"""
         boe = BOEData(header=header)
-
-        # DEC NO
-        match = re.search(r"DEC NO[:\s]*(\d{14})", text, re.IGNORECASE)
-        if match:
-            boe.dec_no = match.group(1)
-
-        # DEC DATE
-        match = re.search(r"DEC DATE[:\s]*(\d{2}-\d{2}-\d{4})", text, re.IGNORECASE)
-        if match:
-            boe.dec_date = match.group(1)
-
-        # MBL/AWB Number
-        match = re.search(
-            r"B[\\\/]L[-\s]*AWB\s+No[.:]?[\s\\]*MANIF[.\s]*([A-Z0-9]+)",
-            text,
-            re.IGNORECASE,
-        )
-        if match:
-            boe.mbl_no = match.group(1)
-
-        # Vessel
-        match = re.search(
-            r"EX[.\s]*VSL[:.\s]*(.+?)\s+VOY", text, re.IGNORECASE | re.DOTALL
-        )
-        if match:
-            boe.vessel = match.group(1).strip()
-
-        # Voyage
-        match = re.search(r"VOY[.\s]*NO[:.\s]*([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            boe.voyage_no = match.group(1)
-
-        # Manifest Reg. No
-        match = re.search(r"Manifest\s+Reg[.\s]*No[.:]?\s*(\d+)", text, re.IGNORECASE)
-        if match:
-            boe.manifest_reg_no = match.group(1)
+        BOE_PLAN.extract(text, boe)
 
         # Containers
-        container_pattern = r"(CMAU\d{7}|TGHU\d{7}|TCNU\d{7}|[A-Z]{4}\d{7})"
-        containers = re.findall(container_pattern, text)
+        containers = CONTAINER_PATTERN.findall(text)
         if containers:
             boe.containers = list(set(containers))  # 중복 제거
             boe.num_containers = len(boe.containers)
 
-        # HS CODE
-        match = re.search(r"H[.\s]*S[.\s]*CODE[:\s]*(\d{10})", text, re.IGNORECASE)
-        if match:
-            boe.hs_code = match.group(1)
-
-        # Description
-        match = re.search(
-            r"GOODS DESCRIPTION[:\s]*(.+?)(?:H\.S\.|CUSTOMS)",
-            text,
-            re.IGNORECASE | re.DOTALL,
-        )
-        if match:
-            boe.description = match.group(1).strip()[:200]  # 최대 200자
-
-        # Gross Weight
-        match = re.search(
-            r"GROSS WEIGHT[:\s]*([\d,]+\.?\d*)\s*Kgs", text, re.IGNORECASE
-        )
-        if match:
-            boe.gross_weight_kg = self._safe_float(match.group(1))
-
-        # Net Weight
-        match = re.search(r"NET WEIGHT[:\s]*([\d,]+\.?\d*)\s*Kgs", text, re.IGNORECASE)
-        if match:
-            boe.net_weight_kg = self._safe_float(match.group(1))
-
-        # Value USD
-        match = re.search(r"USD\s+([\d,]+\.?\d*)", text)
-        if match:
-            boe.value_usd = self._safe_float(match.group(1))
-
-        # CIF LOCAL VALUE (AED)
-        match = re.search(r"CIF[:\s]*([\d,]+\.?\d*)\s*Dhs", text, re.IGNORECASE)
-        if match:
-            boe.cif_value_aed = self._safe_float(match.group(1))
-
-        # Total Duty
-        match = re.search(r"TOTAL DUTY[:\s]*([\d,]+\.?\d*)", text, re.IGNORECASE)
-        if match:
-            boe.duty_aed = self._safe_float(match.group(1))
-
-        # Importer TRN
-        match = re.search(r"IMPORTER[:\s]*.+?[\/\\](\d+)", text, re.IGNORECASE)
-        if match:
-            boe.importer_trn = match.group(1)
-
         # Debit Notes
-        debit_pattern = r"DEBIT NOTE[:\s]*(\d+).*?Amount[:\s]*([\d,]+\.?\d*)"
-        debit_matches = re.findall(debit_pattern, text, re.IGNORECASE | re.DOTALL)
+        debit_matches = DEBIT_NOTE_PATTERN.findall(text)
         if debit_matches:
             boe.debit_notes = [
                 {"note_no": dn[0], "amount_aed": self._safe_float(dn[1])}
@@ -495,110 +910,15 @@ class DSVPDFParser:
     def _parse_do(self, text: str, header: DocumentHeader) -> DOData:
         """Delivery Order 파싱"""
         do = DOData(header=header)
-
-        # D.O. No
-        match = re.search(r"D[.\s]*O[.\s]*No[.:]?\s*([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            do.do_number = match.group(1)
-
-        # D.O. Date
-        match = re.search(
-            r"D[.\s]*O[.\s]*Date[.:]?\s*(\d{1,2}[-/]\w{3}[-/]\d{4})",
-            text,
-            re.IGNORECASE,
-        )
-        if match:
-            do.do_date = match.group(1)
-
-        # Delivery Valid Until
-        match = re.search(
-            r"Delivery\s+valid\s+until[.:]?\s*(\d{1,2}/\d{1,2}/\d{4})",
-            text,
-            re.IGNORECASE,
-        )
-        if match:
-            do.delivery_valid_until = match.group(1)
-
-        # MBL No
-        match = re.search(r"MBL\s+No[.:]?\s+([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            do.mbl_no = match.group(1)
-
-        # HBL No
-        match = re.search(r"HBL\s+No[.:]?\s+([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            do.hbl_no = match.group(1)
-
-        # Vessel
-        match = re.search(
-            r"EX[.\s]*VSL[.:]?\s*(.+?)\s+VOY", text, re.IGNORECASE | re.DOTALL
-        )
-        if match:
-            do.vessel = match.group(1).strip()
-
-        # Voyage No
-        match = re.search(r"Voy[.\s]*No[.:]?\s*([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            do.voyage_no = match.group(1)
-
-        # Manifest Reg. No
-        match = re.search(r"Manifest\s+Reg[.\s]*No[.:]?\s*(\d+)", text, re.IGNORECASE)
-        if match:
-            do.manifest_reg_no = match.group(1)
-
-        # Quantity (containers)
-        match = re.search(r"Quantity[.:]?\s*(\d+)", text, re.IGNORECASE)
-        if match:
-            do.quantity = self._safe_int(match.group(1))
-
-        # Weight
-        match = re.search(r"Weight\(Kgs\)[.:]?\s*([\d,]+\.?\d*)", text, re.IGNORECASE)
-        if match:
-            do.weight_kg = self._safe_float(match.group(1))
-
-        # Volume
-        match = re.search(r"Volume\(CBM\)[.:]?\s*([\d,]+\.?\d*)", text, re.IGNORECASE)
-        if match:
-            do.volume_cbm = self._safe_float(match.group(1))
+        DO_PLAN.extract(text, do)
 
         # Containers
-        container_pattern = (
-            r"(CMAU\d{7}|TGHU\d{7}|TCNU\d{7}|[A-Z]{4}\d{7})\s*([A-Z0-9]+)"
-        )
-        container_matches = re.findall(container_pattern, text)
+        container_matches = CONTAINER_SEAL_PATTERN.findall(text)
         if container_matches:
             do.containers = [
                 {"container_no": c[0], "seal_no": c[1]} for c in container_matches
             ]
 
-        # Description
-        match = re.search(
-            r"Description\s+of\s+Goods[.:]?\s*(.+?)(?:Container|Marks|$)",
-            text,
-            re.IGNORECASE | re.DOTALL,
-        )
-        if match:
-            do.description = match.group(1).strip()[:200]
-
-        # Shipping Line
-        match = re.search(r"For\s+([A-Z\s&-]+LLC)", text, re.IGNORECASE)
-        if match:
-            do.shipping_line = match.group(1).strip()
-
-        # Empty Return Depot
-        match = re.search(
-            r"EMPTY RETURN DEPOT[.:]?\s*(.+?)(?:DEPOT LOCATION|$)",
-            text,
-            re.IGNORECASE | re.DOTALL,
-        )
-        if match:
-            do.empty_return_depot = match.group(1).strip()
-
-        # Empty Return Location
-        match = re.search(r"DEPOT LOCATION[.:]?\s*(.+?)(?:\n|$)", text, re.IGNORECASE)
-        if match:
-            do.empty_return_location = match.group(1).strip()
-
         return do
 
     # ==================== DN Parser ====================
@@ -606,137 +926,7 @@ class DSVPDFParser:
     def _parse_dn(self, text: str, header: DocumentHeader) -> DNData:
         """Delivery Note 파싱"""
         dn = DNData(header=header)
-
-        # Waybill No
-        match = re.search(
-            r"Delivery\s+Note[/\\]Waybill\s*#[.:]?\s*([A-Z0-9-]+)", text, re.IGNORECASE
-        )
-        if match:
-            dn.waybill_no = match.group(1)
-
-        # Trip No
-        match = re.search(r"Trip\s+No[.:]?\s*([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            dn.trip_no = match.group(1)
-
-        # Container Number
-        match = re.search(r"Container\s*#[.:]?\s*([A-Z]{4}\d{7})", text, re.IGNORECASE)
-        if match:
-            dn.container_no = match.group(1)
-
-        # Container Type/Size
-        match = re.search(r"Container\s+Type[.:]?\s*(\w+)", text, re.IGNORECASE)
-        if match:
-            dn.container_type = match.group(1)
-
-        match = re.search(r"Container\s+Size[.:]?\s*(\w+)", text, re.IGNORECASE)
-        if match:
-            dn.container_size = match.group(1)
-
-        # Seal No
-        match = re.search(r"Seal\s*#[.:]?\s*([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            dn.seal_no = match.group(1)
-
-        # Order Number
-        match = re.search(r"Order\s+Number[.:]?\s*([A-Z0-9-]+)", text, re.IGNORECASE)
-        if match:
-            dn.order_number = match.group(1)
-
-        # Job Number
-        match = re.search(r"Job\s+Number[.:]?\s*([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            dn.job_number = match.group(1)
-
-        # Loading Point
-        match = re.search(
-            r"Loading\s+Point[.:]?\s*(.+?)(?:\n|Loading Country)", text, re.IGNORECASE
-        )
-        if match:
-            dn.loading_point = match.group(1).strip()
-
-        # Destination
-        match = re.search(
-            r"Destination[.:]?\s*(.+?)(?:\n|Offloading)", text, re.IGNORECASE
-        )
-        if match:
-            dn.destination = match.group(1).strip()
-
-        # Description
-        match = re.search(
-            r"Description[.:]?\s*(.+?)(?:Sender Section|CONSIGNMENT)",
-            text,
-            re.IGNORECASE | re.DOTALL,
-        )
-        if match:
-            dn.description = match.group(1).strip()[:200]
-
-        # Driver Name
-        match = re.search(
-            r"Driver\s+Name[.:]?\s*(.+?)(?:\n|Employee)", text, re.IGNORECASE
-        )
-        if match:
-            dn.driver_name = match.group(1).strip()
-
-        # Truck Type
-        match = re.search(
-            r"Req\s+Truck\s+Type[.:]?\s*(.+?)(?:\n|Destination)", text, re.IGNORECASE
-        )
-        if match:
-            dn.truck_type = match.group(1).strip()
-
-        # Trailer Type
-        match = re.search(
-            r"Trailer\s+Type[.:]?\s*(.+?)(?:\n|Trailer Plate)", text, re.IGNORECASE
-        )
-        if match:
-            dn.trailer_type = match.group(1).strip()
-
-        # Head Plate
-        match = re.search(r"Head\s+Plate[.:]?\s*([A-Z0-9-]+)", text, re.IGNORECASE)
-        if match:
-            dn.head_plate = match.group(1)
-
-        # Trailer Plate
-        match = re.search(r"Trailer\s+Plate[.:]?\s*([A-Z0-9-]+)", text, re.IGNORECASE)
-        if match:
-            dn.trailer_plate = match.group(1)
-
-        # Loading Date
-        match = re.search(
-            r"Loading\s+Date[.:]?\s*(\d{2}/\d{2}/\d{4})", text, re.IGNORECASE
-        )
-        if match:
-            dn.loading_date = match.group(1)
-
-        # Asset Release Time (Origin)
-        match = re.search(
-            r"ASSET\s+RELEASE\s+DATE\s+&\s+TIME[.:]?\s*(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2})",
-            text,
-            re.IGNORECASE,
-        )
-        if match:
-            dn.asset_release_time_origin = match.group(1)
-
-        # Customer Name
-        match = re.search(
-            r"Customer'?s\s+Name[.:]?\s*(.+?)(?:\n|Address)", text, re.IGNORECASE
-        )
-        if match:
-            dn.customer_name = match.group(1).strip()
-
-        # Consignee Name
-        match = re.search(
-            r"Consignee'?s\s+Name[.:]?\s*(.+?)(?:\n|Address)", text, re.IGNORECASE
-        )
-        if match:
-            dn.consignee_name = match.group(1).strip()
-
-        # Carrier
-        match = re.search(r"Carrier[.:]?\s*(.+?)(?:\n|Driver)", text, re.IGNORECASE)
-        if match:
-            dn.carrier = match.group(1).strip()
-
+        DN_PLAN.extract(text, dn)
         return dn
 
     # ==================== Carrier Invoice Parser ====================
@@ -746,107 +936,19 @@ class DSVPDFParser:
     ) -> CarrierInvoiceData:
         """Carrier Invoice 파싱"""
         inv = CarrierInvoiceData(header=header)
+        CARRIER_INVOICE_PLAN.extract(text, inv)
 
-        # Invoice Number
-        match = re.search(
-            r"(?:TAX\s+)?INVOICE\s*#?\s*[.:]?\s*([A-Z0-9]+)", text, re.IGNORECASE
-        )
-        if match:
-            inv.invoice_number = match.group(1)
-
-        # Date
-        match = re.search(
-            r"Date[.:]?\s*(\d{1,2}[-/]\w{3}[-/]\d{4})", text, re.IGNORECASE
-        )
-        if match:
-            inv.invoice_date = match.group(1)
-
-        # Payable by
-        match = re.search(
-            r"Payable\s+by[.:]?\s*(\d{1,2}[-/]\w{3}[-/]\d{4})", text, re.IGNORECASE
-        )
-        if match:
-            inv.payable_by = match.group(1)
-
-        # Bill of Lading
-        match = re.search(r"Bill\s+of\s+Lading[.:]?\s+([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            inv.bl_number = match.group(1)
-
-        # Booking Ref
-        match = re.search(r"Booking\s+Ref[.:]?\s+([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            inv.booking_ref = match.group(1)
-
-        # Vessel
-        match = re.search(r"Vessel[.:]?\s+(.+?)(?:\n|Voyage)", text, re.IGNORECASE)
-        if match:
-            inv.vessel = match.group(1).strip()
-
-        # Voyage
-        match = re.search(r"Voyage[.:]?\s+([A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            inv.voyage = match.group(1)
-
-        # Load Port
-        match = re.search(
-            r"Load\s+Port[.:]?\s+(.+?)(?:\n|Discharge)", text, re.IGNORECASE
-        )
-        if match:
-            inv.load_port = match.group(1).strip()
-
-        # Discharge Port
-        match = re.search(
-            r"Discharge\s+Port[.:]?\s+(.+?)(?:\n|Place)", text, re.IGNORECASE
-        )
-        if match:
-            inv.discharge_port = match.group(1).strip()
+        # Currency
+        if not inv.currency:
+            inv.currency = "AED"  # Default
 
         # Containers
-        container_pattern = r"(CMAU\d{7}|TGHU\d{7}|TCNU\d{7}|[A-Z]{4}\d{7})"
-        containers = re.findall(container_pattern, text)
+        containers = CONTAINER_PATTERN.findall(text)
         if containers:
             inv.containers = list(set(containers))
 
-        # Invoice To
-        match = re.search(
-            r"Invoice\s+To[.:]?\s*(.+?)(?:Payable to|IBAN)",
-            text,
-            re.IGNORECASE | re.DOTALL,
-        )
-        if match:
-            inv.invoice_to = match.group(1).strip()[:200]
-
-        # Total Amount (AED)
-        match = re.search(r"Total\s+Amount[.:]?\s*([\d,]+\.?\d*)", text, re.IGNORECASE)
-        if match:
-            inv.total_incl_tax = self._safe_float(match.group(1))
-
-        # Currency
-        match = re.search(r"Currency[.:]?\s+([A-Z]{3})", text, re.IGNORECASE)
-        if match:
-            inv.currency = match.group(1)
-        else:
-            inv.currency = "AED"  # Default
-
-        # VAT
-        match = re.search(r"Total\s+VAT\s+([\d.]+)%", text, re.IGNORECASE)
-        if match:
-            inv.vat_rate = self._safe_float(match.group(1))
-
-        # IBAN
-        match = re.search(r"IBAN[.:]?\s+([A-Z]{2}\d{2}[A-Z0-9]+)", text, re.IGNORECASE)
-        if match:
-            inv.iban = match.group(1)
-
-        # SWIFT
-        match = re.search(r"SWIFT[.:]?\s+([A-Z0-9]{8,11})", text, re.IGNORECASE)
-        if match:
-            inv.swift = match.group(1)
-
         # TRN (Tax Registration Number)
-        trn_pattern = r"TRN\s*#?[.:]?\s*(\d{15})"
-        trn_matches = re.findall(trn_pattern, text, re.IGNORECASE)
+        trn_matches = TRN_PATTERN.findall(text)
         if trn_matches:
             inv.trn = trn_matches[0]
             if len(trn_matches) > 1:
@@ -897,7 +999,10 @@ class DSVPDFParser:
         self.logger.info(f"Parsing {doc_type}: {filename}")
 
         # 텍스트 추출
-        text = self._extract_text_from_pdf(pdf_path)
+        if self.lazy_pages:
+            text = self._extract_text_lazy(pdf_path, doc_type)
+        else:
+            text = self._extract_text_from_pdf(pdf_path)
 
         if not text:
             self.logger.warning(f"No text extracted from {filename}")
@@ -1004,11 +1109,16 @@ def main():
         "-r", "--recursive", action="store_true", help="Parse folders recursively"
     )
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose logging")
+    parser.add_argument(
+        "--lazy-pages",
+        action="store_true",
+        help="Stop reading pages once required fields are found",
+    )
 
     args = parser.parse_args()
 
     log_level = "DEBUG" if args.verbose else "INFO"
-    parser_engine = DSVPDFParser(log_level=log_level)
+    parser_engine = DSVPDFParser(log_level=log_level, lazy_pages=args.lazy_pages)
 
     input_path = args.input
 
@@ -161,6 +161,56 @@ class TestPDFParsingAccuracy:
             else:
                 pytest.fail(f"Failed to parse date format: {input_date}")
 
+    def test_extraction_plan_indexed_matches_full_scan(self):
+        """Anchor 색인 추출 결과가 필드별 전체 검색과 동일해야 함"""
+        try:
+            from praser import BOEData, DocumentHeader, BOE_PLAN
+        except ImportError:
+            pytest.skip("praser module not available")
+
+        text = Path(__file__).with_name("test_sample.txt").read_text()
+        text += "\ngross weight 1,234.5 kgs\nEX. VSL: MSC ANNA VOY. NO: 12E\n"
+
+        indexed = BOE_PLAN.extract(text, BOEData(header=DocumentHeader("BOE")))
+        full = BOE_PLAN.extract(
+            text, BOEData(header=DocumentHeader("BOE")), indexed=False
+        )
+
+        assert indexed == full
+        assert indexed.dec_no == "20252101030815"
+        assert indexed.gross_weight_kg == 1234.5
+        assert indexed.vessel == "MSC ANNA"
+        assert indexed.voyage_no == "12E"
+
+    def test_lazy_pages_should_stop_after_required_fields(self, monkeypatch):
+        """필수 필드가 채워지면 남은 페이지를 읽지 않아야 함"""
+        try:
+            from praser import DSVPDFParser
+        except ImportError:
+            pytest.skip("praser module not available")
+
+        pages = [
+            "DEC NO 20252101030815\nB/L-AWB No. MANIF. CHN2595234",
+            "GROSS WEIGHT 53,125.7 Kgs\nTOTAL DUTY 24,657.00",
+        ] + ["Terms and conditions"] * 20
+        consumed = []
+
+        def fake_pages(pdf_path):
+            for page_text in pages:
+                consumed.append(page_text)
+                yield page_text
+
+        parser = DSVPDFParser(log_level="ERROR", lazy_pages=True)
+        monkeypatch.setattr(parser, "_iter_pdf_pages", fake_pages)
+
+        text = parser._extract_text_lazy("dummy.pdf", "BOE")
+        assert len(consumed) == 2
+        assert "TOTAL DUTY" in text
+
+        parser.page_budgets["DO"] = 3
+        parser._extract_text_lazy("dummy.pdf", "DO")
+        assert len(consumed) == 2 + 3
+
     def test_container_numbers_format(self, sample_boe_data):
         """Container 번호 형식이 올바른지 확인"""
         import re
@@ -378,6 +428,41 @@ class TestCrossDocValidation:
         ]
         assert len(weight_issues) > 0, "Should reject >3% weight deviation"
 
+    def test_batch_validation_matches_per_item(
+        self, validator, matching_documents, mismatched_documents
+    ):
+        """일괄 검증 결과가 Item별 검증과 동일해야 함"""
+        documents = [dict(doc, item_code="ITEM-OK") for doc in matching_documents] + [
+            dict(doc, item_code="ITEM-NG") for doc in mismatched_documents
+        ]
+        documents.append(
+            {
+                "header": {"item_code": "ITEM-W", "doc_type": "BOE"},
+                "data": {"gross_weight_kg": 1000.0},
+            }
+        )
+        documents.append(
+            {
+                "header": {"item_code": "ITEM-W", "doc_type": "DO"},
+                "data": {"weight_kg": 1050.0},
+            }
+        )
+
+        batch = validator.validate_batch(documents)
+
+        assert set(batch) == {"ITEM-OK", "ITEM-NG", "ITEM-W"}
+        assert batch["ITEM-OK"] == validator.validate_item_consistency(
+            "ITEM-OK", matching_documents
+        )
+        assert batch["ITEM-NG"] == validator.validate_item_consistency(
+            "ITEM-NG", mismatched_documents
+        )
+        assert [i["type"] for i in batch["ITEM-W"]] == ["WEIGHT_DEVIATION"]
+
+        reports = validator.generate_batch_reports(documents)
+        assert reports["ITEM-NG"]["overall_status"] == "FAIL"
+        assert reports["ITEM-W"]["documents_validated"] == 2
+
 
 class TestWorkflowAutomation:
     """워크플로우 자동화 테스트"""
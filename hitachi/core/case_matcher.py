@@ -4,9 +4,13 @@ CASE NO 기반 스마트 매칭 로직
 병렬 처리 및 동적 헤더 인식 지원
 """
 
+import numpy as np
 import pandas as pd
+import math
+import os
 import re
 import unicodedata
+from collections import Counter
 from typing import Dict, List, Tuple, Optional, Set
 from difflib import SequenceMatcher
 import logging
@@ -20,6 +24,112 @@ except ImportError:
     from parallel_processor import ParallelProcessor
 
 
+class CaseFuzzyIndex:
+    """
+    정규화 CASE NO q-gram 역색인 (fuzzy 후보 사전 필터)
+
+    calculate_similarity 상한으로 임계값에 도달할 수 없는 키를 제외하고
+    남은 키만 원래 순서(warehouse_norm_map 삽입 순서)로 반환한다.
+    - 길이 필터: ratio <= 2*min/(a+b), 접두/접미 보너스 <= 0.15*min/max
+    - q-gram 개수 필터: LCS >= L이면 공통 q-gram >= (a-q+1) - q(a-L) - (q-1)(b-L)
+      (SequenceMatcher 일치 문자 수 <= LCS)
+    비교 대상은 calculate_similarity와 동일하게 키를 한 번 더 정규화한 형태.
+    """
+
+    # 부동소수 경계 여유 (필터는 보수적으로, 최종 판정은 원래 식으로)
+    EPS = 1e-9
+
+    def __init__(self, warehouse_norm_map: Dict[str, List[int]], normalize, q=2):
+        """
+        Args:
+            warehouse_norm_map: 정규화 CASE NO → warehouse 인덱스 리스트
+            normalize: CaseMatcher.normalize_case_no
+            q: q-gram 길이
+        """
+        self.q = q
+        self.keys: List[str] = []
+        self.forms: List[str] = []
+        for norm_case in warehouse_norm_map:
+            if norm_case:
+                self.keys.append(norm_case)
+                self.forms.append(normalize(norm_case))
+
+        self.lengths = np.fromiter(
+            (len(form) for form in self.forms), dtype=np.int64, count=len(self.forms)
+        )
+        self.length_values = np.unique(self.lengths)
+
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for key_id, form in enumerate(self.forms):
+            for gram, count in self._grams(form).items():
+                ids, counts = postings.setdefault(gram, ([], []))
+                ids.append(key_id)
+                counts.append(count)
+        self.postings = {
+            gram: (np.asarray(ids, dtype=np.int64), np.asarray(counts, dtype=np.int64))
+            for gram, (ids, counts) in postings.items()
+        }
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _grams(self, text: str) -> Counter:
+        q = self.q
+        return Counter(text[i : i + q] for i in range(len(text) - q + 1))
+
+    def _required_grams(self, a: int, b: int, threshold: float) -> float:
+        """길이 a, b 쌍이 임계값에 도달하기 위한 최소 공통 q-gram 수 (불가능 시 inf)"""
+        if a == b:
+            # 동일 문자열이면 1.0 (min(1.0, ...) 상한과 같음)
+            if threshold > 1.0:
+                return math.inf
+            if a == 0:
+                return 0
+        lo, hi = min(a, b), max(a, b)
+        if lo == 0:
+            return math.inf if threshold > 0 else 0
+        bonus = 0.15 * lo / hi
+        if 2.0 * lo / (a + b) + bonus < threshold - self.EPS:
+            return math.inf
+
+        lcs = max(0, math.ceil((threshold - bonus) * (a + b) / 2.0 - self.EPS))
+        q = self.q
+        return max(
+            (a - q + 1) - q * (a - lcs) - (q - 1) * (b - lcs),
+            (b - q + 1) - q * (b - lcs) - (q - 1) * (a - lcs),
+        )
+
+    def candidates(self, source_form: str, threshold: float) -> List[int]:
+        """
+        임계값 도달 가능 키 id (오름차순 = 원래 순회 순서)
+
+        Args:
+            source_form: calculate_similarity 기준으로 정규화된 소스 CASE NO
+            threshold: 유사도 임계값
+        """
+        if not self.keys:
+            return []
+
+        a = len(source_form)
+        required = {
+            int(b): self._required_grams(a, int(b), threshold)
+            for b in self.length_values
+        }
+        need = np.array([required[int(b)] for b in self.lengths], dtype=np.float64)
+        possible = np.isfinite(need)
+
+        if (need[possible] > 0).any():
+            shared = np.zeros(len(self.keys), dtype=np.int64)
+            for gram, count in self._grams(source_form).items():
+                posting = self.postings.get(gram)
+                if posting is not None:
+                    ids, counts = posting
+                    shared[ids] += np.minimum(counts, count)
+            possible &= shared >= need
+
+        return np.flatnonzero(possible).tolist()
+
+
 class CaseMatcher:
     """CASE NO 기반 스마트 매칭 클래스"""
 
@@ -87,19 +197,31 @@ class CaseMatcher:
         norm1 = self.normalize_case_no(case1)
         norm2 = self.normalize_case_no(case2)
 
+        return self._normalized_similarity(norm1, norm2)
+
+    def _normalized_similarity(
+        self, norm1: str, norm2: str, threshold: Optional[float] = None
+    ) -> float:
+        """
+        정규화된 두 CASE NO의 유사도 (calculate_similarity 본체)
+
+        Args:
+            norm1: 정규화된 첫 번째 CASE NO
+            norm2: 정규화된 두 번째 CASE NO
+            threshold: 지정 시 상한(quick_ratio + 보너스)이 미달하면
+                SequenceMatcher.ratio() 계산 없이 0.0 반환
+
+        Returns:
+            유사도 (0.0 ~ 1.0)
+        """
         if norm1 == norm2:
             return 1.0
 
-        # [PATCH] 기본 문자열 유사도
-        base_similarity = SequenceMatcher(None, norm1, norm2).ratio()
-
         # 부분 매칭 가중치 (접두사/접미사 일치)
         prefix_bonus = 0.0
         suffix_bonus = 0.0
 
         # 공통 접두사 길이
-        import os
-
         common_prefix_len = len(os.path.commonprefix([norm1, norm2]))
         if common_prefix_len > 3:  # 최소 3자 이상 일치
             prefix_bonus = 0.1 * (common_prefix_len / max(len(norm1), len(norm2)))
@@ -109,6 +231,15 @@ class CaseMatcher:
         if common_suffix_len > 2:  # 최소 2자 이상 일치
             suffix_bonus = 0.05 * (common_suffix_len / max(len(norm1), len(norm2)))
 
+        # [PATCH] 기본 문자열 유사도
+        matcher = SequenceMatcher(None, norm1, norm2)
+        if threshold is not None:
+            # ratio() <= quick_ratio() <= real_quick_ratio() (같은 분모, 부동소수 단조)
+            for upper in (matcher.real_quick_ratio, matcher.quick_ratio):
+                if min(1.0, upper() + prefix_bonus + suffix_bonus) < threshold:
+                    return 0.0
+        base_similarity = matcher.ratio()
+
         # 최종 유사도
         final_similarity = min(1.0, base_similarity + prefix_bonus + suffix_bonus)
 
@@ -162,6 +293,9 @@ class CaseMatcher:
                 warehouse_norm_map[norm_case] = []
             warehouse_norm_map[norm_case].append(idx)
 
+        # fuzzy 후보용 q-gram 역색인 (fuzzy 매칭이 필요할 때 1회 생성)
+        fuzzy_index = None
+
         # 2. Master CASE NO 매칭 (O(n))
         for master_idx, master_case in enumerate(master_cases):
             norm_master = self.normalize_case_no(master_case)
@@ -185,8 +319,16 @@ class CaseMatcher:
                     )
             else:
                 # 정확 매치 실패 시에만 fuzzy matching 수행
+                if fuzzy_index is None:
+                    fuzzy_index = CaseFuzzyIndex(
+                        warehouse_norm_map, self.normalize_case_no
+                    )
                 candidates = self._find_fuzzy_candidates_fast(
-                    master_case, warehouse_cases, warehouse_norm_map
+                    master_case,
+                    warehouse_cases,
+                    warehouse_norm_map,
+                    source_norm=norm_master,
+                    fuzzy_index=fuzzy_index,
                 )
 
                 if candidates:
@@ -216,29 +358,51 @@ class CaseMatcher:
         return matching_results
 
     def _find_fuzzy_candidates_fast(
-        self, source_case, warehouse_cases, warehouse_norm_map
+        self,
+        source_case,
+        warehouse_cases,
+        warehouse_norm_map,
+        source_norm=None,
+        fuzzy_index: Optional[CaseFuzzyIndex] = None,
     ):
         """
         빠른 fuzzy 매칭 후보 찾기
-        정규화된 맵을 활용하여 성능 최적화
+        q-gram 역색인으로 임계값 도달 가능한 키만 유사도 계산 (전체 순회와 동일 결과)
+
+        Args:
+            source_case: 원본 CASE NO
+            warehouse_cases: Warehouse CASE NO 리스트
+            warehouse_norm_map: 정규화 CASE NO → warehouse 인덱스 리스트
+            source_norm: 이미 계산된 source_case 정규화 값 (없으면 계산)
+            fuzzy_index: warehouse_norm_map으로 만든 CaseFuzzyIndex (없으면 생성)
         """
         candidates = []
-        source_norm = self.normalize_case_no(source_case)
+        if source_norm is None:
+            source_norm = self.normalize_case_no(source_case)
+        if not source_norm:
+            return candidates
 
-        # 정규화된 맵에서 유사한 케이스 찾기
-        for norm_case, indices in warehouse_norm_map.items():
-            if norm_case and source_norm:
-                similarity = self.calculate_similarity(source_norm, norm_case)
-                if similarity >= self.similarity_threshold:
-                    for idx in indices:
-                        candidates.append(
-                            {
-                                "target_index": idx,
-                                "target_case": warehouse_cases[idx],
-                                "match_type": "fuzzy",
-                                "similarity": similarity,
-                            }
-                        )
+        if fuzzy_index is None:
+            fuzzy_index = CaseFuzzyIndex(warehouse_norm_map, self.normalize_case_no)
+
+        # calculate_similarity와 동일하게 한 번 더 정규화한 형태로 비교
+        source_form = self.normalize_case_no(source_norm)
+
+        # 정규화된 맵에서 유사한 케이스 찾기 (후보 키만 검증)
+        for key_id in fuzzy_index.candidates(source_form, self.similarity_threshold):
+            similarity = self._normalized_similarity(
+                source_form, fuzzy_index.forms[key_id], self.similarity_threshold
+            )
+            if similarity >= self.similarity_threshold:
+                for idx in warehouse_norm_map[fuzzy_index.keys[key_id]]:
+                    candidates.append(
+                        {
+                            "target_index": idx,
+                            "target_case": warehouse_cases[idx],
+                            "match_type": "fuzzy",
+                            "similarity": similarity,
+                        }
+                    )
 
         # 유사도 순으로 정렬
         candidates.sort(key=lambda x: x["similarity"], reverse=True)
@@ -3,6 +3,7 @@ Masterfile → Warehouse 자동 동기화 엔진
 CASE NO 매칭 기반 데이터 업데이트 (A~AQ열 범위 제한)
 """
 
+import logging
 import pandas as pd
 import numpy as np
 import re
@@ -14,23 +15,23 @@ from pathlib import Path
 
 try:
     from .case_matcher import CaseMatcher
-    from ..formatters.header_detector import HeaderDetector
+    from ..formatters.header_detector import HeaderDetector, HeaderLayoutCache
     from ..validators.hvdc_validator import HVDCValidator
     from ..validators.update_tracker import UpdateTracker
     from ..formatters.header_matcher import HeaderMatcher
     from .parallel_processor import ParallelProcessor
     from ..validators.change_tracker import ChangeTracker
-    from ..formatters.excel_formatter import ExcelFormatter
+    from ..formatters.excel_formatter import ExcelFormatter, XLSXWRITER_AVAILABLE
 except ImportError:
     # 직접 실행 시 fallback
     from case_matcher import CaseMatcher
-    from formatters.header_detector import HeaderDetector
+    from formatters.header_detector import HeaderDetector, HeaderLayoutCache
     from validators.hvdc_validator import HVDCValidator
     from validators.update_tracker import UpdateTracker
     from formatters.header_matcher import HeaderMatcher
     from parallel_processor import ParallelProcessor
     from validators.change_tracker import ChangeTracker
-    from formatters.excel_formatter import ExcelFormatter
+    from formatters.excel_formatter import ExcelFormatter, XLSXWRITER_AVAILABLE
 
 
 class DataSynchronizer:
@@ -43,6 +44,10 @@ class DataSynchronizer:
         validation_enabled: bool = True,
         prioritize_dates: bool = True,
         max_workers: int = None,
+        debug_snapshots: bool = False,
+        layout_cache_enabled: bool = True,
+        layout_cache_path: Optional[str] = None,
+        streaming_output: bool = True,
     ):
         """
         초기화
@@ -53,21 +58,36 @@ class DataSynchronizer:
             validation_enabled: 데이터 유효성 검증 여부
             prioritize_dates: 창고별/현장별 날짜 우선순위 설정
             max_workers: 병렬 처리 최대 워커 수
+            debug_snapshots: UpdateTracker에 before/after 전체 복사본 보관 (디버그용)
+            layout_cache_enabled: 헤더 레이아웃 캐시 사용 여부
+            layout_cache_path: 레이아웃 캐시 파일
+                (기본: Warehouse 파일 폴더의 out/header_layout_cache.json)
+            streaming_output: 데이터 + 색상 표시를 단일 패스로 기록 (xlsxwriter 필요)
         """
         self.column_limit = column_limit
         self.backup_enabled = backup_enabled
         self.validation_enabled = validation_enabled
         self.prioritize_dates = prioritize_dates
+        self.streaming_output = streaming_output and XLSXWRITER_AVAILABLE
+        self.logger = logging.getLogger(__name__)
 
         # 컴포넌트 초기화
         self.case_matcher = CaseMatcher(max_workers=max_workers)
         self.header_detector = HeaderDetector()
         self.hvdc_validator = HVDCValidator()
-        self.update_tracker = UpdateTracker()
+        self.update_tracker = UpdateTracker(keep_snapshots=debug_snapshots)
         self.header_matcher = HeaderMatcher()
         self.parallel_processor = ParallelProcessor(max_workers)
         self.change_tracker = ChangeTracker()
 
+        # 헤더 레이아웃 캐시 (헤더 행/표준화 컬럼/날짜 분류 재사용)
+        # 경로 미지정 시 load_and_analyze_files에서 Warehouse 파일 기준으로 연결
+        self.layout_cache_default = layout_cache_enabled and layout_cache_path is None
+        self.layout_cache = HeaderLayoutCache(
+            layout_cache_path if layout_cache_enabled else None,
+            signature=self.header_detector.rules_signature(),
+        )
+
         # 컬럼 제한 인덱스 계산 (AQ = 43번째 컬럼, 0-based index = 42)
         self.max_column_index = self._column_letter_to_index(column_limit)
 
@@ -127,9 +147,25 @@ class DataSynchronizer:
             r".*location.*",
         ]
 
+        # 날짜 컬럼 분류 규칙 사전 컴파일 (키워드 부분 문자열 → 정규식 1회 검색)
+        self._date_column_rules = {
+            "high": self._compile_keywords(self.high_priority_warehouse_keywords),
+            "medium": self._compile_keywords(self.medium_priority_date_keywords),
+            "pattern": re.compile(
+                "|".join(f"(?:{p})" for p in self.date_column_patterns), re.IGNORECASE
+            ),
+            "status_date": self._compile_keywords(["date", "time", "year", "month"]),
+            "time": self._compile_keywords(["time", "schedule", "plan", "handling"]),
+        }
+
         # 동기화 이력
         self.sync_history = []
 
+    @staticmethod
+    def _compile_keywords(keywords: List[str]) -> "re.Pattern":
+        """키워드 목록 → 부분 문자열 검색 정규식 (any(k in text)와 동일)"""
+        return re.compile("|".join(re.escape(k) for k in keywords))
+
     def _column_letter_to_index(self, column_letter: str) -> int:
         """
         엑셀 컬럼 문자를 인덱스로 변환 (A=0, B=1, ..., AQ=42)
@@ -179,54 +215,36 @@ class DataSynchronizer:
             "low_priority": [],  # 기타 시간 관련 필드
         }
 
+        rules = self._date_column_rules
         for col in df.columns:
             col_lower = str(col).lower().strip()
 
             # 1. 최우선: 창고별/현장별 날짜 컬럼들 (실제 데이터 기반)
-            if any(
-                keyword == col_lower or keyword in col_lower
-                for keyword in self.high_priority_warehouse_keywords
-            ):
+            if rules["high"].search(col_lower):
                 date_columns["high_priority"].append(col)
-                print(f"[최우선] 창고별 날짜 컬럼 발견: {col}")
                 continue
 
             # 2. 중간 우선순위: 일반 날짜 컬럼들
-            if any(
-                keyword == col_lower or keyword in col_lower
-                for keyword in self.medium_priority_date_keywords
-            ):
+            if rules["medium"].search(col_lower):
                 date_columns["medium_priority"].append(col)
-                print(f"[중간] 일반 날짜 컬럼 발견: {col}")
                 continue
 
             # 3. 일반 날짜 패턴 매칭 (추가 탐지)
-            if any(
-                re.match(pattern, col_lower, re.IGNORECASE)
-                for pattern in self.date_column_patterns
-            ):
+            if rules["pattern"].match(col_lower):
                 if (
                     col not in date_columns["high_priority"]
                     and col not in date_columns["medium_priority"]
                 ):
                     date_columns["medium_priority"].append(col)
-                    print(f"[패턴매칭] 날짜 컬럼 발견: {col}")
                     continue
 
             # 4. 상태 관련 날짜 필드 (Status_Location_Date 등)
-            if "status" in col_lower and any(
-                date_word in col_lower
-                for date_word in ["date", "time", "year", "month"]
-            ):
+            if "status" in col_lower and rules["status_date"].search(col_lower):
                 date_columns["medium_priority"].append(col)
-                print(f"[상태] 날짜 컬럼 발견: {col}")
                 continue
 
             # 5. 기타 시간 관련 필드
-            if any(
-                time_keyword in col_lower
-                for time_keyword in ["time", "schedule", "plan", "handling"]
-            ):
+            if rules["time"].search(col_lower):
                 if (
                     col not in date_columns["high_priority"]
                     and col not in date_columns["medium_priority"]
@@ -333,7 +351,10 @@ class DataSynchronizer:
         return validation_result
 
     def _prioritize_column_mapping(
-        self, column_mapping: Dict[str, str], warehouse_df: pd.DataFrame
+        self,
+        column_mapping: Dict[str, str],
+        warehouse_df: pd.DataFrame,
+        date_columns: Optional[Dict[str, List[str]]] = None,
     ) -> Dict[str, str]:
         """
         컬럼 매핑을 우선순위에 따라 정렬 (날짜 컬럼 우선)
@@ -341,6 +362,7 @@ class DataSynchronizer:
         Args:
             column_mapping: 원본 컬럼 매핑
             warehouse_df: Warehouse DataFrame
+            date_columns: 레이아웃 캐시의 날짜 컬럼 분류 (없으면 계산)
 
         Returns:
             우선순위가 적용된 컬럼 매핑
@@ -349,7 +371,8 @@ class DataSynchronizer:
             return column_mapping
 
         # 날짜 컬럼 분류
-        date_columns = self._identify_date_columns(warehouse_df)
+        if date_columns is None:
+            date_columns = self._identify_date_columns(warehouse_df)
 
         # 우선순위별로 컬럼 그룹화
         prioritized_mapping = {}
@@ -454,6 +477,11 @@ class DataSynchronizer:
             "issues": [],
         }
 
+        if self.layout_cache_default:
+            self.layout_cache.attach(
+                Path(warehouse_path).parent / "out" / "header_layout_cache.json"
+            )
+
         try:
             # Masterfile 분석
             master_sheets = pd.ExcelFile(masterfile_path).sheet_names
@@ -470,18 +498,11 @@ class DataSynchronizer:
                 master_sheet = master_sheets[0]  # 첫 번째 시트 사용
 
             if master_sheet:
-                # 헤더 탐지하여 로드
-                df_preview = pd.read_excel(
-                    masterfile_path, sheet_name=master_sheet, nrows=20, header=None
+                # 헤더 탐지(또는 레이아웃 캐시)하여 로드
+                master_df, master_layout = self._load_sheet_with_layout(
+                    masterfile_path, master_sheet
                 )
-                header_row = self.header_detector.detect_header_row(df_preview)
-
-                if header_row is not None:
-                    master_df = pd.read_excel(
-                        masterfile_path, sheet_name=master_sheet, header=header_row
-                    )
-                else:
-                    master_df = pd.read_excel(masterfile_path, sheet_name=master_sheet)
+                header_row = master_layout["header_row"]
 
                 analysis_result["masterfile"] = {
                     "sheet_name": master_sheet,
@@ -489,6 +510,7 @@ class DataSynchronizer:
                     "columns": list(master_df.columns),
                     "header_row": header_row,
                     "case_column": self._find_case_column(master_df),
+                    "standardized_columns": master_layout["standardized"],
                 }
 
             # Warehouse 파일 분석
@@ -506,26 +528,22 @@ class DataSynchronizer:
                 warehouse_sheet = warehouse_sheets[0]
 
             if warehouse_sheet:
-                # 헤더 탐지하여 로드
-                df_preview = pd.read_excel(
-                    warehouse_path, sheet_name=warehouse_sheet, nrows=20, header=None
+                # 헤더 탐지(또는 레이아웃 캐시)하여 로드
+                warehouse_df, warehouse_layout = self._load_sheet_with_layout(
+                    warehouse_path, warehouse_sheet
                 )
-                header_row = self.header_detector.detect_header_row(df_preview)
-
-                if header_row is not None:
-                    warehouse_df = pd.read_excel(
-                        warehouse_path, sheet_name=warehouse_sheet, header=header_row
-                    )
-                else:
-                    warehouse_df = pd.read_excel(
-                        warehouse_path, sheet_name=warehouse_sheet
-                    )
+                header_row = warehouse_layout["header_row"]
 
                 analysis_result["warehouse"] = {
                     "sheet_name": warehouse_sheet,
                     "shape": warehouse_df.shape,
                     "columns": list(warehouse_df.columns),
                     "header_row": header_row,
+                    "standardized_columns": warehouse_layout["standardized"],
+                    "date_columns": {
+                        tier: [warehouse_df.columns[i] for i in positions]
+                        for tier, positions in warehouse_layout["date_columns"].items()
+                    },
                     "case_column": self._find_case_column(warehouse_df),
                     "column_limit_index": min(
                         self.max_column_index, warehouse_df.shape[1] - 1
@@ -542,6 +560,8 @@ class DataSynchronizer:
                     warehouse_df,
                     analysis_result["masterfile"]["case_column"],
                     analysis_result["warehouse"]["case_column"],
+                    master_standardized=master_layout["standardized"],
+                    warehouse_standardized=warehouse_layout["standardized"],
                 )
 
                 # 저장 (동기화에서 사용)
@@ -554,6 +574,56 @@ class DataSynchronizer:
 
         return analysis_result
 
+    def _load_sheet_with_layout(
+        self, file_path: str, sheet_name: str
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        헤더 레이아웃 캐시를 이용한 시트 로드
+
+        헤더 블록이 캐시와 일치하면 헤더 탐지/컬럼 표준화/날짜 분류를 건너뛰고,
+        아니면 탐지 결과를 캐시에 저장한다.
+
+        Args:
+            file_path: Excel 파일 경로
+            sheet_name: 시트명
+
+        Returns:
+            (DataFrame, 레이아웃: header_row / columns / standardized / date_columns)
+        """
+        df_preview = pd.read_excel(
+            file_path, sheet_name=sheet_name, nrows=20, header=None
+        )
+        layout = self.layout_cache.lookup(df_preview)
+        if layout is not None:
+            header_row = layout["header_row"]
+        else:
+            header_row = self.header_detector.detect_header_row(df_preview)
+
+        if header_row is not None:
+            df = pd.read_excel(file_path, sheet_name=sheet_name, header=header_row)
+        else:
+            df = pd.read_excel(file_path, sheet_name=sheet_name)
+
+        columns = [str(col) for col in df.columns]
+        if layout is None or layout["columns"] != columns:
+            date_columns = self._identify_date_columns(df)
+            positions = {col: i for i, col in reversed(list(enumerate(df.columns)))}
+            layout = {
+                "header_row": header_row,
+                "columns": columns,
+                "standardized": [
+                    self.header_detector.standardize_column_name(col)
+                    for col in df.columns
+                ],
+                "date_columns": {
+                    tier: [positions[col] for col in cols]
+                    for tier, cols in date_columns.items()
+                },
+            }
+            self.layout_cache.store(df_preview, layout)
+
+        return df, layout
+
     def _find_case_column(self, df: pd.DataFrame) -> Optional[str]:
         """
         DataFrame에서 CASE NO 컬럼 찾기
@@ -580,6 +650,8 @@ class DataSynchronizer:
         warehouse_df: pd.DataFrame,
         master_case_col: str,
         warehouse_case_col: str,
+        master_standardized: Optional[List[str]] = None,
+        warehouse_standardized: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         두 파일 간의 호환성 검사
@@ -589,6 +661,8 @@ class DataSynchronizer:
             warehouse_df: Warehouse DataFrame
             master_case_col: Masterfile CASE 컬럼명
             warehouse_case_col: Warehouse CASE 컬럼명
+            master_standardized: 레이아웃 캐시의 Master 표준화 컬럼명 (컬럼 순서)
+            warehouse_standardized: 레이아웃 캐시의 Warehouse 표준화 컬럼명
 
         Returns:
             호환성 검사 결과
@@ -617,18 +691,28 @@ class DataSynchronizer:
         )
 
         # 컬럼 매핑 생성 (표준화된 이름 기반)
-        for master_col in master_df.columns:
-            master_norm = self.header_detector.standardize_column_name(master_col)
-
-            # Warehouse에서 동일한 표준화된 이름을 가진 컬럼 찾기
-            for warehouse_col in warehouse_df.columns[: self.max_column_index + 1]:
-                warehouse_norm = self.header_detector.standardize_column_name(
-                    warehouse_col
-                )
-
-                if master_norm == warehouse_norm:
-                    compatibility["column_mapping"][master_col] = warehouse_col
-                    break
+        if master_standardized is None:
+            master_standardized = [
+                self.header_detector.standardize_column_name(col)
+                for col in master_df.columns
+            ]
+        if warehouse_standardized is None:
+            warehouse_standardized = [
+                self.header_detector.standardize_column_name(col)
+                for col in warehouse_df.columns
+            ]
+
+        # Warehouse 표준화 이름 → 첫 번째 컬럼
+        warehouse_by_norm = {}
+        updatable = warehouse_df.columns[: self.max_column_index + 1]
+        for warehouse_col, warehouse_norm in zip(updatable, warehouse_standardized):
+            warehouse_by_norm.setdefault(warehouse_norm, warehouse_col)
+
+        for master_col, master_norm in zip(master_df.columns, master_standardized):
+            if master_norm in warehouse_by_norm:
+                compatibility["column_mapping"][master_col] = warehouse_by_norm[
+                    master_norm
+                ]
 
         return compatibility
 
@@ -697,7 +781,9 @@ class DataSynchronizer:
 
             # 4. 컬럼 매핑 우선순위 적용 (날짜 컬럼 우선)
             prioritized_mapping = self._prioritize_column_mapping(
-                analysis["compatibility"]["column_mapping"], warehouse_df
+                analysis["compatibility"]["column_mapping"],
+                warehouse_df,
+                analysis["warehouse"].get("date_columns"),
             )
 
             # 5. 데이터 업데이트 수행 (CASE NO 매칭 → 날짜 우선 업데이트)
@@ -716,31 +802,23 @@ class DataSynchronizer:
             if not dry_run and update_summary["total_changes"] > 0:
                 # 컬럼 범위 제한 적용하여 저장
                 updated_warehouse = warehouse_df.iloc[:, : self.max_column_index + 1]
+                sheet_name = analysis["warehouse"]["sheet_name"]
 
-                with pd.ExcelWriter(warehouse_path, engine="openpyxl") as writer:
-                    updated_warehouse.to_excel(
-                        writer,
-                        sheet_name=analysis["warehouse"]["sheet_name"],
-                        index=False,
-                    )
-
-                sync_result["success"] = True
-                print(f"\n✅ 파일 저장 완료: {warehouse_path}")
-
-                # 8. 색상 적용 (ExcelFormatter)
-                print(f"🎨 변경사항 색상 표시 적용 중...")
-                try:
+                if self.streaming_output:
+                    # 7-8. 데이터 + 색상 표시 단일 패스 기록 (재로드/재저장 없음)
                     formatter = ExcelFormatter(self.change_tracker)
-                    success = formatter.apply_formatting_inplace(
-                        excel_file_path=warehouse_path,
-                        sheet_name=analysis["warehouse"]["sheet_name"],
+                    if not formatter.write_with_highlights(
+                        warehouse_path, updated_warehouse, sheet_name
+                    ):
+                        raise RuntimeError(f"파일 저장 실패: {warehouse_path}")
+
+                    sync_result["success"] = True
+                    print(f"\n✅ 파일 저장 + 색상 표시 완료: {warehouse_path}")
+                else:
+                    self._save_and_format_legacy(
+                        updated_warehouse, warehouse_path, sheet_name
                     )
-                    if success:
-                        print(f"✅ 색상 표시 완료")
-                    else:
-                        print(f"⚠️ 색상 표시 실패 (데이터는 정상 업데이트됨)")
-                except Exception as e:
-                    print(f"⚠️ 색상 표시 중 오류: {str(e)} (데이터는 정상 업데이트됨)")
+                    sync_result["success"] = True
 
             elif dry_run:
                 sync_result["success"] = True  # 시뮬레이션 성공
@@ -783,6 +861,29 @@ class DataSynchronizer:
 
         return sync_result
 
+    def _save_and_format_legacy(
+        self, updated_warehouse: pd.DataFrame, warehouse_path: str, sheet_name: str
+    ):
+        """openpyxl 저장 후 파일을 다시 열어 색상 적용 (xlsxwriter 미설치 시)"""
+        with pd.ExcelWriter(warehouse_path, engine="openpyxl") as writer:
+            updated_warehouse.to_excel(writer, sheet_name=sheet_name, index=False)
+
+        print(f"\n✅ 파일 저장 완료: {warehouse_path}")
+
+        # 8. 색상 적용 (ExcelFormatter)
+        print(f"🎨 변경사항 색상 표시 적용 중...")
+        try:
+            formatter = ExcelFormatter(self.change_tracker)
+            success = formatter.apply_formatting_inplace(
+                excel_file_path=warehouse_path, sheet_name=sheet_name
+            )
+            if success:
+                print(f"✅ 색상 표시 완료")
+            else:
+                print(f"⚠️ 색상 표시 실패 (데이터는 정상 업데이트됨)")
+        except Exception as e:
+            print(f"⚠️ 색상 표시 중 오류: {str(e)} (데이터는 정상 업데이트됨)")
+
     def _perform_updates(
         self,
         master_df: pd.DataFrame,
@@ -823,14 +924,14 @@ class DataSynchronizer:
         # 날짜 컬럼 자동 식별 (동적 헤더 매칭)
         date_columns = self.header_matcher.get_all_date_columns(warehouse_df.columns)
 
-        # 1. 기존 레코드 업데이트 (병렬)
+        # 1. 기존 레코드 업데이트 (컬럼 단위 일괄)
         all_matches = {
             **matching_results.get("exact_matches", {}),
             **matching_results.get("fuzzy_matches", {}),
         }
 
         if all_matches:
-            update_summary, warehouse_df = self._update_existing_records_parallel(
+            update_summary, warehouse_df = self._update_existing_records_vectorized(
                 master_df,
                 warehouse_df,
                 all_matches,
@@ -854,7 +955,7 @@ class DataSynchronizer:
 
         return update_summary, warehouse_df
 
-    def _update_existing_records_parallel(
+    def _update_existing_records_vectorized(
         self,
         master_df,
         warehouse_df,
@@ -863,87 +964,130 @@ class DataSynchronizer:
         dry_run,
         update_summary,
     ):
-        """기존 레코드 병렬 업데이트"""
-
-        def update_batch(match_items):
-            """배치 업데이트"""
-            batch_changes = []
-            batch_errors = []
-
-            for master_idx, match_info in match_items:
-                warehouse_idx = match_info["target_index"]
-                master_row = master_df.iloc[master_idx]
+        """
+        기존 레코드 컬럼 단위 일괄 업데이트
 
-                for col_name in warehouse_df.columns:
-                    if col_name in master_row.index:
-                        master_value = master_row[col_name]
-                        warehouse_value = warehouse_df.at[warehouse_idx, col_name]
-
-                        is_date = self.header_matcher.is_date_column(col_name)
-
-                        # Master 값이 있고, 값이 다른 경우에만 업데이트
-                        if pd.notna(master_value) and not self._values_equal_safe(
-                            master_value, warehouse_value
-                        ):
-                            # 날짜 업데이트 디버그 로그
-                            if is_date:
-                                print(
-                                    f"[DEBUG] 날짜 업데이트: {col_name} - {warehouse_value} -> {master_value}"
-                                )
-
-                            # 변경 기록
-                            batch_changes.append(
-                                {
-                                    "wh_idx": warehouse_idx,
-                                    "col_name": col_name,
-                                    "new_value": master_value,
-                                    "old_value": warehouse_value,
-                                    "is_date": is_date,
-                                    "master_idx": master_idx,
-                                    "case_no": match_info.get("target_case", ""),
-                                }
-                            )
-
-            return batch_changes
-
-        # 매치된 케이스들을 배치로 나누어 병렬 처리
+        1. 매치된 Master/Warehouse 행을 위치 배열로 정렬
+        2. 공통 컬럼별 변경 마스크 일괄 계산 (_changed_mask)
+        3. 컬럼당 1회 마스크 대입으로 적용, 변경 목록은 마스크에서 생성
+        """
         match_items = list(all_matches.items())
-        batch_size = max(
-            100, len(match_items) // (self.parallel_processor.max_workers * 2)
+        update_summary["updated_records"] = len(all_matches)
+        if not match_items:
+            return update_summary, warehouse_df
+
+        # 1. 행 정렬: Master 위치(iloc) ↔ Warehouse 라벨(at) → 위치
+        master_pos = np.fromiter(
+            (master_idx for master_idx, _ in match_items),
+            dtype=np.int64,
+            count=len(match_items),
         )
-
-        # 병렬 업데이트
-        change_batches = self.parallel_processor.process_batches(
-            match_items, batch_size, update_batch, use_threads=True
+        warehouse_pos = warehouse_df.index.get_indexer(
+            [match_info["target_index"] for _, match_info in match_items]
         )
+        if (warehouse_pos < 0).any():
+            missing = [
+                match_items[i][1]["target_index"]
+                for i in np.flatnonzero(warehouse_pos < 0)
+            ]
+            raise KeyError(f"Warehouse 인덱스 없음: {missing[:5]}")
+        case_nos = [match_info.get("target_case", "") for _, match_info in match_items]
+
+        # 동일 이름 컬럼은 첫 번째 위치 사용
+        master_columns = {}
+        for pos, col_name in enumerate(master_df.columns):
+            master_columns.setdefault(col_name, pos)
+
+        # 2. 컬럼별 변경 마스크
+        column_changes = []
+        for col_pos, col_name in enumerate(warehouse_df.columns):
+            if col_name not in master_columns:
+                continue
 
-        # 변경사항 적용
-        for batch in change_batches:
-            for change in batch:
-                if not dry_run:
-                    warehouse_df.at[change["wh_idx"], change["col_name"]] = change[
-                        "new_value"
-                    ]
+            master_col = master_df.iloc[:, master_columns[col_name]]
+            warehouse_col = warehouse_df.iloc[:, col_pos]
+            master_values = master_col.to_numpy()[master_pos]
+            warehouse_values = warehouse_col.to_numpy()[warehouse_pos]
+
+            changed = self._changed_mask(master_values, warehouse_values)
+            if not changed.any():
+                continue
 
-                # 변경사항 추적
-                self.change_tracker.add_change(
-                    case_no=change["case_no"],
-                    column_name=change["col_name"],
-                    old_value=change["old_value"],
-                    new_value=change["new_value"],
-                    change_type="date_update" if change["is_date"] else "field_update",
-                    priority="master_priority",
-                    row_index=change["wh_idx"],
+            rows = np.flatnonzero(changed)
+            new_values = master_col.take(master_pos[rows]).to_numpy(dtype=object)
+            old_values = warehouse_col.take(warehouse_pos[rows]).to_numpy(dtype=object)
+            is_date = self.header_matcher.is_date_column(col_name)
+            column_changes.append(
+                (col_pos, col_name, rows, new_values, old_values, is_date)
+            )
+            self.update_tracker.log_column_changes(
+                col_name,
+                rows=[match_items[row][1]["target_index"] for row in rows],
+                case_nos=[case_nos[row] for row in rows],
+                old=old_values,
+                new=new_values,
+                change_type="date_update" if is_date else "field_update",
+                priority="master_priority",
+            )
+
+            # 3. 컬럼당 1회 대입 (같은 행 중복 매치는 마지막 매치 값)
+            if not dry_run:
+                values = warehouse_col.to_numpy(dtype=object, copy=True)
+                values[warehouse_pos[rows]] = new_values
+                updated = pd.Series(
+                    values, index=warehouse_df.index, name=warehouse_col.name
                 )
+                if warehouse_col.dtype != object:
+                    updated = updated.infer_objects()
+                warehouse_df.isetitem(col_pos, updated)
+
+        if not column_changes:
+            return update_summary, warehouse_df
+
+        # 변경 목록: 매치 순서 → 컬럼 순서 (행 우선)
+        change_rows = np.concatenate([rows for _, _, rows, *_ in column_changes])
+        change_cols = np.concatenate(
+            [
+                np.full(len(c[2]), k, dtype=np.int64)
+                for k, c in enumerate(column_changes)
+            ]
+        )
+        change_offsets = np.concatenate(
+            [np.arange(len(c[2]), dtype=np.int64) for c in column_changes]
+        )
+        order = np.lexsort((change_cols, change_rows))
+
+        date_change_count = 0
+        for k, offset in zip(change_cols[order], change_offsets[order]):
+            _, col_name, rows, new_values, old_values, is_date = column_changes[k]
+            row = rows[offset]
+
+            # 변경사항 추적
+            self.change_tracker.add_change(
+                case_no=case_nos[row],
+                column_name=col_name,
+                old_value=old_values[offset],
+                new_value=new_values[offset],
+                change_type="date_update" if is_date else "field_update",
+                priority="master_priority",
+                row_index=match_items[row][1]["target_index"],
+            )
 
-                # 통계 업데이트
-                update_summary["total_changes"] += 1
-                if change["is_date"]:
-                    update_summary["date_updates"]["high_priority_dates"] += 1
-                else:
-                    update_summary["date_updates"]["non_date_fields"] += 1
+            # 통계 업데이트
+            update_summary["total_changes"] += 1
+            if is_date:
+                date_change_count += 1
+                update_summary["date_updates"]["high_priority_dates"] += 1
+            else:
+                update_summary["date_updates"]["non_date_fields"] += 1
+
+        if date_change_count:
+            self.logger.debug(
+                "날짜 업데이트: %d건 (%d개 컬럼)",
+                date_change_count,
+                sum(1 for c in column_changes if c[5]),
+            )
 
-        update_summary["updated_records"] = len(all_matches)
         return update_summary, warehouse_df
 
     def _add_new_records_parallel(
@@ -1001,6 +1145,74 @@ class DataSynchronizer:
         update_summary["new_records"] = len(new_cases)
         return update_summary, warehouse_df
 
+    def _changed_mask(
+        self, master_values: np.ndarray, warehouse_values: np.ndarray
+    ) -> np.ndarray:
+        """
+        컬럼 단위 변경 여부 (Master 값이 있고 Warehouse 값과 다른 셀)
+
+        _values_equal_safe와 같은 규칙(양쪽 NaN 동일, strip 문자열 비교)에
+        숫자는 수치로, 날짜는 Timestamp로 비교하는 규칙을 더한다.
+
+        Args:
+            master_values: 매치 순서로 정렬된 Master 컬럼 값
+            warehouse_values: 같은 순서의 Warehouse 컬럼 값
+
+        Returns:
+            변경 여부 bool 배열
+        """
+        changed = np.asarray(pd.notna(master_values), dtype=bool)
+        if not changed.any():
+            return changed
+
+        rows = np.flatnonzero(changed)
+        master_values = master_values[rows]
+        warehouse_values = warehouse_values[rows]
+        differs = np.asarray(pd.isna(warehouse_values), dtype=bool)
+
+        kinds = (master_values.dtype.kind, warehouse_values.dtype.kind)
+        if all(kind in "iuf" for kind in kinds) or kinds == ("M", "M"):
+            # 숫자/날짜 dtype 컬럼: 직접 비교
+            differs |= master_values != warehouse_values
+        else:
+            check = np.flatnonzero(~differs)
+            master_text = (
+                pd.Series(master_values[check], dtype=object).astype(str).str.strip()
+            )
+            warehouse_text = (
+                pd.Series(warehouse_values[check], dtype=object).astype(str).str.strip()
+            )
+            text_differs = check[master_text.to_numpy() != warehouse_text.to_numpy()]
+            # 문자열이 다른 셀만 숫자/날짜 동치 확인
+            differs[text_differs] = [
+                not self._values_equal_typed(master_values[i], warehouse_values[i])
+                for i in text_differs
+            ]
+
+        changed[rows] = differs
+        return changed
+
+    @staticmethod
+    def _values_equal_typed(val1, val2) -> bool:
+        """숫자끼리는 수치, 날짜끼리는 Timestamp 비교 (그 외 False)"""
+        numeric = (int, float, np.number)
+        if (
+            isinstance(val1, numeric)
+            and isinstance(val2, numeric)
+            and not isinstance(val1, (bool, np.bool_))
+            and not isinstance(val2, (bool, np.bool_))
+        ):
+            return float(val1) == float(val2)
+
+        dates = (datetime, np.datetime64)
+        if isinstance(val1, dates) and isinstance(val2, dates):
+            try:
+                return pd.Timestamp(val1) == pd.Timestamp(val2)
+            except (TypeError, ValueError):
+                return False
+
+        return False
+
     def _values_equal_safe(self, val1, val2) -> bool:
         """
         안전한 값 비교 (pandas 배열 오류 방지)
@@ -4,11 +4,12 @@ Hitachi HVDC Formatters Modules
 서식 및 헤더 처리 모듈들을 포함합니다:
 - ExcelFormatter: Excel 색상/서식 처리
 - HeaderDetector: 헤더 감지
+- HeaderLayoutCache: 헤더 레이아웃 캐시
 - HeaderMatcher: 헤더 매칭
 """
 
 from .excel_formatter import ExcelFormatter
-from .header_detector import HeaderDetector
+from .header_detector import HeaderDetector, HeaderLayoutCache
 from .header_matcher import HeaderMatcher
 
-__all__ = ["ExcelFormatter", "HeaderDetector", "HeaderMatcher"]
+__all__ = ["ExcelFormatter", "HeaderDetector", "HeaderLayoutCache", "HeaderMatcher"]
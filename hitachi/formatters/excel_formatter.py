@@ -11,9 +11,20 @@ from openpyxl.styles import PatternFill, Font, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 from typing import Dict, List, Any, Optional, Set, Tuple
+import datetime as dt
 import os
 import logging
 from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import xlsxwriter
+
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
 
 try:
     from ..validators.change_tracker import ChangeTracker
@@ -26,6 +37,19 @@ except ImportError:
     from core.parallel_processor import ParallelProcessor
 
 
+# 단일 패스 기록 시 pandas to_excel과 같은 날짜 형식 / 헤더 서식
+DATETIME_NUM_FORMAT = "YYYY-MM-DD HH:MM:SS"
+DATE_NUM_FORMAT = "YYYY-MM-DD"
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+
+# 변경 유형별 셀 강조 (_apply_formatting_parallel과 같은 색상)
+HIGHLIGHT_FILLS = {
+    "date_update": "#FFC000",  # 주황색
+    "field_update": "#E6F3FF",  # 연한 파란색
+    "new_record": "#FFFF00",  # 노란색
+}
+
+
 class ExcelFormatter:
     """Excel 파일에 변경사항을 색깔로 표시하는 포맷터"""
 
@@ -215,6 +239,227 @@ class ExcelFormatter:
             self.logger.error(f"Excel 서식 적용 오류: {str(e)}")
             return False
 
+    def write_with_highlights(
+        self,
+        excel_file_path: str,
+        df: pd.DataFrame,
+        sheet_name: str = "Sheet1",
+    ) -> bool:
+        """
+        데이터 + 변경사항 강조를 단일 스트리밍 패스로 기록 (xlsxwriter)
+
+        동기화 결과 DataFrame과 ChangeTracker 변경 목록으로 바로 셀 서식을
+        정하므로 저장 후 load_workbook/read_excel 재로드와 재저장이 없다.
+        서식은 (강조색, 굵게, 숫자 형식) 조합별로 1회만 생성해 공유한다.
+
+        Args:
+            excel_file_path: 출력 Excel 파일 경로 (임시 파일 기록 후 교체)
+            df: 기록할 DataFrame (index 라벨 = ChangeTracker row_index)
+            sheet_name: 시트명
+
+        Returns:
+            성공 여부
+        """
+        if not XLSXWRITER_AVAILABLE:
+            self.logger.error("xlsxwriter가 설치되지 않아 단일 패스 기록 불가")
+            return False
+
+        path = Path(excel_file_path)
+        tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+        try:
+            highlights, colored_cases = self._build_highlight_map(df)
+
+            workbook = xlsxwriter.Workbook(str(tmp_path), {"constant_memory": True})
+            worksheet = workbook.add_worksheet(sheet_name)
+            formats: Dict[Tuple, Any] = {}
+
+            def get_format(fill=None, bold=False, num_format=None):
+                key = (fill, bold, num_format)
+                if key not in formats:
+                    props = {}
+                    if fill:
+                        props.update(pattern=1, bg_color=fill)
+                    if bold:
+                        props["bold"] = True
+                    if num_format:
+                        props["num_format"] = num_format
+                    formats[key] = workbook.add_format(props) if props else None
+                return formats[key]
+
+            header_format = workbook.add_format(HEADER_FORMAT)
+            for col_idx, col_name in enumerate(df.columns):
+                value, _ = self._excel_value(col_name)
+                worksheet.write(0, col_idx, value, header_format)
+
+            # 컬럼별로 변환된 값 목록 (행 순서대로 기록)
+            columns = [
+                [self._excel_value(v) for v in df.iloc[:, i].to_numpy(dtype=object)]
+                for i in range(df.shape[1])
+            ]
+            for row_idx in range(len(df)):
+                excel_row = row_idx + 1
+                for col_idx, column in enumerate(columns):
+                    value, num_format = column[row_idx]
+                    highlight = highlights.get((row_idx, col_idx))
+                    if highlight is None:
+                        if value is None:
+                            continue
+                        cell_format = get_format(num_format=num_format)
+                    else:
+                        cell_format = get_format(*highlight, num_format)
+                    if value is None:
+                        worksheet.write_blank(excel_row, col_idx, None, cell_format)
+                    else:
+                        worksheet.write(excel_row, col_idx, value, cell_format)
+
+            # 범례 추가 (기존 _add_legend와 같은 위치: 데이터 행 수 + 5)
+            self._write_legend_streaming(worksheet, workbook, df.shape[0] + 5)
+
+            workbook.close()
+            os.replace(tmp_path, path)
+
+            self.logger.info(
+                f"단일 패스 기록 완료: {os.path.basename(excel_file_path)} "
+                f"(서식 {len(formats)}종)"
+            )
+            self._print_formatting_summary(colored_cases)
+            return True
+
+        except Exception as e:
+            self.logger.error(f"단일 패스 기록 오류: {str(e)}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return False
+
+    def _build_highlight_map(
+        self, df: pd.DataFrame
+    ) -> Tuple[Dict[Tuple[int, int], Tuple[str, bool]], Dict[str, int]]:
+        """
+        ChangeTracker 변경 목록 → {(행 위치, 컬럼 위치): (강조색, 굵게)}
+
+        변경 순서대로 적용한 결과와 같다 (강조색은 마지막 변경, 굵게는 누적).
+        """
+        colored_cases = {
+            "new_cases": 0,
+            "high_priority": 0,
+            "medium_priority": 0,
+            "low_priority": 0,
+        }
+        highlights: Dict[Tuple[int, int], Tuple[str, bool]] = {}
+        changes = [
+            change
+            for change in self.change_tracker.changes
+            if change.change_type in HIGHLIGHT_FILLS
+        ]
+        if not changes:
+            return highlights, colored_cases
+
+        column_positions: Dict[Any, Optional[int]] = {}
+        row_positions = df.index.get_indexer([change.row_index for change in changes])
+
+        for change, row_pos in zip(changes, row_positions):
+            if change.column_name not in column_positions:
+                col_idx = self._find_column_index(df.columns, change.column_name)
+                column_positions[change.column_name] = (
+                    None if col_idx is None else col_idx - 1
+                )
+            col_pos = column_positions[change.column_name]
+            if col_pos is None or row_pos < 0:
+                continue
+
+            fill = HIGHLIGHT_FILLS[change.change_type]
+            if change.change_type == "new_record":
+                targets = [(row_pos, c) for c in range(df.shape[1])]
+                colored_cases["new_cases"] += len(targets)
+            else:
+                targets = [(row_pos, col_pos)]
+                if change.change_type == "date_update":
+                    colored_cases["high_priority"] += 1
+
+            bold = change.change_type == "date_update"
+            for target in targets:
+                previous = highlights.get(target)
+                highlights[target] = (
+                    fill,
+                    bold or (previous is not None and previous[1]),
+                )
+
+        return highlights, colored_cases
+
+    @staticmethod
+    def _excel_value(value) -> Tuple[Any, Optional[str]]:
+        """
+        셀 값 변환 (pandas to_excel과 같은 규칙)
+
+        Returns:
+            (기록 값 또는 None=빈 셀, 숫자 형식)
+        """
+        if value is None or value is pd.NaT:
+            return None, None
+        if isinstance(value, (bool, np.bool_)):
+            return bool(value), None
+        if isinstance(value, (int, np.integer)):
+            return int(value), None
+        if isinstance(value, (float, np.floating)):
+            if np.isnan(value):
+                return None, None
+            if np.isinf(value):
+                return ("inf" if value > 0 else "-inf"), None
+            return float(value), None
+        if isinstance(value, dt.datetime):
+            if value.tzinfo is not None:
+                raise ValueError("Excel does not support datetimes with timezones")
+            return value, DATETIME_NUM_FORMAT
+        if isinstance(value, dt.date):
+            return value, DATE_NUM_FORMAT
+        if isinstance(value, dt.timedelta):
+            return value.total_seconds() / 86400, "0"
+        if (
+            not isinstance(value, str)
+            and pd.api.types.is_scalar(value)
+            and pd.isna(value)
+        ):
+            return None, None
+        return str(value), None
+
+    def _write_legend_streaming(self, worksheet, workbook, start_row: int):
+        """범례 추가 (_add_legend와 같은 내용, 1-based start_row)"""
+        legend_data = [
+            ("색상 범례", "설명"),
+            ("신규 케이스", "새로 추가된 케이스 (파란색)"),
+            ("고우선순위 날짜변경", "창고/현장별 중요 날짜 변경 (주황색)"),
+            ("중우선순위 날짜변경", "일반 날짜 변경 (초록색)"),
+            ("저우선순위 날짜변경", "기타 날짜 변경 (회색)"),
+        ]
+        color_keys = [
+            "new_case",
+            "high_priority_date",
+            "medium_priority_date",
+            "low_priority_date",
+        ]
+
+        worksheet.write(
+            start_row - 1,
+            0,
+            "🎨 변경사항 색상 범례",
+            workbook.add_format({"bold": True, "font_size": 14}),
+        )
+        for i, (category, description) in enumerate(legend_data):
+            row = start_row + i + 1  # 0-based (= start_row + i + 2, 1-based)
+            cell_format = None
+            if i > 0:
+                style = self.colors[color_keys[i - 1]]
+                cell_format = workbook.add_format(
+                    {
+                        "pattern": 1,
+                        "bg_color": "#" + style["fill"].start_color.rgb[-6:],
+                        "font_color": "#" + style["font"].color.rgb[-6:],
+                        "bold": bool(style["font"].bold),
+                    }
+                )
+            worksheet.write(row, 0, category, cell_format)
+            worksheet.write(row, 1, description)
+
     def _apply_formatting_parallel(self, worksheet, df, case_to_row):
         """병렬로 색깔 적용"""
 
@@ -227,9 +472,8 @@ class ExcelFormatter:
                 if col_idx:
                     # case_to_row 매핑을 사용하여 실제 Excel 행 번호 찾기
                     if change.case_no in case_to_row:
-                        row_num = (
-                            case_to_row[change.case_no] + 2
-                        )  # Excel은 1부터 시작, 헤더 고려
+                        # case_to_row는 이미 Excel 행 번호 (1부터 시작, 헤더 고려)
+                        row_num = case_to_row[change.case_no]
                     else:
                         # 매핑이 없으면 DataFrame 인덱스 사용
                         row_num = change.row_index + 2
@@ -5,10 +5,20 @@
 HVDC 키워드 패턴으로 실제 헤더 위치 식별
 """
 
+import hashlib
+import json
+import logging
 import pandas as pd
 import re
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+# 헤더 레이아웃 캐시 형식/탐지 규칙 버전 (변경 시 기존 캐시 무효화)
+HEADER_LAYOUT_CACHE_VERSION = 1
+
+# 헤더 탐지 시 검사하는 최대 행 수
+HEADER_SCAN_ROWS = 10
+
 
 class HeaderDetector:
     """HVDC Excel 파일의 헤더를 동적으로 탐지하는 클래스 (Enhanced)"""
@@ -102,6 +112,48 @@ class HeaderDetector:
         ]
         self.hvdc_keywords.extend(additional_keywords)
 
+        self._compile_lookup_tables()
+
+    def _compile_lookup_tables(self) -> None:
+        """동의어/키워드 규칙을 조회 테이블로 사전 컴파일"""
+        # 동의어(대문자) → 표준명 (기존 순회 순서상 첫 매칭 우선)
+        self._synonym_lookup: Dict[str, str] = {}
+        for standard_name, synonyms in self.default_synonyms.items():
+            for synonym in synonyms:
+                self._synonym_lookup.setdefault(synonym.upper(), standard_name)
+        self._standardized: Dict[str, str] = {}
+
+        # 신뢰도 키워드 (중복 포함, 대문자)
+        self._confidence_keywords = tuple(k.upper() for k in self.hvdc_keywords)
+
+        # 헤더 점수 (키워드, 가중치): 대문자 행 텍스트에 대한 부분 문자열 검사
+        self._title_words = ("PROJECT", "MASTER FILE", "WAREHOUSE DATA")
+        score_table = [(k, 5) for k in ("HVDC CODE", "No.", "no.")]
+        score_table += [
+            (k.upper(), 3)
+            for k in ("Description", "Storage", "CBM", "Site", "Pkg", "EQ No")
+        ]
+        score_table += [
+            (k.upper(), 2)
+            for k in ("HS Code", "Currency", "Price", "Vessel", "Status", "Invoice")
+        ]
+        score_table += [("SHIPMENT INVOICE NO", 4), ("STATUS_CURRENT", 3)]
+        self._score_table = tuple(score_table)
+
+    def rules_signature(self) -> str:
+        """탐지/표준화 규칙 해시 (레이아웃 캐시 키에 포함)"""
+        payload = json.dumps(
+            [
+                HEADER_LAYOUT_CACHE_VERSION,
+                self.threshold,
+                self.default_synonyms,
+                self.hvdc_keywords,
+                self._score_table,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
     def detect_header_row(self, df: pd.DataFrame) -> Optional[int]:
         """
         데이터프레임에서 헤더 행을 탐지 (Enhanced with threshold)
@@ -116,7 +168,7 @@ class HeaderDetector:
         best_score = -1
         best_confidence = 0.0
 
-        for row_idx in range(min(10, len(df))):  # 처음 10행만 검사
+        for row_idx in range(min(HEADER_SCAN_ROWS, len(df))):  # 처음 10행만 검사
             try:
                 row_values = df.iloc[row_idx].astype(str).values
             except Exception as e:
@@ -189,8 +241,8 @@ class HeaderDetector:
         row_text = " ".join(str(val) for val in row_values if val is not None).upper()
         matched_keywords = 0
 
-        for keyword in self.hvdc_keywords:
-            if keyword.upper() in row_text:
+        for keyword in self._confidence_keywords:
+            if keyword in row_text:
                 matched_keywords += 1
 
         # 매칭된 키워드 비율과 점수를 종합하여 신뢰도 계산
@@ -216,17 +268,18 @@ class HeaderDetector:
             return "unknown_column"
 
         column_name = str(column_name).strip()
-
-        # 동의어 매핑을 통한 표준화
-        for standard_name, synonyms in self.default_synonyms.items():
-            for synonym in synonyms:
-                if column_name.upper() == synonym.upper():
-                    return standard_name
-
-        # 매핑되지 않은 경우 원본을 소문자로 변환하고 공백을 언더스코어로 치환
-        standardized = re.sub(r"[^\w\s]", "", column_name.lower())
-        standardized = re.sub(r"\s+", "_", standardized)
-
+        standardized = self._standardized.get(column_name)
+        if standardized is not None:
+            return standardized
+
+        # 동의어 매핑을 통한 표준화 (사전 컴파일 조회 테이블)
+        standardized = self._synonym_lookup.get(column_name.upper())
+        if standardized is None:
+            # 매핑되지 않은 경우 원본을 소문자로 변환하고 공백을 언더스코어로 치환
+            standardized = re.sub(r"[^\w\s]", "", column_name.lower())
+            standardized = re.sub(r"\s+", "_", standardized)
+
+        self._standardized[column_name] = standardized
         return standardized
 
     def get_standardized_columns(
@@ -291,10 +344,7 @@ class HeaderDetector:
         row_text = " ".join(str(val) for val in row_values if val is not None).upper()
 
         # 제목 행으로 보이는 패턴 감점
-        if any(
-            title_word in row_text
-            for title_word in ["PROJECT", "MASTER FILE", "WAREHOUSE DATA"]
-        ):
+        if any(title_word in row_text for title_word in self._title_words):
             return -1
 
         # 실제 데이터 행 패턴 감점 - 더 정교한 로직
@@ -310,35 +360,109 @@ class HeaderDetector:
             ):
                 return -1
 
-        # 핵심 헤더 키워드들 (가중치 매우 높음)
-        core_keywords = ["HVDC CODE", "No.", "no."]
-        for keyword in core_keywords:
+        # 핵심(5) / 중요(3) / 부가(2) 키워드 및 특별 패턴 가중치
+        for keyword, weight in self._score_table:
             if keyword in row_text:
-                score += 5
+                score += weight
 
-        # 중요한 헤더 키워드들 (가중치 높음)
-        important_keywords = ["Description", "Storage", "CBM", "Site", "Pkg", "EQ No"]
-        for keyword in important_keywords:
-            if keyword.upper() in row_text:
-                score += 3
+        return score
 
-        # 부가적인 헤더 키워드들 (가중치 보통)
-        additional_keywords = [
-            "HS Code",
-            "Currency",
-            "Price",
-            "Vessel",
-            "Status",
-            "Invoice",
-        ]
-        for keyword in additional_keywords:
-            if keyword.upper() in row_text:
-                score += 2
 
-        # 특별한 패턴들
-        if "SHIPMENT INVOICE NO" in row_text:
-            score += 4
-        if "STATUS_CURRENT" in row_text:
-            score += 3
+class HeaderLayoutCache:
+    """
+    시트 헤더 레이아웃 캐시 (JSON 파일)
 
-        return score
+    키: 탐지 규칙 서명 + 헤더 블록(첫 행 ~ 헤더 행) 셀 텍스트 해시.
+    값: header_row, 컬럼명, 표준화 컬럼명, 날짜 컬럼 분류(컬럼 위치).
+    같은 레이아웃의 파일을 다시 열면 헤더 탐지/표준화/날짜 분류를 건너뛴다.
+
+    제한: detect_header_row는 HEADER_SCAN_ROWS행까지 점수를 매기지만 키는
+    헤더 행까지만 포함한다 (데이터 행이 달라도 적중해야 하므로). 헤더 아래
+    데이터 행이 헤더보다 높은 점수를 받는 시트는 캐시 적중 시 탐지 결과와
+    다를 수 있다. 적중 후 읽은 컬럼명이 저장값과 다르면 레이아웃을 재계산한다.
+    """
+
+    def __init__(self, path: Optional[str] = None, signature: str = ""):
+        """
+        Args:
+            path: 캐시 파일 경로 (None이면 메모리 전용)
+            signature: HeaderDetector.rules_signature()
+        """
+        self.path = Path(path) if path else None
+        self.signature = signature
+        self.layouts: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == HEADER_LAYOUT_CACHE_VERSION:
+            self.layouts = {
+                key: layout
+                for key, layout in data.get("layouts", {}).items()
+                if key.startswith(self.signature + ":")
+            }
+
+    def attach(self, path: str) -> None:
+        """캐시 파일 지정 (메모리 항목 유지 + 파일 항목 병합)"""
+        path = Path(path)
+        if path == self.path:
+            return
+        current = self.layouts
+        self.path = path
+        self._load()
+        self.layouts.update(current)
+
+    def save(self) -> None:
+        """캐시 파일 저장 (읽기 전용/네트워크 폴더 등 저장 실패 시 경고만, 동기화는 계속)"""
+        if self.path is None:
+            return
+        data = {"version": HEADER_LAYOUT_CACHE_VERSION, "layouts": self.layouts}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            tmp.replace(self.path)
+        except OSError as e:
+            self.logger.warning("헤더 레이아웃 캐시 저장 실패: %s", e)
+
+    def fingerprint(self, preview: pd.DataFrame, header_row: Optional[int]) -> str:
+        """헤더 블록 해시 (첫 행 ~ header_row, None이면 탐지 범위 전체)"""
+        rows = HEADER_SCAN_ROWS if header_row is None else header_row + 1
+        block = preview.iloc[:rows].astype(str).to_numpy()
+        text = "\x1e".join("\x1f".join(row) for row in block)
+        digest = hashlib.sha256(
+            f"{preview.shape[1]}|{header_row}|{text}".encode("utf-8")
+        ).hexdigest()
+        return f"{self.signature}:{digest}"
+
+    def lookup(self, preview: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """미리보기의 헤더 블록과 일치하는 저장 레이아웃"""
+        header_rows = {layout["header_row"] for layout in self.layouts.values()}
+        # 긴 헤더 블록부터 비교 (None = 탐지 범위 전체)
+        for header_row in sorted(
+            header_rows,
+            key=lambda h: HEADER_SCAN_ROWS if h is None else h,
+            reverse=True,
+        ):
+            if header_row is not None and header_row >= len(preview):
+                continue
+            layout = self.layouts.get(self.fingerprint(preview, header_row))
+            if layout is not None:
+                self.hits += 1
+                return layout
+        self.misses += 1
+        return None
+
+    def store(self, preview: pd.DataFrame, layout: Dict[str, Any]) -> None:
+        self.layouts[self.fingerprint(preview, layout["header_row"])] = layout
+        self.save()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""CaseFuzzyIndex 후보 필터 vs 전체 순회 동일성 테스트"""
+
+import random
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from hitachi import CaseMatcher
+from hitachi.core.case_matcher import CaseFuzzyIndex
+
+
+def exhaustive_candidates(matcher, source_case, warehouse_cases, warehouse_norm_map):
+    """역색인 도입 전 전체 순회 구현"""
+    candidates = []
+    source_norm = matcher.normalize_case_no(source_case)
+    for norm_case, indices in warehouse_norm_map.items():
+        if norm_case and source_norm:
+            similarity = matcher.calculate_similarity(source_norm, norm_case)
+            if similarity >= matcher.similarity_threshold:
+                for idx in indices:
+                    candidates.append(
+                        {
+                            "target_index": idx,
+                            "target_case": warehouse_cases[idx],
+                            "match_type": "fuzzy",
+                            "similarity": similarity,
+                        }
+                    )
+    candidates.sort(key=lambda x: x["similarity"], reverse=True)
+    return candidates[:5]
+
+
+def make_cases(rng, n):
+    cases = []
+    for _ in range(n):
+        if rng.random() < 0.5:
+            cases.append(f"HE-{rng.randint(0, 9999):04d}")
+        else:
+            cases.append(f"SIM-{rng.randint(0, 99)}-{rng.randint(1, 9)}")
+    # 재정규화 시 결과가 바뀌는 키 / 짧은 키
+    return cases + ["CASCASEE", "case no: 12", "he_0001.2", "x"]
+
+
+def perturb(rng, case):
+    chars = list(case)
+    for _ in range(rng.randint(0, 2)):
+        pos = rng.randrange(len(chars))
+        if rng.random() < 0.5:
+            del chars[pos]
+        else:
+            chars.insert(pos, rng.choice("0123456789-"))
+    return "".join(chars) or case
+
+
+def test_fuzzy_index_matches_exhaustive_scan():
+    rng = random.Random(7)
+    warehouse_cases = make_cases(rng, 300)
+    sources = [perturb(rng, rng.choice(warehouse_cases)) for _ in range(150)]
+
+    for threshold in (0.95, 0.8, 0.5):
+        matcher = CaseMatcher(similarity_threshold=threshold, max_workers=1)
+        norm_map = {}
+        for idx, case in enumerate(warehouse_cases):
+            norm_map.setdefault(matcher.normalize_case_no(case), []).append(idx)
+        index = CaseFuzzyIndex(norm_map, matcher.normalize_case_no)
+
+        for source in sources:
+            expected = exhaustive_candidates(matcher, source, warehouse_cases, norm_map)
+            assert (
+                matcher._find_fuzzy_candidates_fast(
+                    source, warehouse_cases, norm_map, fuzzy_index=index
+                )
+                == expected
+            )
+
+
+def test_fuzzy_index_prunes_unreachable_keys():
+    matcher = CaseMatcher(similarity_threshold=0.95, max_workers=1)
+    norm_map = {
+        matcher.normalize_case_no(c): [i]
+        for i, c in enumerate(["HE-0001", "HE-00012", "ZZ-9999", "HE-0001-LONG-SUFFIX"])
+    }
+    index = CaseFuzzyIndex(norm_map, matcher.normalize_case_no)
+
+    # 접두사 보너스로 HE-0001도 도달 가능, 길이/q-gram 미달 키는 제외
+    assert index.candidates("HE-00012", 0.95) == [0, 1]
+    assert index.candidates("HE-00012", 0.0) == [0, 1, 2, 3]
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""헤더 레이아웃 캐시 / 사전 컴파일 조회 테이블 테스트"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from hitachi import DataSynchronizer, HeaderDetector
+from hitachi.formatters.header_detector import HeaderLayoutCache
+
+
+def preview(header):
+    return pd.DataFrame(
+        [
+            ["HVDC PROJECT", None, None],
+            header,
+            ["HE-001", "1.5", "2024-01-01"],
+            ["HE-002", "2.5", "2024-01-02"],
+        ]
+    )
+
+
+def test_standardize_uses_synonym_table():
+    detector = HeaderDetector(custom_synonyms={"case_no": ["Case No."]})
+    assert detector.standardize_column_name(" Qty ") == "quantity"
+    assert detector.standardize_column_name("CODE") == "hvdc_code"
+    assert detector.standardize_column_name("case no.") == "case_no"
+    assert detector.standardize_column_name("ETA / ATA (Date)") == "eta_ata_date"
+    assert detector.standardize_column_name(None) == "unknown_column"
+
+
+def test_layout_cache_roundtrip(tmp_path):
+    path = tmp_path / "layouts.json"
+    cache = HeaderLayoutCache(path, signature="rules-a")
+    layout = {"header_row": 1, "columns": ["Case No", "CBM", "ETA"]}
+    cache.store(preview(["Case No", "CBM", "ETA"]), layout)
+
+    # 데이터 행이 달라도 헤더 블록이 같으면 적중
+    other = preview(["Case No", "CBM", "ETA"])
+    other.iloc[2, 0] = "HE-999"
+    reloaded = HeaderLayoutCache(path, signature="rules-a")
+    assert reloaded.lookup(other) == layout
+    assert reloaded.lookup(preview(["Case No", "CBM", "ATA"])) is None
+    assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+    # 탐지 규칙이 바뀌면 무효화
+    assert HeaderLayoutCache(path, signature="rules-b").lookup(other) is None
+
+
+def test_known_layout_skips_detection(tmp_path, monkeypatch):
+    xlsx = tmp_path / "warehouse.xlsx"
+    pd.DataFrame(
+        {"Case No.": ["HE-1", "HE-2"], "ETA": ["2024-01-01", None], "Qty": [1, 2]}
+    ).to_excel(xlsx, sheet_name="Case List", index=False)
+    cache_path = tmp_path / "layouts.json"
+
+    first = DataSynchronizer(max_workers=1, layout_cache_path=str(cache_path))
+    df, layout = first._load_sheet_with_layout(str(xlsx), "Case List")
+    assert layout["standardized"] == ["case_no", "date", "quantity"]
+    assert layout["date_columns"]["medium_priority"] == [1]
+
+    second = DataSynchronizer(max_workers=1, layout_cache_path=str(cache_path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("header detection should be skipped")
+
+    monkeypatch.setattr(second.header_detector, "detect_header_row", fail)
+    monkeypatch.setattr(second, "_identify_date_columns", fail)
+    df2, layout2 = second._load_sheet_with_layout(str(xlsx), "Case List")
+    assert layout2 == layout
+    assert df2.equals(df)
+
+
+def test_default_cache_next_to_warehouse(tmp_path):
+    frame = pd.DataFrame({"Case No.": ["HE-1"], "ETA": ["2024-01-01"]})
+    master = tmp_path / "master.xlsx"
+    warehouse = tmp_path / "data" / "warehouse.xlsx"
+    warehouse.parent.mkdir()
+    frame.to_excel(master, sheet_name="Case List", index=False)
+    frame.to_excel(warehouse, sheet_name="Case List", index=False)
+
+    sync = DataSynchronizer(max_workers=1)
+    assert sync.layout_cache.path is None
+    sync.load_and_analyze_files(str(master), str(warehouse))
+
+    cache_path = warehouse.parent / "out" / "header_layout_cache.json"
+    assert sync.layout_cache.path == cache_path
+    assert cache_path.exists()
+    assert not (project_root / "hitachi" / "out" / "header_layout_cache.json").exists()
+
+
+def test_unwritable_cache_does_not_fail_sync(tmp_path, caplog):
+    xlsx = tmp_path / "warehouse.xlsx"
+    pd.DataFrame({"Case No.": ["HE-1"], "Qty": [1]}).to_excel(
+        xlsx, sheet_name="Case List", index=False
+    )
+    # 캐시 폴더 자리에 파일이 있어 mkdir이 OSError
+    blocker = tmp_path / "blocked"
+    blocker.write_text("not a directory")
+
+    sync = DataSynchronizer(
+        max_workers=1, layout_cache_path=str(blocker / "layouts.json")
+    )
+    df, layout = sync._load_sheet_with_layout(str(xlsx), "Case List")
+
+    assert layout["standardized"] == ["case_no", "quantity"]
+    assert len(df) == 1
+    assert "헤더 레이아웃 캐시 저장 실패" in caplog.text
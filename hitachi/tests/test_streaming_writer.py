@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""ExcelFormatter 단일 패스 기록 (데이터 + 변경 강조) 테스트"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from hitachi.formatters.excel_formatter import ExcelFormatter, XLSXWRITER_AVAILABLE
+from hitachi.validators.change_tracker import ChangeTracker
+
+pytestmark = pytest.mark.skipif(
+    not XLSXWRITER_AVAILABLE, reason="xlsxwriter not installed"
+)
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame(
+        {
+            "Case No.": ["C1", "C2", "C3"],
+            "ETA": pd.to_datetime(["2024-01-01", None, "2024-03-01"]),
+            "Qty": [1, 2, 3],
+            "CBM": [0.5, np.nan, 1.5],
+            "Note": ["a", None, "c"],
+        }
+    )
+
+
+def fill_of(cell):
+    return cell.fill.fgColor.rgb[-6:] if cell.fill.fill_type else None
+
+
+def test_values_round_trip_like_to_excel(tmp_path, frame):
+    expected_path = tmp_path / "expected.xlsx"
+    frame.to_excel(expected_path, sheet_name="Case List", index=False)
+
+    path = tmp_path / "out.xlsx"
+    formatter = ExcelFormatter(ChangeTracker())
+    assert formatter.write_with_highlights(str(path), frame, "Case List")
+
+    expected = pd.read_excel(expected_path, sheet_name="Case List")
+    actual = pd.read_excel(path, sheet_name="Case List", nrows=len(frame))
+    pd.testing.assert_frame_equal(actual, expected)
+    assert not (tmp_path / "out.tmp.xlsx").exists()
+
+
+def test_highlights_follow_row_index(tmp_path, frame):
+    tracker = ChangeTracker()
+    tracker.add_change("C3", "ETA", None, "2024-03-01", "date_update", row_index=2)
+    tracker.add_change("C2", "Qty", 1, 2, "field_update", row_index=1)
+    # 빈 셀(NaN)도 강조는 기록
+    tracker.add_change("C2", "CBM", 1.0, None, "field_update", row_index=1)
+    tracker.add_change("C9", "Missing", 1, 2, "field_update", row_index=0)
+
+    path = tmp_path / "out.xlsx"
+    assert ExcelFormatter(tracker).write_with_highlights(str(path), frame, "S")
+
+    ws = load_workbook(path)["S"]
+    assert fill_of(ws["B4"]) == "FFC000" and ws["B4"].font.bold
+    assert fill_of(ws["C3"]) == "E6F3FF" and not ws["C3"].font.bold
+    assert fill_of(ws["D3"]) == "E6F3FF" and ws["D3"].value is None
+    highlighted = {
+        cell.coordinate
+        for row in ws.iter_rows(max_row=len(frame) + 1)
+        for cell in row
+        if fill_of(cell)
+    }
+    assert highlighted == {"B4", "C3", "D3"}
+    # 범례: 데이터 행 수 + 5 위치
+    assert ws.cell(row=len(frame) + 5, column=1).value == "🎨 변경사항 색상 범례"
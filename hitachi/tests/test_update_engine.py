@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""컬럼 단위 일괄 업데이트 엔진 테스트"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from hitachi import DataSynchronizer
+
+
+def empty_summary():
+    return {
+        "updated_records": 0,
+        "total_changes": 0,
+        "date_updates": {
+            "high_priority_dates": 0,
+            "medium_priority_dates": 0,
+            "low_priority_dates": 0,
+            "non_date_fields": 0,
+        },
+    }
+
+
+def test_changed_mask_is_type_aware():
+    sync = DataSynchronizer(max_workers=1)
+
+    # 숫자 dtype: 수치 비교, Warehouse NaN은 변경
+    master = np.array([5, 6, 7])
+    warehouse = np.array([5.0, np.nan, 7.5])
+    assert sync._changed_mask(master, warehouse).tolist() == [False, True, True]
+
+    # object: strip 문자열 비교 + 숫자/날짜 동치, Master 결측은 변경 없음
+    master = np.array([5, "a", pd.Timestamp("2024-01-01"), None, "b "], dtype=object)
+    warehouse = np.array(
+        [5.0, "a ", np.datetime64("2024-01-01"), 1, np.nan], dtype=object
+    )
+    assert sync._changed_mask(master, warehouse).tolist() == [
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_update_existing_records_applies_masks_and_tracks_changes():
+    sync = DataSynchronizer(max_workers=1)
+    master_df = pd.DataFrame(
+        {
+            "Case No.": ["C3", "C1"],
+            "ETA": pd.to_datetime(["2024-02-01", "2024-01-01"]),
+            "Qty": [3, 1],
+            "Remark": [None, "new"],
+        }
+    )
+    warehouse_df = pd.DataFrame(
+        {
+            "Case No.": ["C1", "C2", "C3"],
+            "ETA": pd.to_datetime(["2024-01-01", "2024-01-05", "2024-01-09"]),
+            "Qty": [1.0, 2.0, np.nan],
+            "Remark": ["old", "keep", "keep"],
+            "Warehouse Only": ["x", "y", "z"],
+        }
+    )
+    matches = {
+        0: {"target_index": 2, "target_case": "C3"},
+        1: {"target_index": 0, "target_case": "C1"},
+    }
+
+    summary, result = sync._update_existing_records_vectorized(
+        master_df, warehouse_df, matches, [], False, empty_summary()
+    )
+
+    assert result.at[2, "ETA"] == pd.Timestamp("2024-02-01")
+    assert result.at[2, "Qty"] == 3
+    assert result.at[0, "Remark"] == "new"
+    assert result.at[2, "Remark"] == "keep"
+    assert result["Warehouse Only"].tolist() == ["x", "y", "z"]
+
+    changes = [
+        (c.case_no, c.column_name, c.change_type, c.row_index)
+        for c in sync.change_tracker.changes
+    ]
+    # 매치 순서 → 컬럼 순서
+    assert changes == [
+        ("C3", "ETA", "date_update", 2),
+        ("C3", "Qty", "field_update", 2),
+        ("C1", "Remark", "field_update", 0),
+    ]
+    assert summary["total_changes"] == 3
+    assert summary["date_updates"]["high_priority_dates"] == 1
+    assert summary["updated_records"] == 2
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""UpdateTracker 희소 변경 행렬 테스트"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from hitachi import UpdateTracker
+
+
+def make_tracker(tmp_path, **kwargs):
+    tracker = UpdateTracker(out_dir=str(tmp_path), **kwargs)
+    tracker.log_column_changes(
+        "ETA",
+        rows=[0, 2],
+        case_nos=["C1", "C3"],
+        old=[None, "2024-01-01"],
+        new=["2024-02-01", "2024-03-01"],
+        change_type="date_update",
+        priority="master_priority",
+    )
+    tracker.log_case_update(
+        "C2", [{"column": "Qty", "old": 1, "new": 2}, {"column": "ETA", "old": 1}]
+    )
+    return tracker
+
+
+def test_report_counts_from_matrix(tmp_path):
+    tracker = make_tracker(tmp_path)
+
+    report = tracker.generate_change_comparison_report()
+    assert report["counts"]["total_changes"] == 4
+    assert report["counts"]["by_type"] == {"cell_update": 2, "date_update": 2}
+    # priority 없는 변경은 제외 (groupby 기본 동작)
+    assert report["counts"]["by_priority"] == {"master_priority": 2}
+    assert report["counts"]["by_column"] == {"ETA": 3, "Qty": 1}
+
+    assert [c.case_no for c in tracker.changes] == ["C1", "C3", "C2", "C2"]
+    details = pd.read_csv(tracker.generate_detailed_report())
+    assert list(details.columns) == [
+        "case_no",
+        "column",
+        "old",
+        "new",
+        "change_type",
+        "priority",
+    ]
+    assert len(details) == 4
+    assert Path(tracker.create_change_heatmap()).exists()
+
+
+def test_snapshots_only_in_debug_mode(tmp_path):
+    df = pd.DataFrame({"A": [1, 2]})
+
+    tracker = UpdateTracker(out_dir=str(tmp_path))
+    tracker.capture_before_state(df, "Sheet1")
+    tracker.capture_after_state(df, "Sheet1")
+    assert tracker.before == {} and tracker.after == {}
+    assert tracker.shapes["Sheet1"] == {"before": (2, 1), "after": (2, 1)}
+
+    debug = UpdateTracker(out_dir=str(tmp_path), keep_snapshots=True)
+    debug.capture_before_state(df, "Sheet1")
+    assert debug.before["Sheet1"].equals(df)
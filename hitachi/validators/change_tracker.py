@@ -21,6 +21,7 @@ class ChangeTracker:
         self.changes: List[ChangeRecord] = []
         self.date_changes: Dict[str, List[Dict[str, Any]]] = {}
         self._new_cases: Set[str] = set()
+        self._date_columns: Dict[str, bool] = {}
 
     def get_new_cases(self) -> Set[str]:
         return set(self._new_cases)
@@ -48,12 +49,19 @@ class ChangeTracker:
                            change_type=change_type, priority=priority,
                            row_index=row_index)
         self.changes.append(rec)
-        if any(k in str(column_name).lower() for k in DATE_KEYS) or change_type == "date_update":
+        if self._is_date_column(column_name) or change_type == "date_update":
             self.date_changes.setdefault(case_no, []).append({
                 "column": column_name, "old": old_value, "new": new_value,
                 "priority": priority, "row_index": row_index
             })
 
+    def _is_date_column(self, column_name: str) -> bool:
+        key = str(column_name)
+        is_date = self._date_columns.get(key)
+        if is_date is None:
+            is_date = self._date_columns[key] = any(k in key.lower() for k in DATE_KEYS)
+        return is_date
+
     def log_new_case(self, case_no: str) -> None:
         self._new_cases.add(str(case_no))
 
@@ -1,10 +1,12 @@
 from __future__ import annotations
 import os
-from typing import Any, Dict, List, Optional
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -17,8 +19,113 @@ class CaseChange:
     change_type: str = "cell_update"
     priority: Optional[str] = None
 
+CHANGE_FIELDS = ("case_no", "column", "old", "new", "change_type", "priority")
+
+class _Codebook:
+    """문자열(또는 None) → 정수 코드"""
+
+    def __init__(self) -> None:
+        self.codes: Dict[Any, int] = {}
+        self.values: List[Any] = []
+
+    def code(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        values = np.empty(len(self.values), dtype=object)
+        values[:] = self.values
+        return values[codes]
+
+class ChangeMatrix:
+    """
+    희소 변경 행렬 (변경 셀만 컬럼형 배열로 저장)
+
+    row: Warehouse 행 인덱스(-1 = 미상), column/case_no/change_type/priority: 코드,
+    old/new: 값 리스트. 집계는 코드 배열 bincount로 계산.
+    """
+
+    def __init__(self) -> None:
+        self.rows = array("q")
+        self.column_codes = array("l")
+        self.case_codes = array("l")
+        self.type_codes = array("l")
+        self.priority_codes = array("l")
+        self.old: List[Any] = []
+        self.new: List[Any] = []
+        self.columns = _Codebook()
+        self.cases = _Codebook()
+        self.types = _Codebook()
+        self.priorities = _Codebook()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def append(self, case_no: str, column: str, old: Any, new: Any,
+               change_type: str, priority: Optional[str], row: int = -1) -> None:
+        self.rows.append(-1 if row is None else int(row))
+        self.column_codes.append(self.columns.code(column))
+        self.case_codes.append(self.cases.code(case_no))
+        self.type_codes.append(self.types.code(change_type))
+        self.priority_codes.append(self.priorities.code(priority))
+        self.old.append(old)
+        self.new.append(new)
+
+    def extend_column(self, column: str, rows: Sequence[int], case_nos: Sequence[str],
+                      old: Sequence[Any], new: Sequence[Any], change_type: str,
+                      priority: Optional[str]) -> None:
+        """한 컬럼의 변경 셀 일괄 추가"""
+        n = len(rows)
+        if n == 0:
+            return
+        self.rows.extend(np.asarray(rows, dtype=np.int64).tolist())
+        self.column_codes.extend([self.columns.code(column)] * n)
+        self.case_codes.extend([self.cases.code(c) for c in case_nos])
+        self.type_codes.extend([self.types.code(change_type)] * n)
+        self.priority_codes.extend([self.priorities.code(priority)] * n)
+        self.old.extend(old)
+        self.new.extend(new)
+
+    def _codes(self, codes: array) -> np.ndarray:
+        return np.frombuffer(codes, dtype=codes.typecode) if len(codes) else np.zeros(0, dtype=np.int64)
+
+    def counts(self, field: str) -> Dict[Any, int]:
+        """코드별 변경 수 (등록 순서, 0건 제외)"""
+        book, codes = {
+            "column": (self.columns, self.column_codes),
+            "case_no": (self.cases, self.case_codes),
+            "change_type": (self.types, self.type_codes),
+            "priority": (self.priorities, self.priority_codes),
+        }[field]
+        totals = np.bincount(self._codes(codes), minlength=len(book.values))
+        return {book.values[i]: int(totals[i]) for i in np.flatnonzero(totals)}
+
+    def to_frame(self) -> pd.DataFrame:
+        """CaseChange 필드 순서의 DataFrame (+ row)"""
+        old = np.empty(len(self.old), dtype=object)
+        old[:] = self.old
+        new = np.empty(len(self.new), dtype=object)
+        new[:] = self.new
+        return pd.DataFrame({
+            "case_no": self.cases.decode(self._codes(self.case_codes)),
+            "column": self.columns.decode(self._codes(self.column_codes)),
+            "old": old,
+            "new": new,
+            "change_type": self.types.decode(self._codes(self.type_codes)),
+            "priority": self.priorities.decode(self._codes(self.priority_codes)),
+            "row": self._codes(self.rows).astype(np.int64),
+        })
+
 class UpdateTracker:
-    def __init__(self, out_dir: Optional[str] = None) -> None:
+    def __init__(self, out_dir: Optional[str] = None, keep_snapshots: bool = False) -> None:
+        """
+        Args:
+            out_dir: 리포트 출력 폴더 (기본 hitachi/out/)
+            keep_snapshots: True면 before/after 전체 DataFrame 복사본 보관 (디버그용)
+        """
         self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         if out_dir is None:
             # 스크립트 위치 기준으로 hitachi/out/ 경로 설정
@@ -27,19 +134,37 @@ class UpdateTracker:
         self.out_dir = Path(out_dir)
         self.out_dir.mkdir(parents=True, exist_ok=True)
 
+        self.keep_snapshots = keep_snapshots
         self.before: Dict[str, pd.DataFrame] = {}
         self.after: Dict[str, pd.DataFrame] = {}
+        self.shapes: Dict[str, Dict[str, tuple]] = {}
         self.total_cases: int = 0
         self.warehouse_columns: List[str] = []
-        self.changes: List[CaseChange] = []
+        self.matrix = ChangeMatrix()
         self.new_cases: Dict[str, Dict[str, Any]] = {}
         self._started: bool = False
 
+    @property
+    def changes(self) -> List[CaseChange]:
+        """변경 목록 (희소 행렬에서 생성, 호환용)"""
+        m = self.matrix
+        return [
+            CaseChange(case_no=m.cases.values[case], column=m.columns.values[col],
+                       old=old, new=new, change_type=m.types.values[ctype],
+                       priority=m.priorities.values[prio])
+            for case, col, old, new, ctype, prio in zip(
+                m.case_codes, m.column_codes, m.old, m.new, m.type_codes, m.priority_codes)
+        ]
+
     def capture_before_state(self, df: pd.DataFrame, sheet_name: str) -> None:
-        self.before[sheet_name] = df.copy()
+        self.shapes.setdefault(sheet_name, {})["before"] = df.shape
+        if self.keep_snapshots:
+            self.before[sheet_name] = df.copy()
 
     def capture_after_state(self, df: pd.DataFrame, sheet_name: str) -> None:
-        self.after[sheet_name] = df.copy()
+        self.shapes.setdefault(sheet_name, {})["after"] = df.shape
+        if self.keep_snapshots:
+            self.after[sheet_name] = df.copy()
 
     def start_update_tracking(self, total_cases: int, warehouse_columns: List[str]) -> None:
         self.total_cases = int(total_cases or 0)
@@ -51,14 +176,15 @@ class UpdateTracker:
         for ch in changes or []:
             ctype = force_change_type or ch.get("change_type") or "cell_update"
             prio = force_priority or ch.get("priority")
-            self.changes.append(
-                CaseChange(case_no=case_no,
-                           column=ch.get("column"),
-                           old=ch.get("old"),
-                           new=ch.get("new"),
-                           change_type=ctype,
-                           priority=prio)
-            )
+            self.matrix.append(case_no, ch.get("column"), ch.get("old"), ch.get("new"),
+                               ctype, prio, row=ch.get("row_index"))
+
+    def log_column_changes(self, column: str, rows: Sequence[int], case_nos: Sequence[str],
+                           old: Sequence[Any], new: Sequence[Any],
+                           change_type: str = "cell_update",
+                           priority: Optional[str] = None) -> None:
+        """한 컬럼의 변경 셀 일괄 기록 (동기화 엔진의 변경 마스크에서 호출)"""
+        self.matrix.extend_column(column, rows, case_nos, old, new, change_type, priority)
 
     def log_new_case(self, case_no: str, row_data: Dict[str, Any]) -> None:
         self.new_cases[str(case_no)] = dict(row_data or {})
@@ -66,8 +192,16 @@ class UpdateTracker:
     def end_update_tracking(self) -> Dict[str, Any]:
         return self.generate_change_comparison_report()
 
+    def column_counts(self) -> pd.Series:
+        """컬럼별 변경 수 (내림차순, 동수는 컬럼명 순)"""
+        counts = pd.Series(self.matrix.counts("column"), dtype=np.int64)
+        if counts.empty:
+            return counts
+        counts = counts.sort_index()
+        return counts.sort_values(ascending=False, kind="stable")
+
     def create_change_heatmap(self) -> str:
-        if not self.changes:
+        if not len(self.matrix):
             fig, ax = plt.subplots()
             ax.set_title("No changes")
             png = self.out_dir / f"change_heatmap_{self.run_id}.png"
@@ -75,8 +209,7 @@ class UpdateTracker:
             plt.close(fig)
             return str(png)
 
-        df = pd.DataFrame([asdict(c) for c in self.changes])
-        counts = df.groupby('column').size().sort_values(ascending=False)
+        counts = self.column_counts()
 
         fig, ax = plt.subplots()
         counts.plot(kind='bar', ax=ax)
@@ -90,10 +223,11 @@ class UpdateTracker:
         return str(png)
 
     def generate_detailed_report(self) -> str:
-        rows = [asdict(c) for c in self.changes]
         csv_path = self.out_dir / f"update_details_{self.run_id}.csv"
-        import pandas as pd
-        pd.DataFrame(rows).to_csv(csv_path, index=False)
+        if len(self.matrix):
+            self.matrix.to_frame()[list(CHANGE_FIELDS)].to_csv(csv_path, index=False)
+        else:
+            pd.DataFrame().to_csv(csv_path, index=False)
         return str(csv_path)
 
     def generate_change_comparison_report(self) -> Dict[str, Any]:
@@ -101,15 +235,16 @@ class UpdateTracker:
             "run_id": self.run_id,
             "total_cases": self.total_cases,
             "new_cases": list(self.new_cases.keys()),
-            "counts": {"total_changes": len(self.changes),
+            "counts": {"total_changes": len(self.matrix),
                        "by_type": {},
-                       "by_priority": {}},
+                       "by_priority": {},
+                       "by_column": {}},
         }
-        if self.changes:
-            import pandas as pd
-            df = pd.DataFrame([asdict(c) for c in self.changes])
-            by_type = df.groupby('change_type').size().to_dict()
-            by_prio = df.groupby('priority').size().to_dict()
-            summary["counts"]["by_type"] = {str(k): int(v) for k, v in by_type.items()}
-            summary["counts"]["by_priority"] = {str(k): int(v) for k, v in by_prio.items()}
+        if len(self.matrix):
+            by_type = self.matrix.counts("change_type")
+            # groupby 기본 동작과 같이 priority 없음(None)은 제외
+            by_prio = {k: v for k, v in self.matrix.counts("priority").items() if k is not None}
+            summary["counts"]["by_type"] = {str(k): v for k, v in sorted(by_type.items(), key=lambda kv: str(kv[0]))}
+            summary["counts"]["by_priority"] = {str(k): v for k, v in sorted(by_prio.items(), key=lambda kv: str(kv[0]))}
+            summary["counts"]["by_column"] = {str(k): int(v) for k, v in self.column_counts().items()}
         return summary